@@ -0,0 +1,77 @@
+"""
+Streaming HTML text extraction for citation verification
+
+Replaces BeautifulSoup(html.parser) + decompose() + get_text(): the page is
+fed to a SAX-style HTMLParser as it downloads, text inside script, style,
+nav and footer elements is dropped, and no tree is ever built.
+"""
+
+from html.parser import HTMLParser
+from typing import List
+
+SKIP_TAGS = frozenset({'script', 'style', 'nav', 'footer', 'noscript', 'template'})
+
+
+class TextExtractor(HTMLParser):
+    """
+    Incremental visible-text extractor
+
+    Usage:
+        extractor = TextExtractor()
+        for chunk in chunks:
+            extractor.feed(chunk)
+        text = extractor.text()
+    """
+
+    def __init__(self, max_chars: int = 500_000):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self._parts: List[str] = []
+        self._pending: List[str] = []
+        self._chars = 0
+        self._skipping: List[str] = []
+
+    @property
+    def full(self) -> bool:
+        return self._chars >= self.max_chars
+
+    def _flush(self):
+        # A text node can arrive split across feed() calls; strip it whole
+        if self._pending:
+            data = ''.join(self._pending).strip()
+            self._pending = []
+            if data:
+                self._parts.append(data)
+                self._chars += len(data) + 1
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in SKIP_TAGS:
+            self._skipping.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._flush()  # <br/>, <img/> ... never open a skipped region
+
+    def handle_endtag(self, tag):
+        self._flush()
+        # Stray end tags are ignored; a matching one closes its region
+        if tag in self._skipping:
+            while self._skipping.pop() != tag:
+                pass
+
+    def handle_data(self, data):
+        if not self._skipping and not self.full:
+            self._pending.append(data)
+
+    def text(self) -> str:
+        """Visible text joined with single spaces (like get_text(' ', strip=True))"""
+        self.close()
+        self._flush()
+        return ' '.join(self._parts)[:self.max_chars]
+
+
+def extract_text(html: str, max_chars: int = 500_000) -> str:
+    """Visible text of an HTML document"""
+    extractor = TextExtractor(max_chars)
+    extractor.feed(html)
+    return extractor.text()
@@ -1,19 +1,52 @@
-
 """
 Citation Verification Module for RevSEO Intelligence™
 Verifies AI citations are real and accurate (not hallucinated)
+
+Fetching is bounded three ways: a global concurrency limit, a per-host limit
+(politeness), and a byte cap on every body (ranged, streamed GET). Pages are
+cached by URL and revalidated with ETag / Last-Modified, so re-verifying a
+citation against a new query usually costs one 304 or nothing at all. Only
+definite answers (200, 404, 410) are cached; 5xx, 429 and the like are
+retried on the next lookup.
 """
 
 import asyncio
-from typing import Dict, List, Optional
-from datetime import datetime
+import codecs
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 import httpx
-from bs4 import BeautifulSoup
 import re
 import logging
 
+from .text_extractor import TextExtractor
+
 logger = logging.getLogger(__name__)
 
+# Status codes that mean "this server does not do HEAD", not "page missing"
+HEAD_UNSUPPORTED = {400, 403, 405, 501}
+
+# Answers worth keeping for cache_ttl; anything else may be transient
+CACHEABLE_STATUSES = {200, 404, 410}
+
+
+@dataclass
+class CachedPage:
+    """What one fetch of a URL taught us"""
+    status_code: int
+    text: str = ''
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+    has_content: bool = False
+
+    @property
+    def resolves(self) -> bool:
+        return self.status_code == 200
+
 
 class CitationVerifier:
     """
@@ -22,14 +55,173 @@ class CitationVerifier:
     2. Contain relevant content
     3. Match anchor text claims
     """
-    
-    def __init__(self, timeout: float = 30.0):
+
+    def __init__(self, timeout: float = 30.0, max_concurrent: int = 20,
+                 per_host_concurrent: int = 2, max_bytes: int = 512 * 1024,
+                 cache_size: int = 2048, cache_ttl: float = 3600.0):
+        """
+        Args:
+            timeout: Per-request timeout in seconds
+            max_concurrent: Requests in flight across all hosts
+            per_host_concurrent: Requests in flight to any one host
+            max_bytes: Body bytes read per page (Range header + streaming cap)
+            cache_size: URLs kept in the page cache (LRU)
+            cache_ttl: Seconds a cached page is trusted before revalidation
+        """
         self.client = httpx.AsyncClient(
             timeout=timeout,
             follow_redirects=True,
             headers={'User-Agent': 'Mozilla/5.0 (compatible; RevFlowBot/1.0; +https://revflow.ai)'}
         )
-        
+        self.max_concurrent = max_concurrent
+        self.per_host_concurrent = per_host_concurrent
+        self.max_bytes = max_bytes
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+
+        self._global_limit: Optional[asyncio.Semaphore] = None
+        # host -> [semaphore, tasks holding or waiting]; dropped when idle
+        self._host_limits: Dict[str, list] = {}
+        self._cache: 'OrderedDict[str, CachedPage]' = OrderedDict()
+        self._in_flight: Dict[Tuple[str, bool], asyncio.Future] = {}
+        self.stats = {
+            'requests': 0, 'head_requests': 0, 'not_modified': 0,
+            'cache_hits': 0, 'bytes_read': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def _slot(self, url: str) -> AsyncIterator[None]:
+        """Hold a per-host and a global request slot"""
+        # Semaphores bind to the running loop on first use, so build them lazily
+        if self._global_limit is None:
+            self._global_limit = asyncio.Semaphore(self.max_concurrent)
+        host = (urlsplit(url).hostname or '').lower()
+        entry = self._host_limits.setdefault(host, [asyncio.Semaphore(self.per_host_concurrent), 0])
+        entry[1] += 1
+        try:
+            async with entry[0], self._global_limit:
+                yield
+        finally:
+            # Only hosts with requests in flight keep a semaphore
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._host_limits[host]
+
+    def _remember(self, url: str, page: CachedPage):
+        self._cache[url] = page
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _head(self, url: str) -> Optional[CachedPage]:
+        """Status + validators without a body; None if the server won't do HEAD"""
+        self.stats['head_requests'] += 1
+        response = await self.client.head(url)
+        if response.status_code in HEAD_UNSUPPORTED:
+            return None
+        return CachedPage(
+            status_code=response.status_code,
+            etag=response.headers.get('etag'),
+            last_modified=response.headers.get('last-modified'),
+            fetched_at=time.monotonic()
+        )
+
+    async def _get(self, url: str, cached: Optional[CachedPage]) -> CachedPage:
+        """Ranged, streamed, conditional GET; parses text as bytes arrive"""
+        headers = {'Range': f'bytes=0-{self.max_bytes - 1}'}
+        if cached is not None and cached.has_content:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+
+        self.stats['requests'] += 1
+        async with self.client.stream('GET', url, headers=headers) as response:
+            if response.status_code == 304 and cached is not None:
+                self.stats['not_modified'] += 1
+                cached.fetched_at = time.monotonic()
+                return cached
+
+            # 206 is the answer to our own Range header, not a different page
+            status = 200 if response.status_code == 206 else response.status_code
+            page = CachedPage(
+                status_code=status,
+                etag=response.headers.get('etag'),
+                last_modified=response.headers.get('last-modified'),
+                fetched_at=time.monotonic()
+            )
+            if status != 200:
+                return page
+
+            extractor = TextExtractor()
+            decoder = _decoder(response.encoding)
+            received = 0
+            async for chunk in response.aiter_bytes():
+                chunk = chunk[:self.max_bytes - received]
+                received += len(chunk)
+                extractor.feed(decoder.decode(chunk))
+                if received >= self.max_bytes or extractor.full:
+                    break
+            extractor.feed(decoder.decode(b'', final=True))
+            self.stats['bytes_read'] += received
+
+            page.text = extractor.text().lower()
+            page.has_content = True
+            return page
+
+    async def _fetch(self, url: str, need_content: bool) -> CachedPage:
+        cached = self._cache.get(url)
+        if cached is not None:
+            fresh = time.monotonic() - cached.fetched_at < self.cache_ttl
+            if fresh and (cached.has_content or not need_content or not cached.resolves):
+                self.stats['cache_hits'] += 1
+                self._cache.move_to_end(url)
+                return cached
+
+        async with self._slot(url):
+            page = None
+            if not need_content and cached is None:
+                page = await self._head(url)
+            if page is None:
+                page = await self._get(url, cached)
+
+        if page.status_code in CACHEABLE_STATUSES:
+            self._remember(url, page)
+        return page
+
+    async def fetch_page(self, url: str, need_content: bool = True) -> CachedPage:
+        """
+        Fetch (or reuse) a page; concurrent callers for one URL share a request
+
+        need_content=False allows a HEAD probe, falling back to a ranged GET
+        when the server rejects HEAD.
+        """
+        key = (url, need_content)
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            page = await self._fetch(url, need_content)
+            future.set_result(page)
+            return page
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else waited
+            raise
+        finally:
+            del self._in_flight[key]
+
+    # ------------------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------------------
+
     async def verify_citation(self, citation: Dict, query_context: str) -> Dict:
         """Verify a single citation"""
         result = {
@@ -39,22 +231,26 @@ class CitationVerifier:
             'issues': [],
             'checks': {}
         }
-        
+
         url = citation.get('url')
         if not url:
             result['issues'].append('Missing URL')
             return result
-        
+
+        query_terms = self._extract_key_terms(query_context)
+        anchor_text = citation.get('anchor_text', '')
+        check_anchor = bool(anchor_text) and len(anchor_text) > 3
+
         # Check 1: URL resolves
         try:
-            response = await self.client.get(url)
-            result['checks']['url_resolves'] = response.status_code == 200
-            result['checks']['status_code'] = response.status_code
-            
-            if response.status_code != 200:
-                result['issues'].append(f'HTTP {response.status_code}')
+            page = await self.fetch_page(url, need_content=bool(query_terms) or check_anchor)
+            result['checks']['url_resolves'] = page.resolves
+            result['checks']['status_code'] = page.status_code
+
+            if not page.resolves:
+                result['issues'].append(f'HTTP {page.status_code}')
                 return result
-                
+
         except httpx.TimeoutException:
             result['issues'].append('Timeout')
             result['checks']['url_resolves'] = False
@@ -63,38 +259,25 @@ class CitationVerifier:
             result['issues'].append(f'Error: {str(e)[:50]}')
             result['checks']['url_resolves'] = False
             return result
-        
+
         # Check 2: Content relevance
-        try:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            for script in soup(['script', 'style', 'nav', 'footer']):
-                script.decompose()
-            page_text = soup.get_text(separator=' ', strip=True).lower()
-            
-            query_terms = self._extract_key_terms(query_context)
-            
-            matches = sum(1 for term in query_terms if term.lower() in page_text)
-            relevance_score = matches / len(query_terms) if query_terms else 0
-            
-            result['checks']['content_relevant'] = relevance_score > 0.3
-            result['checks']['relevance_score'] = round(relevance_score, 2)
-            
-            if relevance_score < 0.3:
-                result['issues'].append('Low relevance')
-                
-        except Exception as e:
-            result['issues'].append(f'Parse error: {str(e)[:30]}')
-            result['checks']['content_relevant'] = False
-        
+        page_text = page.text
+        matches = sum(1 for term in query_terms if term.lower() in page_text)
+        relevance_score = matches / len(query_terms) if query_terms else 0
+
+        result['checks']['content_relevant'] = relevance_score > 0.3
+        result['checks']['relevance_score'] = round(relevance_score, 2)
+
+        if relevance_score < 0.3:
+            result['issues'].append('Low relevance')
+
         # Check 3: Anchor text presence
-        anchor_text = citation.get('anchor_text', '')
-        if anchor_text and len(anchor_text) > 3:
+        if check_anchor:
             anchor_in_page = anchor_text.lower() in page_text
             result['checks']['anchor_found'] = anchor_in_page
             if not anchor_in_page:
                 result['issues'].append('Anchor not found')
-        
+
         # Calculate score
         score = 0
         if result['checks'].get('url_resolves'):
@@ -103,49 +286,71 @@ class CitationVerifier:
             score += 40
         if result['checks'].get('anchor_found', True):
             score += 20
-            
+
         result['score'] = score
         result['verified'] = score >= 60
-        
+
         return result
-    
+
+    async def verify_many(self, items: List[Dict], max_concurrent: Optional[int] = None) -> List[Dict]:
+        """
+        Verify citations that each carry their own query context
+
+        Args:
+            items: [{'url': ..., 'anchor_text': ..., 'query_context': ...}, ...]
+            max_concurrent: Optional cap on this call's citations in flight
+
+        Returns:
+            One result per item, in order (exceptions become failed results)
+        """
+        limit = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+
+        async def verify(item: Dict) -> Dict:
+            if limit is None:
+                return await self.verify_citation(item, item.get('query_context', ''))
+            async with limit:
+                return await self.verify_citation(item, item.get('query_context', ''))
+
+        results = await asyncio.gather(*(verify(item) for item in items), return_exceptions=True)
+        return [
+            {'url': item.get('url'), 'verified': False, 'error': str(result)[:100]}
+            if isinstance(result, Exception) else result
+            for item, result in zip(items, results)
+        ]
+
     async def verify_batch(self, citations: List[Dict], query_context: str,
-                          max_concurrent: int = 5) -> Dict:
-        """Verify multiple citations with concurrency limit"""
-        semaphore = asyncio.Semaphore(max_concurrent)
-        
-        async def verify_with_limit(citation):
-            async with semaphore:
-                return await self.verify_citation(citation, query_context)
-        
-        tasks = [verify_with_limit(c) for c in citations]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        verified_count = 0
-        total_score = 0
-        verification_results = []
-        
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                verification_results.append({
-                    'url': citations[i].get('url'),
-                    'verified': False,
-                    'error': str(result)[:100]
-                })
-            else:
-                verification_results.append(result)
-                if result.get('verified'):
-                    verified_count += 1
-                total_score += result.get('score', 0)
-        
+                          max_concurrent: Optional[int] = None) -> Dict:
+        """
+        Verify multiple citations against one query
+
+        Concurrency is bounded by the verifier's global and per-host limits;
+        max_concurrent, if given, further caps this batch alone.
+        """
+        started = time.perf_counter()
+        verification_results = await self.verify_many(
+            [dict(citation, query_context=query_context) for citation in citations],
+            max_concurrent=max_concurrent
+        )
+
+        verified_count = sum(1 for result in verification_results if result.get('verified'))
+        total_score = sum(result.get('score', 0) for result in verification_results)
+
         return {
             'total_citations': len(citations),
             'verified_count': verified_count,
             'verification_rate': round(verified_count / len(citations) * 100, 1) if citations else 0,
             'average_score': round(total_score / len(citations), 1) if citations else 0,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
             'results': verification_results
         }
-    
+
+    def get_stats(self) -> Dict:
+        """Request, revalidation and cache counters"""
+        return dict(self.stats, cached_urls=len(self._cache))
+
+    def clear_cache(self):
+        self._cache.clear()
+
     def _extract_key_terms(self, query: str) -> List[str]:
         """Extract key terms for relevance checking"""
         stopwords = {
@@ -156,6 +361,14 @@ class CitationVerifier:
         }
         words = re.findall(r'\b[a-zA-Z]{3,}\b', query.lower())
         return [w for w in words if w not in stopwords][:10]
-    
+
     async def close(self):
         await self.client.aclose()
+
+
+def _decoder(encoding: Optional[str]):
+    """Incremental decoder so multi-byte characters may straddle chunks"""
+    try:
+        return codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
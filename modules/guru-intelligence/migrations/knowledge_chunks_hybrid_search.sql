@@ -0,0 +1,59 @@
+-- ============================================================================
+-- GURU INTELLIGENCE PLATFORM - HYBRID SEARCH OVER knowledge_chunks
+-- Version: 1.0
+-- Purpose: Stored tsvector + GIN index for keyword search, pgvector HNSW
+--          index over the MiniLM embeddings for semantic search
+-- Used by: src/hybrid_search.py (POST /knowledge/search)
+-- ============================================================================
+
+-- ============================================================================
+-- PART 1: STORED TSVECTOR (no more to_tsvector() over the table per query)
+-- ============================================================================
+
+ALTER TABLE knowledge_chunks
+ADD COLUMN IF NOT EXISTS content_tsv tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(section_title, '')), 'A') ||
+        setweight(to_tsvector('english', content), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_content_tsv ON knowledge_chunks USING GIN(content_tsv);
+
+-- ============================================================================
+-- PART 2: PGVECTOR HNSW INDEX (all-MiniLM-L6-v2 = 384 dimensions)
+-- ============================================================================
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+ALTER TABLE knowledge_chunks
+ADD COLUMN IF NOT EXISTS embedding_vec vector(384);
+
+-- Keep embedding_vec in sync with the FLOAT8[] written by KnowledgeIngester
+CREATE OR REPLACE FUNCTION knowledge_chunks_sync_embedding() RETURNS trigger AS $$
+BEGIN
+    IF NEW.embedding IS NULL OR array_length(NEW.embedding, 1) <> 384 THEN
+        NEW.embedding_vec := NULL;
+    ELSE
+        NEW.embedding_vec := NEW.embedding::vector(384);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_knowledge_chunks_embedding ON knowledge_chunks;
+CREATE TRIGGER trg_knowledge_chunks_embedding
+    BEFORE INSERT OR UPDATE OF embedding ON knowledge_chunks
+    FOR EACH ROW EXECUTE FUNCTION knowledge_chunks_sync_embedding();
+
+-- Backfill existing rows
+UPDATE knowledge_chunks
+SET embedding_vec = embedding::vector(384)
+WHERE embedding IS NOT NULL
+  AND array_length(embedding, 1) = 384
+  AND embedding_vec IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_embedding_hnsw
+    ON knowledge_chunks USING hnsw (embedding_vec vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+ANALYZE knowledge_chunks;
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Guru Intelligence - Assessor Rules/sec Benchmark
+Measures Tier 1 throughput of the previous per-request loop (parse each
+validation_pattern, re-scan the content per rule) versus rules compiled once
+by the RuleCatalog, city detection with one regex per city versus the
+combined automaton, and Tier 2 with one shared spaCy parse.
+
+Usage:
+    python scripts/bench_assessor.py [--rules 300] [--words 2000] [--repeat 20]
+
+No database is needed: a synthetic rule set is used.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from multi_tiered_assessor import Tier1Validator, Tier2Validator
+
+TIER1_PATTERNS = [
+    'word_count_min:300', 'word_count_max:3000', 'word_count_range:500:2500',
+    'has_phone:_', 'has_price:_', 'has_license:_', 'has_cities:3', 'has_h2:2',
+    'has_bullets:3', 'contains_keyword:drain cleaning', 'no_phrase:cutting-edge',
+    'has_numbers:5',
+]
+
+TIER2_DESCRIPTIONS = [
+    'Avoid passive voice in the opening paragraph',
+    'Keep readability at grade 12 or below',
+    'First sentence should answer the query in under 20 words',
+]
+
+PARAGRAPH = (
+    "Phoenix plumbers charge between $150-$450 for drain cleaning services. "
+    "ABC Plumbing has served Scottsdale, Tempe, Mesa and Gilbert since 1987. "
+    "Our licensed team (ROC-284756) responds within 60 minutes. "
+    "Call (602) 555-1234 for same-day service.\n\n"
+    "## How Much Does Drain Cleaning Cost?\n\n"
+    "- Upfront pricing\n- No hidden fees\n- Certified technicians\n\n"
+)
+
+
+def make_rules(count, tier):
+    rules = []
+    for i in range(count):
+        rule = {
+            'rule_id': f'BENCH-{tier}-{i:03d}',
+            'rule_name': f'Benchmark rule {i}',
+            'enforcement_level': 'required' if i % 3 == 0 else 'recommended',
+            'auto_fixable': False,
+        }
+        if tier == 1:
+            rule['validation_pattern'] = TIER1_PATTERNS[i % len(TIER1_PATTERNS)]
+            rule['rule_description'] = rule['validation_pattern']
+        else:
+            rule['validation_type'] = 'nlp'
+            rule['rule_description'] = TIER2_DESCRIPTIONS[i % len(TIER2_DESCRIPTIONS)]
+        rules.append(rule)
+    return rules
+
+
+def make_content(words):
+    paragraph_words = len(PARAGRAPH.split())
+    return PARAGRAPH * max(1, words // paragraph_words)
+
+
+def find_cities_per_city(content):
+    """The previous implementation: one regex search per city"""
+    return [
+        city for city in Tier1Validator.CITIES
+        if re.search(r'\b' + re.escape(city) + r'\b', content, re.I)
+    ]
+
+
+LEGACY_FUNCTIONS = {
+    'word_count_min': lambda content, min_val: len(content.split()) >= int(min_val),
+    'word_count_max': lambda content, max_val: len(content.split()) <= int(max_val),
+    'word_count_range': lambda content, min_val, max_val: int(min_val) <= len(content.split()) <= int(max_val),
+    'has_phone': lambda content, _: bool(re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', content)),
+    'has_price': lambda content, _: bool(re.search(r'\$\d+', content)),
+    'has_license': lambda content, _: bool(re.search(r'(?:ROC|license|lic|#)[-#]?\s*\d+', content, re.I)),
+    'has_cities': lambda content, min_count: len(find_cities_per_city(content)) >= int(min_count),
+    'has_h2': lambda content, min_count: content.count('## ') >= int(min_count),
+    'has_bullets': lambda content, min_count: len(re.findall(r'^\s*[-*]\s', content, re.M)) >= int(min_count),
+    'contains_keyword': lambda content, keyword: keyword.lower() in content.lower(),
+    'no_phrase': lambda content, phrase: phrase.lower() not in content.lower(),
+    'has_numbers': lambda content, min_count: len(re.findall(r'\b\d+\b', content)) >= int(min_count),
+}
+
+
+def legacy_tier1(content, rules):
+    """The previous Tier 1 loop: parse and evaluate every pattern per request"""
+    passed = 0
+    for rule in rules:
+        parts = rule['validation_pattern'].split(':')
+        if LEGACY_FUNCTIONS[parts[0]](content, *parts[1:]):
+            passed += 1
+    return passed
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def report(label, seconds, count, unit='rules'):
+    print(f"  {label:<28} {seconds * 1000:8.2f} ms  {count / seconds:12,.0f} {unit}/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rules', type=int, default=300)
+    parser.add_argument('--words', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    content = make_content(args.words)
+    print(f"Content: {len(content.split())} words, {args.rules} rules per tier, {args.repeat} runs\n")
+
+    tier1 = Tier1Validator()
+    rules = make_rules(args.rules, 1)
+    compiled = tier1.compile(rules)
+    print("Tier 1")
+    assert legacy_tier1(content, rules) == tier1.validate(content, compiled).rules_passed
+    report("previous per-request loop", timed(lambda: legacy_tier1(content, rules), args.repeat), args.rules)
+    report("compiled per request", timed(lambda: tier1.validate(content, rules), args.repeat), args.rules)
+    report("precompiled (catalog)", timed(lambda: tier1.validate(content, compiled), args.repeat), args.rules)
+
+    print("\nCity detection")
+    assert find_cities_per_city(content) == Tier1Validator._find_cities(content)
+    cities = len(Tier1Validator.CITIES)
+    report("one regex per city", timed(lambda: find_cities_per_city(content), args.repeat), cities, 'cities')
+    report("combined automaton", timed(lambda: Tier1Validator._find_cities(content), args.repeat), cities, 'cities')
+
+    tier2 = Tier2Validator()
+    if tier2.nlp:
+        rules = make_rules(args.rules, 2)
+        compiled = tier2.compile(rules)
+        print("\nTier 2 (one spaCy parse per validation)")
+        report("precompiled (catalog)", timed(lambda: tier2.validate(content, compiled), args.repeat), args.rules)
+    else:
+        print("\nTier 2 skipped: spaCy model not available")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Guru Intelligence - Hybrid Search Latency Benchmark
+Reports p50/p99 search latency as the chunk count grows, for the previous
+per-query to_tsvector search and the hybrid searcher's keyword (stored
+tsvector + GIN), semantic (pgvector HNSW) and fused modes.
+
+Usage:
+    python scripts/bench_hybrid_search.py [--sizes 1000 10000 50000] [--queries 200]
+
+Requirements:
+    - PostgreSQL with the pgvector extension (DB_HOST/DB_PORT/DB_NAME/DB_USER/DB_PASSWORD)
+    - Creates and drops the table knowledge_chunks_bench; knowledge_chunks is not touched
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hybrid_search import HybridSearcher, percentile, to_vector_literal
+
+TABLE = 'knowledge_chunks_bench'
+DIMENSIONS = 384
+
+VOCABULARY = (
+    "bluf answer first entity schema local proof citation snippet voice search "
+    "freshness ranking factor review google maps landmark neighborhood plumber "
+    "hvac roofing price license warranty faq heading paragraph chunk quotable "
+    "structured data json-ld e-e-a-t expertise trust author experience query"
+).split()
+
+LEGACY_QUERY = f"""
+    SELECT id, ts_rank(to_tsvector('english', content), plainto_tsquery('english', %s)) AS rank
+    FROM {TABLE}
+    WHERE to_tsvector('english', content) @@ plainto_tsquery('english', %s)
+    ORDER BY rank DESC LIMIT %s
+"""
+
+
+class RandomEmbedder:
+    """Stands in for MiniLM: random unit vectors, so no model download is needed"""
+
+    def __init__(self, seed: int = 7):
+        self.random = random.Random(seed)
+
+    def encode(self, text):
+        return _Vector(random_unit_vector(self.random))
+
+
+class _Vector(list):
+    def tolist(self):
+        return list(self)
+
+
+def random_unit_vector(rng) -> list:
+    vector = [rng.gauss(0, 1) for _ in range(DIMENSIONS)]
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+def random_text(rng, words: int) -> str:
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def create_table(conn):
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        CREATE EXTENSION IF NOT EXISTS vector;
+        DROP TABLE IF EXISTS {TABLE};
+        CREATE TABLE {TABLE} (
+            id SERIAL PRIMARY KEY,
+            source_file VARCHAR(255),
+            section_title VARCHAR(500),
+            domain VARCHAR(50),
+            content TEXT NOT NULL,
+            embedding_vec vector({DIMENSIONS}),
+            content_tsv tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(section_title, '')), 'A') ||
+                setweight(to_tsvector('english', content), 'B')
+            ) STORED
+        );
+        CREATE INDEX ON {TABLE} USING GIN(content_tsv);
+        CREATE INDEX ON {TABLE} USING hnsw (embedding_vec vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+    """)
+    conn.commit()
+    cursor.close()
+
+
+def grow_table(conn, rng, count: int):
+    cursor = conn.cursor()
+    rows = [
+        (
+            'bench.md',
+            random_text(rng, 4),
+            rng.choice(['ai-seo', 'local-seo', 'content']),
+            random_text(rng, 250),
+            to_vector_literal(random_unit_vector(rng))
+        )
+        for _ in range(count)
+    ]
+    execute_values(
+        cursor,
+        f"INSERT INTO {TABLE} (source_file, section_title, domain, content, embedding_vec) VALUES %s",
+        rows,
+        template="(%s, %s, %s, %s, %s::vector)",
+        page_size=500
+    )
+    cursor.execute(f"ANALYZE {TABLE}")
+    conn.commit()
+    cursor.close()
+
+
+def time_queries(fn, queries):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return percentile(latencies, 50), percentile(latencies, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hybrid search p50/p99 latency vs. chunk count')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', 5432)),
+        database=os.getenv('DB_NAME', 'knowledge_graph_db'),
+        user=os.getenv('DB_USER', 'knowledge_admin'),
+        password=os.getenv('DB_PASSWORD', '')
+    )
+    rng = random.Random(42)
+    searcher = HybridSearcher(table=TABLE, embedder=RandomEmbedder())
+    queries = [random_text(rng, 3) for _ in range(args.queries)]
+
+    def legacy(query):
+        cursor = conn.cursor()
+        cursor.execute(LEGACY_QUERY, [query, query, args.limit])
+        cursor.fetchall()
+        cursor.close()
+
+    create_table(conn)
+    try:
+        print(f"{'chunks':>8}  {'mode':<10} {'p50 ms':>8} {'p99 ms':>8}")
+        loaded = 0
+        for size in sorted(args.sizes):
+            grow_table(conn, rng, size - loaded)
+            loaded = size
+            modes = [('legacy', legacy)] + [
+                (mode, lambda query, mode=mode: searcher.search(conn, query, limit=args.limit, mode=mode))
+                for mode in HybridSearcher.MODES
+            ]
+            for name, fn in modes:
+                p50, p99 = time_queries(fn, queries)
+                print(f"{size:>8}  {name:<10} {p50:8.2f} {p99:8.2f}")
+            conn.rollback()
+    finally:
+        cursor = conn.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
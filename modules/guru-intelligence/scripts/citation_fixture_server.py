@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Guru Intelligence - Citation Fixture Server
+Serves canned pages so CitationVerifier can be exercised without touching
+real sites. Supports ETag / Last-Modified revalidation, Range requests and
+per-path quirks, and records per-host concurrency for politeness checks.
+
+Routes:
+    /page/<name>   HTML page (ETag + Last-Modified, 304 on match, Range)
+    /big           HTML page larger than any sane byte cap
+    /nohead        HEAD answers 405, GET works
+    /missing       404
+    /flaky         503 while state.failures > 0, then the plumbing page
+
+Every response is delayed by --latency seconds.
+
+Usage:
+    python scripts/citation_fixture_server.py --port 8766 --latency 0.2
+"""
+
+import argparse
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LAST_MODIFIED = formatdate(1_700_000_000, usegmt=True)
+
+PAGES = {
+    'plumbing': (
+        "<html><head><title>Emergency Plumbing Austin</title>"
+        "<script>var hidden = 'water heater repair';</script>"
+        "<style>.x{color:red}</style></head><body>"
+        "<nav>Home | Roofing | HVAC</nav>"
+        "<h1>Emergency plumbing in Austin</h1>"
+        "<p>Licensed plumbers for burst pipes, drain cleaning &amp; leak detection, 24/7.</p>"
+        "<footer>Copyright Roofing Co</footer></body></html>"
+    ),
+    'roofing': (
+        "<html><body><h1>Roof replacement guide</h1>"
+        "<p>Shingle roofing costs and warranty terms in Dallas.</p></body></html>"
+    ),
+}
+
+
+class FixtureState:
+    """Request counters shared by handler threads"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = 0
+        self.methods = {}
+        self.not_modified = 0
+        self.in_flight = {}
+        self.max_in_flight = {}
+        self.bytes_sent = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+
+
+def make_handler(state: FixtureState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _body(self):
+            path = self.path.split('?')[0]
+            if path.startswith('/page/') and path[6:] in PAGES:
+                return PAGES[path[6:]], True
+            if path == '/big':
+                return '<html><body>' + '<p>plumbing filler text</p>' * 200_000 + '</body></html>', True
+            if path in ('/nohead', '/flaky'):
+                return PAGES['plumbing'], False
+            return None, False
+
+        def _handle(self, head: bool):
+            host = self.headers.get('Host', '').split(':')[0]
+            with state.lock:
+                state.requests += 1
+                state.methods[self.command] = state.methods.get(self.command, 0) + 1
+                state.in_flight[host] = state.in_flight.get(host, 0) + 1
+                state.max_in_flight[host] = max(state.max_in_flight.get(host, 0), state.in_flight[host])
+            try:
+                if state.latency:
+                    time.sleep(state.latency)
+                self._respond(head)
+            finally:
+                with state.lock:
+                    state.in_flight[host] -= 1
+
+        def _respond(self, head: bool):
+            if self.path.startswith('/flaky'):
+                with state.lock:
+                    failing = state.failures > 0
+                    state.failures -= failing
+                if failing:
+                    self._send(503, b'try again', head)
+                    return
+            body, validators = self._body()
+            if body is None:
+                self._send(404, b'not found', head)
+                return
+            if head and self.path.startswith('/nohead'):
+                self._send(405, b'', head)
+                return
+
+            payload = body.encode('utf-8')
+            etag = f'"{len(payload):x}"'
+            headers = {'Content-Type': 'text/html; charset=utf-8'}
+            if validators:
+                headers['ETag'] = etag
+                headers['Last-Modified'] = LAST_MODIFIED
+                if self.headers.get('If-None-Match') == etag:
+                    with state.lock:
+                        state.not_modified += 1
+                    self._send(304, b'', True, headers)
+                    return
+
+            status = 200
+            requested = self.headers.get('Range', '')
+            if requested.startswith('bytes=0-') and requested[8:].isdigit():
+                end = min(int(requested[8:]), len(payload) - 1)
+                headers['Content-Range'] = f'bytes 0-{end}/{len(payload)}'
+                payload = payload[:end + 1]
+                status = 206
+            self._send(status, payload, head, headers)
+
+        def _send(self, status, payload, head, headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(0 if status == 304 else len(payload)))
+            self.end_headers()
+            if not head and status != 304:
+                # Count first: the client may be done before write() returns
+                with state.lock:
+                    state.bytes_sent += len(payload)
+                self.wfile.write(payload)
+
+        def do_GET(self):
+            self._handle(head=False)
+
+        def do_HEAD(self):
+            self._handle(head=True)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(host: str = '127.0.0.1', port: int = 0, latency: float = 0.0):
+    """Start the fixture server in a background thread; returns (server, state)"""
+    state = FixtureState(latency)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local fixture pages for citation verification')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds per response')
+    args = parser.parse_args()
+
+    server, _ = serve(args.host, args.port, args.latency)
+    print(f"🧪 Citation fixtures on http://{args.host}:{args.port} ({', '.join(PAGES)})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Guru Intelligence - Stub LLM Server
+Answers Anthropic Messages API calls locally so Tier 3 can be exercised
+without an API key or cost. Every rule in the prompt passes except those
+whose rule_id starts with one of the --fail prefixes.
+
+Usage:
+    python scripts/stub_llm_server.py --port 8765 --latency 0.5 --fail TONE- BLUF-
+
+    GURU_LLM_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=stub \\
+        python src/multi_tiered_assessor.py
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RULE_LINE = re.compile(r'^\d+\. \[([^\]]+)\]', re.M)
+
+
+class StubState:
+    """Request counters shared by handler threads"""
+
+    def __init__(self, latency: float, fail_prefixes):
+        self.latency = latency
+        self.fail_prefixes = tuple(fail_prefixes)
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if not self.path.rstrip('/').endswith('/v1/messages'):
+                self.send_error(404)
+                return
+
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            prompt = ''.join(
+                message['content'] if isinstance(message['content'], str)
+                else ''.join(part.get('text', '') for part in message['content'])
+                for message in body.get('messages', [])
+            )
+
+            with state.lock:
+                state.requests += 1
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            try:
+                time.sleep(state.latency)
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+            assessments = [
+                {
+                    'rule_id': rule_id,
+                    'passed': not rule_id.startswith(state.fail_prefixes) if state.fail_prefixes else True,
+                    'reason': 'stub assessment'
+                }
+                for rule_id in RULE_LINE.findall(prompt)
+            ]
+            text = json.dumps({'assessments': assessments})
+            response = {
+                'id': f'msg_stub_{state.requests}',
+                'type': 'message',
+                'role': 'assistant',
+                'model': body.get('model', 'stub'),
+                'content': [{'type': 'text', 'text': text}],
+                'stop_reason': 'end_turn',
+                'stop_sequence': None,
+                'usage': {'input_tokens': len(prompt) // 4, 'output_tokens': len(text) // 4}
+            }
+
+            payload = json.dumps(response).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            print(f"stub: {format % args} (requests={state.requests}, max_in_flight={state.max_in_flight})")
+
+    return Handler
+
+
+def serve(host: str = '127.0.0.1', port: int = 8765, latency: float = 0.5, fail_prefixes=()):
+    """Start the stub in a background thread; returns (server, state)"""
+    state = StubState(latency, fail_prefixes)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stub for the Anthropic Messages API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.5, help='Seconds per response')
+    parser.add_argument('--fail', nargs='*', default=[], help='rule_id prefixes to mark as failed')
+    args = parser.parse_args()
+
+    server, _ = serve(args.host, args.port, args.latency, args.fail)
+    print(f"🧪 Stub LLM listening on http://{args.host}:{args.port} (latency {args.latency}s)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
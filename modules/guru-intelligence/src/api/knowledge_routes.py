@@ -6,7 +6,10 @@ import psycopg2
 import os
 import re
 
+from hybrid_search import HybridSearcher
+
 router = APIRouter()
+searcher = HybridSearcher()
 
 # Database connection
 # DB_CONFIG = {
@@ -106,16 +109,14 @@ async def get_rules(request: RulesRequest):
 
 
 @router.post("/search")
-async def search_knowledge(request: SearchRequest):
+def search_knowledge(request: SearchRequest):
+    # Hybrid semantic + keyword search (see hybrid_search.py); blocking, so run in the threadpool
     conn = get_db_connection()
-    cur = conn.cursor()
-    query = "SELECT chunk_id, source_file, section_title, content, ts_rank(to_tsvector('english', content), plainto_tsquery('english', %s)) as rank FROM knowledge_chunks WHERE to_tsvector('english', content) @@ plainto_tsquery('english', %s) ORDER BY rank DESC LIMIT %s"
-    cur.execute(query, [request.query, request.query, request.limit])
-    rows = cur.fetchall()
-    results = [{"chunk_id": row[0], "source": row[1], "section": row[2], "content": row[3][:500] + "..." if len(row[3]) > 500 else row[3], "relevance": float(row[4]) if row[4] else 0} for row in rows]
-    cur.close()
-    conn.close()
-    return {"query": request.query, "results": results, "count": len(results)}
+    try:
+        response = searcher.search(conn, request.query, domain=request.domain, limit=request.limit)
+    finally:
+        conn.close()
+    return {"query": request.query, "results": response["results"], "count": len(response["results"]), "mode": response["mode"]}
 
 
 @router.post("/assess")
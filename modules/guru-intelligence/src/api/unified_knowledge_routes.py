@@ -20,6 +20,7 @@ import os
 
 # Import the Multi-Tiered Assessor
 from multi_tiered_assessor import MultiTieredAssessor
+from hybrid_search import HybridSearcher
 
 # Router setup
 knowledge_router = APIRouter(prefix="/knowledge", tags=["knowledge"])
@@ -35,10 +36,23 @@ scoring_router = APIRouter(prefix="/scoring", tags=["scoring"])
 #     'password': os.getenv('DB_PASSWORD', 'ZYsCjjdy2dzIwrKKM4TY7Vc0Z8ryoR1V')
 # }
 
+def get_db_connection():
+    """Connection to the knowledge graph database (DB_* environment variables)"""
+    return psycopg2.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', 5432)),
+        database=os.getenv('DB_NAME', 'knowledge_graph_db'),
+        user=os.getenv('DB_USER', 'knowledge_admin'),
+        password=os.getenv('DB_PASSWORD', '')
+    )
+
 # Initialize assessor (will be configured with API key from environment)
 CLAUDE_API_KEY = os.getenv('ANTHROPIC_API_KEY', '')
 assessor = MultiTieredAssessor(claude_api_key=CLAUDE_API_KEY if CLAUDE_API_KEY else None)
 
+# Hybrid (pgvector + full-text) knowledge search
+searcher = HybridSearcher()
+
 # ============================================================================
 # REQUEST/RESPONSE MODELS
 # ============================================================================
@@ -50,6 +64,13 @@ class AssessRequest(BaseModel):
     industry: str = Field(default="general", description="Industry (plumbing, hvac, legal, etc.)")
     options: Optional[Dict[str, Any]] = Field(default=None, description="Assessment options")
 
+class SearchRequest(BaseModel):
+    """Request model for /search endpoint"""
+    query: str = Field(..., description="Search text")
+    domain: Optional[str] = Field(default=None, description="Knowledge domain (ai-seo, local-seo, etc.)")
+    limit: int = Field(default=10, ge=1, le=100)
+    mode: str = Field(default="hybrid", description="hybrid, semantic or keyword")
+
 class RulesQueryRequest(BaseModel):
     """Request model for /rules endpoint"""
     category: Optional[str] = None
@@ -87,7 +108,7 @@ async def assess_content(request: AssessRequest):
     """
     try:
         # Run assessment
-        result = assessor.assess(
+        result = await assessor.aassess(
             content=request.content,
             page_type=request.page_type,
             industry=request.industry,
@@ -105,6 +126,49 @@ async def assess_content(request: AssessRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Assessment failed: {str(e)}")
 
+@knowledge_router.post("/search")
+def search_knowledge(request: SearchRequest):
+    """
+    Hybrid knowledge search
+    
+    Combines semantic (pgvector HNSW over chunk embeddings) and keyword
+    (stored tsvector, GIN index) retrieval with reciprocal-rank fusion.
+    Falls back to keyword-only when embeddings or the index are unavailable.
+    
+    A plain def: the query embedding and psycopg2 calls block, so FastAPI
+    runs this in its threadpool instead of on the event loop.
+    """
+    if request.mode not in HybridSearcher.MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(HybridSearcher.MODES)}")
+    
+    conn = None
+    try:
+        conn = get_db_connection()
+        response = searcher.search(
+            conn,
+            request.query,
+            domain=request.domain,
+            limit=request.limit,
+            mode=request.mode
+        )
+        
+        return {
+            "query": request.query,
+            "count": len(response["results"]),
+            **response
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+@knowledge_router.get("/search/stats")
+async def search_stats():
+    """Recent search latency (p50/p99) and which indexes are in use"""
+    return searcher.get_stats()
+
 @knowledge_router.post("/rules")
 async def query_rules(request: RulesQueryRequest):
     """
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Guru Intelligence - Hybrid Knowledge Search
+Semantic + keyword retrieval over knowledge_chunks, merged with
+reciprocal-rank fusion (RRF)
+
+Semantic: query embedded with all-MiniLM-L6-v2 (same model as ingestion),
+          nearest chunks from the pgvector HNSW index on embedding_vec
+Keyword:  plainto_tsquery against the stored content_tsv column (GIN index)
+Fusion:   score = sum over methods of 1 / (RRF_K + rank)
+
+Requires migrations/knowledge_chunks_hybrid_search.sql. Without it (or
+without sentence-transformers) search degrades to keyword-only, computing
+tsvectors on the fly as before.
+
+Usage:
+    from hybrid_search import HybridSearcher
+
+    searcher = HybridSearcher()
+    response = searcher.search(conn, "how to write a BLUF intro", limit=10)
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Optional embeddings dependency
+try:
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    EMBEDDINGS_AVAILABLE = False
+
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+RRF_K = 60
+
+# pgvector applies WHERE filters after the HNSW scan, so a domain-filtered
+# search widens the scan by this factor (capped at pgvector's ef_search limit)
+DOMAIN_OVERFETCH = 10
+MAX_EF_SEARCH = 1000
+
+# SQLSTATEs meaning the migration is missing (undefined column, object, function);
+# anything else (timeouts, dropped connections) only fails the current search
+MISSING_SCHEMA_CODES = {'42703', '42704', '42883'}
+
+
+def is_missing_schema(error: Exception) -> bool:
+    """True if a database error means the hybrid search migration is not applied"""
+    return getattr(error, 'pgcode', None) in MISSING_SCHEMA_CODES
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Hashable]], k: int = RRF_K,
+                           weights: Optional[Sequence[float]] = None) -> List[Tuple[Hashable, float]]:
+    """
+    Merge ranked id lists into one ranking
+
+    Args:
+        rankings: One list of ids per retrieval method, best first
+        k: RRF constant; larger values flatten the head of each list
+        weights: Optional per-method weights (default 1.0 each)
+
+    Returns:
+        (id, score) pairs, best first; ties keep first-seen order
+    """
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[Hashable, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no values)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[min(len(ordered), max(1, rank)) - 1]
+
+
+def to_vector_literal(embedding: Sequence[float]) -> str:
+    """pgvector text form: [0.1,0.2,...]"""
+    return '[' + ','.join(f'{x:.7g}' for x in embedding) + ']'
+
+
+class HybridSearcher:
+    """Hybrid retrieval over knowledge_chunks with RRF fusion"""
+
+    MODES = ('hybrid', 'semantic', 'keyword')
+
+    def __init__(self, table: str = 'knowledge_chunks', candidates: int = 50,
+                 ef_search: int = 64, embedder: Any = None, latency_window: int = 1000):
+        """
+        Args:
+            table: Chunk table (overridable for benchmarks)
+            candidates: Results taken from each method before fusion
+            ef_search: HNSW search breadth (recall vs. latency); widened
+                       for domain-filtered searches
+            embedder: Object with encode(text) (default: MiniLM, loaded lazily)
+            latency_window: Recent searches kept for p50/p99
+        """
+        self.table = table
+        self.candidates = candidates
+        self.ef_search = ef_search
+        self._embedder = embedder
+        self._embedder_failed = False
+        self._query_vectors: Dict[str, str] = {}
+        self._query_vectors_lock = threading.Lock()
+        self._latencies: deque = deque(maxlen=latency_window)
+
+        # Flipped off once if the migration has not been applied (see is_missing_schema)
+        self.vector_available = True
+        self.stored_tsvector = True
+
+    @property
+    def embedder(self):
+        if self._embedder is None and EMBEDDINGS_AVAILABLE and not self._embedder_failed:
+            try:
+                self._embedder = SentenceTransformer(EMBEDDING_MODEL)
+            except Exception as e:
+                logger.warning(f"Could not load embeddings model: {e}")
+                self._embedder_failed = True
+        return self._embedder
+
+    def embed_query(self, query: str) -> Optional[str]:
+        """Query embedding as a pgvector literal (cached per query text)"""
+        with self._query_vectors_lock:
+            cached = self._query_vectors.get(query)
+        if cached is not None:
+            return cached
+        if self.embedder is None:
+            return None
+        vector = to_vector_literal(self.embedder.encode(query[:8000]).tolist())
+        with self._query_vectors_lock:
+            if query not in self._query_vectors and len(self._query_vectors) >= 1024:
+                self._query_vectors.pop(next(iter(self._query_vectors)))
+            self._query_vectors[query] = vector
+        return vector
+
+    def _vector_candidates(self, conn, vector: str, domain: Optional[str], k: int) -> List[int]:
+        cursor = conn.cursor()
+        try:
+            ef_search = max(self.ef_search, k)
+            if domain:
+                ef_search = max(ef_search, min(k * DOMAIN_OVERFETCH, MAX_EF_SEARCH))
+            cursor.execute("SET LOCAL hnsw.ef_search = %s", (ef_search,))
+            query = f"SELECT id FROM {self.table} WHERE embedding_vec IS NOT NULL"
+            params: List[Any] = []
+            if domain:
+                query += " AND domain = %s"
+                params.append(domain)
+            query += " ORDER BY embedding_vec <=> %s::vector LIMIT %s"
+            params.extend([vector, k])
+            cursor.execute(query, params)
+            return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            conn.rollback()
+            if is_missing_schema(e):
+                self.vector_available = False
+                logger.warning(f"Vector search unavailable, using keyword search only: {e}")
+            else:
+                logger.warning(f"Vector search failed, using keyword search for this query: {e}")
+            return []
+        finally:
+            cursor.close()
+
+    def _keyword_candidates(self, conn, query_text: str, domain: Optional[str], k: int) -> List[int]:
+        for stored in ([True, False] if self.stored_tsvector else [False]):
+            document = "content_tsv" if stored else "to_tsvector('english', content)"
+            query = f"""
+                SELECT id FROM {self.table}, plainto_tsquery('english', %s) q
+                WHERE {document} @@ q
+            """
+            params: List[Any] = [query_text]
+            if domain:
+                query += " AND domain = %s"
+                params.append(domain)
+            query += f" ORDER BY ts_rank_cd({document}, q) DESC LIMIT %s"
+            params.append(k)
+
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query, params)
+                return [row[0] for row in cursor.fetchall()]
+            except Exception as e:
+                conn.rollback()
+                if not stored or not is_missing_schema(e):
+                    raise
+                self.stored_tsvector = False
+                logger.warning(f"content_tsv missing, computing tsvectors per query: {e}")
+            finally:
+                cursor.close()
+        return []
+
+    def _fetch(self, conn, ids: List[int]) -> Dict[int, Tuple]:
+        if not ids:
+            return {}
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT id, source_file, section_title, domain, content FROM {self.table} WHERE id = ANY(%s)",
+            (ids,)
+        )
+        rows = {row[0]: row for row in cursor.fetchall()}
+        cursor.close()
+        return rows
+
+    def search(self, conn, query: str, domain: Optional[str] = None, limit: int = 10,
+               mode: str = 'hybrid') -> Dict:
+        """
+        Search knowledge chunks
+
+        Args:
+            conn: psycopg2 connection
+            query: Search text
+            domain: Optional knowledge domain filter (e.g. 'local-seo')
+            limit: Results to return
+            mode: 'hybrid', 'semantic' or 'keyword'
+
+        Returns:
+            {'results': [...], 'mode': mode actually used, 'timings_ms': {...}}
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}")
+        start = time.perf_counter()
+        timings: Dict[str, float] = {}
+        k = max(self.candidates, limit)
+
+        semantic: List[int] = []
+        if mode in ('hybrid', 'semantic') and self.vector_available:
+            t = time.perf_counter()
+            vector = self.embed_query(query)
+            timings['embed'] = (time.perf_counter() - t) * 1000
+            if vector is not None:
+                t = time.perf_counter()
+                semantic = self._vector_candidates(conn, vector, domain, k)
+                timings['semantic'] = (time.perf_counter() - t) * 1000
+
+        keyword: List[int] = []
+        if mode == 'keyword' or (mode == 'hybrid') or not semantic:
+            t = time.perf_counter()
+            keyword = self._keyword_candidates(conn, query, domain, k)
+            timings['keyword'] = (time.perf_counter() - t) * 1000
+
+        rankings = [ranking for ranking in (semantic, keyword) if ranking]
+        fused = reciprocal_rank_fusion(rankings)[:limit]
+        semantic_rank = {chunk_id: rank for rank, chunk_id in enumerate(semantic, start=1)}
+        keyword_rank = {chunk_id: rank for rank, chunk_id in enumerate(keyword, start=1)}
+
+        t = time.perf_counter()
+        rows = self._fetch(conn, [chunk_id for chunk_id, _ in fused])
+        timings['fetch'] = (time.perf_counter() - t) * 1000
+
+        results = []
+        for chunk_id, score in fused:
+            row = rows.get(chunk_id)
+            if row is None:
+                continue
+            content = row[4]
+            results.append({
+                "chunk_id": chunk_id,
+                "source": row[1],
+                "section": row[2],
+                "domain": row[3],
+                "content": content[:500] + "..." if len(content) > 500 else content,
+                "relevance": round(score, 6),
+                "semantic_rank": semantic_rank.get(chunk_id),
+                "keyword_rank": keyword_rank.get(chunk_id)
+            })
+
+        used = 'hybrid' if semantic and keyword else ('semantic' if semantic else 'keyword')
+        total = (time.perf_counter() - start) * 1000
+        self._latencies.append(total)
+        timings['total'] = total
+
+        return {
+            "results": results,
+            "mode": used,
+            "timings_ms": {name: round(ms, 2) for name, ms in timings.items()}
+        }
+
+    def get_stats(self) -> Dict:
+        """Latency percentiles over recent searches"""
+        latencies = list(self._latencies)
+        return {
+            "searches": len(latencies),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "vector_available": self.vector_available,
+            "stored_tsvector": self.stored_tsvector
+        }
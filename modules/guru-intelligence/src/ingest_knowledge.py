@@ -7,6 +7,11 @@ This activates the intelligence system by populating:
 1. PostgreSQL with document chunks and metadata
 2. Embeddings for semantic search
 3. Structured rules for validation
+
+Ingestion is incremental: files whose hash matches ingested_documents are
+skipped, and only chunks whose chunk_hash is not stored yet for that file
+are embedded (in batches) and bulk-inserted. Files are spread across a process pool
+(INGEST_WORKERS), each worker with its own connection and embedder.
 """
 
 import os
@@ -14,19 +19,21 @@ import sys
 import json
 import hashlib
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 import subprocess
 
-# Configure logging
+# Configure logging (the log file only where the server directory exists)
+LOG_DIR = '/opt/guru-intelligence/logs'
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('/opt/guru-intelligence/logs/ingestion.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.StreamHandler()] + (
+        [logging.FileHandler(os.path.join(LOG_DIR, 'ingestion.log'))] if os.path.isdir(LOG_DIR) else []
+    )
 )
 logger = logging.getLogger(__name__)
 
@@ -47,11 +54,29 @@ except ImportError:
     EMBEDDINGS_AVAILABLE = False
 
 
+EMBED_BATCH_SIZE = int(os.getenv('INGEST_EMBED_BATCH_SIZE', '64'))
+INSERT_BATCH_SIZE = int(os.getenv('INGEST_INSERT_BATCH_SIZE', '256'))
+
+
+def chunk_hash(filename: str, content: str) -> str:
+    """
+    Chunk identity, scoped to its source file: the same text in two files
+    is two rows, so re-ingesting or pruning one file never touches the other
+    """
+    return hashlib.md5(f"{filename}\0{content}".encode()).hexdigest()
+
+
 class KnowledgeIngester:
     """Ingests documents into Guru Intelligence Knowledge Graph"""
     
-    def __init__(self, db_config: Dict):
+    def __init__(self, db_config: Dict, force: bool = False):
+        """
+        Args:
+            db_config: psycopg2 connection parameters
+            force: Re-ingest files even if their hash is unchanged
+        """
         self.db_config = db_config
+        self.force = force
         self.conn = None
         self.embedder = None
         
@@ -274,14 +299,21 @@ class KnowledgeIngester:
         Intelligently chunk content by sections/headers
         Returns list of chunks with metadata
         """
-        chunks = []
-        lines = content.split('\n')
+        return list(self.iter_chunks(content, chunk_size, overlap))
+    
+    def iter_chunks(self, content: str, chunk_size: int = 1500, overlap: int = 200) -> Iterator[Dict]:
+        """
+        Stream chunks of content (see chunk_content)
         
+        The running word count is kept per line, so the chunk text is only
+        joined when a chunk is emitted.
+        """
         current_chunk = []
+        current_words = 0
         current_section = "Introduction"
         chunk_index = 0
         
-        for line in lines:
+        for line in content.split('\n'):
             # Detect section headers
             if line.startswith('# '):
                 current_section = line[2:].strip()
@@ -290,35 +322,33 @@ class KnowledgeIngester:
             elif line.startswith('### '):
                 current_section = line[4:].strip()
             
-            current_chunk.append(line)
-            current_text = '\n'.join(current_chunk)
+            current_chunk.append((line, len(line.split())))
+            current_words += current_chunk[-1][1]
             
             # Check if chunk is large enough
-            if len(current_text.split()) >= chunk_size:
-                chunks.append({
-                    'content': current_text,
+            if current_words >= chunk_size:
+                yield {
+                    'content': '\n'.join(text for text, _ in current_chunk),
                     'section_title': current_section,
                     'chunk_index': chunk_index,
-                    'word_count': len(current_text.split())
-                })
+                    'word_count': current_words
+                }
                 
                 # Keep overlap for context
-                overlap_lines = current_chunk[-10:] if len(current_chunk) > 10 else []
-                current_chunk = overlap_lines
+                current_chunk = current_chunk[-10:] if len(current_chunk) > 10 else []
+                current_words = sum(words for _, words in current_chunk)
                 chunk_index += 1
         
         # Add remaining content
         if current_chunk:
-            current_text = '\n'.join(current_chunk)
+            current_text = '\n'.join(text for text, _ in current_chunk)
             if current_text.strip():
-                chunks.append({
+                yield {
                     'content': current_text,
                     'section_title': current_section,
                     'chunk_index': chunk_index,
-                    'word_count': len(current_text.split())
-                })
-        
-        return chunks
+                    'word_count': current_words
+                }
     
     def generate_embedding(self, text: str) -> Optional[List[float]]:
         """Generate embedding for text chunk"""
@@ -330,6 +360,28 @@ class KnowledgeIngester:
                 logger.warning(f"Embedding generation failed: {e}")
         return None
     
+    def generate_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed many chunks in batched forward passes (None for empty texts)"""
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        if not self.embedder:
+            return embeddings
+        
+        indexes = [i for i, text in enumerate(texts) if text.strip()]
+        if not indexes:
+            return embeddings
+        try:
+            vectors = self.embedder.encode(
+                [texts[i][:8000] for i in indexes],  # Limit input
+                batch_size=EMBED_BATCH_SIZE
+            )
+            for i, vector in zip(indexes, vectors):
+                embeddings[i] = vector.tolist()
+        except Exception as e:
+            logger.warning(f"Batch embedding failed, embedding one at a time: {e}")
+            for i in indexes:
+                embeddings[i] = self.generate_embedding(texts[i])
+        return embeddings
+    
     def extract_rules_from_content(self, content: str, source_file: str) -> List[Dict]:
         """
         Extract structured rules from content
@@ -396,8 +448,53 @@ class KnowledgeIngester:
         
         return rules
     
+    def _stored_file_hash(self, filename: str) -> Optional[str]:
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT file_hash FROM ingested_documents WHERE filename = %s", (filename,))
+        row = cursor.fetchone()
+        cursor.close()
+        return row[0] if row else None
+    
+    def _insert_chunks(self, cursor, filename: str, doc_meta: Dict, chunks: List[Dict]) -> Tuple[int, int]:
+        """Embed and bulk-insert the file's chunks not stored yet; returns (inserted, unchanged)"""
+        cursor.execute(
+            "SELECT chunk_hash FROM knowledge_chunks WHERE source_file = %s AND chunk_hash = ANY(%s)",
+            (filename, [chunk['chunk_hash'] for chunk in chunks])
+        )
+        stored = {row[0] for row in cursor.fetchall()}
+        new_chunks = [chunk for chunk in chunks if chunk['chunk_hash'] not in stored]
+        if not new_chunks:
+            return 0, len(chunks)
+        
+        embeddings = self.generate_embeddings([chunk['content'] for chunk in new_chunks])
+        execute_values(cursor, """
+            INSERT INTO knowledge_chunks
+            (source_file, chunk_hash, content, content_type, domain, priority,
+             section_title, chunk_index, word_count, embedding, metadata)
+            VALUES %s
+            ON CONFLICT (chunk_hash) DO UPDATE SET
+                content = EXCLUDED.content,
+                updated_at = NOW()
+        """, [
+            (
+                filename, chunk['chunk_hash'], chunk['content'],
+                doc_meta['type'], doc_meta['domain'], doc_meta['priority'],
+                chunk['section_title'], chunk['chunk_index'], chunk['word_count'],
+                embedding, json.dumps({'source': filename})
+            )
+            for chunk, embedding in zip(new_chunks, embeddings)
+        ], page_size=INSERT_BATCH_SIZE)
+        return len(new_chunks), len(chunks) - len(new_chunks)
+    
     def ingest_document(self, filepath: str) -> Dict:
-        """Ingest a single document into the knowledge graph"""
+        """
+        Ingest a single document into the knowledge graph
+        
+        Unchanged files (same hash as ingested_documents) are skipped. Chunks
+        stream through in batches of INSERT_BATCH_SIZE: already-stored chunk
+        hashes are skipped, the rest are embedded in batches and bulk-inserted.
+        Chunks of an earlier version of the file are removed.
+        """
         filename = Path(filepath).name
         logger.info(f"Ingesting: {filename}")
         
@@ -409,26 +506,77 @@ class KnowledgeIngester:
             'description': filename
         })
         
+        # Hash the raw file first: unchanged files are not converted or chunked
+        try:
+            file_hash = hashlib.sha256(Path(filepath).read_bytes()).hexdigest()
+        except OSError as e:
+            logger.warning(f"Could not read: {filename} ({e})")
+            return {'status': 'failed', 'filename': filename, 'reason': 'unreadable'}
+        if not self.force and self._stored_file_hash(filename) == file_hash:
+            logger.info("  Unchanged, skipped")
+            return {'status': 'skipped', 'filename': filename, 'reason': 'unchanged'}
+        
         # Read content
         content = self.read_document(filepath)
         if not content:
             logger.warning(f"Could not read: {filename}")
-            return {'status': 'failed', 'reason': 'unreadable'}
+            return {'status': 'failed', 'filename': filename, 'reason': 'unreadable'}
         
-        # Generate file hash
-        file_hash = hashlib.sha256(content.encode()).hexdigest()
+        cursor = self.conn.cursor()
         
-        # Chunk content
-        chunks = self.chunk_content(content)
-        logger.info(f"  Created {len(chunks)} chunks")
+        # Stream chunks: hash, skip stored, embed + insert per batch
+        chunk_hashes = set()
+        chunk_count = 0
+        chunks_inserted = 0
+        chunks_unchanged = 0
+        batch: List[Dict] = []
+        for chunk in self.iter_chunks(content):
+            chunk_count += 1
+            chunk['chunk_hash'] = chunk_hash(filename, chunk['content'])
+            if chunk['chunk_hash'] in chunk_hashes:
+                continue  # Repeated text inside this file
+            chunk_hashes.add(chunk['chunk_hash'])
+            batch.append(chunk)
+            if len(batch) >= INSERT_BATCH_SIZE:
+                inserted, unchanged = self._insert_chunks(cursor, filename, doc_meta, batch)
+                chunks_inserted += inserted
+                chunks_unchanged += unchanged
+                batch = []
+        if batch:
+            inserted, unchanged = self._insert_chunks(cursor, filename, doc_meta, batch)
+            chunks_inserted += inserted
+            chunks_unchanged += unchanged
+        logger.info(f"  {chunk_count} chunks: {chunks_inserted} new, {chunks_unchanged} unchanged")
+        
+        # Drop chunks from the previous version of this file
+        cursor.execute(
+            "DELETE FROM knowledge_chunks WHERE source_file = %s AND NOT (chunk_hash = ANY(%s))",
+            (filename, list(chunk_hashes))
+        )
+        chunks_removed = cursor.rowcount
         
         # Extract rules
         rules = self.extract_rules_from_content(content, filename)
         logger.info(f"  Extracted {len(rules)} rules")
         
-        cursor = self.conn.cursor()
+        # Insert rules (duplicates by rule_id are ignored)
+        unique_rules = list({rule['rule_id']: rule for rule in rules}.values())
+        if unique_rules:
+            execute_values(cursor, """
+                INSERT INTO extracted_rules
+                (rule_id, rule_name, rule_category, rule_description, source_document, source_section)
+                VALUES %s
+                ON CONFLICT (rule_id) DO NOTHING
+            """, [
+                (
+                    rule['rule_id'], rule['rule_name'][:255], rule['rule_category'],
+                    rule['rule_description'], rule['source_document'], rule['source_section'][:500]
+                )
+                for rule in unique_rules
+            ], page_size=INSERT_BATCH_SIZE)
+        rules_inserted = len(unique_rules)
         
-        # Register document
+        # Register document last, so an interrupted run is retried next time
         cursor.execute("""
             INSERT INTO ingested_documents 
             (filename, file_hash, doc_type, domain, priority, description, chunk_count, rules_extracted)
@@ -441,65 +589,42 @@ class KnowledgeIngester:
         """, (
             filename, file_hash, doc_meta['type'], doc_meta['domain'],
             doc_meta['priority'], doc_meta['description'],
-            len(chunks), len(rules)
+            chunk_count, len(rules)
         ))
         
-        # Insert chunks
-        chunks_inserted = 0
-        for chunk in chunks:
-            chunk_hash = hashlib.md5(chunk['content'].encode()).hexdigest()
-            embedding = self.generate_embedding(chunk['content'])
-            
-            try:
-                cursor.execute("""
-                    INSERT INTO knowledge_chunks
-                    (source_file, chunk_hash, content, content_type, domain, priority,
-                     section_title, chunk_index, word_count, embedding, metadata)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (chunk_hash) DO UPDATE SET
-                        content = EXCLUDED.content,
-                        updated_at = NOW()
-                """, (
-                    filename, chunk_hash, chunk['content'],
-                    doc_meta['type'], doc_meta['domain'], doc_meta['priority'],
-                    chunk['section_title'], chunk['chunk_index'], chunk['word_count'],
-                    embedding, json.dumps({'source': filename})
-                ))
-                chunks_inserted += 1
-            except Exception as e:
-                logger.warning(f"  Chunk insert error: {e}")
-        
-        # Insert rules
-        rules_inserted = 0
-        for rule in rules:
-            try:
-                cursor.execute("""
-                    INSERT INTO extracted_rules
-                    (rule_id, rule_name, rule_category, rule_description, source_document, source_section)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (rule_id) DO NOTHING
-                """, (
-                    rule['rule_id'], rule['rule_name'][:255], rule['rule_category'],
-                    rule['rule_description'], rule['source_document'], rule['source_section'][:500]
-                ))
-                rules_inserted += 1
-            except Exception as e:
-                logger.warning(f"  Rule insert error: {e}")
-        
         self.conn.commit()
+        cursor.close()
         
         return {
             'status': 'success',
             'filename': filename,
             'chunks_inserted': chunks_inserted,
+            'chunks_unchanged': chunks_unchanged,
+            'chunks_removed': chunks_removed,
             'rules_inserted': rules_inserted
         }
     
-    def ingest_all(self, source_dir: str) -> Dict:
-        """Ingest all documents from source directory"""
+    def ingest_document_or_fail(self, filepath: str) -> Dict:
+        """ingest_document, rolling back and reporting a failure instead of raising"""
+        try:
+            return self.ingest_document(filepath)
+        except Exception as e:
+            logger.error(f"Ingestion failed for {filepath}: {e}")
+            self.conn.rollback()
+            return {'status': 'failed', 'filename': Path(filepath).name, 'reason': str(e)}
+    
+    def ingest_all(self, source_dir: str, workers: Optional[int] = None) -> Dict:
+        """
+        Ingest all documents from source directory
+        
+        Args:
+            source_dir: Directory holding the registered source documents
+            workers: Worker processes (default: INGEST_WORKERS or 1 = in-process)
+        """
         results = {
             'total_files': 0,
             'successful': 0,
+            'skipped': 0,
             'failed': 0,
             'total_chunks': 0,
             'total_rules': 0,
@@ -507,23 +632,43 @@ class KnowledgeIngester:
         }
         
         source_path = Path(source_dir)
-        
+        filepaths = []
         for filename in self.source_docs.keys():
             filepath = source_path / filename
             if filepath.exists():
-                results['total_files'] += 1
-                result = self.ingest_document(str(filepath))
-                results['details'].append(result)
-                
-                if result['status'] == 'success':
-                    results['successful'] += 1
-                    results['total_chunks'] += result.get('chunks_inserted', 0)
-                    results['total_rules'] += result.get('rules_inserted', 0)
-                else:
-                    results['failed'] += 1
+                filepaths.append(str(filepath))
             else:
                 logger.warning(f"File not found: {filepath}")
         
+        workers = workers or int(os.getenv('INGEST_WORKERS', '1'))
+        start = time.perf_counter()
+        if workers > 1 and len(filepaths) > 1:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(filepaths)),
+                initializer=_init_worker,
+                initargs=(self.db_config, self.force)
+            ) as pool:
+                outcomes = list(pool.map(_ingest_in_worker, filepaths))
+        else:
+            outcomes = [self.ingest_document_or_fail(filepath) for filepath in filepaths]
+        elapsed = time.perf_counter() - start
+        
+        for result in outcomes:
+            results['total_files'] += 1
+            results['details'].append(result)
+            
+            if result['status'] == 'success':
+                results['successful'] += 1
+                results['total_chunks'] += result.get('chunks_inserted', 0)
+                results['total_rules'] += result.get('rules_inserted', 0)
+            elif result['status'] == 'skipped':
+                results['skipped'] += 1
+            else:
+                results['failed'] += 1
+        
+        results['elapsed_seconds'] = round(elapsed, 2)
+        results['docs_per_sec'] = round(results['total_files'] / elapsed, 2) if elapsed > 0 else 0.0
+        results['chunks_per_sec'] = round(results['total_chunks'] / elapsed, 2) if elapsed > 0 else 0.0
         return results
     
     def close(self):
@@ -533,6 +678,22 @@ class KnowledgeIngester:
             logger.info("Database connection closed")
 
 
+# Per-process ingester for ProcessPoolExecutor workers
+_worker_ingester: Optional[KnowledgeIngester] = None
+
+
+def _init_worker(db_config: Dict, force: bool):
+    """Give each worker process its own connection and embedding model"""
+    global _worker_ingester
+    _worker_ingester = KnowledgeIngester(db_config, force=force)
+    _worker_ingester.connect()
+    _worker_ingester.init_embedder()
+
+
+def _ingest_in_worker(filepath: str) -> Dict:
+    return _worker_ingester.ingest_document_or_fail(filepath)
+
+
 def main():
     """Main ingestion entry point"""
     
@@ -552,7 +713,7 @@ def main():
     logger.info("GURU INTELLIGENCE KNOWLEDGE INGESTION")
     logger.info("=" * 60)
     
-    ingester = KnowledgeIngester(db_config)
+    ingester = KnowledgeIngester(db_config, force=os.getenv('INGEST_FORCE', '').lower() == 'true')
     
     try:
         ingester.connect()
@@ -565,9 +726,12 @@ def main():
         logger.info("INGESTION COMPLETE")
         logger.info(f"  Files processed: {results['total_files']}")
         logger.info(f"  Successful: {results['successful']}")
+        logger.info(f"  Skipped (unchanged): {results['skipped']}")
         logger.info(f"  Failed: {results['failed']}")
         logger.info(f"  Total chunks: {results['total_chunks']}")
         logger.info(f"  Total rules: {results['total_rules']}")
+        logger.info(f"  Throughput: {results['docs_per_sec']} docs/sec, "
+                    f"{results['chunks_per_sec']} chunks/sec ({results['elapsed_seconds']}s)")
         logger.info("=" * 60)
         
         return results
@@ -7,6 +7,15 @@ Tier 1: Regex/Deterministic (Free, ~100ms)
 Tier 2: NLP/spaCy (Free, ~500ms) 
 Tier 3: LLM/Claude (Paid, ~3s)
 
+Rules are read from the database once into a versioned RuleCatalog and
+compiled into callable checks; the catalog reloads only when the rules table
+changes (row count or latest updated_at).
+
+Tier 3 is async: large rule sets are split into chunks sent as parallel
+Claude calls under a concurrency limit shared by all documents, responses
+are cached by (content hash, rule-set hash), and cost is accumulated.
+Point GURU_LLM_BASE_URL at scripts/stub_llm_server.py to run it offline.
+
 Usage:
     from multi_tiered_assessor import MultiTieredAssessor
     
@@ -14,10 +23,16 @@ Usage:
     result = assessor.assess(content, page_type='service', industry='plumbing')
 """
 
+import asyncio
+import hashlib
+import os
 import re
 import time
 import json
-from typing import Dict, List, Optional, Tuple
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 import anthropic
@@ -62,6 +77,14 @@ class TierResult:
     processing_time_ms: int = 0
     skipped: bool = False
     skip_reason: Optional[str] = None
+    api_cost: float = 0.0
+    tokens_used: int = 0
+
+@dataclass
+class CompiledRule:
+    """A rule and its check, compiled once per catalog version"""
+    rule: Dict
+    check: Optional[Callable[[Any], bool]] = None
 
 @dataclass
 class AssessmentResult:
@@ -86,6 +109,102 @@ class AssessmentResult:
     industry: str = ""
     assessed_at: str = ""
 
+PHONE_RE = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+PRICE_RE = re.compile(r'\$\d+')
+LICENSE_RE = re.compile(r'(?:ROC|license|lic|#)[-#]?\s*\d+', re.I)
+BULLET_RE = re.compile(r'^\s*[-*]\s', re.M)
+NUMBER_RE = re.compile(r'\b\d+\b')
+
+def _trie_pattern(words: List[str]) -> str:
+    """Case-folded alternation of words shaped as a trie (shared prefixes match once)"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if '' in node:
+            return '(?:' + '|'.join(branches) + ')?'
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    
+    return build(trie)
+
+class ContentText:
+    """Content plus the features Tier 1 checks share, computed on first use"""
+    
+    def __init__(self, content: str):
+        self.content = content
+    
+    @cached_property
+    def word_count(self) -> int:
+        return len(self.content.split())
+    
+    @cached_property
+    def lower(self) -> str:
+        return self.content.lower()
+    
+    @cached_property
+    def cities(self) -> List[str]:
+        return Tier1Validator._find_cities(self.content)
+    
+    @cached_property
+    def has_phone(self) -> bool:
+        return bool(PHONE_RE.search(self.content))
+    
+    @cached_property
+    def has_price(self) -> bool:
+        return bool(PRICE_RE.search(self.content))
+    
+    @cached_property
+    def has_license(self) -> bool:
+        return bool(LICENSE_RE.search(self.content))
+    
+    @cached_property
+    def h2_count(self) -> int:
+        return self.content.count('## ')
+    
+    @cached_property
+    def bullet_count(self) -> int:
+        return len(BULLET_RE.findall(self.content))
+    
+    @cached_property
+    def number_count(self) -> int:
+        return len(NUMBER_RE.findall(self.content))
+
+def _min_count(count: Callable[[ContentText], int]):
+    """Check factory for 'feature:N' patterns (feature >= N)"""
+    def factory(min_count):
+        n = int(min_count)
+        return lambda text: count(text) >= n
+    return factory
+
+def _flag(test: Callable[[ContentText], bool]):
+    """Check factory for 'feature:_' patterns (argument ignored)"""
+    def factory(_):
+        return test
+    return factory
+
+def _word_count_max(max_val):
+    n = int(max_val)
+    return lambda text: text.word_count <= n
+
+def _word_count_range(min_val, max_val):
+    low, high = int(min_val), int(max_val)
+    return lambda text: low <= text.word_count <= high
+
+def _contains_keyword(keyword):
+    keyword = keyword.lower()
+    return lambda text: keyword in text.lower
+
+def _no_phrase(phrase):
+    phrase = phrase.lower()
+    return lambda text: phrase not in text.lower
+
 class Tier1Validator:
     """Tier 1: Deterministic/Regex validation ($0.00)"""
     
@@ -104,69 +223,96 @@ class Tier1Validator:
         # Add more as needed
     ]
     
-    VALIDATION_FUNCTIONS = {
-        'word_count_min': lambda content, min_val: len(content.split()) >= int(min_val),
-        'word_count_max': lambda content, max_val: len(content.split()) <= int(max_val),
-        'word_count_range': lambda content, min_val, max_val: int(min_val) <= len(content.split()) <= int(max_val),
-        'has_phone': lambda content, _: bool(re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', content)),
-        'has_price': lambda content, _: bool(re.search(r'\$\d+', content)),
-        'has_license': lambda content, _: bool(re.search(r'(?:ROC|license|lic|#)[-#]?\s*\d+', content, re.I)),
-        'has_cities': lambda content, min_count: len(Tier1Validator._find_cities(content)) >= int(min_count),
-        'has_h2': lambda content, min_count: content.count('## ') >= int(min_count),
-        'has_bullets': lambda content, min_count: len(re.findall(r'^\s*[-*]\s', content, re.M)) >= int(min_count),
-        'contains_keyword': lambda content, keyword: keyword.lower() in content.lower(),
-        'no_phrase': lambda content, phrase: phrase.lower() not in content.lower(),
-        'has_numbers': lambda content, min_count: len(re.findall(r'\b\d+\b', content)) >= int(min_count),
+    # validation_pattern 'name:arg1:arg2' -> factory(arg1, arg2) -> check(ContentText)
+    CHECK_FACTORIES = {
+        'word_count_min': _min_count(lambda text: text.word_count),
+        'word_count_max': _word_count_max,
+        'word_count_range': _word_count_range,
+        'has_phone': _flag(lambda text: text.has_phone),
+        'has_price': _flag(lambda text: text.has_price),
+        'has_license': _flag(lambda text: text.has_license),
+        'has_cities': _min_count(lambda text: len(text.cities)),
+        'has_h2': _min_count(lambda text: text.h2_count),
+        'has_bullets': _min_count(lambda text: text.bullet_count),
+        'contains_keyword': _contains_keyword,
+        'no_phrase': _no_phrase,
+        'has_numbers': _min_count(lambda text: text.number_count),
     }
     
+    _city_matcher: Optional[Tuple[Tuple[str, ...], Any, Dict[str, str]]] = None
+    
+    @classmethod
+    def _cities_automaton(cls) -> Tuple[Any, Dict[str, str]]:
+        """One trie-shaped regex for all CITIES (rebuilt if the list changes)"""
+        cities = tuple(cls.CITIES)
+        if cls._city_matcher is None or cls._city_matcher[0] != cities:
+            # Lookahead so a city inside another match (York in New York) is still seen
+            pattern = re.compile(r'(?=\b(' + _trie_pattern(list(cities)) + r')\b)', re.I)
+            cls._city_matcher = (cities, pattern, {city.lower(): city for city in cities})
+        return cls._city_matcher[1], cls._city_matcher[2]
+    
     @staticmethod
     def _find_cities(content: str) -> List[str]:
-        """Find city mentions in content"""
-        found_cities = []
-        for city in Tier1Validator.CITIES:
-            if re.search(r'\b' + re.escape(city) + r'\b', content, re.I):
-                found_cities.append(city)
-        return found_cities
-    
-    def validate(self, content: str, rules: List[Dict]) -> TierResult:
-        """Run all Tier 1 validations"""
+        """Find city mentions in content (in CITIES order)"""
+        pattern, canonical = Tier1Validator._cities_automaton()
+        seen = {canonical.get(match.group(1).lower()) for match in pattern.finditer(content)}
+        return [city for city in Tier1Validator.CITIES if city in seen]
+    
+    def compile(self, rules: List[Dict]) -> List[CompiledRule]:
+        """Parse each rule's validation_pattern once into a check"""
+        compiled = []
+        for rule in rules:
+            compiled.append(CompiledRule(rule=rule, check=self._compile_pattern(rule)))
+        return compiled
+    
+    def _compile_pattern(self, rule: Dict) -> Optional[Callable[[ContentText], bool]]:
+        validation_pattern = rule.get('validation_pattern')
+        if not validation_pattern:
+            return None
+        
+        # Parse validation pattern
+        parts = validation_pattern.split(':')
+        factory = self.CHECK_FACTORIES.get(parts[0])
+        if factory is None:
+            return None
+        try:
+            return factory(*parts[1:])
+        except Exception as e:
+            print(f"⚠️  Tier 1 validation error for {rule['rule_id']}: {e}")
+            return None
+    
+    def validate(self, content: str, rules: List) -> TierResult:
+        """Run all Tier 1 validations (rules as dicts or from compile())"""
         start_time = time.time()
         violations = []
         passed_count = 0
         
-        for rule in rules:
-            rule_id = rule['rule_id']
-            rule_name = rule['rule_name']
-            validation_pattern = rule['validation_pattern']
-            enforcement_level = rule['enforcement_level']
-            
-            if not validation_pattern:
+        if rules and not isinstance(rules[0], CompiledRule):
+            rules = self.compile(rules)
+        text = ContentText(content)
+        
+        for compiled in rules:
+            rule = compiled.rule
+            if compiled.check is None:
                 continue
             
-            # Parse validation pattern
-            parts = validation_pattern.split(':')
-            func_name = parts[0]
-            func_args = parts[1:] if len(parts) > 1 else []
-            
-            if func_name in self.VALIDATION_FUNCTIONS:
-                try:
-                    func = self.VALIDATION_FUNCTIONS[func_name]
-                    passed = func(content, *func_args)
-                    
-                    if passed:
-                        passed_count += 1
-                    else:
-                        severity = 'critical' if enforcement_level == 'required' else 'minor'
-                        violations.append(Violation(
-                            rule_id=rule_id,
-                            rule_name=rule_name,
-                            tier=1,
-                            severity=severity,
-                            message=rule['rule_description'],
-                            auto_fixable=rule.get('auto_fixable', False)
-                        ))
-                except Exception as e:
-                    print(f"⚠️  Tier 1 validation error for {rule_id}: {e}")
+            try:
+                passed = compiled.check(text)
+                
+                if passed:
+                    passed_count += 1
+                else:
+                    severity = 'critical' if rule['enforcement_level'] == 'required' else 'minor'
+                    violations.append(Violation(
+                        rule_id=rule['rule_id'],
+                        rule_name=rule['rule_name'],
+                        tier=1,
+                        severity=severity,
+                        message=rule['rule_description'],
+                        auto_fixable=rule.get('auto_fixable', False)
+                    ))
+            except Exception as e:
+                print(f"⚠️  Tier 1 validation error for {rule['rule_id']}: {e}")
         
         processing_time = int((time.time() - start_time) * 1000)
         
@@ -178,9 +324,66 @@ class Tier1Validator:
             processing_time_ms=processing_time
         )
 
+class ParsedContent:
+    """Content and its spaCy parse, shared by every Tier 2 rule of one validation"""
+    
+    def __init__(self, content: str, nlp):
+        self.content = content
+        self.nlp = nlp
+    
+    @cached_property
+    def doc(self):
+        return self.nlp(self.content[:100000])  # Limit for performance
+    
+    @cached_property
+    def first_paragraph_passive(self) -> int:
+        """auxpass tokens in the first paragraph (read from the shared parse)"""
+        first_para = self.content.split('\n\n')[0] if '\n\n' in self.content else self.content[:500]
+        end = len(first_para)
+        count = 0
+        for token in self.doc:
+            if token.idx >= end:
+                break
+            if token.dep_ == 'auxpass':
+                count += 1
+        return count
+    
+    @cached_property
+    def fk_grade(self) -> Optional[float]:
+        try:
+            return textstat.flesch_kincaid_grade(self.content)
+        except:
+            return None
+    
+    @cached_property
+    def first_sentence_words(self) -> Optional[int]:
+        first_sent = next(iter(self.doc.sents), None)
+        if first_sent is None:
+            return None
+        return len([token for token in first_sent if not token.is_punct])
+
+def _no_passive_intro(parsed: ParsedContent) -> bool:
+    # Check for passive voice in first paragraph
+    return parsed.first_paragraph_passive == 0
+
+def _readable(parsed: ParsedContent) -> bool:
+    # Check Flesch-Kincaid score: Grade 12 or below (skip if textstat fails)
+    return parsed.fk_grade is None or parsed.fk_grade <= 12
+
+def _short_first_sentence(parsed: ParsedContent) -> bool:
+    # Check first sentence length
+    return parsed.first_sentence_words is None or parsed.first_sentence_words <= 20
+
 class Tier2Validator:
     """Tier 2: NLP/spaCy validation ($0.00)"""
     
+    # Description phrase -> check, first match wins
+    CHECKS = [
+        ('passive voice', _no_passive_intro),
+        ('readability', _readable),
+        ('first sentence', _short_first_sentence),
+    ]
+    
     def __init__(self):
         self.nlp = None
         if SPACY_AVAILABLE:
@@ -189,8 +392,17 @@ class Tier2Validator:
             except:
                 print("⚠️  spaCy model not loaded - run: python -m spacy download en_core_web_sm")
     
-    def validate(self, content: str, rules: List[Dict]) -> TierResult:
-        """Run all Tier 2 validations"""
+    def compile(self, rules: List[Dict]) -> List[CompiledRule]:
+        """Match each rule's description to its NLP check once"""
+        compiled = []
+        for rule in rules:
+            description = rule['rule_description'].lower()
+            check = next((check for phrase, check in self.CHECKS if phrase in description), None)
+            compiled.append(CompiledRule(rule=rule, check=check))
+        return compiled
+    
+    def validate(self, content: str, rules: List) -> TierResult:
+        """Run all Tier 2 validations (rules as dicts or from compile())"""
         start_time = time.time()
         violations = []
         passed_count = 0
@@ -204,47 +416,23 @@ class Tier2Validator:
                 skip_reason="spaCy not available"
             )
         
-        # Parse content with spaCy
-        doc = self.nlp(content[:100000])  # Limit for performance
+        if rules and not isinstance(rules[0], CompiledRule):
+            rules = self.compile(rules)
+        # Parsed at most once, on the first rule that needs it
+        parsed = ParsedContent(content, self.nlp)
         
-        for rule in rules:
-            rule_id = rule['rule_id']
-            rule_name = rule['rule_name']
-            validation_type = rule['validation_type']
-            enforcement_level = rule['enforcement_level']
-            
-            passed = True
-            
-            # Implement Tier 2 checks
-            if 'passive voice' in rule['rule_description'].lower():
-                # Check for passive voice in first paragraph
-                first_para = content.split('\n\n')[0] if '\n\n' in content else content[:500]
-                passive_count = sum(1 for token in self.nlp(first_para) if token.dep_ == 'auxpass')
-                passed = passive_count == 0
-            
-            elif 'readability' in rule['rule_description'].lower():
-                # Check Flesch-Kincaid score
-                try:
-                    fk_score = textstat.flesch_kincaid_grade(content)
-                    passed = fk_score <= 12  # Grade 12 or below
-                except:
-                    passed = True  # Skip if textstat fails
-            
-            elif 'first sentence' in rule['rule_description'].lower():
-                # Check first sentence length
-                sentences = list(doc.sents)
-                if sentences:
-                    first_sent = sentences[0]
-                    word_count = len([token for token in first_sent if not token.is_punct])
-                    passed = word_count <= 20
+        for compiled in rules:
+            rule = compiled.rule
+            # Rules without an implemented check pass
+            passed = compiled.check(parsed) if compiled.check else True
             
             if passed:
                 passed_count += 1
             else:
-                severity = 'major' if enforcement_level == 'required' else 'minor'
+                severity = 'major' if rule['enforcement_level'] == 'required' else 'minor'
                 violations.append(Violation(
-                    rule_id=rule_id,
-                    rule_name=rule_name,
+                    rule_id=rule['rule_id'],
+                    rule_name=rule['rule_name'],
                     tier=2,
                     severity=severity,
                     message=rule['rule_description']
@@ -261,40 +449,101 @@ class Tier2Validator:
         )
 
 class Tier3Validator:
-    """Tier 3: LLM/Claude validation (~$0.01 per batch)"""
+    """
+    Tier 3: LLM/Claude validation (~$0.01 per batch)
+    
+    Rules are sent in chunks of chunk_size, one Claude call per chunk, with
+    at most max_concurrency calls in flight across all documents. Each
+    chunk's assessments are cached by (content hash, rule-set hash), so a
+    re-assessment only pays for rules or content that changed; identical
+    chunks requested concurrently share one call.
+    
+    All calls run on the validator's own background event loop, whichever
+    loop (or blocking caller) asked for them, so there is one client and one
+    concurrency limit per validator.
+    """
+    
+    MODEL = "claude-sonnet-4-20250514"
+    # Claude Sonnet 4 pricing per million tokens (approximate)
+    INPUT_PRICE = 3.00
+    OUTPUT_PRICE = 15.00
     
-    def __init__(self, api_key: Optional[str] = None):
-        self.client = None
-        if api_key:
-            self.client = anthropic.Anthropic(api_key=api_key)
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 chunk_size: Optional[int] = None, max_concurrency: Optional[int] = None,
+                 cache_size: Optional[int] = None):
+        """
+        Args:
+            api_key: Anthropic API key (Tier 3 is skipped without one)
+            base_url: API endpoint, e.g. a local stub (default: GURU_LLM_BASE_URL)
+            chunk_size: Rules per call (default: GURU_TIER3_CHUNK_SIZE or 10)
+            max_concurrency: Calls in flight (default: GURU_TIER3_CONCURRENCY or 4)
+            cache_size: Cached chunk responses (default: GURU_TIER3_CACHE_SIZE or 2048)
+        """
+        self.api_key = api_key
+        self.base_url = base_url or os.getenv('GURU_LLM_BASE_URL') or None
+        self.chunk_size = max(1, chunk_size or int(os.getenv('GURU_TIER3_CHUNK_SIZE', '10')))
+        self.max_concurrency = max(1, max_concurrency or int(os.getenv('GURU_TIER3_CONCURRENCY', '4')))
+        self.cache_size = cache_size or int(os.getenv('GURU_TIER3_CACHE_SIZE', '2048'))
+        self._cache: "OrderedDict[Tuple[str, str], List[Dict]]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._client = None
+        self._semaphore = None
+        self._runner = None
+        self._lock = threading.Lock()
+        
+        # Cumulative over the validator's lifetime
         self.total_cost = 0.0
         self.total_tokens = 0
+        self.api_calls = 0
+        self.cache_hits = 0
     
-    def validate_batched(self, content: str, rules: List[Dict], max_rules: int = 10) -> TierResult:
-        """Run batched LLM validation - ONE API call for multiple rules"""
-        start_time = time.time()
-        violations = []
-        passed_count = 0
-        
-        if not self.client:
-            return TierResult(
-                tier=3,
-                rules_checked=0,
-                rules_passed=0,
-                skipped=True,
-                skip_reason="Claude API key not configured"
-            )
-        
-        # Limit to max_rules to control cost
-        rules_to_check = rules[:max_rules]
-        
-        # Build batched prompt
+    @property
+    def enabled(self) -> bool:
+        return bool(self.api_key)
+    
+    def _runner_loop(self) -> asyncio.AbstractEventLoop:
+        """The validator's background event loop (started on first use)"""
+        with self._lock:
+            if self._runner is None:
+                self._runner = asyncio.new_event_loop()
+                threading.Thread(target=self._runner.run_forever, name='tier3-loop', daemon=True).start()
+            return self._runner
+    
+    def _ensure_client(self):
+        """Async client and limiter, created on (and bound to) the background loop"""
+        if self._client is None:
+            self._client = anthropic.AsyncAnthropic(api_key=self.api_key, base_url=self.base_url)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+    
+    def run(self, coro):
+        """
+        Run a coroutine for a blocking caller on the validator's own event
+        loop, so sync calls share one client and connection pool
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._runner_loop()).result()
+    
+    def close(self):
+        """Close the client and stop the validator's event loop"""
+        with self._lock:
+            runner, self._runner = self._runner, None
+        if runner is None:
+            return
+        client, self._client = self._client, None
+        if client is not None:
+            asyncio.run_coroutine_threadsafe(client.close(), runner).result()
+        runner.call_soon_threadsafe(runner.stop)
+    
+    @staticmethod
+    def _hash(payload) -> str:
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    
+    def _build_prompt(self, content: str, rules: List[Dict]) -> str:
         rules_text = "\n".join([
             f"{i+1}. [{r['rule_id']}] {r['rule_name']}: {r['rule_description']}"
-            for i, r in enumerate(rules_to_check)
+            for i, r in enumerate(rules)
         ])
         
-        prompt = f"""Analyze this content against {len(rules_to_check)} quality rules.
+        return f"""Analyze this content against {len(rules)} quality rules.
 
 CONTENT TO ASSESS:
 ---
@@ -313,56 +562,137 @@ For each rule, provide your assessment in this JSON format:
 }}
 
 Be strict but fair. Only mark as failed if clearly violated. Respond ONLY with valid JSON."""
-
+    
+    async def _assess_chunk(self, content: str, content_hash: str,
+                            rules: List[Dict]) -> Tuple[List[Dict], float, int]:
+        """(assessments, cost, tokens) for one chunk of rules; cost is 0 on a cache hit"""
+        rule_set_hash = self._hash([
+            [r['rule_id'], r['rule_name'], r['rule_description']] for r in rules
+        ] + [self.MODEL])
+        key = (content_hash, rule_set_hash)
+        
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return cached, 0.0, 0
+        
+        pending = self._pending.get(key)
+        if pending is not None:
+            # Same content and rules already in flight (e.g. a duplicate document)
+            with self._lock:
+                self.cache_hits += 1
+            return await asyncio.shield(pending), 0.0, 0
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
         try:
-            # Call Claude API
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=1000,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            # Parse response
-            response_text = response.content[0].text
+            async with self._semaphore:
+                response = await self._client.messages.create(
+                    model=self.MODEL,
+                    max_tokens=1000,
+                    messages=[{"role": "user", "content": self._build_prompt(content, rules)}]
+                )
             
             # Extract JSON from response
+            response_text = response.content[0].text
             json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                result_data = json.loads(json_match.group())
-                assessments = result_data.get('assessments', [])
-                
-                # Map results back to rules
-                for assessment in assessments:
-                    rule_id = assessment.get('rule_id')
-                    passed = assessment.get('passed', False)
-                    reason = assessment.get('reason', '')
-                    
-                    # Find matching rule
-                    matching_rule = next((r for r in rules_to_check if r['rule_id'] == rule_id), None)
-                    
-                    if matching_rule:
-                        if passed:
-                            passed_count += 1
-                        else:
-                            severity = 'major' if matching_rule['enforcement_level'] == 'required' else 'minor'
-                            violations.append(Violation(
-                                rule_id=rule_id,
-                                rule_name=matching_rule['rule_name'],
-                                tier=3,
-                                severity=severity,
-                                message=reason
-                            ))
+            assessments = json.loads(json_match.group()).get('assessments', []) if json_match else []
             
-            # Track cost (approximate)
             input_tokens = response.usage.input_tokens
             output_tokens = response.usage.output_tokens
-            self.total_tokens = input_tokens + output_tokens
-            
-            # Claude Sonnet 4 pricing (approximate)
-            self.total_cost = (input_tokens / 1_000_000 * 3.00) + (output_tokens / 1_000_000 * 15.00)
+            cost = (input_tokens / 1_000_000 * self.INPUT_PRICE) + (output_tokens / 1_000_000 * self.OUTPUT_PRICE)
             
+            with self._lock:
+                self.api_calls += 1
+                self.total_cost += cost
+                self.total_tokens += input_tokens + output_tokens
+                # An unparseable or empty reply is not cached, so the next request retries it
+                if assessments:
+                    self._cache[key] = assessments
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+            future.set_result(assessments)
+            return assessments, cost, input_tokens + output_tokens
+        
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
         except Exception as e:
-            print(f"⚠️  Tier 3 LLM validation error: {e}")
+            future.set_exception(e)
+            future.exception()  # Mark retrieved: there may be no other waiter
+            raise
+        finally:
+            self._pending.pop(key, None)
+    
+    async def validate(self, content: str, rules: List[Dict], max_rules: Optional[int] = None) -> TierResult:
+        """
+        Run batched LLM validation for one document
+        
+        Args:
+            content: Content to assess (the first 5000 characters are sent)
+            rules: Tier 3 rules
+            max_rules: Optional cap on rules checked, to control cost
+        """
+        start_time = time.time()
+        violations = []
+        passed_count = 0
+        
+        if not self.enabled:
+            return TierResult(
+                tier=3,
+                rules_checked=0,
+                rules_passed=0,
+                skipped=True,
+                skip_reason="Claude API key not configured"
+            )
+        
+        runner = self._runner_loop()
+        if asyncio.get_running_loop() is not runner:
+            # Hand the whole document to the background loop; this loop just waits
+            return await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(self.validate(content, rules, max_rules), runner)
+            )
+        self._ensure_client()
+        rules_to_check = rules[:max_rules] if max_rules else rules
+        content_hash = self._hash(content[:5000])
+        chunks = [rules_to_check[i:i + self.chunk_size]
+                  for i in range(0, len(rules_to_check), self.chunk_size)]
+        
+        outcomes = await asyncio.gather(
+            *(self._assess_chunk(content, content_hash, chunk) for chunk in chunks),
+            return_exceptions=True
+        )
+        
+        api_cost = 0.0
+        tokens_used = 0
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"⚠️  Tier 3 LLM validation error: {outcome}")
+                continue
+            assessments, cost, tokens = outcome
+            api_cost += cost
+            tokens_used += tokens
+            
+            # Map results back to this chunk's rules
+            by_id = {r['rule_id']: r for r in chunk}
+            for assessment in assessments:
+                rule_id = assessment.get('rule_id')
+                matching_rule = by_id.get(rule_id)
+                if not matching_rule:
+                    continue
+                if assessment.get('passed', False):
+                    passed_count += 1
+                else:
+                    severity = 'major' if matching_rule['enforcement_level'] == 'required' else 'minor'
+                    violations.append(Violation(
+                        rule_id=rule_id,
+                        rule_name=matching_rule['rule_name'],
+                        tier=3,
+                        severity=severity,
+                        message=assessment.get('reason', '')
+                    ))
         
         processing_time = int((time.time() - start_time) * 1000)
         
@@ -371,8 +701,124 @@ Be strict but fair. Only mark as failed if clearly violated. Respond ONLY with v
             rules_checked=len(rules_to_check),
             rules_passed=passed_count,
             violations=violations,
-            processing_time_ms=processing_time
+            processing_time_ms=processing_time,
+            api_cost=api_cost,
+            tokens_used=tokens_used
         )
+    
+    async def validate_documents(self, items: List[Tuple[str, List[Dict]]],
+                                 max_rules: Optional[int] = None) -> List[TierResult]:
+        """Validate several (content, rules) documents; their chunks share the limiter"""
+        return list(await asyncio.gather(
+            *(self.validate(content, rules, max_rules) for content, rules in items)
+        ))
+    
+    def validate_batched(self, content: str, rules: List[Dict], max_rules: Optional[int] = None) -> TierResult:
+        """Blocking wrapper around validate() for callers without an event loop"""
+        return self.run(self.validate(content, rules, max_rules))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'api_calls': self.api_calls,
+            'cache_hits': self.cache_hits,
+            'cache_entries': len(self._cache),
+            'total_cost': round(self.total_cost, 6),
+            'total_tokens': self.total_tokens
+        }
+
+class RuleCatalog:
+    """
+    Versioned in-memory catalog of active rules, compiled per tier
+    
+    All active rules are loaded with one query and compiled by the tier
+    validators. At most every refresh_interval seconds a cheap version query
+    (row count, latest updated_at and a hash of the active rule ids, so an
+    is_active toggle that leaves updated_at alone still counts) decides
+    whether to reload; assessments in between never touch the database.
+    """
+    
+    RULES_QUERY = """
+        SELECT rule_id, rule_name, rule_category, rule_description,
+               complexity_level, validation_type, validation_pattern,
+               prompt_template, enforcement_level, priority_score,
+               auto_fixable, applies_to_modules, applies_to_page_types
+        FROM extracted_rules
+        WHERE is_active = TRUE
+        ORDER BY complexity_level, priority_score DESC
+    """
+    VERSION_QUERY = """
+        SELECT COUNT(*), MAX(updated_at),
+               md5(string_agg(rule_id::text, ',' ORDER BY rule_id) FILTER (WHERE is_active))
+        FROM extracted_rules
+    """
+    
+    def __init__(self, get_conn: Callable[[], Any],
+                 compilers: Dict[int, Callable[[List[Dict]], List[CompiledRule]]],
+                 refresh_interval: float = 30.0):
+        """
+        Args:
+            get_conn: Returns the database connection (or None)
+            compilers: Tier -> function compiling that tier's rules
+            refresh_interval: Seconds between version checks
+        """
+        self.get_conn = get_conn
+        self.compilers = compilers
+        self.refresh_interval = refresh_interval
+        self.version: Optional[Tuple] = None
+        self.loads = 0
+        self._rules: Dict[int, List[CompiledRule]] = {}
+        self._checked = 0.0
+        self._lock = threading.Lock()
+    
+    def rules(self, complexity_level: int, page_type: Optional[str] = None) -> List[CompiledRule]:
+        """Compiled rules of one tier that apply to page_type, by priority"""
+        self.refresh()
+        rules = self._rules.get(complexity_level, [])
+        if not page_type:
+            return rules
+        return [
+            compiled for compiled in rules
+            if compiled.rule.get('applies_to_page_types') is None
+            or page_type in compiled.rule['applies_to_page_types']
+        ]
+    
+    def refresh(self, force: bool = False):
+        """Reload and recompile if the rules table changed"""
+        now = time.monotonic()
+        if not force and self.version is not None and now - self._checked < self.refresh_interval:
+            return
+        
+        with self._lock:
+            if not force and self.version is not None and now - self._checked < self.refresh_interval:
+                return
+            conn = self.get_conn()
+            if not conn:
+                return
+            self._checked = now
+            try:
+                cursor = conn.cursor()
+                cursor.execute(self.VERSION_QUERY)
+                version = tuple(cursor.fetchone())
+                if force or version != self.version:
+                    cursor.execute(self.RULES_QUERY)
+                    columns = [desc[0] for desc in cursor.description]
+                    rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                    self._rules = self._compile(rows)
+                    self.version = version
+                    self.loads += 1
+                cursor.close()
+            except Exception as e:
+                conn.rollback()
+                print(f"⚠️  Rule catalog refresh failed (serving previous rules): {e}")
+    
+    def _compile(self, rows: List[Dict]) -> Dict[int, List[CompiledRule]]:
+        by_tier: Dict[int, List[Dict]] = {}
+        for row in rows:
+            by_tier.setdefault(row['complexity_level'], []).append(row)
+        return {
+            tier: self.compilers.get(tier, lambda rules: [CompiledRule(rule=r) for r in rules])(rules)
+            for tier, rules in by_tier.items()
+        }
 
 class MultiTieredAssessor:
     """Main assessment orchestrator with short-circuit logic"""
@@ -383,6 +829,10 @@ class MultiTieredAssessor:
         self.tier2 = Tier2Validator()
         self.tier3 = Tier3Validator(claude_api_key)
         self._connect_db()
+        self.catalog = RuleCatalog(
+            lambda: self.conn,
+            {1: self.tier1.compile, 2: self.tier2.compile}
+        )
     
     def _connect_db(self):
         """Connect to PostgreSQL"""
@@ -393,40 +843,17 @@ class MultiTieredAssessor:
         #     print(f"⚠️  Database connection failed: {e}")
     
     def _get_rules(self, complexity_level: int, page_type: Optional[str] = None, 
-                   industry: Optional[str] = None) -> List[Dict]:
-        """Fetch rules from database by tier and filters"""
-        if not self.conn:
-            return []
-        
-        cursor = self.conn.cursor()
-        
-        query = """
-            SELECT rule_id, rule_name, rule_category, rule_description,
-                   complexity_level, validation_type, validation_pattern,
-                   prompt_template, enforcement_level, priority_score,
-                   auto_fixable, applies_to_modules, applies_to_page_types
-            FROM extracted_rules
-            WHERE complexity_level = %s
-              AND is_active = TRUE
-        """
-        params = [complexity_level]
-        
-        if page_type:
-            query += " AND (%s = ANY(applies_to_page_types) OR applies_to_page_types IS NULL)"
-            params.append(page_type)
-        
-        query += " ORDER BY priority_score DESC"
-        
-        cursor.execute(query, params)
-        
-        columns = [desc[0] for desc in cursor.description]
-        rules = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        cursor.close()
-        return rules
+                   industry: Optional[str] = None) -> List[CompiledRule]:
+        """Rules for one tier from the catalog (filtered by page type)"""
+        return self.catalog.rules(complexity_level, page_type)
     
     def assess(self, content: str, page_type: str = 'service', industry: str = 'general',
                options: Optional[Dict] = None) -> AssessmentResult:
+        """Blocking assess for callers without an event loop (see aassess)"""
+        return self.tier3.run(self.aassess(content, page_type, industry, options))
+    
+    async def aassess(self, content: str, page_type: str = 'service', industry: str = 'general',
+                      options: Optional[Dict] = None) -> AssessmentResult:
         """
         Main assessment method with short-circuit logic
         
@@ -437,14 +864,14 @@ class MultiTieredAssessor:
             options: Configuration options
                 - run_tier3: Enable LLM checks (default: True)
                 - short_circuit: Stop on critical failures (default: True)
-                - max_tier3_rules: Batch limit for LLM (default: 10)
+                - max_tier3_rules: Cap on LLM-checked rules (default: all, in parallel chunks)
         """
         start_time = time.time()
         
         options = options or {}
         run_tier3 = options.get('run_tier3', True)
         short_circuit = options.get('short_circuit', True)
-        max_tier3_rules = options.get('max_tier3_rules', 10)
+        max_tier3_rules = options.get('max_tier3_rules')
         
         violations = []
         tier_results = {}
@@ -452,7 +879,7 @@ class MultiTieredAssessor:
         
         # ============== TIER 1: Deterministic ==============
         tier1_rules = self._get_rules(1, page_type, industry)
-        tier1_result = self.tier1.validate(content, tier1_rules)
+        tier1_result = await asyncio.to_thread(self.tier1.validate, content, tier1_rules)
         tier_results[1] = tier1_result
         tiers_run.append(1)
         violations.extend(tier1_result.violations)
@@ -469,7 +896,7 @@ class MultiTieredAssessor:
         # ============== TIER 2: NLP ==============
         tier2_rules = self._get_rules(2, page_type, industry)
         if tier2_rules:
-            tier2_result = self.tier2.validate(content, tier2_rules)
+            tier2_result = await asyncio.to_thread(self.tier2.validate, content, tier2_rules)
             tier_results[2] = tier2_result
             tiers_run.append(2)
             violations.extend(tier2_result.violations)
@@ -488,7 +915,9 @@ class MultiTieredAssessor:
         if run_tier3:
             tier3_rules = self._get_rules(3, page_type, industry)
             if tier3_rules:
-                tier3_result = self.tier3.validate_batched(content, tier3_rules, max_tier3_rules)
+                tier3_result = await self.tier3.validate(
+                    content, [compiled.rule for compiled in tier3_rules], max_tier3_rules
+                )
                 tier_results[3] = tier3_result
                 tiers_run.append(3)
                 violations.extend(tier3_result.violations)
@@ -532,9 +961,9 @@ class MultiTieredAssessor:
             for v in violations if v.auto_fixable and v.fix_suggestion
         ]
         
-        # Cost tracking
-        api_cost = self.tier3.total_cost
-        tokens_used = self.tier3.total_tokens
+        # Cost tracking (this assessment only; Tier3Validator keeps the running total)
+        api_cost = sum(tr.api_cost for tr in tier_results.values())
+        tokens_used = sum(tr.tokens_used for tr in tier_results.values())
         
         # Total processing time
         total_processing_time = sum(tr.processing_time_ms for tr in tier_results.values())
@@ -0,0 +1,190 @@
+"""
+Tests for citation verification against the local fixture server
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+pytest.importorskip('httpx')
+
+from citation_fixture_server import serve
+from citation_verification.text_extractor import extract_text
+from citation_verification.verifier import CitationVerifier
+
+QUERY = "emergency plumbing austin burst pipes"
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _verify(verifier, citations, query=QUERY):
+    try:
+        return await verifier.verify_batch(citations, query)
+    finally:
+        await verifier.close()
+
+
+class TestTextExtractor:
+    """Test suite for the streaming text extractor"""
+
+    def test_skips_script_style_nav_footer(self):
+        """Test: Only visible body text survives"""
+        html = (
+            "<html><head><script>var x = 'hidden';</script><style>p{}</style></head>"
+            "<body><nav>Menu</nav><p>Visible &amp; kept</p><footer>Legal</footer></body></html>"
+        )
+        assert extract_text(html) == "Visible & kept"
+
+    def test_chunk_boundaries_do_not_matter(self):
+        """Test: Feeding one character at a time gives the same text"""
+        from citation_verification.text_extractor import TextExtractor
+
+        html = "<div><p>Drain <b>cleaning</b></p><script>skip()</script><p>leak detection</p></div>"
+        extractor = TextExtractor()
+        for char in html:
+            extractor.feed(char)
+        assert extractor.text() == extract_text(html) == "Drain cleaning leak detection"
+
+
+class TestCitationVerifier:
+    """Test suite for CitationVerifier against fixture pages"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.server, self.state = serve(latency=0.0)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_relevant_page_verifies(self):
+        """Test: Relevant page with a matching anchor scores 100"""
+        verifier = CitationVerifier()
+        report = _run(_verify(verifier, [
+            {'url': f"{self.base}/page/plumbing", 'anchor_text': 'leak detection'}
+        ]))
+        result = report['results'][0]
+
+        assert result['verified'] is True
+        assert result['score'] == 100
+        assert result['checks']['status_code'] == 200
+
+    def test_hidden_text_does_not_count(self):
+        """Test: Anchor text that only appears in script/nav/footer is not found"""
+        verifier = CitationVerifier()
+        report = _run(_verify(verifier, [
+            {'url': f"{self.base}/page/plumbing", 'anchor_text': 'water heater repair'},
+            {'url': f"{self.base}/page/plumbing", 'anchor_text': 'Copyright Roofing'}
+        ]))
+
+        for result in report['results']:
+            assert result['checks']['anchor_found'] is False
+            assert 'Anchor not found' in result['issues']
+
+    def test_missing_page_fails(self):
+        """Test: 404 is reported and not verified"""
+        verifier = CitationVerifier()
+        report = _run(_verify(verifier, [{'url': f"{self.base}/missing"}]))
+        result = report['results'][0]
+
+        assert result['verified'] is False
+        assert result['issues'] == ['HTTP 404']
+
+    def test_transient_errors_are_not_cached(self):
+        """Test: A 503 is fetched again on the next lookup, a 404 is reused"""
+        self.state.failures = 1
+        verifier = CitationVerifier()
+        citations = [{'url': f"{self.base}/flaky"}, {'url': f"{self.base}/missing"}]
+
+        async def twice():
+            try:
+                first = await verifier.verify_batch(citations, QUERY)
+                second = await verifier.verify_batch(citations, QUERY)
+                return first, second
+            finally:
+                await verifier.close()
+
+        first, second = _run(twice())
+        assert [r['checks']['status_code'] for r in first['results']] == [503, 404]
+        assert [r['checks']['status_code'] for r in second['results']] == [200, 404]
+        assert second['results'][0]['verified'] is True
+        assert verifier.get_stats()['requests'] == 3
+
+    def test_per_host_limit(self):
+        """Test: Never more than per_host_concurrent requests to one host"""
+        self.state.latency = 0.1
+        verifier = CitationVerifier(max_concurrent=10, per_host_concurrent=2)
+        citations = [{'url': f"{self.base}/page/roofing?n={i}"} for i in range(8)]
+        report = _run(_verify(verifier, citations, "roofing warranty dallas"))
+
+        assert report['verified_count'] == 8
+        assert self.state.max_in_flight['127.0.0.1'] == 2
+        assert verifier._host_limits == {}
+
+    def test_batch_limit_leaves_verifier_limit_alone(self):
+        """Test: verify_batch(max_concurrent=...) caps that batch without changing the verifier"""
+        self.state.latency = 0.05
+        verifier = CitationVerifier(max_concurrent=10, per_host_concurrent=4)
+        citations = [{'url': f"{self.base}/page/roofing?n={i}"} for i in range(4)]
+
+        async def batch():
+            try:
+                return await verifier.verify_batch(citations, "roofing warranty dallas", max_concurrent=1)
+            finally:
+                await verifier.close()
+
+        report = _run(batch())
+        assert report['verified_count'] == 4
+        assert self.state.max_in_flight['127.0.0.1'] == 1
+        assert verifier.max_concurrent == 10
+
+    def test_byte_cap(self):
+        """Test: Large pages are fetched with a Range header and read up to max_bytes"""
+        verifier = CitationVerifier(max_bytes=4096)
+        report = _run(_verify(verifier, [{'url': f"{self.base}/big"}], "plumbing filler"))
+
+        assert report['results'][0]['verified'] is True
+        assert self.state.bytes_sent == 4096
+        assert verifier.get_stats()['bytes_read'] == 4096
+
+    def test_etag_revalidation(self):
+        """Test: A stale cache entry is revalidated with a 304, a fresh one is reused"""
+        verifier = CitationVerifier(cache_ttl=0.0)
+        citation = {'url': f"{self.base}/page/plumbing"}
+
+        async def twice():
+            try:
+                first = await verifier.verify_citation(citation, QUERY)
+                second = await verifier.verify_citation(citation, "drain cleaning")
+                return first, second
+            finally:
+                await verifier.close()
+
+        first, second = _run(twice())
+        assert first['verified'] and second['verified']
+        assert self.state.not_modified == 1
+        assert verifier.get_stats()['not_modified'] == 1
+
+        verifier = CitationVerifier()
+        _run(_verify(verifier, [citation, citation, citation]))
+        assert verifier.get_stats()['requests'] == 1
+
+    def test_head_falls_back_to_get(self):
+        """Test: Resolution-only checks use HEAD, and a ranged GET when HEAD is refused"""
+        verifier = CitationVerifier()
+        report = _run(_verify(verifier, [
+            {'url': f"{self.base}/page/roofing"},
+            {'url': f"{self.base}/nohead"}
+        ], query=""))
+
+        assert [result['checks']['url_resolves'] for result in report['results']] == [True, True]
+        assert self.state.methods == {'HEAD': 2, 'GET': 1}
@@ -0,0 +1,204 @@
+"""
+Hybrid search: RRF ordering, keyword fallback and schema-error handling
+against a scripted fake connection
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'src', 'api'))
+
+from hybrid_search import HybridSearcher, reciprocal_rank_fusion
+
+
+class _PgError(Exception):
+    def __init__(self, message, pgcode=None):
+        super().__init__(message)
+        self.pgcode = pgcode
+
+
+class _Cursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    def execute(self, query, params=None):
+        self.conn.queries.append(query)
+        if query.startswith('SET LOCAL'):
+            self.conn.ef_search = params[0]
+            return
+        if 'embedding_vec <=>' in query:
+            if self.conn.vector_error:
+                raise self.conn.vector_error
+            # Like HNSW: scan ef_search nearest chunks, then filter, then limit
+            scanned = self.conn.semantic[:self.conn.ef_search]
+            if 'domain = %s' in query:
+                scanned = [chunk_id for chunk_id in scanned if self.conn.domain_of(chunk_id) == params[0]]
+            self.rows = [(chunk_id,) for chunk_id in scanned[:params[-1]]]
+        elif '@@' in query:
+            if 'content_tsv' in query and self.conn.tsv_error:
+                raise self.conn.tsv_error
+            self.rows = [(chunk_id,) for chunk_id in self.conn.keyword]
+        else:
+            self.rows = [
+                (chunk_id, f'doc{chunk_id}.md', f'Section {chunk_id}', self.conn.domain_of(chunk_id), f'Chunk {chunk_id}')
+                for chunk_id in params[0]
+            ]
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class _FakeConn:
+    def __init__(self, semantic=(), keyword=(), vector_error=None, tsv_error=None, domains=None):
+        self.semantic = list(semantic)
+        self.keyword = list(keyword)
+        self.domains = domains or {}
+        self.ef_search = None
+        self.vector_error = vector_error
+        self.tsv_error = tsv_error
+        self.queries = []
+        self.rollbacks = 0
+        self.closed = False
+
+    def cursor(self):
+        return _Cursor(self)
+
+    def domain_of(self, chunk_id):
+        return self.domains.get(chunk_id, 'local-seo')
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class _Embedder:
+    def encode(self, text):
+        return SimpleNamespace(tolist=lambda: [0.1, 0.2, 0.3])
+
+
+class TestHybridSearcher:
+    def test_rrf_ordering(self):
+        conn = _FakeConn(semantic=[1, 2, 3], keyword=[3, 1, 4])
+        response = HybridSearcher(embedder=_Embedder()).search(conn, 'bluf intro', limit=10)
+
+        assert response['mode'] == 'hybrid'
+        assert [r['chunk_id'] for r in response['results']] == [1, 3, 2, 4]
+        expected = dict(reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]]))
+        for result in response['results']:
+            assert result['relevance'] == round(expected[result['chunk_id']], 6)
+        assert response['results'][1]['semantic_rank'] == 3
+        assert response['results'][1]['keyword_rank'] == 1
+        assert response['results'][3]['semantic_rank'] is None
+
+    def test_keyword_fallback_without_embeddings(self, monkeypatch):
+        monkeypatch.setattr('hybrid_search.EMBEDDINGS_AVAILABLE', False)
+        conn = _FakeConn(semantic=[1, 2], keyword=[7, 5])
+        response = HybridSearcher().search(conn, 'bluf intro')
+
+        assert response['mode'] == 'keyword'
+        assert [r['chunk_id'] for r in response['results']] == [7, 5]
+        assert not any('embedding_vec' in q for q in conn.queries)
+
+    def test_semantic_mode_falls_back_to_keyword_when_empty(self):
+        conn = _FakeConn(semantic=[], keyword=[9])
+        response = HybridSearcher(embedder=_Embedder()).search(conn, 'bluf', mode='semantic')
+
+        assert response['mode'] == 'keyword'
+        assert [r['chunk_id'] for r in response['results']] == [9]
+
+    def test_transient_vector_error_keeps_vector_search(self):
+        searcher = HybridSearcher(embedder=_Embedder())
+        conn = _FakeConn(semantic=[1], keyword=[2], vector_error=_PgError('canceling statement due to timeout', '57014'))
+
+        assert searcher.search(conn, 'bluf')['mode'] == 'keyword'
+        assert conn.rollbacks == 1
+        assert searcher.vector_available
+
+        conn.vector_error = None
+        assert searcher.search(conn, 'bluf')['mode'] == 'hybrid'
+
+    def test_missing_migration_disables_vector_search(self):
+        searcher = HybridSearcher(embedder=_Embedder())
+        conn = _FakeConn(
+            semantic=[1], keyword=[2],
+            vector_error=_PgError('column "embedding_vec" does not exist', '42703'),
+            tsv_error=_PgError('column "content_tsv" does not exist', '42703')
+        )
+
+        response = searcher.search(conn, 'bluf')
+        assert response['mode'] == 'keyword'
+        assert [r['chunk_id'] for r in response['results']] == [2]
+        assert not searcher.vector_available
+        assert not searcher.stored_tsvector
+        assert "to_tsvector('english', content)" in conn.queries[-2]
+
+    def test_domain_filter_still_returns_k_semantic_rows(self):
+        # Every tenth chunk is local-seo, so the default HNSW breadth holds only 6
+        chunk_ids = list(range(1000))
+        domains = {chunk_id: 'local-seo' if chunk_id % 10 == 0 else 'ai-seo' for chunk_id in chunk_ids}
+        conn = _FakeConn(semantic=chunk_ids, domains=domains)
+        searcher = HybridSearcher(embedder=_Embedder(), candidates=10)
+
+        response = searcher.search(conn, 'bluf', domain='local-seo', limit=10, mode='semantic')
+
+        assert response['mode'] == 'semantic'
+        assert [r['chunk_id'] for r in response['results']] == list(range(0, 100, 10))
+        assert {r['domain'] for r in response['results']} == {'local-seo'}
+
+        searcher.search(conn, 'bluf', limit=10, mode='semantic')
+        assert conn.ef_search == searcher.ef_search
+
+    def test_transient_keyword_error_is_raised(self):
+        searcher = HybridSearcher(embedder=_Embedder())
+        conn = _FakeConn(keyword=[2], tsv_error=_PgError('server closed the connection'))
+
+        with pytest.raises(_PgError):
+            searcher.search(conn, 'bluf', mode='keyword')
+        assert searcher.stored_tsvector
+
+
+class TestSearchRoute:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        pytest.importorskip('anthropic')
+        pytest.importorskip('psycopg2')
+        pytest.importorskip('httpx')
+        fastapi = pytest.importorskip('fastapi')
+        from fastapi.testclient import TestClient
+        import unified_knowledge_routes as routes
+
+        conn = _FakeConn(semantic=[1, 2], keyword=[2, 3])
+        monkeypatch.setattr(routes, 'get_db_connection', lambda: conn)
+        monkeypatch.setattr(routes, 'searcher', HybridSearcher(embedder=_Embedder()))
+        app = fastapi.FastAPI()
+        app.include_router(routes.knowledge_router)
+        return TestClient(app), conn
+
+    def test_search_borrows_and_closes_a_connection(self, client):
+        client, conn = client
+        response = client.post('/knowledge/search', json={'query': 'bluf intro', 'limit': 2})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body['count'] == 2
+        assert [r['chunk_id'] for r in body['results']] == [2, 1]
+        assert conn.closed
+
+    def test_failed_search_still_closes_the_connection(self, client):
+        client, conn = client
+        conn.tsv_error = _PgError('server closed the connection')
+        response = client.post('/knowledge/search', json={'query': 'bluf', 'mode': 'keyword'})
+
+        assert response.status_code == 500
+        assert conn.closed
@@ -0,0 +1,154 @@
+"""
+Incremental ingestion against an in-memory fake of the three ingestion tables
+"""
+
+import copy
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+pytest.importorskip('psycopg2')
+
+import ingest_knowledge
+from ingest_knowledge import KnowledgeIngester, chunk_hash
+
+FILE_A = 'AI-SEO_AEO_AGE_CONTENT_GUIDE.md'
+FILE_B = 'TOP_25_LOCAL_SEARCH_RANKING_FACTORS.md'
+
+
+class _FakeDB:
+    """knowledge_chunks / extracted_rules / ingested_documents with commit and rollback"""
+
+    def __init__(self):
+        self.committed = {'chunks': {}, 'documents': {}, 'rules': {}}
+        self.state = copy.deepcopy(self.committed)
+        self.rollbacks = 0
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def commit(self):
+        self.committed = copy.deepcopy(self.state)
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.state = copy.deepcopy(self.committed)
+
+    def chunks_of(self, filename):
+        return sorted(
+            content for source_file, content in self.committed['chunks'].values() if source_file == filename
+        )
+
+
+class _FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+        self.rowcount = 0
+
+    def execute(self, query, params=()):
+        chunks = self.db.state['chunks']
+        if query.startswith('SELECT file_hash'):
+            stored = self.db.state['documents'].get(params[0])
+            self.rows = [(stored,)] if stored else []
+        elif query.startswith('SELECT chunk_hash'):
+            filename, hashes = params
+            self.rows = [(h,) for h in hashes if h in chunks and chunks[h][0] == filename]
+        elif query.startswith('DELETE FROM knowledge_chunks'):
+            filename, keep = params
+            doomed = [h for h, (source_file, _) in chunks.items() if source_file == filename and h not in keep]
+            for h in doomed:
+                del chunks[h]
+            self.rowcount = len(doomed)
+        elif 'INSERT INTO ingested_documents' in query:
+            self.db.state['documents'][params[0]] = params[1]
+        else:
+            raise AssertionError(f"unexpected query: {query}")
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+def _execute_values(cursor, query, rows, page_size=None):
+    state = cursor.db.state
+    if 'INSERT INTO knowledge_chunks' in query:
+        for row in rows:
+            filename, hash_, content = row[:3]
+            state['chunks'][hash_] = (state['chunks'].get(hash_, (filename,))[0], content)
+    else:
+        for row in rows:
+            state['rules'].setdefault(row[0], row)
+
+
+@pytest.fixture
+def ingester(monkeypatch):
+    monkeypatch.setattr(ingest_knowledge, 'execute_values', _execute_values)
+    ingester = KnowledgeIngester(db_config={})
+    ingester.conn = _FakeDB()
+    return ingester
+
+
+def _write(directory, filename, text):
+    (directory / filename).write_text(text, encoding='utf-8')
+
+
+class TestIngestion:
+    def test_chunk_hash_is_scoped_to_the_file(self):
+        assert chunk_hash(FILE_A, 'same text') != chunk_hash(FILE_B, 'same text')
+        assert chunk_hash(FILE_A, 'same text') == chunk_hash(FILE_A, 'same text')
+
+    def test_shared_chunk_survives_the_other_file_changing(self, ingester, tmp_path):
+        _write(tmp_path, FILE_A, 'Shared opening paragraph.')
+        _write(tmp_path, FILE_B, 'Shared opening paragraph.')
+        results = ingester.ingest_all(str(tmp_path), workers=1)
+        assert results['successful'] == 2
+        assert results['total_chunks'] == 2
+
+        _write(tmp_path, FILE_A, 'A rewritten paragraph.')
+        results = ingester.ingest_all(str(tmp_path), workers=1)
+
+        assert results['successful'] == 1 and results['skipped'] == 1
+        assert ingester.conn.chunks_of(FILE_A) == ['A rewritten paragraph.']
+        assert ingester.conn.chunks_of(FILE_B) == ['Shared opening paragraph.']
+
+    def test_unchanged_chunks_are_not_reinserted(self, ingester, tmp_path):
+        _write(tmp_path, FILE_A, 'First.')
+        ingester.ingest_all(str(tmp_path), workers=1)
+
+        ingester.force = True
+        result = ingester.ingest_all(str(tmp_path), workers=1)['details'][0]
+        assert result['chunks_inserted'] == 0
+        assert result['chunks_unchanged'] == 1
+        assert result['chunks_removed'] == 0
+
+    def test_failing_file_is_rolled_back_and_the_rest_continue(self, ingester, tmp_path, monkeypatch):
+        _write(tmp_path, FILE_A, 'Good file.')
+        _write(tmp_path, FILE_B, 'Bad file.')
+        extract = ingester.extract_rules_from_content
+
+        def extract_or_fail(content, source_file):
+            if source_file == FILE_B:
+                raise RuntimeError('rule extraction failed')
+            return extract(content, source_file)
+
+        monkeypatch.setattr(ingester, 'extract_rules_from_content', extract_or_fail)
+        results = ingester.ingest_all(str(tmp_path), workers=1)
+
+        assert results['successful'] == 1
+        assert results['failed'] == 1
+        failed = next(d for d in results['details'] if d['status'] == 'failed')
+        assert failed == {'status': 'failed', 'filename': FILE_B, 'reason': 'rule extraction failed'}
+        assert ingester.conn.rollbacks == 1
+        assert ingester.conn.chunks_of(FILE_A) == ['Good file.']
+        assert ingester.conn.chunks_of(FILE_B) == []
+        assert FILE_B not in ingester.conn.committed['documents']
@@ -0,0 +1,355 @@
+"""
+Equivalence tests: compiled Tier 1/2 validators vs. the previous per-request matcher,
+plus Tier 3 batching against the stub LLM server
+"""
+
+import asyncio
+import os
+import random
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+pytest.importorskip('anthropic')
+pytest.importorskip('psycopg2')
+
+import multi_tiered_assessor
+from multi_tiered_assessor import Tier1Validator, Tier2Validator, Tier3Validator
+from stub_llm_server import serve
+
+
+# ------------------------------------------------------------------
+# The previous implementation, kept verbatim as the reference
+# ------------------------------------------------------------------
+
+def _legacy_find_cities(content):
+    found_cities = []
+    for city in Tier1Validator.CITIES:
+        if re.search(r'\b' + re.escape(city) + r'\b', content, re.I):
+            found_cities.append(city)
+    return found_cities
+
+
+LEGACY_FUNCTIONS = {
+    'word_count_min': lambda content, min_val: len(content.split()) >= int(min_val),
+    'word_count_max': lambda content, max_val: len(content.split()) <= int(max_val),
+    'word_count_range': lambda content, min_val, max_val: int(min_val) <= len(content.split()) <= int(max_val),
+    'has_phone': lambda content, _: bool(re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', content)),
+    'has_price': lambda content, _: bool(re.search(r'\$\d+', content)),
+    'has_license': lambda content, _: bool(re.search(r'(?:ROC|license|lic|#)[-#]?\s*\d+', content, re.I)),
+    'has_cities': lambda content, min_count: len(_legacy_find_cities(content)) >= int(min_count),
+    'has_h2': lambda content, min_count: content.count('## ') >= int(min_count),
+    'has_bullets': lambda content, min_count: len(re.findall(r'^\s*[-*]\s', content, re.M)) >= int(min_count),
+    'contains_keyword': lambda content, keyword: keyword.lower() in content.lower(),
+    'no_phrase': lambda content, phrase: phrase.lower() not in content.lower(),
+    'has_numbers': lambda content, min_count: len(re.findall(r'\b\d+\b', content)) >= int(min_count),
+}
+
+
+def legacy_tier1(content, rules):
+    passed_count = 0
+    violations = []
+    for rule in rules:
+        if not rule['validation_pattern']:
+            continue
+        parts = rule['validation_pattern'].split(':')
+        func_name, func_args = parts[0], parts[1:]
+        if func_name in LEGACY_FUNCTIONS:
+            try:
+                if LEGACY_FUNCTIONS[func_name](content, *func_args):
+                    passed_count += 1
+                else:
+                    severity = 'critical' if rule['enforcement_level'] == 'required' else 'minor'
+                    violations.append((rule['rule_id'], severity, rule['rule_description'],
+                                       rule.get('auto_fixable', False)))
+            except Exception:
+                pass
+    return passed_count, violations
+
+
+def legacy_tier2(content, rules, nlp, textstat):
+    passed_count = 0
+    violations = []
+    doc = nlp(content[:100000])
+    for rule in rules:
+        passed = True
+        description = rule['rule_description'].lower()
+        if 'passive voice' in description:
+            first_para = content.split('\n\n')[0] if '\n\n' in content else content[:500]
+            passed = sum(1 for token in nlp(first_para) if token.dep_ == 'auxpass') == 0
+        elif 'readability' in description:
+            try:
+                passed = textstat.flesch_kincaid_grade(content) <= 12
+            except Exception:
+                passed = True
+        elif 'first sentence' in description:
+            sentences = list(doc.sents)
+            if sentences:
+                passed = len([t for t in sentences[0] if not t.is_punct]) <= 20
+        if passed:
+            passed_count += 1
+        else:
+            severity = 'major' if rule['enforcement_level'] == 'required' else 'minor'
+            violations.append((rule['rule_id'], severity, rule['rule_description'], False))
+    return passed_count, violations
+
+
+def _outcome(result):
+    return result.rules_passed, [
+        (v.rule_id, v.severity, v.message, v.auto_fixable) for v in result.violations
+    ]
+
+
+# ------------------------------------------------------------------
+# Randomized content and rules
+# ------------------------------------------------------------------
+
+SNIPPETS = [
+    "Call (602) 555-1234 today.", "Call 602.555.1234", "phone 6025551234",
+    "Prices from $150 to $450.", "only $ 99", "ROC-284756", "License # 12345", "lic 77", "#42",
+    "## Pricing", "##Not a heading", "- Upfront pricing", "* Same-day service", "  - indented bullet",
+    "We serve Phoenix, scottsdale and TEMPE.", "Salt Lake City and San Antonio", "Phoenixville is not Phoenix",
+    "New Yorker", "mesa", "drain cleaning", "Drain Cleaning", "cutting-edge", "since 1987", "in 60 minutes",
+    "12 34 5678", "3.5 stars", "word", "\n\n", "\n",
+]
+
+PATTERNS = [
+    'word_count_min:{n}', 'word_count_max:{n}', 'word_count_range:{a}:{b}', 'has_phone:_', 'has_price:_',
+    'has_license:_', 'has_cities:{k}', 'has_h2:{k}', 'has_bullets:{k}', 'contains_keyword:drain cleaning',
+    'contains_keyword:Phoenix', 'no_phrase:cutting-edge', 'no_phrase:Mesa', 'has_numbers:{k}',
+    # Malformed or unknown patterns must behave the same too
+    'word_count_min:abc', 'has_cities', 'word_count_range:5', 'not_a_check:1', '',
+]
+
+
+def random_content(rng):
+    return ' '.join(rng.choice(SNIPPETS) for _ in range(rng.randrange(0, 60)))
+
+
+def random_tier1_rules(rng, count):
+    rules = []
+    for i in range(count):
+        pattern = rng.choice(PATTERNS).format(
+            n=rng.randrange(0, 200), a=rng.randrange(0, 50), b=rng.randrange(50, 300), k=rng.randrange(0, 6)
+        )
+        rules.append({
+            'rule_id': f'R1-{i}',
+            'rule_name': f'Rule {i}',
+            'rule_description': f'Check {pattern}',
+            'validation_pattern': pattern,
+            'enforcement_level': rng.choice(['required', 'recommended']),
+            'auto_fixable': rng.random() < 0.3,
+        })
+    return rules
+
+
+class _Doc(list):
+    """Token list with spaCy's .sents"""
+
+    def __init__(self, tokens, sents):
+        super().__init__(tokens)
+        self.sents = sents
+
+
+class _FakeNLP:
+    """Regex tokenizer with deterministic sentences and passive markers"""
+
+    def __call__(self, text):
+        tokens = [
+            SimpleNamespace(
+                text=match.group(), idx=match.start(), is_punct=not match.group()[0].isalnum(),
+                dep_='auxpass' if match.group().lower() in ('was', 'were', 'been') else 'dep'
+            )
+            for match in re.finditer(r"\w+|[^\w\s]", text)
+        ]
+        sents, current = [], []
+        for token in tokens:
+            current.append(token)
+            if token.text in '.!?':
+                sents.append(current)
+                current = []
+        if current:
+            sents.append(current)
+        return _Doc(tokens, sents)
+
+
+class _FakeTextstat:
+    @staticmethod
+    def flesch_kincaid_grade(content):
+        if not content.strip():
+            raise ValueError("empty text")
+        words = content.split()
+        return sum(len(w) for w in words) / len(words) * 2
+
+
+class TestTier1Equivalence:
+    def test_randomized_against_previous_matcher(self):
+        rng = random.Random(1601)
+        tier1 = Tier1Validator()
+        for _ in range(300):
+            content = random_content(rng)
+            rules = random_tier1_rules(rng, rng.randrange(1, 40))
+            expected = legacy_tier1(content, rules)
+
+            assert _outcome(tier1.validate(content, rules)) == expected
+            assert _outcome(tier1.validate(content, tier1.compile(rules))) == expected
+
+    def test_city_automaton_matches_per_city_search(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            content = random_content(rng)
+            assert Tier1Validator._find_cities(content) == _legacy_find_cities(content)
+
+
+class TestTier2Equivalence:
+    def test_randomized_against_previous_matcher(self, monkeypatch):
+        monkeypatch.setattr(multi_tiered_assessor, 'textstat', _FakeTextstat, raising=False)
+        nlp = _FakeNLP()
+        tier2 = Tier2Validator()
+        tier2.nlp = nlp
+
+        rng = random.Random(1602)
+        words = ["The", "pipe", "was", "replaced", "by", "our", "team", "quickly", ".", "Call", "now", "!",
+                 "Drains", "were", "cleared", "\n\n", "extraordinarily", "comprehensive", "service"]
+        descriptions = [
+            "Avoid passive voice in the opening paragraph", "Keep readability at grade 12 or below",
+            "First sentence should answer the query", "Use a friendly tone", "READABILITY and passive voice",
+        ]
+        for _ in range(200):
+            content = ' '.join(rng.choice(words) for _ in range(rng.randrange(0, 80)))
+            rules = [
+                {
+                    'rule_id': f'R2-{i}',
+                    'rule_name': f'Rule {i}',
+                    'rule_description': rng.choice(descriptions),
+                    'validation_type': 'nlp',
+                    'enforcement_level': rng.choice(['required', 'recommended']),
+                }
+                for i in range(rng.randrange(1, 12))
+            ]
+            expected = legacy_tier2(content, rules, nlp, _FakeTextstat)
+
+            assert _outcome(tier2.validate(content, rules)) == expected
+            assert _outcome(tier2.validate(content, tier2.compile(rules))) == expected
+
+
+# ------------------------------------------------------------------
+# Tier 3 against the stub LLM server
+# ------------------------------------------------------------------
+
+def tier3_rules(prefix, count):
+    return [
+        {
+            'rule_id': f'{prefix}-{i:03d}',
+            'rule_name': f'Rule {i}',
+            'rule_description': f'LLM check {i}',
+            'enforcement_level': 'required' if i % 2 else 'recommended',
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def stub():
+    server, state = serve(port=0, latency=0.05, fail_prefixes=['TONE-'])
+    yield f'http://127.0.0.1:{server.server_address[1]}', state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def validator(stub):
+    validator = Tier3Validator(api_key='stub', base_url=stub[0], chunk_size=5, max_concurrency=3)
+    yield validator
+    validator.close()
+
+
+class TestTier3Batching:
+    def test_chunks_respect_the_concurrency_limit(self, stub, validator):
+        _, state = stub
+        documents = [(f'Document {i}', tier3_rules('BLUF', 10) + tier3_rules('TONE', 10)) for i in range(4)]
+
+        results = validator.run(validator.validate_documents(documents))
+
+        assert state.requests == 4 * 4
+        assert 1 < state.max_in_flight <= 3
+        for result in results:
+            assert result.rules_checked == 20
+            assert result.rules_passed == 10
+            assert sorted(v.rule_id for v in result.violations) == [f'TONE-{i:03d}' for i in range(10)]
+
+    def test_identical_documents_share_calls_and_cache(self, stub, validator):
+        _, state = stub
+        rules = tier3_rules('BLUF', 12)
+
+        first, duplicate = validator.run(validator.validate_documents([('Same content', rules)] * 2))
+        assert state.requests == 3
+        assert duplicate.rules_passed == first.rules_passed == 12
+        assert duplicate.api_cost == 0
+
+        again = validator.validate_batched('Same content', rules)
+        assert state.requests == 3
+        assert again.rules_passed == 12 and again.api_cost == 0
+        assert validator.get_stats()['cache_hits'] == 6
+
+        validator.validate_batched('Changed content', rules)
+        assert state.requests == 6
+
+    def test_unparseable_reply_is_not_cached(self, monkeypatch, validator):
+        replies = iter(['I cannot answer that.', '{"assessments": [{"rule_id": "BLUF-000", "passed": true}]}'])
+
+        class _Messages:
+            async def create(self, **kwargs):
+                return SimpleNamespace(
+                    content=[SimpleNamespace(text=next(replies))],
+                    usage=SimpleNamespace(input_tokens=10, output_tokens=5)
+                )
+
+        class _Client:
+            messages = _Messages()
+
+            async def close(self):
+                pass
+
+        monkeypatch.setattr(multi_tiered_assessor.anthropic, 'AsyncAnthropic', lambda **kwargs: _Client())
+        rules = tier3_rules('BLUF', 1)
+
+        assert validator.validate_batched('Content', rules).rules_passed == 0
+        assert validator.get_stats()['cache_entries'] == 0
+        assert validator.validate_batched('Content', rules).rules_passed == 1
+        assert validator.get_stats()['api_calls'] == 2
+        assert validator.get_stats()['cache_entries'] == 1
+
+    def test_sync_calls_reuse_one_client(self, validator):
+        rules = tier3_rules('BLUF', 3)
+        validator.validate_batched('One', rules)
+        client = validator._client
+        validator.validate_batched('Two', rules)
+
+        assert validator._client is client
+
+    def test_other_event_loops_share_the_client_and_limit(self, stub, validator):
+        _, state = stub
+        rules = tier3_rules('BLUF', 15)
+        validator.validate_batched('Sync', rules)
+        client = validator._client
+
+        async def assess(tag):
+            return await validator.validate_documents([(f'{tag} {i}', rules) for i in range(2)])
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            runs = list(pool.map(lambda tag: asyncio.run(assess(tag)), ['First', 'Second']))
+        validator.validate_batched('Sync again', rules)
+
+        assert validator._client is client
+        assert not client.is_closed()
+        assert all(result.rules_passed == 15 for results in runs for result in results)
+        assert state.requests == 6 * 3
+        assert 1 < state.max_in_flight <= 3
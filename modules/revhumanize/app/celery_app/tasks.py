@@ -1,37 +1,58 @@
 """Background tasks"""
+from celery import group
+from celery.signals import worker_process_init
+
 from app.celery_app import celery_app
 
+
+@worker_process_init.connect
+def load_validators(**kwargs):
+    """Build this worker process's validators once, before the first task"""
+    from app.services.validation_pipeline import get_validators
+    get_validators()
+
+
 @celery_app.task(name='validate_content_async')
 def validate_content_async(content: str, title: str = None):
-    from app.services.qa_validator import QAValidator
-    from app.services.ai_detector import AIDetector
-    
-    validator = QAValidator()
-    detector = AIDetector()
-    qa_result = validator.validate(content, title)
-    ai_result = detector.detect(content)
-    
+    from app.services.batch_processor import validate_item
+
+    result = validate_item({'content': content, 'title': title}, 0)
+
     return {
-        'qa_score': qa_result.get('score', 0),
-        'ai_probability': ai_result.get('probability', 0),
+        'qa_score': result['qa_score'],
+        'ai_probability': result['ai_probability'],
         'status': 'completed'
     }
 
+@celery_app.task(name='validate_batch_chunk')
+def validate_batch_chunk(batch_id: str, offset: int, items: list):
+    from app.services.batch_processor import process_chunk
+
+    counts = process_chunk(batch_id, offset, items)
+    return {'batch_id': batch_id, 'offset': offset, **counts}
+
+@celery_app.task(name='mark_batch_chunk_failed')
+def mark_batch_chunk_failed(request, exc, traceback):
+    """
+    Error callback for validate_batch_chunk
+
+    Celery calls it for any chunk failure: an unhandled exception, a hard
+    time limit or a worker that died, so the batch never stays "processing".
+    """
+    from app.services.batch_processor import chunk_failed
+
+    batch_id, offset = request.args[:2]
+    chunk_failed(batch_id, offset, exc)
+
 @celery_app.task(name='batch_validate_async')
-def batch_validate_async(batch_id: str, items: list):
-    from app.services.qa_validator import QAValidator
-    results = []
-    validator = QAValidator()
-    
-    for idx, item in enumerate(items):
-        try:
-            qa_result = validator.validate(item['content'], item.get('title'))
-            results.append({
-                'content_id': item.get('content_id', f'item_{idx}'),
-                'qa_score': qa_result.get('score', 0),
-                'status': 'completed'
-            })
-        except Exception as e:
-            results.append({'content_id': f'item_{idx}', 'error': str(e)})
-    
-    return {'batch_id': batch_id, 'results': results}
+def batch_validate_async(batch_id: str, items: list, chunk_size: int = None):
+    """Split a batch into chunks and spread them across the workers"""
+    from app.services.batch_processor import CHUNK_SIZE, chunk_items
+
+    chunks = chunk_items(items, chunk_size or CHUNK_SIZE)
+    group(
+        validate_batch_chunk.s(batch_id, offset, chunk).set(link_error=mark_batch_chunk_failed.s())
+        for offset, chunk in chunks
+    ).apply_async()
+
+    return {'batch_id': batch_id, 'chunks': len(chunks), 'status': 'dispatched'}
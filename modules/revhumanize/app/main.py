@@ -9,9 +9,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, FileResponse
 from sqlalchemy.orm import Session
+import asyncio
 import os
 import uuid
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # RevAudit Anti-Hallucination Integration
 sys.path.insert(0, '/opt/shared-api-engine')
@@ -21,7 +23,7 @@ try:
 except ImportError:
     REVAUDIT_AVAILABLE = False
 
-from .database import get_db_session, init_db
+from .database import get_db, get_db_session, init_db
 from .models.pydantic_models import (
     ContentValidationRequest,
     ContentValidationResponse,
@@ -35,8 +37,8 @@ from .models.pydantic_models import (
     ManualReviewResponse
 )
 from .models.db_models import ReviewQueueItem, AuditLog
-from .validators import QAValidator
-from .services import VoiceConsistencyChecker, YMYLVerificationChecker, AIDetector
+from .services.result_cache import normalize_content
+from .services.validation_pipeline import get_validators, needs_review, run_validators, validation_checks
 
 # Initialize FastAPI
 app = FastAPI(
@@ -58,11 +60,25 @@ app.add_middleware(
 if REVAUDIT_AVAILABLE:
     integrate_revaudit(app, "RevHumanize")
 
-# Initialize services
-qa_validator = QAValidator()
-voice_checker = VoiceConsistencyChecker()
-ymyl_checker = YMYLVerificationChecker()
-ai_detector = AIDetector()
+# Initialize services (one set per process, shared with in-process batch work)
+validators = get_validators()
+qa_validator = validators["qa"]
+voice_checker = validators["voice"]
+ymyl_checker = validators["ymyl"]
+ai_detector = validators["ai_detection"]
+
+# Worker threads for the validator fan-out in /api/v1/validate
+validation_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("REVHUMANIZE_VALIDATOR_WORKERS", "4")),
+    thread_name_prefix="validator"
+)
+
+# Separate threads for in-process batch chunks (no Celery broker), so a large
+# batch cannot starve interactive /api/v1/validate requests
+batch_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("REVHUMANIZE_BATCH_WORKERS", "2")),
+    thread_name_prefix="batch"
+)
 
 # Initialize database on startup
 @app.on_event("startup")
@@ -100,24 +116,19 @@ async def validate_content(
     """
     # Generate content_id if not provided
     content_id = request.get_content_id()
-    # Run QA validation
-    qa_result = qa_validator.calculate_score(request.content, request.title)
+    content = normalize_content(request.content)
     
-    # Run voice check
-    voice_result = voice_checker.check(request.content)
-    
-    # Run YMYL check  
-    ymyl_result = ymyl_checker.check(request.content, "general")
-    
-    # Run AI detection
-    ai_result = ai_detector.detect(request.content)
+    # Parse once, then run QA, voice, YMYL and AI detection concurrently
+    results, timings = await run_validators(
+        content, validation_checks(content, request.title, validators), executor=validation_executor
+    )
+    qa_result = results["qa"]
+    voice_result = results["voice"]
+    ymyl_result = results["ymyl"]
+    ai_result = results["ai_detection"]
     
     # Determine if manual review needed
-    requires_review = (
-        qa_result["qa_score"] < request.target_score or
-        not voice_result["is_consistent"] or
-        ai_result["is_ai_generated"]
-    )
+    requires_review = needs_review(results, request.target_score)
     
     # Add to review queue if needed
     if requires_review and db:
@@ -149,7 +160,8 @@ async def validate_content(
         tier2_issues=qa_result["tier2_issues"],
         tier3_issues=qa_result["tier3_issues"],
         requires_manual_review=requires_review,
-        status="needs_review" if requires_review else "approved"
+        status="needs_review" if requires_review else "approved",
+        validator_timings_ms=timings
     )
 
 # ============================================================================
@@ -444,24 +456,20 @@ async def submit_batch(
     customer_id: str,
     items: List[Dict[str, Any]]
 ):
-    """Submit batch of content for validation"""
+    """Queue a batch of content for background validation"""
     from app.models.db_models import BatchJob
-    import uuid
+    from app.services.batch_processor import chunk_items, submit_chunks, validate_item
     
     batch_id = str(uuid.uuid4())
+    loop = asyncio.get_running_loop()
     
     with get_db() as db:
         if db is None:
-            # Process without database
-            results = []
-            for item in items:
-                result = await validate_content(
-                    ContentValidationRequest(
-                        content=item.get("content", ""),
-                        title=item.get("title", "")
-                    )
-                )
-                results.append(result)
+            # No database to track progress in: process inline
+            results = await loop.run_in_executor(
+                batch_executor,
+                lambda: [validate_item(item, i, validators) for i, item in enumerate(items)]
+            )
             
             return {
                 "batch_id": batch_id,
@@ -475,54 +483,36 @@ async def submit_batch(
             id=batch_id,
             customer_id=customer_id,
             total_items=len(items),
-            status="processing"
+            status="queued" if items else "completed",
+            results=[]
         )
         db.add(batch)
         db.commit()
     
-    # Process items (in production, this would be async/background)
-    results = []
-    completed = 0
-    failed = 0
-    
-    for item in items:
-        try:
-            result = await validate_content(
-                ContentValidationRequest(
-                    content=item.get("content", ""),
-                    title=item.get("title", "")
-                )
-            )
-            results.append(result)
-            completed += 1
-        except Exception as e:
-            results.append({"error": str(e)})
-            failed += 1
-    
-    # Update batch job
-    with get_db() as db:
-        if db:
-            batch = db.query(BatchJob).filter(BatchJob.id == batch_id).first()
-            if batch:
-                batch.completed_items = completed
-                batch.failed_items = failed
-                batch.status = "completed"
-                batch.results = results
-                batch.completed_at = datetime.utcnow()
-                db.commit()
+    chunks = chunk_items(items)
+    runner = "celery"
+    try:
+        from app.celery_app.tasks import batch_validate_async
+        await loop.run_in_executor(None, batch_validate_async.delay, batch_id, items)
+    except Exception as e:
+        # Broker unreachable: run the chunks on this process's batch threads
+        print(f"⚠️  Celery unavailable, processing batch {batch_id} in-process: {e}")
+        runner = "local"
+        submit_chunks(batch_executor, batch_id, chunks, validators)
     
     return {
         "batch_id": batch_id,
-        "status": "completed",
+        "status": "queued" if items else "completed",
         "total_items": len(items),
-        "completed": completed,
-        "failed": failed
+        "chunks": len(chunks),
+        "runner": runner
     }
 
 @app.get("/api/v1/batch/{batch_id}")
 async def get_batch_status(batch_id: str):
-    """Get status of a batch job"""
+    """Get status of a batch job, with live throughput and ETA"""
     from app.models.db_models import BatchJob
+    from app.services.batch_processor import batch_progress
     
     with get_db() as db:
         if db is None:
@@ -537,7 +527,8 @@ async def get_batch_status(batch_id: str):
                 "total_items": batch.total_items,
                 "completed_items": batch.completed_items,
                 "failed_items": batch.failed_items,
-                "results": batch.results if batch.status == "completed" else None
+                **batch_progress(batch),
+                "results": batch.results if batch.status in ("completed", "failed") else None
             }
         
         return {"error": "Batch not found"}
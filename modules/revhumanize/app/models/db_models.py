@@ -87,3 +87,19 @@ class APIKey(Base):
     customer_id = Column(String, nullable=False, index=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, server_default=func.now())
+
+class BatchJob(Base):
+    """Batch processing jobs"""
+    __tablename__ = "batch_jobs"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    customer_id = Column(String, index=True)
+    total_items = Column(Integer, default=0)
+    completed_items = Column(Integer, default=0)
+    failed_items = Column(Integer, default=0)
+    status = Column(String, default="queued")  # queued, processing, completed, failed
+    results = Column(JSON, default=list)
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    completed_at = Column(DateTime)
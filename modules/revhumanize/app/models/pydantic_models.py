@@ -39,6 +39,7 @@ class ContentValidationResponse(BaseModel):
     tier3_issues: List[Dict[str, Any]] = []
     requires_manual_review: bool
     status: str
+    validator_timings_ms: Optional[Dict[str, float]] = None
 
 class VoiceCheckRequest(BaseModel):
     content: str
@@ -102,6 +103,7 @@ class AIDetectionResult(BaseModel):
     statistical_score: float = 0.0
     verdict: str = "UNKNOWN"
     model_used: str = "unknown"
+    sections: List[Dict[str, Any]] = []  # per-section heatmap for long documents
 
 class QAValidationResult(BaseModel):
     score: float = 0.0
@@ -8,19 +8,48 @@ Uses:
 3. Burstiness detection
 4. Pattern matching
 5. Statistical fingerprinting
+
+Model inference is batched: concurrent detect() calls are grouped by
+MicroBatcher into padded forward passes that run in a worker thread, so the
+event loop never blocks on RoBERTa/GPT-2.
+
+Long documents are scored with section-aligned sliding windows over the whole
+text (see document_windows) instead of only the first 1-2k characters. The
+document is tokenized once with GPT-2's byte-level BPE; RoBERTa shares that
+vocabulary, so its window inputs are mapped from the same tokens. Window
+scores are cached by window text, so after an edit only changed sections go
+through the models. Set REVHUMANIZE_DETECTOR_SLIDING_WINDOW=false for the
+old introduction-only scoring.
+
+Backends (REVHUMANIZE_DETECTOR_BACKEND):
+    torch - default fp32 PyTorch models
+    int8  - dynamic int8 quantization of Linear layers (CPU)
+    onnx  - ONNX Runtime via optimum (pip install optimum[onnxruntime])
 """
+import asyncio
+import json
+import os
 import re
 import torch
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from transformers import (
     AutoTokenizer,
-    AutoModelForSequenceClassification,
-    pipeline
+    AutoModelForSequenceClassification
 )
 from loguru import logger
 
 from ..models import AIDetectionResult
+from .inference_batcher import MicroBatcher
+from .document_windows import (
+    WINDOW_STRIDE, WINDOW_TOKENS, plan_windows, pooled_perplexity, section_heatmap, weighted_mean
+)
+from .parsed_document import ParsedDocument
+from .result_cache import ResultCache, fingerprint, normalize_content
+
+DETECTOR_BACKENDS = ("torch", "int8", "onnx")
+TRANSFORMER_MODEL = "openai-community/roberta-base-openai-detector"
+PERPLEXITY_MODEL = "gpt2"
 
 
 class AIDetectionEngine:
@@ -29,35 +58,82 @@ class AIDetectionEngine:
     for maximum accuracy (80-90% comparable to commercial tools)
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10.0,
+        sliding_window: Optional[bool] = None
+    ):
+        """
+        Args:
+            backend: torch, int8 or onnx (default: REVHUMANIZE_DETECTOR_BACKEND or torch)
+            max_batch_size: Largest padded batch per forward pass
+            max_wait_ms: How long a request waits for others to share its batch
+            sliding_window: Score the whole document in windows
+                            (default: REVHUMANIZE_DETECTOR_SLIDING_WINDOW or true)
+        """
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        logger.info(f"Initializing AI Detection Engine on {self.device}")
+        self.backend = (backend or os.getenv("REVHUMANIZE_DETECTOR_BACKEND", "torch")).lower()
+        if self.backend not in DETECTOR_BACKENDS:
+            logger.warning(f"Unknown detector backend '{self.backend}', using torch")
+            self.backend = "torch"
+        if self.backend != "torch" and self.device != "cpu":
+            logger.info(f"{self.backend} backend is CPU-only, ignoring CUDA")
+            self.device = "cpu"
+        logger.info(f"Initializing AI Detection Engine on {self.device} ({self.backend})")
+        
+        if sliding_window is None:
+            sliding_window = os.getenv("REVHUMANIZE_DETECTOR_SLIDING_WINDOW", "true").lower() == "true"
+        self.sliding_window = sliding_window
         
         # Load models
         self._load_transformer_model()
         self._load_perplexity_model()
+        self._gpt2_to_roberta = self._build_token_map()
+        
+        # One worker thread per model; requests are merged into padded batches
+        self._transformer_batcher = MicroBatcher(
+            self._transformer_batch, max_batch_size, max_wait_ms, name="roberta"
+        )
+        self._perplexity_batcher = MicroBatcher(
+            self._perplexity_batch, max_batch_size, max_wait_ms, name="gpt2"
+        )
         
         # Pattern database (Tier 1 kill words)
         self.ai_patterns = self._load_ai_patterns()
+        
+        # Results are cached per content hash; the key changes with the models
+        self.model_version = fingerprint(
+            TRANSFORMER_MODEL, self.transformer_model is not None,
+            PERPLEXITY_MODEL, self.perplexity_model is not None,
+            self.backend, self.ai_patterns,
+            self._use_windows() and (WINDOW_TOKENS, WINDOW_STRIDE)
+        )
+        self.cache = ResultCache("ai_detection")
+        self.window_cache = ResultCache("ai_window", max_entries=16 * 1024)
     
     def _load_transformer_model(self):
         """Load RoBERTa-based AI detector"""
         try:
-            model_name = "openai-community/roberta-base-openai-detector"
+            model_name = TRANSFORMER_MODEL
             logger.info(f"Loading transformer model: {model_name}")
             
             self.transformer_tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.transformer_model = AutoModelForSequenceClassification.from_pretrained(
-                model_name
-            ).to(self.device)
-            self.transformer_model.eval()
             
-            # Alternative: Use pipeline for easier inference
-            self.transformer_pipeline = pipeline(
-                "text-classification",
-                model=model_name,
-                device=0 if self.device == "cuda" else -1
-            )
+            if self.backend == "onnx":
+                from optimum.onnxruntime import ORTModelForSequenceClassification
+                self.transformer_model = ORTModelForSequenceClassification.from_pretrained(
+                    model_name, export=True
+                )
+            else:
+                model = AutoModelForSequenceClassification.from_pretrained(model_name).to(self.device)
+                model.eval()
+                if self.backend == "int8":
+                    model = torch.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                self.transformer_model = model
             
             logger.success("Transformer model loaded successfully")
         except Exception as e:
@@ -67,18 +143,58 @@ class AIDetectionEngine:
     def _load_perplexity_model(self):
         """Load GPT-2 for perplexity analysis"""
         try:
-            from transformers import GPT2LMHeadModel, GPT2Tokenizer
+            from transformers import GPT2LMHeadModel, GPT2TokenizerFast
             
             logger.info("Loading GPT-2 for perplexity analysis")
-            self.perplexity_tokenizer = GPT2Tokenizer.from_pretrained("gpt2")
-            self.perplexity_model = GPT2LMHeadModel.from_pretrained("gpt2").to(self.device)
-            self.perplexity_model.eval()
+            # Fast tokenizer: character offsets are needed to cut windows
+            self.perplexity_tokenizer = GPT2TokenizerFast.from_pretrained(PERPLEXITY_MODEL)
+            # GPT-2 has no pad token; padded positions are masked out of the loss
+            self.perplexity_tokenizer.pad_token = self.perplexity_tokenizer.eos_token
+            
+            if self.backend == "onnx":
+                from optimum.onnxruntime import ORTModelForCausalLM
+                self.perplexity_model = ORTModelForCausalLM.from_pretrained(
+                    PERPLEXITY_MODEL, export=True, use_cache=False
+                )
+            else:
+                model = GPT2LMHeadModel.from_pretrained(PERPLEXITY_MODEL).to(self.device)
+                model.eval()
+                if self.backend == "int8":
+                    model = torch.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                self.perplexity_model = model
             
             logger.success("Perplexity model loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load perplexity model: {e}")
             self.perplexity_model = None
     
+    def _build_token_map(self) -> Optional[List[int]]:
+        """
+        GPT-2 token id -> RoBERTa token id
+        
+        Both models use the same byte-level BPE tokens (with different ids), so
+        one tokenization of the document serves both. Tokens RoBERTa lacks
+        (e.g. <|endoftext|>) map to -1 and such windows are re-tokenized.
+        """
+        if self.transformer_model is None or self.perplexity_model is None:
+            return None
+        try:
+            roberta_vocab = self.transformer_tokenizer.get_vocab()
+            gpt2_vocab = self.perplexity_tokenizer.get_vocab()
+            mapping = [-1] * (max(gpt2_vocab.values()) + 1)
+            for token, gpt2_id in gpt2_vocab.items():
+                mapping[gpt2_id] = roberta_vocab.get(token, -1)
+            shared = sum(1 for r in mapping if r >= 0) / len(mapping)
+            if shared < 0.99:
+                logger.warning(f"Tokenizers share only {shared:.1%} of tokens, windows will be re-tokenized")
+                return None
+            return mapping
+        except Exception as e:
+            logger.warning(f"Could not map GPT-2 tokens to RoBERTa: {e}")
+            return None
+    
     def _load_ai_patterns(self) -> List[str]:
         """Load Tier 1 kill words as AI detection patterns"""
         return [
@@ -101,28 +217,71 @@ class AIDetectionEngine:
             r'whether you are',
         ]
     
-    async def detect(self, content: str) -> AIDetectionResult:
+    async def detect(self, content: str, doc: ParsedDocument = None) -> AIDetectionResult:
         """
         Run ensemble AI detection on content
         
+        Args:
+            content: Text to score
+            doc: Already-parsed content, shared with other validators
+        
         Returns comprehensive AI detection result with breakdown
+        (cached by content hash and model version; results that fell back to
+        default scores after a model error are not cached)
         """
-        logger.info(f"Running AI detection on {len(content)} characters")
+        content = normalize_content(content)
+        if doc is not None and doc.content != content:
+            doc = None
+        
+        result, _ = await self.cache.aget_or_compute(
+            self.model_version, content, (),
+            lambda: self._detect(content, doc),
+            encode=lambda detected: detected[0].model_dump(mode="json"),
+            decode=lambda data: (AIDetectionResult.model_validate(data), False),
+            cacheable=lambda detected: not detected[1]
+        )
+        return result
+    
+    async def _detect(self, content: str, doc: ParsedDocument = None) -> Tuple[AIDetectionResult, bool]:
+        """
+        Uncached ensemble detection
         
-        # Method 1: Transformer-based classification
-        transformer_score = await self._transformer_detection(content)
+        Returns (result, degraded); degraded is True when a model error made
+        a method fall back, so the result must not be cached.
+        """
+        doc = doc or ParsedDocument(content)
+        logger.info(f"Running AI detection on {len(content)} characters")
         
-        # Method 2: Perplexity analysis
-        perplexity_score = await self._perplexity_detection(content)
+        # Methods 1 + 2: model scores, batched with other in-flight requests
+        degraded = False
+        sections = []
+        scores = None
+        if self._use_windows():
+            try:
+                scores = await self._window_scores(content)
+            except Exception as e:
+                logger.error(f"Sliding-window detection failed: {e}")
+                degraded = True
+        if scores is not None:
+            transformer_score, perplexity_score, sections = scores
+        else:
+            transformer_score, perplexity_score = await asyncio.gather(
+                self._transformer_detection(content),
+                self._perplexity_detection(content)
+            )
+            if transformer_score is None or perplexity_score is None:
+                degraded = True
+                transformer_score = 0.5 if transformer_score is None else transformer_score
+                perplexity_score = 0.5 if perplexity_score is None else perplexity_score
         
         # Method 3: Burstiness analysis
-        burstiness_score = await self._burstiness_detection(content)
+        burstiness_score = await self._burstiness_detection(content, doc)
         
         # Method 4: Pattern matching (Tier 1 words)
-        pattern_score = await self._pattern_detection(content)
+        pattern_score = await self._pattern_detection(content, doc)
         
         # Method 5: Statistical fingerprinting
-        statistical_score = await self._statistical_detection(content)
+        statistical_score = await self._statistical_detection(content, doc)
         
         # Ensemble: Weighted average
         final_score = (
@@ -147,86 +306,173 @@ class AIDetectionEngine:
             pattern_score=pattern_score,
             statistical_score=statistical_score,
             verdict="AI" if final_score > 0.70 else "HUMAN",
-            model_used="ensemble_v1.0"
+            model_used="ensemble_v1.0",
+            sections=sections
         )
         
         logger.info(f"AI Detection Result: {result.verdict} ({final_score:.2%} AI probability)")
+        if degraded:
+            logger.warning("AI detection used fallback scores, result not cached")
         
-        return result
+        return result, degraded
+    
+    def _use_windows(self) -> bool:
+        return (
+            self.sliding_window
+            and self.transformer_model is not None
+            and self.perplexity_model is not None
+            and getattr(self.perplexity_tokenizer, "is_fast", False)
+        )
+    
+    async def _window_scores(self, content: str) -> Optional[Tuple[float, float, List[Dict]]]:
+        """
+        Whole-document transformer and perplexity scores from sliding windows
+        
+        Returns (transformer_score, perplexity_score, per-section heatmap), or
+        None when there is nothing to window. Model errors propagate.
+        """
+        encoding = self.perplexity_tokenizer(
+            content, add_special_tokens=False, return_offsets_mapping=True
+        )
+        gpt2_ids = encoding["input_ids"]
+        windows = plan_windows(content, encoding["offset_mapping"])
+        if not windows:
+            return None
+        
+        # Only windows whose text changed since they were last scored hit the models
+        keys = [self.window_cache.key(self.model_version, content[w.start:w.end]) for w in windows]
+        cached = await self.window_cache.aget_many(self.model_version, keys)
+        missing = [i for i, value in enumerate(cached) if value is None]
+        if missing:
+            probabilities, perplexities = await asyncio.gather(
+                self._transformer_batcher.submit_many(
+                    [self._roberta_window(content, gpt2_ids, windows[i]) for i in missing]
+                ),
+                self._perplexity_batcher.submit_many(
+                    [gpt2_ids[windows[i].token_start:windows[i].token_end] for i in missing]
+                )
+            )
+            for i, probability, perplexity in zip(missing, probabilities, perplexities):
+                cached[i] = json.dumps([probability, perplexity])
+            await self.window_cache.aset_many([(keys[i], cached[i]) for i in missing])
+        
+        window_scores = [json.loads(value) for value in cached]
+        probabilities = [score[0] for score in window_scores]
+        perplexities = [score[1] for score in window_scores]
+        tokens = [w.tokens for w in windows]
+        
+        transformer_score = weighted_mean(probabilities, tokens)
+        perplexity_score = self._normalize_perplexity(pooled_perplexity(perplexities, tokens))
+        heatmap = section_heatmap(
+            windows, probabilities, [self._normalize_perplexity(p) for p in perplexities]
+        )
+        return transformer_score, perplexity_score, heatmap
     
-    async def _transformer_detection(self, content: str) -> float:
+    def _roberta_window(self, content: str, gpt2_ids: List[int], window) -> Union[str, List[int]]:
+        """RoBERTa input for a window: mapped token ids, or its text if unmappable"""
+        if self._gpt2_to_roberta is not None:
+            ids = [self._gpt2_to_roberta[t] for t in gpt2_ids[window.token_start:window.token_end]]
+            if min(ids, default=0) >= 0:
+                tokenizer = self.transformer_tokenizer
+                return [tokenizer.bos_token_id] + ids + [tokenizer.eos_token_id]
+        return content[window.start:window.end]
+    
+    async def _transformer_detection(self, content: str) -> Optional[float]:
         """
         RoBERTa-based AI detection (Method 1)
-        Returns: 0.0-1.0 (probability of AI-generated)
+        Returns: 0.0-1.0 (probability of AI-generated), None if inference failed
         """
         if self.transformer_model is None:
             logger.warning("Transformer model not available, returning default")
             return 0.5
         
         try:
-            # Truncate to model's max length
-            max_length = 512
-            inputs = self.transformer_tokenizer(
-                content[:2000],  # Use first 2000 chars
-                truncation=True,
-                max_length=max_length,
-                return_tensors="pt"
-            ).to(self.device)
-            
-            with torch.no_grad():
-                outputs = self.transformer_model(**inputs)
-                probabilities = torch.nn.functional.softmax(outputs.logits, dim=1)
-                
-                # Model outputs: [Real, Fake]
-                # We want Fake probability
-                ai_prob = probabilities[0][1].item()
-            
-            return ai_prob
+            return await self._transformer_batcher.submit(content[:2000])  # Use first 2000 chars
         
         except Exception as e:
             logger.error(f"Transformer detection failed: {e}")
-            return 0.5
+            return None
+    
+    def _encode_batch(self, items: List[Union[str, List[int]]], tokenizer, max_length: int):
+        """Pad a mix of texts and pre-tokenized id lists into one batch"""
+        rows = [
+            tokenizer(item, truncation=True, max_length=max_length)["input_ids"]
+            if isinstance(item, str) else list(item)[:max_length]
+            for item in items
+        ]
+        width = max(1, max(len(row) for row in rows))
+        input_ids = torch.full((len(rows), width), tokenizer.pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(rows), width), dtype=torch.long)
+        for i, row in enumerate(rows):
+            input_ids[i, :len(row)] = torch.tensor(row, dtype=torch.long)
+            attention_mask[i, :len(row)] = 1
+        if self.backend != "onnx":
+            input_ids, attention_mask = input_ids.to(self.device), attention_mask.to(self.device)
+        return input_ids, attention_mask
+    
+    def _transformer_batch(self, items: List[Union[str, List[int]]]) -> List[float]:
+        """One padded RoBERTa forward pass for a batch (runs in the worker thread)"""
+        # Truncate to model's max length
+        input_ids, attention_mask = self._encode_batch(items, self.transformer_tokenizer, 512)
+        
+        with torch.inference_mode():
+            outputs = self.transformer_model(input_ids=input_ids, attention_mask=attention_mask)
+            probabilities = torch.nn.functional.softmax(outputs.logits, dim=1)
+        
+        # Model outputs: [Real, Fake]
+        # We want Fake probability
+        return probabilities[:, 1].tolist()
     
-    async def _perplexity_detection(self, content: str) -> float:
+    @staticmethod
+    def _normalize_perplexity(perplexity: float) -> float:
+        # Normalize: Lower perplexity = higher AI probability
+        # Typical ranges: Human 20-50, AI 5-20
+        return max(0, min(1, (50 - perplexity) / 45))
+    
+    async def _perplexity_detection(self, content: str) -> Optional[float]:
         """
         Perplexity-based detection (Method 2)
         Low perplexity = likely AI (AI text is more predictable)
-        Returns: 0.0-1.0 (normalized score)
+        Returns: 0.0-1.0 (normalized score), None if inference failed
         """
         if self.perplexity_model is None:
             return 0.5
         
         try:
-            # Encode text
-            encodings = self.perplexity_tokenizer(
-                content[:1000],
-                return_tensors="pt"
-            ).to(self.device)
-            
-            # Calculate perplexity
-            with torch.no_grad():
-                outputs = self.perplexity_model(**encodings, labels=encodings.input_ids)
-                loss = outputs.loss
-                perplexity = torch.exp(loss).item()
-            
-            # Normalize: Lower perplexity = higher AI probability
-            # Typical ranges: Human 20-50, AI 5-20
-            normalized = max(0, min(1, (50 - perplexity) / 45))
-            
-            return normalized
+            perplexity = await self._perplexity_batcher.submit(content[:1000])
+            return self._normalize_perplexity(perplexity)
         
         except Exception as e:
             logger.error(f"Perplexity detection failed: {e}")
-            return 0.5
+            return None
+    
+    def _perplexity_batch(self, items: List[Union[str, List[int]]]) -> List[float]:
+        """Per-text GPT-2 perplexity from one padded forward pass (worker thread)"""
+        input_ids, attention_mask = self._encode_batch(items, self.perplexity_tokenizer, 1024)
+        
+        with torch.inference_mode():
+            logits = self.perplexity_model(
+                input_ids=input_ids,
+                attention_mask=attention_mask
+            ).logits
+        
+        # Shifted next-token loss, averaged over each text's real tokens only
+        shift_logits = logits[:, :-1, :].float()
+        shift_labels = input_ids[:, 1:]
+        shift_mask = attention_mask[:, 1:].float()
+        token_loss = torch.nn.functional.cross_entropy(
+            shift_logits.transpose(1, 2), shift_labels, reduction="none"
+        )
+        mean_loss = (token_loss * shift_mask).sum(dim=1) / shift_mask.sum(dim=1).clamp(min=1)
+        return torch.exp(mean_loss).tolist()
     
-    async def _burstiness_detection(self, content: str) -> float:
+    async def _burstiness_detection(self, content: str, doc: ParsedDocument = None) -> float:
         """
         Burstiness analysis (Method 3)
         AI text has more uniform sentence lengths
         Returns: 0.0-1.0 (higher = more AI-like)
         """
-        sentences = re.split(r'[.!?]+', content)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        sentences = (doc or ParsedDocument(content)).sentences
         
         if len(sentences) < 3:
             return 0.5
@@ -245,13 +491,13 @@ class AIDetectionEngine:
         
         return ai_score
     
-    async def _pattern_detection(self, content: str) -> float:
+    async def _pattern_detection(self, content: str, doc: ParsedDocument = None) -> float:
         """
         Pattern matching detection (Method 4)
         Uses Tier 1 kill words as AI indicators
         Returns: 0.0-1.0 (percentage of AI patterns found)
         """
-        content_lower = content.lower()
+        content_lower = doc.lower if doc else content.lower()
         
         matches = 0
         for pattern in self.ai_patterns:
@@ -263,14 +509,14 @@ class AIDetectionEngine:
         
         return score
     
-    async def _statistical_detection(self, content: str) -> float:
+    async def _statistical_detection(self, content: str, doc: ParsedDocument = None) -> float:
         """
         Statistical fingerprinting (Method 5)
         Analyzes various statistical features
         Returns: 0.0-1.0 (AI probability)
         """
         # Word-level statistics
-        words = content.split()
+        words = doc.words if doc else content.split()
         if len(words) < 10:
             return 0.5
         
@@ -300,13 +546,16 @@ class AIDetectionEngine:
     async def batch_detect(self, contents: List[str]) -> List[AIDetectionResult]:
         """
         Batch detection for multiple content items
-        More efficient than individual calls
+        All items are submitted together so the models see full padded batches
         """
         logger.info(f"Running batch AI detection on {len(contents)} items")
         
-        results = []
-        for content in contents:
-            result = await self.detect(content)
-            results.append(result)
-        
-        return results
+        return list(await asyncio.gather(*(self.detect(content) for content in contents)))
+    
+    def get_batching_stats(self) -> Dict[str, Dict]:
+        """Micro-batching counters for both models"""
+        return {
+            "backend": self.backend,
+            "transformer": self._transformer_batcher.get_stats(),
+            "perplexity": self._perplexity_batcher.get_stats()
+        }
@@ -3,7 +3,8 @@ AI Detection Engine
 Multiple methods to detect AI-generated content
 """
 from typing import Dict, Any
-import re
+
+from .parsed_document import ParsedDocument
 
 class AIDetector:
     """
@@ -18,7 +19,7 @@ class AIDetector:
         "in today's digital age", "to summarize"
     ]
     
-    def detect(self, content: str) -> Dict[str, Any]:
+    def detect(self, content: str, doc: ParsedDocument = None) -> Dict[str, Any]:
         """
         Detect if content is AI-generated
         
@@ -31,13 +32,14 @@ class AIDetector:
                 "details": Dict
             }
         """
-        content_lower = content.lower()
+        doc = doc or ParsedDocument(content)
+        content_lower = doc.lower
         
         # Method 1: Pattern matching
         ai_phrase_count = sum(1 for phrase in self.AI_PHRASES if phrase in content_lower)
         
         # Method 2: Sentence structure uniformity (simple check)
-        sentences = [s.strip() for s in re.split(r'[.!?]+', content) if s.strip()]
+        sentences = doc.sentences
         if sentences:
             avg_length = sum(len(s.split()) for s in sentences) / len(sentences)
             length_variance = sum(abs(len(s.split()) - avg_length) for s in sentences) / len(sentences)
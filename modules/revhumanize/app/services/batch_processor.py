@@ -0,0 +1,237 @@
+"""
+Batch Processor - chunked background validation for /api/v1/batch
+
+A submitted batch is split into chunks. Each chunk is validated by a worker
+(a Celery task, or an in-process thread when no broker is reachable) using
+that process's shared validators, and progress is written to the BatchJob
+row every few items so GET /api/v1/batch/{id} can report live throughput
+and an ETA. Chunks of one batch may run on different workers at once; each
+progress write locks the BatchJob row, so counters and results never race.
+"""
+import os
+from concurrent.futures import Executor, Future
+from datetime import datetime
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .parsed_document import ParsedDocument
+from .result_cache import normalize_content
+from .validation_pipeline import get_validators, needs_review, validation_checks
+
+CHUNK_SIZE = int(os.getenv("REVHUMANIZE_BATCH_CHUNK_SIZE", "25"))
+PROGRESS_EVERY = int(os.getenv("REVHUMANIZE_BATCH_PROGRESS_EVERY", "5"))
+
+SessionFactory = Callable[[], ContextManager]
+
+
+def _default_sessions() -> SessionFactory:
+    from ..database import get_db
+    return get_db
+
+
+def chunk_items(items: List[Dict], size: int = CHUNK_SIZE) -> List[Tuple[int, List[Dict]]]:
+    """Split items into (offset, chunk) pairs"""
+    size = max(1, size)
+    return [(offset, items[offset:offset + size]) for offset in range(0, len(items), size)]
+
+
+def validate_item(item: Dict[str, Any], index: int, validators: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Validate one batch item with the same checks as /api/v1/validate
+
+    Returns the response fields plus the item's index in the batch.
+    """
+    content = item.get("content")
+    if not isinstance(content, str):
+        # normalize_content() would quietly turn a missing body into ""
+        raise ValueError(f"content must be a string, got {type(content).__name__}")
+    content = normalize_content(content)
+    doc = ParsedDocument.parse(content)
+    checks = validation_checks(content, item.get("title", ""), validators or get_validators())
+    results = {name: check(doc) for name, check in checks.items()}
+    requires_review = needs_review(results, item.get("target_score", 70.0))
+
+    return {
+        "index": index,
+        "content_id": item.get("content_id") or f"item_{index}",
+        "qa_score": results["qa"]["qa_score"],
+        "voice_consistency_score": results["voice"]["score"],
+        "ymyl_verification_score": results["ymyl"]["score"],
+        "ai_probability": results["ai_detection"]["probability"],
+        "tier1_issues": results["qa"]["tier1_issues"],
+        "tier2_issues": results["qa"]["tier2_issues"],
+        "tier3_issues": results["qa"]["tier3_issues"],
+        "requires_manual_review": requires_review,
+        "status": "needs_review" if requires_review else "approved"
+    }
+
+
+def mark_started(batch_id: str, sessions: SessionFactory = None):
+    """Flag the batch as processing and stamp its start time (first chunk only)"""
+    with (sessions or _default_sessions())() as db:
+        if db is None:
+            return
+        from ..models.db_models import BatchJob
+        batch = db.query(BatchJob).filter(BatchJob.id == batch_id).with_for_update().first()
+        if batch is None:
+            return
+        now = datetime.utcnow()
+        if batch.started_at is None:
+            batch.started_at = now
+        if batch.status == "queued":
+            batch.status = "processing"
+        batch.updated_at = now
+        db.commit()
+
+
+def record_progress(batch_id: str, results: List[Dict], sessions: SessionFactory = None):
+    """Add finished item results to the batch and close it once all items are in"""
+    if not results:
+        return
+
+    failed = sum(1 for r in results if "error" in r)
+    with (sessions or _default_sessions())() as db:
+        if db is None:
+            return
+        from ..models.db_models import BatchJob
+        batch = db.query(BatchJob).filter(BatchJob.id == batch_id).with_for_update().first()
+        if batch is None:
+            return
+
+        now = datetime.utcnow()
+        batch.completed_items = (batch.completed_items or 0) + len(results) - failed
+        batch.failed_items = (batch.failed_items or 0) + failed
+        # Reassign (not append) so SQLAlchemy sees the JSON column change
+        merged = list(batch.results or []) + results
+        batch.updated_at = now
+        if batch.completed_items + batch.failed_items >= (batch.total_items or 0):
+            merged.sort(key=lambda r: r.get("index", 0))
+            batch.status = "completed" if batch.completed_items or not batch.total_items else "failed"
+            batch.completed_at = now
+        batch.results = merged
+        db.commit()
+
+
+def mark_failed(batch_id: str, offset: int, error: BaseException, sessions: SessionFactory = None):
+    """Close a batch as failed after a chunk died outside per-item handling"""
+    with (sessions or _default_sessions())() as db:
+        if db is None:
+            return
+        from ..models.db_models import BatchJob
+        batch = db.query(BatchJob).filter(BatchJob.id == batch_id).with_for_update().first()
+        if batch is None:
+            return
+        now = datetime.utcnow()
+        batch.status = "failed"
+        batch.updated_at = now
+        batch.completed_at = batch.completed_at or now
+        batch.results = list(batch.results or []) + [
+            {"index": offset, "chunk_offset": offset, "error": f"chunk failed: {error}"}
+        ]
+        db.commit()
+
+
+def chunk_failed(batch_id: str, offset: int, error: BaseException, sessions: SessionFactory = None):
+    """Log a dead chunk and fail its batch (never raises; used from callbacks)"""
+    logger.error(f"Batch {batch_id} chunk at {offset} failed: {error}")
+    try:
+        mark_failed(batch_id, offset, error, sessions)
+    except Exception as e:
+        logger.error(f"Could not mark batch {batch_id} failed: {e}")
+
+
+def submit_chunks(
+    executor: Executor,
+    batch_id: str,
+    chunks: List[Tuple[int, List[Dict[str, Any]]]],
+    validators: Dict[str, Any] = None,
+    sessions: SessionFactory = None
+) -> List[Future]:
+    """
+    Run a batch's chunks on a local executor (no Celery broker)
+
+    Each future gets a done-callback that marks the batch failed if its chunk
+    raised, so an in-process batch never stays "processing" forever.
+    """
+    futures = []
+    for offset, chunk in chunks:
+        future = executor.submit(process_chunk, batch_id, offset, chunk, validators, sessions)
+
+        def on_done(done: Future, offset: int = offset):
+            error = done.exception()
+            if error is not None:
+                chunk_failed(batch_id, offset, error, sessions)
+
+        future.add_done_callback(on_done)
+        futures.append(future)
+    return futures
+
+
+def process_chunk(
+    batch_id: str,
+    offset: int,
+    items: List[Dict[str, Any]],
+    validators: Dict[str, Any] = None,
+    sessions: SessionFactory = None,
+    progress_every: int = PROGRESS_EVERY
+) -> Dict[str, int]:
+    """
+    Validate one chunk, writing progress every progress_every items
+
+    Args:
+        batch_id: BatchJob id
+        offset: Index of the chunk's first item in the batch
+        items: The chunk's items
+        validators: Validator set (default: this process's shared set)
+        sessions: Database session factory (default: app.database.get_db)
+        progress_every: Items between progress writes
+    """
+    validators = validators or get_validators()
+    mark_started(batch_id, sessions)
+
+    pending: List[Dict] = []
+    completed = failed = 0
+    for index, item in enumerate(items, start=offset):
+        try:
+            pending.append(validate_item(item, index, validators))
+            completed += 1
+        except Exception as e:
+            pending.append({
+                "index": index,
+                "content_id": item.get("content_id") or f"item_{index}",
+                "error": str(e)
+            })
+            failed += 1
+        if len(pending) >= max(1, progress_every):
+            record_progress(batch_id, pending, sessions)
+            pending = []
+
+    record_progress(batch_id, pending, sessions)
+    return {"completed": completed, "failed": failed}
+
+
+def batch_progress(batch: Any, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Live progress for a BatchJob: processed count, percent, items/sec and ETA"""
+    total = batch.total_items or 0
+    processed = (batch.completed_items or 0) + (batch.failed_items or 0)
+    started = batch.started_at
+    finished = batch.completed_at or now or datetime.utcnow()
+
+    elapsed = (finished - started).total_seconds() if started else 0.0
+    throughput = processed / elapsed if elapsed > 0 else 0.0
+    remaining = max(0, total - processed)
+    if remaining == 0:
+        eta = 0.0
+    elif throughput > 0:
+        eta = remaining / throughput
+    else:
+        eta = None
+
+    return {
+        "processed_items": processed,
+        "percent_complete": round(100.0 * processed / total, 1) if total else 100.0,
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput_items_per_sec": round(throughput, 2),
+        "eta_seconds": round(eta, 1) if eta is not None else None
+    }
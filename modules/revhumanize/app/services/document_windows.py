@@ -0,0 +1,150 @@
+"""
+Document Windows - section-aligned sliding windows for long-document scoring
+
+The detector models only see 512 (RoBERTa) / 1024 (GPT-2) tokens at a time.
+To score a whole page, the tokenized document is cut into sections that
+start on paragraph boundaries: consecutive paragraphs are merged until a
+section holds at least min_section_tokens, and a section longer than one
+window is covered by overlapping strided windows. Because boundaries follow
+the paragraphs, editing one paragraph changes only the windows of its own
+section, so cached window scores stay valid for the rest of the document.
+"""
+import math
+import re
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+WINDOW_TOKENS = 510  # RoBERTa's 512 minus <s> and </s>
+WINDOW_STRIDE = 384
+MIN_SECTION_TOKENS = 128
+
+_PARAGRAPH_BREAK_RE = re.compile(r'\n[ \t]*\n\s*')
+
+
+class Window:
+    """A token range of the document and the characters it covers"""
+
+    __slots__ = ('section', 'token_start', 'token_end', 'start', 'end')
+
+    def __init__(self, section: int, token_start: int, token_end: int, start: int, end: int):
+        self.section = section
+        self.token_start = token_start
+        self.token_end = token_end
+        self.start = start
+        self.end = end
+
+    @property
+    def tokens(self) -> int:
+        return self.token_end - self.token_start
+
+    def __repr__(self):
+        return f"Window(section={self.section}, tokens={self.token_start}:{self.token_end}, chars={self.start}:{self.end})"
+
+
+def paragraph_token_ranges(content: str, offsets: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Token index ranges of the document's paragraphs (blank-line separated)"""
+    starts = [start for start, _ in offsets]
+    bounds = [0]
+    for match in _PARAGRAPH_BREAK_RE.finditer(content):
+        bounds.append(bisect_left(starts, match.end()))
+    bounds.append(len(offsets))
+
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def plan_windows(
+    content: str,
+    offsets: Sequence[Tuple[int, int]],
+    window_tokens: int = WINDOW_TOKENS,
+    stride: int = WINDOW_STRIDE,
+    min_section_tokens: int = MIN_SECTION_TOKENS
+) -> List[Window]:
+    """
+    Windows covering every token of the document
+
+    Args:
+        content: The document
+        offsets: (start, end) character offsets of each token, in order
+        window_tokens: Max tokens per window
+        stride: Step between overlapping windows inside a long section
+        min_section_tokens: Paragraphs are merged until a section has this many
+    """
+    stride = max(1, min(stride, window_tokens))
+
+    sections: List[Tuple[int, int]] = []
+    current = None
+    for a, b in paragraph_token_ranges(content, offsets):
+        current = (current[0], b) if current else (a, b)
+        if current[1] - current[0] >= min_section_tokens:
+            sections.append(current)
+            current = None
+    if current:
+        if sections and current[1] - current[0] < min_section_tokens:
+            # Short tail joins the previous section
+            sections[-1] = (sections[-1][0], current[1])
+        else:
+            sections.append(current)
+
+    windows = []
+    for index, (a, b) in enumerate(sections):
+        start = a
+        while True:
+            end = min(start + window_tokens, b)
+            windows.append(Window(index, start, end, offsets[start][0], offsets[end - 1][1]))
+            if end >= b:
+                break
+            start += stride
+    return windows
+
+
+def section_heatmap(
+    windows: Sequence[Window],
+    transformer_scores: Sequence[float],
+    perplexity_scores: Sequence[float],
+    transformer_weight: float = 0.40,
+    perplexity_weight: float = 0.25
+) -> List[Dict]:
+    """
+    Per-section AI probability
+
+    Window scores are averaged per section (weighted by tokens) and combined
+    with the same relative weights the ensemble gives the two models.
+    """
+    sections: Dict[int, Dict] = {}
+    for window, t_score, p_score in zip(windows, transformer_scores, perplexity_scores):
+        entry = sections.setdefault(window.section, {
+            "section": window.section, "start": window.start, "end": window.end,
+            "tokens": 0, "_t": 0.0, "_p": 0.0
+        })
+        entry["start"] = min(entry["start"], window.start)
+        entry["end"] = max(entry["end"], window.end)
+        entry["tokens"] += window.tokens
+        entry["_t"] += t_score * window.tokens
+        entry["_p"] += p_score * window.tokens
+
+    heatmap = []
+    for entry in sorted(sections.values(), key=lambda e: e["section"]):
+        n = entry.pop("tokens")
+        t_score = entry.pop("_t") / n
+        p_score = entry.pop("_p") / n
+        heatmap.append({
+            **entry,
+            "tokens": n,
+            "transformer_score": round(t_score, 4),
+            "perplexity_score": round(p_score, 4),
+            "ai_probability": round(
+                (t_score * transformer_weight + p_score * perplexity_weight)
+                / (transformer_weight + perplexity_weight), 4
+            )
+        })
+    return heatmap
+
+
+def weighted_mean(values: Sequence[float], weights: Sequence[float]) -> float:
+    total = sum(weights)
+    return sum(v * w for v, w in zip(values, weights)) / total if total else 0.0
+
+
+def pooled_perplexity(perplexities: Sequence[float], tokens: Sequence[int]) -> float:
+    """Document perplexity from per-window perplexities (token-weighted mean log-loss)"""
+    return math.exp(weighted_mean([math.log(max(p, 1e-9)) for p in perplexities], tokens))
@@ -19,6 +19,8 @@ from ..models import (
     EEATScore, GEOScore, StructuralScore,
     ValidationStatus
 )
+from .lexicon_scanner import LexiconHit, LexiconScanner, TokenIndex
+from .result_cache import ResultCache, WatchedFile, normalize_content
 
 
 class HumanizerValidator:
@@ -30,24 +32,59 @@ class HumanizerValidator:
         if config_path is None:
             config_path = Path(__file__).parent.parent / "config" / "content_rules.yaml"
         
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        # Edits to the rules file are picked up (and invalidate cached results)
+        self.rules_file = WatchedFile(config_path)
+        self.rules_version = None
+        self._load_rules()
+        self.cache = ResultCache("humanizer")
         
         logger.info("Humanizer Validator initialized")
     
+    def _load_rules(self):
+        """(Re)load content_rules.yaml if it changed since the last load"""
+        version = self.rules_file.version()
+        if version == self.rules_version:
+            return
+        
+        with open(self.rules_file.path, 'r') as f:
+            self.config = yaml.safe_load(f)
+        
+        # Tier 1/2 lexicons and all rule patterns, compiled once per ruleset
+        self.scanner = LexiconScanner.from_config(self.config)
+        if self.rules_version is not None:
+            logger.info(f"Content rules changed ({self.rules_version} -> {version}), reloaded")
+        self.rules_version = version
+    
     async def validate(self, content: str, title: str = "", keywords: List[str] = None) -> HumanizerValidationResult:
         """
         Run complete validation on content
         
         Returns comprehensive validation result with all scoring
+        (cached by content hash and ruleset version)
         """
+        self._load_rules()
+        content = normalize_content(content)
+        
+        return await self.cache.aget_or_compute(
+            self.rules_version, content, (title, keywords or []),
+            lambda: self._validate(content, title, keywords),
+            encode=lambda result: result.model_dump(mode="json"),
+            decode=HumanizerValidationResult.model_validate
+        )
+    
+    async def _validate(self, content: str, title: str = "", keywords: List[str] = None) -> HumanizerValidationResult:
+        """Uncached validation"""
         logger.info(f"Validating content ({len(content)} chars)")
         
+        # One pass over the document finds every tier 1 and tier 2 lexicon hit
+        content_lower = content.lower()
+        hits = self.scanner.scan(content_lower)
+        
         # Tier 1: Kill List scan (Critical)
-        tier1_issues = await self._scan_tier1(content)
+        tier1_issues = await self._scan_tier1(content, hits)
         
         # Tier 2: Proof required scan (Major)
-        tier2_issues = await self._scan_tier2(content)
+        tier2_issues = await self._scan_tier2(content, hits)
         
         # Tier 3: Pattern replacement scan (Minor - auto-fixable)
         tier3_issues = await self._scan_tier3(content)
@@ -95,43 +132,34 @@ class HumanizerValidator:
         
         return result
     
-    async def _scan_tier1(self, content: str) -> List[Tier1Issue]:
+    async def _scan_tier1(self, content: str, hits: List[LexiconHit] = None) -> List[Tier1Issue]:
         """
         Scan for Tier 1 kill words (Auto-Reject)
         """
         issues = []
         content_lower = content.lower()
+        if hits is None:
+            hits = self.scanner.scan(content_lower)
         
         # Check kill words
-        for category in ['verbs', 'adjectives', 'adverbs', 'phrases']:
-            kill_words = self.config['tier1_kill_words'].get(category, [])
+        for hit in hits:
+            if hit.tier != 1:
+                continue
+            # Get context (50 chars before and after)
+            start = max(0, hit.start - 50)
+            end = min(len(content), hit.end + 50)
+            context = content[start:end]
             
-            for word in kill_words:
-                # Use word boundaries for words, regular search for phrases
-                if len(word.split()) == 1:
-                    pattern = rf'\b{re.escape(word)}\b'
-                else:
-                    pattern = re.escape(word)
-                
-                for match in re.finditer(pattern, content_lower, re.IGNORECASE):
-                    # Get context (50 chars before and after)
-                    start = max(0, match.start() - 50)
-                    end = min(len(content), match.end() + 50)
-                    context = content[start:end]
-                    
-                    issues.append(Tier1Issue(
-                        word=word,
-                        category=category,
-                        context=context,
-                        position=match.start()
-                    ))
+            issues.append(Tier1Issue(
+                word=hit.term,
+                category=hit.category,
+                context=context,
+                position=hit.start
+            ))
         
         # Check forbidden patterns
-        for pattern_rule in self.config['tier1_kill_words']['forbidden_patterns']:
-            pattern = pattern_rule['pattern']
-            description = pattern_rule['description']
-            
-            for match in re.finditer(pattern, content_lower, re.IGNORECASE):
+        for pattern, description in self.scanner.forbidden_patterns:
+            for match in pattern.finditer(content_lower):
                 start = max(0, match.start() - 50)
                 end = min(len(content), match.end() + 50)
                 context = content[start:end]
@@ -146,50 +174,39 @@ class HumanizerValidator:
         logger.info(f"Tier 1 scan: {len(issues)} critical issues found")
         return issues
     
-    async def _scan_tier2(self, content: str) -> List[Tier2Issue]:
+    async def _scan_tier2(self, content: str, hits: List[LexiconHit] = None) -> List[Tier2Issue]:
         """
         Scan for Tier 2 proof-required words
         These are only issues if they appear WITHOUT substantiation
         """
         issues = []
         content_lower = content.lower()
+        if hits is None:
+            hits = self.scanner.scan(content_lower)
         
-        tier2_words = self.config['tier2_proof_required']['words']
-        proof_patterns = self.config['tier2_proof_required']['proof_patterns']
-        proximity = self.config['tier2_proof_required']['proximity_words']
+        # Token offsets are indexed once; each trigger looks up its word window
+        tokens = None
         
-        for trigger_word in tier2_words:
-            pattern = rf'\b{re.escape(trigger_word)}\b'
+        for hit in hits:
+            if hit.tier != 2:
+                continue
+            if tokens is None:
+                tokens = TokenIndex(content_lower)
             
-            for match in re.finditer(pattern, content_lower, re.IGNORECASE):
-                # Get surrounding context (proximity words)
-                words = content_lower.split()
-                match_word_index = len(content_lower[:match.start()].split())
-                
-                start_idx = max(0, match_word_index - proximity)
-                end_idx = min(len(words), match_word_index + proximity)
-                
-                surrounding_text = ' '.join(words[start_idx:end_idx])
-                
-                # Check if any proof pattern exists in surrounding text
-                has_proof = False
-                for proof_pattern in proof_patterns:
-                    if re.search(proof_pattern, surrounding_text):
-                        has_proof = True
-                        break
+            # Check if any proof pattern exists within proximity words
+            if not self.scanner.has_proof_near(tokens, hit.start):
+                trigger_word = hit.term
+                start = max(0, hit.start - 100)
+                end = min(len(content), hit.end + 100)
+                context = content[start:end]
                 
-                if not has_proof:
-                    start = max(0, match.start() - 100)
-                    end = min(len(content), match.end() + 100)
-                    context = content[start:end]
-                    
-                    issues.append(Tier2Issue(
-                        trigger_word=trigger_word,
-                        context=context,
-                        position=match.start(),
-                        missing_proof="number, percentage, or specific outcome",
-                        suggestion=f'Add specific proof after "{trigger_word}" (e.g., "We {trigger_word} load time from 4.2s to 1.1s")'
-                    ))
+                issues.append(Tier2Issue(
+                    trigger_word=trigger_word,
+                    context=context,
+                    position=hit.start,
+                    missing_proof="number, percentage, or specific outcome",
+                    suggestion=f'Add specific proof after "{trigger_word}" (e.g., "We {trigger_word} load time from 4.2s to 1.1s")'
+                ))
         
         logger.info(f"Tier 2 scan: {len(issues)} proof-required issues found")
         return issues
@@ -201,14 +218,8 @@ class HumanizerValidator:
         """
         issues = []
         
-        replacements = self.config['tier3_replacements']
-        
-        for rule in replacements:
-            pattern = rule['pattern']
-            replacement = rule['replacement']
-            description = rule['description']
-            
-            for match in re.finditer(pattern, content, re.IGNORECASE):
+        for pattern, replacement, description in self.scanner.tier3_patterns:
+            for match in pattern.finditer(content):
                 start = max(0, match.start() - 50)
                 end = min(len(content), match.end() + 50)
                 context = content[start:end]
@@ -0,0 +1,138 @@
+"""
+Dynamic micro-batching for model inference
+
+Concurrent requests each submit one item; the batcher groups whatever is
+waiting (up to max_batch_size, or after max_wait_ms) into one call of a
+synchronous batch function that runs in a worker thread. While a batch is
+running, new items queue up and go out together in the next batch, so
+throughput grows with load instead of each request paying for its own
+forward pass.
+"""
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+class MicroBatcher:
+    """
+    Collects items from concurrent coroutines into batches
+
+    Usage:
+        batcher = MicroBatcher(model_fn, max_batch_size=16, max_wait_ms=10)
+        score = await batcher.submit(text)
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10.0,
+        max_concurrent_batches: int = 1,
+        executor: Optional[Executor] = None,
+        name: str = "batch"
+    ):
+        """
+        Args:
+            process_batch: Sync function mapping a list of items to a list of results
+            max_batch_size: Largest batch handed to process_batch
+            max_wait_ms: How long the first queued item waits for company
+            max_concurrent_batches: Batches allowed to run at once
+            executor: Where process_batch runs (defaults to a dedicated thread pool)
+            name: Label used in thread names and error messages
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=self.max_concurrent_batches,
+            thread_name_prefix=f"{name}-worker"
+        )
+        self.name = name
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running = 0
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.stats = {"batches": 0, "items": 0, "largest_batch": 0, "errors": 0, "busy_seconds": 0.0}
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # New event loop (e.g. a fresh asyncio.run): start clean
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+            self._running = 0
+
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None and self._running < self.max_concurrent_batches:
+            self._timer = loop.call_later(self.max_wait, self._dispatch)
+
+        return await future
+
+    async def submit_many(self, items: List[Any]) -> List[Any]:
+        """Queue several items at once (they share batches with other callers)"""
+        return list(await asyncio.gather(*(self.submit(item) for item in items)))
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending and self._running < self.max_concurrent_batches:
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            self._running += 1
+            task = self._loop.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        items = [item for item, _ in batch]
+        started = time.perf_counter()
+        try:
+            results = await self._loop.run_in_executor(self.executor, self.process_batch, items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"{self.name}: process_batch returned {len(results)} results for {len(items)} items"
+                )
+        except Exception as e:
+            # Every caller in the batch sees the error and applies its own fallback
+            self.stats["errors"] += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self.stats["batches"] += 1
+            self.stats["items"] += len(items)
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(items))
+            self.stats["busy_seconds"] += time.perf_counter() - started
+            self._running -= 1
+            # Everything that arrived while we were busy goes out now
+            if self._pending:
+                self._dispatch()
+
+    def get_stats(self) -> Dict[str, Any]:
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "avg_batch_size": round(self.stats["items"] / batches, 2) if batches else 0.0,
+            "queued": len(self._pending),
+            "running": self._running
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,209 @@
+"""
+Lexicon Scanner - compiled single-pass matching for the humanizer tiers
+
+The tier 1 kill words and tier 2 trigger words from content_rules.yaml are
+compiled once into a single trie-shaped regex. One scan over the lowercased
+document reports every position where some lexicon term could start; the
+terms that share that prefix are then checked for their own word-boundary
+rules, so a document is read once no matter how many terms the lexicons hold.
+
+The tier 1 forbidden patterns, tier 3 replacements and tier 2 proof patterns
+are free-form regexes and are precompiled here as well.
+
+TokenIndex records where every whitespace-separated token starts, so the
+"proof within N words" check for tier 2 is a binary search plus a slice
+instead of re-splitting the document for every trigger.
+"""
+import re
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+TIER1_CATEGORIES = ('verbs', 'adjectives', 'adverbs', 'phrases')
+
+_TOKEN_RE = re.compile(r'\S+')
+
+
+class LexiconHit:
+    """One lexicon term found in a document"""
+
+    __slots__ = ('tier', 'term', 'category', 'start', 'end', 'order')
+
+    def __init__(self, tier: int, term: str, category: str, start: int, end: int, order: int):
+        self.tier = tier
+        self.term = term
+        self.category = category
+        self.start = start
+        self.end = end
+        self.order = order  # position of the term in content_rules.yaml
+
+    def __repr__(self):
+        return f"LexiconHit(tier={self.tier}, term={self.term!r}, start={self.start})"
+
+
+class TokenIndex:
+    """Start offsets of the whitespace-separated tokens of a document"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens: List[str] = []
+        self.starts: List[int] = []
+        for match in _TOKEN_RE.finditer(text):
+            self.tokens.append(match.group())
+            self.starts.append(match.start())
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def index_at(self, offset: int) -> int:
+        """Number of tokens that start before offset (== len(text[:offset].split()))"""
+        return bisect_left(self.starts, offset)
+
+    def window(self, offset: int, radius: int) -> str:
+        """The tokens within radius words of offset, joined by single spaces"""
+        i = self.index_at(offset)
+        return ' '.join(self.tokens[max(0, i - radius):min(len(self.tokens), i + radius)])
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Regex alternation shaped like a trie over words.
+
+    Branches are ordered so that at any position the longest matching word
+    wins, which lets a single match stand for every shorter word it contains
+    as a prefix.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        ends_here = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if ends_here:
+            # Optional (greedy) so a longer word is preferred over this prefix
+            return ('(?:' + body + ')?') if len(branches) == 1 else body + '?'
+        return body
+
+    return build(trie)
+
+
+class LexiconScanner:
+    """
+    All humanizer lexicons compiled into one automaton
+
+    Usage:
+        scanner = LexiconScanner.from_config(config)
+        hits = scanner.scan(content.lower())
+    """
+
+    def __init__(
+        self,
+        terms: List[Tuple[int, str, str, bool]],
+        forbidden_patterns: List[Dict] = None,
+        tier3_replacements: List[Dict] = None,
+        proof_patterns: List[str] = None,
+        proximity_words: int = 50
+    ):
+        """
+        Args:
+            terms: (tier, term, category, word_bounded) in config order; word_bounded
+                   terms only match between word boundaries (\\b...\\b)
+            forbidden_patterns: tier1_kill_words.forbidden_patterns rules
+            tier3_replacements: tier3_replacements rules
+            proof_patterns: tier2_proof_required.proof_patterns
+            proximity_words: How far (in words) tier 2 proof may be from its trigger
+        """
+        self.forbidden_patterns = [
+            (re.compile(rule['pattern'], re.IGNORECASE), rule['description'])
+            for rule in forbidden_patterns or []
+        ]
+        self.tier3_patterns = [
+            (re.compile(rule['pattern'], re.IGNORECASE), rule['replacement'], rule['description'])
+            for rule in tier3_replacements or []
+        ]
+        self.proof_pattern = (
+            re.compile('|'.join(f'(?:{p})' for p in proof_patterns)) if proof_patterns else None
+        )
+        self.proximity_words = proximity_words
+
+        # literal -> [(order, tier, term, category, matcher)]
+        self._entries: Dict[str, List[Tuple[int, int, str, str, re.Pattern]]] = {}
+        for order, (tier, term, category, bounded) in enumerate(terms):
+            literal = term.lower()
+            pattern = rf'\b{re.escape(literal)}\b' if bounded else re.escape(literal)
+            self._entries.setdefault(literal, []).append(
+                (order, tier, term, category, re.compile(pattern))
+            )
+
+        # For every literal, the entries of all literals that are prefixes of it:
+        # these are the only terms that can also match where it matched.
+        literals = sorted(self._entries)
+        self._candidates: Dict[str, List[Tuple[int, int, str, str, re.Pattern]]] = {}
+        for literal in literals:
+            self._candidates[literal] = [
+                entry
+                for other in literals if literal.startswith(other)
+                for entry in self._entries[other]
+            ]
+
+        trie = _trie_pattern(literals)
+        self._automaton = re.compile(f'(?=({trie}))') if trie else None
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "LexiconScanner":
+        """Compile the lexicons and patterns from content_rules.yaml"""
+        terms = []
+        kill_words = config.get('tier1_kill_words', {})
+        for category in TIER1_CATEGORIES:
+            for word in kill_words.get(category, []):
+                # Word boundaries for single words, plain search for phrases
+                terms.append((1, word, category, len(word.split()) == 1))
+
+        tier2 = config.get('tier2_proof_required', {})
+        for word in tier2.get('words', []):
+            terms.append((2, word, 'proof_required', True))
+
+        return cls(
+            terms,
+            forbidden_patterns=kill_words.get('forbidden_patterns', []),
+            tier3_replacements=config.get('tier3_replacements', []),
+            proof_patterns=tier2.get('proof_patterns', []),
+            proximity_words=tier2.get('proximity_words', 50)
+        )
+
+    def scan(self, text_lower: str) -> List[LexiconHit]:
+        """
+        Every lexicon hit in one pass over text_lower.
+
+        Hits come back in config order, then by position - the same order as
+        running re.finditer once per term.
+        """
+        hits = []
+        if self._automaton is None:
+            return hits
+
+        last_end: Dict[int, int] = {}  # finditer never reports overlapping hits of one term
+        for match in self._automaton.finditer(text_lower):
+            pos = match.start()
+            for order, tier, term, category, matcher in self._candidates[match.group(1)]:
+                if pos < last_end.get(order, -1):
+                    continue
+                found = matcher.match(text_lower, pos)
+                if found:
+                    last_end[order] = found.end()
+                    hits.append(LexiconHit(tier, term, category, pos, found.end(), order))
+
+        hits.sort(key=lambda hit: (hit.order, hit.start))
+        return hits
+
+    def has_proof_near(self, tokens: TokenIndex, offset: int) -> bool:
+        """Whether a proof pattern appears within proximity_words of offset"""
+        if self.proof_pattern is None:
+            return False
+        return self.proof_pattern.search(tokens.window(offset, self.proximity_words)) is not None
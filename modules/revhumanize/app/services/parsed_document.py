@@ -0,0 +1,93 @@
+"""
+Parsed Document - text views shared by all validators
+
+Every validator used to lowercase, strip HTML and split the same content into
+sentences and words on its own. ParsedDocument does each of those once per
+request and hands the results to every validator that asks for them.
+
+Views are computed on first use and cached; ParsedDocument.parse() builds the
+common ones up front so validators running concurrently only read them.
+"""
+import re
+from functools import cached_property
+from typing import List, Tuple
+
+from .lexicon_scanner import TokenIndex
+
+_TAG_RE = re.compile(r'<[^>]+>')
+# Runs of text between sentence terminators (same pieces as re.split(r'[.!?]+'))
+_SENTENCE_RE = re.compile(r'[^.!?]+')
+
+
+def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """(start, end) of each non-blank sentence, surrounding whitespace trimmed"""
+    spans = []
+    for match in _SENTENCE_RE.finditer(text):
+        piece = match.group()
+        stripped = piece.strip()
+        if stripped:
+            start = match.start() + (len(piece) - len(piece.lstrip()))
+            spans.append((start, start + len(stripped)))
+    return spans
+
+
+class ParsedDocument:
+    """
+    One piece of content, pre-split for validation
+
+    Attributes (all lazy, cached):
+        lower: Lowercased content
+        words: Whitespace-separated tokens of the content
+        sentences / sentence_spans: Non-blank sentences and their offsets
+        paragraphs: Non-blank paragraphs (split on blank lines)
+        plain_text: Content with HTML tags removed
+        plain_sentences: Sentences of plain_text
+        tokens: TokenIndex over lower (token offsets for proximity lookups)
+    """
+
+    def __init__(self, content: str):
+        self.content = content or ""
+
+    @classmethod
+    def parse(cls, content: str) -> "ParsedDocument":
+        """Build a document with the commonly used views already computed"""
+        doc = cls(content)
+        for view in ("lower", "words", "sentences", "paragraphs", "plain_sentences"):
+            getattr(doc, view)
+        return doc
+
+    @cached_property
+    def lower(self) -> str:
+        return self.content.lower()
+
+    @cached_property
+    def words(self) -> List[str]:
+        return self.content.split()
+
+    @cached_property
+    def sentence_spans(self) -> List[Tuple[int, int]]:
+        return _sentence_spans(self.content)
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        return [self.content[start:end] for start, end in self.sentence_spans]
+
+    @cached_property
+    def paragraphs(self) -> List[str]:
+        return [p.strip() for p in self.content.split('\n\n') if p.strip()]
+
+    @cached_property
+    def plain_text(self) -> str:
+        return _TAG_RE.sub('', self.content)
+
+    @cached_property
+    def plain_sentences(self) -> List[str]:
+        text = self.plain_text
+        return [text[start:end] for start, end in _sentence_spans(text)]
+
+    @cached_property
+    def tokens(self) -> TokenIndex:
+        return TokenIndex(self.lower)
+
+    def __len__(self) -> int:
+        return len(self.content)
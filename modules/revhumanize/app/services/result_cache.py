@@ -0,0 +1,357 @@
+"""
+Result Cache - content-hash cache for validations and detections
+
+Articles come back many times (re-edits, the review queue, batch retries),
+so results are cached under:
+
+    <namespace>:c<CACHE_CODE_VERSION>:<version>:sha256(normalized content + parameters)
+
+The version is a fingerprint of whatever determines the result - the
+content_rules.yaml bytes, the detector model names and backend, a checker's
+pattern tables - so editing the rules or swapping a model produces new keys
+and old entries are never served. Scoring logic and result shapes live in
+code, which no fingerprint sees: bump CACHE_CODE_VERSION whenever a change
+would alter a cached result, so Redis entries from older code are not served. When a cache sees a new version it also
+drops its in-process entries for the old one.
+
+Two tiers:
+    L1 - bounded in-process LRU (REVHUMANIZE_CACHE_SIZE entries per cache)
+    L2 - optional Redis shared by all processes (REVHUMANIZE_CACHE_REDIS_URL,
+         entries expire after REVHUMANIZE_CACHE_TTL seconds)
+
+Values are stored as JSON, so every hit returns a fresh copy.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+# Bump when scoring code or a cached result's schema changes
+CACHE_CODE_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("REVHUMANIZE_CACHE_SIZE", "1024"))
+DEFAULT_TTL = int(os.getenv("REVHUMANIZE_CACHE_TTL", str(7 * 24 * 3600)))
+
+
+def normalize_content(content: str) -> str:
+    """Canonical form used for hashing (and validation): NFC, \\n line endings"""
+    text = unicodedata.normalize("NFC", content or "")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def fingerprint(*parts: Any) -> str:
+    """Short stable hash of JSON-serializable parts (used as a version)"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class WatchedFile:
+    """
+    Content fingerprint of a file that notices edits
+
+    The file is re-hashed only when its mtime or size changes, and stat() is
+    called at most once per check_interval seconds.
+    """
+
+    def __init__(self, path, check_interval: float = 2.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._stat = None
+        self._checked = 0.0
+        self._version = ""
+        self._lock = threading.Lock()
+        self.version()
+
+    def version(self) -> str:
+        now = time.monotonic()
+        with self._lock:
+            if self._version and now - self._checked < self.check_interval:
+                return self._version
+            self._checked = now
+            try:
+                st = self.path.stat()
+                stat = (st.st_mtime_ns, st.st_size)
+                if stat != self._stat:
+                    self._version = hashlib.sha256(self.path.read_bytes()).hexdigest()[:16]
+                    self._stat = stat
+            except OSError:
+                self._version = self._version or "missing"
+            return self._version
+
+
+class RedisBackend:
+    """Shared L2 tier; on errors it backs off instead of failing requests"""
+
+    def __init__(self, url: str, ttl: int = DEFAULT_TTL, retry_interval: float = 30.0):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+        self.errors = 0
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self):
+        with self._lock:
+            self.errors += 1
+            self._down_until = time.monotonic() + self.retry_interval
+
+    def get(self, key: str) -> Optional[str]:
+        if not self._available():
+            return None
+        try:
+            value = self.client.get(key)
+        except Exception:
+            self._failed()
+            return None
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key: str, value: str):
+        if not self._available():
+            return
+        try:
+            self.client.set(key, value, ex=self.ttl)
+        except Exception:
+            self._failed()
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        """One MGET for all keys"""
+        if not keys or not self._available():
+            return [None] * len(keys)
+        try:
+            values = self.client.mget(list(keys))
+        except Exception:
+            self._failed()
+            return [None] * len(keys)
+        return [value.decode("utf-8") if value is not None else None for value in values]
+
+    def set_many(self, items: Sequence[Tuple[str, str]]):
+        """All writes in one pipeline round trip"""
+        if not items or not self._available():
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items:
+                pipe.set(key, value, ex=self.ttl)
+            pipe.execute()
+        except Exception:
+            self._failed()
+
+
+@lru_cache(maxsize=1)
+def shared_backend() -> Optional[RedisBackend]:
+    """The process-wide L2 backend, if REVHUMANIZE_CACHE_REDIS_URL is set"""
+    url = os.getenv("REVHUMANIZE_CACHE_REDIS_URL")
+    if not url:
+        return None
+    try:
+        return RedisBackend(url)
+    except Exception as e:
+        logger.warning(f"Result cache Redis unavailable (L1 only): {e}")
+        return None
+
+
+class ResultCache:
+    """
+    Two-tier cache for one kind of result
+
+    Usage:
+        cache = ResultCache("voice")
+        result = cache.get_or_compute(version, content, (reference_voice,), lambda: check(content))
+    """
+
+    def __init__(self, namespace: str, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 backend: Optional[Any] = ...):
+        """
+        Args:
+            namespace: Key prefix, one per cached function
+            max_entries: L1 capacity
+            backend: L2 with get/set, and optionally get_many/set_many
+                     (default: shared_backend(); None for L1 only)
+        """
+        self.namespace = namespace
+        self.max_entries = max(1, max_entries)
+        self.backend = shared_backend() if backend is ... else backend
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "l2_hits": 0, "misses": 0, "invalidations": 0}
+
+    def key(self, version: str, content: str, params: Sequence[Any] = ()) -> str:
+        digest = hashlib.sha256(
+            json.dumps([content, list(params)], default=str).encode("utf-8")
+        ).hexdigest()
+        return f"revhumanize:{self.namespace}:c{CACHE_CODE_VERSION}:{version}:{digest}"
+
+    def get(self, version: str, key: str) -> Optional[str]:
+        value = self._local_get(version, key)
+        if value is None and self.backend is not None:
+            value = self._l2_value(key, self.backend.get(key))
+        if value is None:
+            self._count("misses")
+        return value
+
+    async def aget(self, version: str, key: str) -> Optional[str]:
+        """get() with the Redis round trip in a worker thread, off the event loop"""
+        value = self._local_get(version, key)
+        if value is None and self.backend is not None:
+            value = self._l2_value(key, await asyncio.to_thread(self.backend.get, key))
+        if value is None:
+            self._count("misses")
+        return value
+
+    def set(self, key: str, value: str):
+        self._remember(key, value)
+        if self.backend is not None:
+            self.backend.set(key, value)
+
+    async def aset(self, key: str, value: str):
+        """set() with the Redis write in a worker thread"""
+        self._remember(key, value)
+        if self.backend is not None:
+            await asyncio.to_thread(self.backend.set, key, value)
+
+    async def aget_many(self, version: str, keys: Sequence[str]) -> List[Optional[str]]:
+        """aget() for many keys: L1 inline, then one L2 batch lookup in a worker thread"""
+        values = [self._local_get(version, key) for key in keys]
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing and self.backend is not None:
+            fetched = await asyncio.to_thread(self._backend_get_many, [keys[i] for i in missing])
+            for i, value in zip(missing, fetched):
+                values[i] = self._l2_value(keys[i], value)
+        for value in values:
+            if value is None:
+                self._count("misses")
+        return values
+
+    async def aset_many(self, items: Sequence[Tuple[str, str]]):
+        """aset() for many entries with one L2 batch write"""
+        for key, value in items:
+            self._remember(key, value)
+        if items and self.backend is not None:
+            await asyncio.to_thread(self._backend_set_many, items)
+
+    def _backend_get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        if hasattr(self.backend, "get_many"):
+            return self.backend.get_many(keys)
+        return [self.backend.get(key) for key in keys]
+
+    def _backend_set_many(self, items: Sequence[Tuple[str, str]]):
+        if hasattr(self.backend, "set_many"):
+            self.backend.set_many(items)
+        else:
+            for key, value in items:
+                self.backend.set(key, value)
+
+    def _local_get(self, version: str, key: str) -> Optional[str]:
+        with self._lock:
+            if version != self._version:
+                # Rules or model changed: nothing cached so far can be served
+                if self._version is not None:
+                    self.stats["invalidations"] += 1
+                self._entries.clear()
+                self._version = version
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+            return value
+
+    def _l2_value(self, key: str, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            self._remember(key, value)
+            self._count("l2_hits")
+        return value
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _remember(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(
+        self,
+        version: str,
+        content: str,
+        params: Sequence[Any],
+        compute: Callable[[], Any],
+        encode: Callable[[Any], Any] = None,
+        decode: Callable[[Any], Any] = None,
+        cacheable: Callable[[Any], bool] = None
+    ) -> Any:
+        """
+        Cached compute() for content + params under version
+
+        Args:
+            encode: Result -> JSON-serializable data (e.g. pydantic model_dump)
+            decode: JSON data -> result (e.g. Model.model_validate)
+            cacheable: Result -> whether to store it (e.g. False for a
+                       fallback produced after a transient error)
+        """
+        key = self.key(version, content, params)
+        cached = self.get(version, key)
+        if cached is not None:
+            data = json.loads(cached)
+            return decode(data) if decode else data
+
+        result = compute()
+        if cacheable is None or cacheable(result):
+            self.set(key, json.dumps(encode(result) if encode else result, default=str))
+        return result
+
+    async def aget_or_compute(
+        self,
+        version: str,
+        content: str,
+        params: Sequence[Any],
+        compute: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Any] = None,
+        decode: Callable[[Any], Any] = None,
+        cacheable: Callable[[Any], bool] = None
+    ) -> Any:
+        """get_or_compute for coroutine functions (Redis access runs in a worker thread)"""
+        key = self.key(version, content, params)
+        cached = await self.aget(version, key)
+        if cached is not None:
+            data = json.loads(cached)
+            return decode(data) if decode else data
+
+        result = await compute()
+        if cacheable is None or cacheable(result):
+            await self.aset(key, json.dumps(encode(result) if encode else result, default=str))
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            entries = len(self._entries)
+        lookups = stats["hits"] + stats["l2_hits"] + stats["misses"]
+        return {
+            **stats,
+            "entries": entries,
+            "hit_rate": round((stats["hits"] + stats["l2_hits"]) / lookups, 3) if lookups else 0.0,
+            "l2": self.backend is not None,
+            "code_version": CACHE_CODE_VERSION
+        }
@@ -0,0 +1,100 @@
+"""
+Validation Pipeline - concurrent validator fan-out over one parsed document
+
+The content is parsed once (ParsedDocument) in a worker thread, then every
+validator runs concurrently in the executor so the event loop stays free for
+other requests. Each validator is timed where it runs, and the timings are
+returned with the results.
+"""
+import asyncio
+import time
+from concurrent.futures import Executor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .parsed_document import ParsedDocument
+
+Validator = Callable[[ParsedDocument], Any]
+
+
+@lru_cache(maxsize=1)
+def get_validators() -> Dict[str, Any]:
+    """The validator instances for this process, created on first use"""
+    from ..validators import QAValidator
+    from .voice_checker import VoiceConsistencyChecker
+    from .ymyl_checker import YMYLVerificationChecker
+    from .ai_detector import AIDetector
+
+    return {
+        "qa": QAValidator(),
+        "voice": VoiceConsistencyChecker(),
+        "ymyl": YMYLVerificationChecker(),
+        "ai_detection": AIDetector()
+    }
+
+
+def validation_checks(content: str, title: Optional[str] = None,
+                      validators: Dict[str, Any] = None) -> Dict[str, Validator]:
+    """The /api/v1/validate checks for one piece of content, keyed by name"""
+    validators = validators or get_validators()
+    return {
+        "qa": lambda doc: validators["qa"].calculate_score(content, title, doc=doc),
+        "voice": lambda doc: validators["voice"].check(content, doc=doc),
+        "ymyl": lambda doc: validators["ymyl"].check(content, "general", doc=doc),
+        "ai_detection": lambda doc: validators["ai_detection"].detect(content, doc=doc)
+    }
+
+
+def needs_review(results: Dict[str, Any], target_score: float = 70.0) -> bool:
+    """Whether validation results send the content to manual review"""
+    return (
+        results["qa"]["qa_score"] < target_score or
+        not results["voice"]["is_consistent"] or
+        results["ai_detection"]["is_ai_generated"]
+    )
+
+
+def _timed(fn: Callable[[Any], Any], arg: Any) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    result = fn(arg)
+    return result, (time.perf_counter() - started) * 1000
+
+
+async def run_validators(
+    content: str,
+    validators: Dict[str, Validator],
+    executor: Optional[Executor] = None
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Run independent validators concurrently on shared preprocessing
+
+    Args:
+        content: Text to validate
+        validators: name -> function taking the ParsedDocument
+        executor: Where parsing and validators run (default: the loop's executor)
+
+    Returns:
+        (results by name, timings in ms by name - including "parse" and "total")
+        If a validator raises, the first error is re-raised after all finish.
+    """
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+
+    doc, parse_ms = await loop.run_in_executor(executor, _timed, ParsedDocument.parse, content)
+
+    names = list(validators)
+    outcomes = await asyncio.gather(
+        *(loop.run_in_executor(executor, _timed, validators[name], doc) for name in names),
+        return_exceptions=True
+    )
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {"parse": round(parse_ms, 2)}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, BaseException):
+            raise outcome
+        results[name], elapsed_ms = outcome
+        timings[name] = round(elapsed_ms, 2)
+    timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+
+    return results, timings
@@ -5,6 +5,9 @@ Ensures content matches brand voice patterns
 from typing import List, Dict, Any
 import re
 
+from .parsed_document import ParsedDocument
+from .result_cache import ResultCache, fingerprint, normalize_content
+
 class VoiceConsistencyChecker:
     """
     Checks if content maintains consistent voice and tone
@@ -25,9 +28,13 @@ class VoiceConsistencyChecker:
         r"to summarize"
     ]
     
-    def check(self, content: str, reference_voice: str = None) -> Dict[str, Any]:
+    def __init__(self):
+        self.cache_version = fingerprint(type(self).__name__, self.PROHIBITED_PATTERNS)
+        self.cache = ResultCache("voice")
+    
+    def check(self, content: str, reference_voice: str = None, doc: ParsedDocument = None) -> Dict[str, Any]:
         """
-        Check content for voice consistency
+        Check content for voice consistency (cached by content hash)
         
         Returns:
             {
@@ -36,10 +43,21 @@ class VoiceConsistencyChecker:
                 "is_consistent": bool
             }
         """
+        content = normalize_content(content)
+        if doc is not None and doc.content != content:
+            doc = None
+        
+        return self.cache.get_or_compute(
+            self.cache_version, content, (reference_voice,),
+            lambda: self._check(content, reference_voice, doc)
+        )
+    
+    def _check(self, content: str, reference_voice: str = None, doc: ParsedDocument = None) -> Dict[str, Any]:
+        """Uncached voice check"""
         violations = []
         
         # Check for prohibited AI patterns
-        content_lower = content.lower()
+        content_lower = doc.lower if doc else content.lower()
         for pattern in self.PROHIBITED_PATTERNS:
             matches = list(re.finditer(pattern, content_lower, re.IGNORECASE))
             if matches:
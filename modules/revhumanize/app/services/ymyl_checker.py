@@ -5,6 +5,9 @@ Verifies critical information in health, finance, legal content
 from typing import List, Dict, Any
 import re
 
+from .parsed_document import ParsedDocument
+from .result_cache import ResultCache, fingerprint, normalize_content
+
 class YMYLVerificationChecker:
     """
     Verifies YMYL content has proper disclaimers and accurate info
@@ -17,9 +20,13 @@ class YMYLVerificationChecker:
         "legal": ["attorney", "licensed", "jurisdiction", "disclaimer"]
     }
     
-    def check(self, content: str, content_type: str = "general") -> Dict[str, Any]:
+    def __init__(self):
+        self.cache_version = fingerprint(type(self).__name__, self.YMYL_REQUIREMENTS)
+        self.cache = ResultCache("ymyl")
+    
+    def check(self, content: str, content_type: str = "general", doc: ParsedDocument = None) -> Dict[str, Any]:
         """
-        Verify YMYL content requirements
+        Verify YMYL content requirements (cached by content hash)
         
         Returns:
             {
@@ -28,6 +35,17 @@ class YMYLVerificationChecker:
                 "is_verified": bool
             }
         """
+        content = normalize_content(content)
+        if doc is not None and doc.content != content:
+            doc = None
+        
+        return self.cache.get_or_compute(
+            self.cache_version, content, (content_type,),
+            lambda: self._check(content, content_type, doc)
+        )
+    
+    def _check(self, content: str, content_type: str = "general", doc: ParsedDocument = None) -> Dict[str, Any]:
+        """Uncached YMYL check"""
         failures = []
         
         # If not YMYL content, pass automatically
@@ -40,7 +58,7 @@ class YMYLVerificationChecker:
             }
         
         # Check for required elements
-        content_lower = content.lower()
+        content_lower = doc.lower if doc else content.lower()
         required = self.YMYL_REQUIREMENTS.get(content_type, [])
         
         for requirement in required:
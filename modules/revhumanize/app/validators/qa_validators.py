@@ -3,7 +3,8 @@ Complete Validation Engines
 Tier 1, 2, 3 validators with all checks
 """
 from typing import List, Dict, Any
-import re
+
+from ..services.parsed_document import ParsedDocument
 
 class Tier1Validator:
     """
@@ -13,8 +14,9 @@ class Tier1Validator:
     - Invalid structure
     """
     
-    def validate(self, content: str, title: str = None) -> List[Dict[str, Any]]:
+    def validate(self, content: str, title: str = None, doc: ParsedDocument = None) -> List[Dict[str, Any]]:
         issues = []
+        doc = doc or ParsedDocument(content)
         
         # Check minimum length
         if len(content) < 100:
@@ -35,10 +37,7 @@ class Tier1Validator:
             })
         
         # Check for paragraphs
-        paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
-
-        paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
-        if len(paragraphs) < 2:
+        if len(doc.paragraphs) < 2:
             issues.append({
                 "type": "no_paragraphs",
                 "severity": "critical",
@@ -56,12 +55,12 @@ class Tier2Validator:
     - Content quality
     """
     
-    def validate(self, content: str) -> List[Dict[str, Any]]:
+    def validate(self, content: str, doc: ParsedDocument = None) -> List[Dict[str, Any]]:
         issues = []
+        doc = doc or ParsedDocument(content)
         
         # Check sentence length
-        sentences = re.split(r'[.!?]+', content)
-        long_sentences = [s for s in sentences if len(s.split()) > 40]
+        long_sentences = [s for s in doc.sentences if len(s.split()) > 40]
         if long_sentences:
             issues.append({
                 "type": "long_sentences",
@@ -72,8 +71,8 @@ class Tier2Validator:
         
         # Check for passive voice (simple check)
         passive_indicators = ['was', 'were', 'been', 'being']
-        passive_count = sum(content.lower().count(word) for word in passive_indicators)
-        if passive_count > len(content.split()) * 0.1:
+        passive_count = sum(doc.lower.count(word) for word in passive_indicators)
+        if passive_count > len(doc.words) * 0.1:
             issues.append({
                 "type": "passive_voice",
                 "severity": "warning",
@@ -123,9 +122,10 @@ class QAValidator:
         self.tier2 = Tier2Validator()
         self.tier3 = Tier3Validator()
     
-    def calculate_score(self, content: str, title: str = None) -> Dict[str, Any]:
-        tier1_issues = self.tier1.validate(content, title)
-        tier2_issues = self.tier2.validate(content)
+    def calculate_score(self, content: str, title: str = None, doc: ParsedDocument = None) -> Dict[str, Any]:
+        doc = doc or ParsedDocument(content)
+        tier1_issues = self.tier1.validate(content, title, doc)
+        tier2_issues = self.tier2.validate(content, doc)
         tier3_issues = self.tier3.validate(content)
         
         # Calculate score (100 base, subtract for issues)
@@ -2,9 +2,10 @@
 Voice Consistency Checker
 Prevents voice modality bleeding during ensemble humanization
 """
-import re
 from typing import Dict, List
 
+from ..services.parsed_document import ParsedDocument
+
 
 class VoiceConsistencyChecker:
     """
@@ -130,7 +131,8 @@ class VoiceConsistencyChecker:
     def check_voice_consistency(
         self,
         content: str,
-        target_voice: str = 'partner'
+        target_voice: str = 'partner',
+        doc: ParsedDocument = None
     ) -> Dict:
         """
         Analyze content for voice consistency violations
@@ -138,6 +140,7 @@ class VoiceConsistencyChecker:
         Args:
             content: HTML or text content to check
             target_voice: Target voice modality ('partner', 'peer', 'professor')
+            doc: Already-parsed content, if the caller has one
         
         Returns:
             Dict with consistency score, violations, and pass/fail status
@@ -147,7 +150,7 @@ class VoiceConsistencyChecker:
             raise ValueError(f"Unknown voice: {target_voice}. Must be one of {list(self.VOICE_PATTERNS.keys())}")
         
         # Tokenize content
-        sentences = self._split_sentences(content)
+        sentences = self._split_sentences(content, doc)
         
         if not sentences:
             return {
@@ -236,26 +239,22 @@ class VoiceConsistencyChecker:
         
         return suggestions.get(target_voice, {}).get(pattern_type, 'Review and revise for voice consistency')
     
-    def _split_sentences(self, content: str) -> List[str]:
+    def _split_sentences(self, content: str, doc: ParsedDocument = None) -> List[str]:
         """
         Split content into sentences
         
         Args:
             content: HTML or text content
+            doc: Already-parsed content (HTML stripping and splitting are reused)
         
         Returns:
             List of sentences
         """
-        # Remove HTML tags first
-        text = re.sub(r'<[^>]+>', '', content)
-        
-        # Split on sentence boundaries
-        sentences = re.split(r'[.!?]+', text)
-        
-        # Clean and filter
-        sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
+        # HTML tags removed, split on sentence boundaries, stripped
+        sentences = (doc or ParsedDocument(content)).plain_sentences
         
-        return sentences
+        # Filter out fragments
+        return [s for s in sentences if len(s) > 10]
     
     def batch_check(self, contents: List[Dict[str, str]], target_voice: str = 'partner') -> List[Dict]:
         """
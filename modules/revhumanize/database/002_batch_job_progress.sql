@@ -0,0 +1,12 @@
+-- ═══════════════════════════════════════════════════════════════════════════
+-- Humanization Pipeline - Batch job progress columns
+-- ═══════════════════════════════════════════════════════════════════════════
+
+-- batch_jobs is created by SQLAlchemy create_all(), which never alters an
+-- existing table; add the columns the chunked batch processor writes
+ALTER TABLE IF EXISTS batch_jobs ADD COLUMN IF NOT EXISTS started_at TIMESTAMP WITHOUT TIME ZONE;
+ALTER TABLE IF EXISTS batch_jobs ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITHOUT TIME ZONE;
+
+-- Log migration
+INSERT INTO audit_log ("user", action, entity_type, success, metadata)
+VALUES ('system', 'database_migration', 'schema', TRUE, '{"version": "1.0.1", "migration": "002_batch_job_progress"}');
@@ -0,0 +1,101 @@
+"""
+Benchmark: per-term regex scans vs the compiled lexicon scanner
+
+Runs the old tier 1 / tier 2 scanning loops and LexiconScanner over generated
+documents of 5k-50k words and checks that both report the same hits.
+
+Usage:
+    python -m tests.bench_lexicon_scanner --words 5000 20000 50000
+"""
+import argparse
+import random
+import re
+import time
+from pathlib import Path
+
+import yaml
+
+from app.services.lexicon_scanner import LexiconScanner, TokenIndex
+
+RULES = Path(__file__).parent.parent / "app" / "config" / "content_rules.yaml"
+
+FILLER = (
+    "our licensed plumbers fix leaks replace water heaters and clear drains "
+    "across the metro area with upfront pricing and same day service"
+).split()
+
+
+def make_document(config, words: int, seed: int = 7) -> str:
+    """Filler text with roughly 1 lexicon term and 1 number per 40 words"""
+    rng = random.Random(seed)
+    terms = [w for c in ('verbs', 'adjectives', 'adverbs', 'phrases')
+             for w in config['tier1_kill_words'].get(c, [])]
+    terms += config['tier2_proof_required']['words']
+    out = []
+    while len(out) < words:
+        out.extend(rng.choice(FILLER) for _ in range(38))
+        out.append(rng.choice(terms))
+        out.append(f"{rng.randint(1, 99)}%" if rng.random() < 0.3 else rng.choice(FILLER))
+    return ' '.join(out[:words])
+
+
+def legacy_scan(config, content):
+    """Tier 1 + tier 2 lexicon scan as HumanizerValidator did it before"""
+    content_lower = content.lower()
+    tier1 = []
+    for category in ['verbs', 'adjectives', 'adverbs', 'phrases']:
+        for word in config['tier1_kill_words'].get(category, []):
+            pattern = rf'\b{re.escape(word)}\b' if len(word.split()) == 1 else re.escape(word)
+            for match in re.finditer(pattern, content_lower, re.IGNORECASE):
+                tier1.append((word, match.start()))
+
+    tier2 = []
+    proof_patterns = config['tier2_proof_required']['proof_patterns']
+    proximity = config['tier2_proof_required']['proximity_words']
+    for trigger_word in config['tier2_proof_required']['words']:
+        for match in re.finditer(rf'\b{re.escape(trigger_word)}\b', content_lower, re.IGNORECASE):
+            words = content_lower.split()
+            i = len(content_lower[:match.start()].split())
+            surrounding = ' '.join(words[max(0, i - proximity):min(len(words), i + proximity)])
+            if not any(re.search(p, surrounding) for p in proof_patterns):
+                tier2.append((trigger_word, match.start()))
+    return tier1, tier2
+
+
+def compiled_scan(scanner: LexiconScanner, content):
+    content_lower = content.lower()
+    hits = scanner.scan(content_lower)
+    tokens = TokenIndex(content_lower)
+    tier1 = [(h.term, h.start) for h in hits if h.tier == 1]
+    tier2 = [(h.term, h.start) for h in hits if h.tier == 2 and not scanner.has_proof_near(tokens, h.start)]
+    return tier1, tier2
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", type=int, nargs="+", default=[5000, 10000, 20000, 50000])
+    args = parser.parse_args()
+
+    with open(RULES) as f:
+        config = yaml.safe_load(f)
+    scanner, compile_time = timed(LexiconScanner.from_config, config)
+    print(f"compile: {compile_time * 1000:.1f} ms")
+    print(f"{'words':>7} {'legacy ms':>10} {'compiled ms':>12} {'speedup':>8}  hits")
+
+    for words in args.words:
+        doc = make_document(config, words)
+        old, old_time = timed(legacy_scan, config, doc)
+        new, new_time = timed(compiled_scan, scanner, doc)
+        assert old == new, f"scanner disagrees with legacy scan at {words} words"
+        print(f"{words:>7} {old_time * 1000:>10.1f} {new_time * 1000:>12.1f} "
+              f"{old_time / new_time:>7.1f}x  {len(new[0])}+{len(new[1])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Tests for chunked background batch validation
+"""
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from app.services.batch_processor import batch_progress, chunk_items, process_chunk, submit_chunks, validate_item
+
+
+@contextmanager
+def no_database():
+    yield None
+
+
+class FakeBatchDB:
+    """Session stand-in holding one BatchJob; commits fail while `broken`"""
+    
+    def __init__(self, total_items):
+        self.batch = SimpleNamespace(
+            status="queued", total_items=total_items, completed_items=0, failed_items=0,
+            results=[], started_at=None, updated_at=None, completed_at=None
+        )
+        self.broken = False
+    
+    def query(self, model):
+        return self
+    
+    def filter(self, *args):
+        return self
+    
+    def with_for_update(self):
+        return self
+    
+    def first(self):
+        return self.batch
+    
+    def commit(self):
+        if self.broken:
+            raise RuntimeError("connection reset")
+    
+    @contextmanager
+    def sessions(self):
+        yield self
+
+
+class TestBatchProcessor:
+    """Test suite for batch chunking and item validation"""
+    
+    def test_chunk_items_keeps_offsets(self):
+        """Test: Chunks cover every item once with their batch offsets"""
+        items = [{"content": str(i)} for i in range(7)]
+        
+        chunks = chunk_items(items, 3)
+        
+        assert [offset for offset, _ in chunks] == [0, 3, 6]
+        assert [item for _, chunk in chunks for item in chunk] == items
+    
+    def test_validate_item_fields(self):
+        """Test: Items get the /api/v1/validate fields plus their index"""
+        result = validate_item({"content": "We fix leaks.\n\nCall us today.", "title": "Plumbing help"}, 4)
+        
+        assert result["index"] == 4
+        assert result["content_id"] == "item_4"
+        assert result["status"] in ("approved", "needs_review")
+        assert 0 <= result["qa_score"] <= 100
+    
+    def test_process_chunk_counts_failures(self):
+        """Test: A bad item is recorded as failed without stopping the chunk"""
+        items = [{"content": "Good content here."}, {"content": None}, {"content": "More content."}]
+        
+        counts = process_chunk("batch-1", 10, items, sessions=no_database, progress_every=2)
+        
+        assert counts == {"completed": 2, "failed": 1}
+
+    def test_local_chunk_crash_marks_batch_failed(self):
+        """Test: A chunk that dies outside per-item handling fails the batch"""
+        pytest.importorskip("app.models.db_models")
+        db = FakeBatchDB(total_items=2)
+        original_commit = db.commit
+        calls = []
+        
+        def commit():
+            calls.append(1)
+            # mark_started succeeds, the progress write then loses the connection
+            db.broken = len(calls) == 2
+            original_commit()
+        
+        db.commit = commit
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            futures = submit_chunks(executor, "batch-1", [(0, [{"content": "Fine."}, {"content": "Also fine."}])],
+                                    sessions=db.sessions)
+            wait(futures)
+        
+        assert isinstance(futures[0].exception(), RuntimeError)
+        assert db.batch.status == "failed"
+        assert db.batch.completed_at is not None
+        assert db.batch.results[-1]["error"] == "chunk failed: connection reset"
+    
+    def test_celery_chunk_crash_marks_batch_failed(self, monkeypatch):
+        """Test: A Celery chunk that raises fails the batch through its error callback"""
+        pytest.importorskip("celery")
+        pytest.importorskip("app.models.db_models")
+        from app.celery_app import celery_app
+        from app.celery_app.tasks import batch_validate_async
+        from app.services import batch_processor
+        db = FakeBatchDB(total_items=2)
+        
+        def crash(*args, **kwargs):
+            raise MemoryError("worker out of memory")
+        
+        monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+        monkeypatch.setattr(batch_processor, "_default_sessions", lambda: db.sessions)
+        monkeypatch.setattr(batch_processor, "process_chunk", crash)
+        batch_validate_async.apply(args=("batch-1", [{"content": "Fine."}, {"content": "Also fine."}]),
+                                   kwargs={"chunk_size": 1})
+        
+        assert db.batch.status == "failed"
+        assert db.batch.completed_at is not None
+        assert [r["chunk_offset"] for r in db.batch.results] == [0, 1]
+        assert db.batch.results[0]["error"] == "chunk failed: worker out of memory"
+    
+    def test_local_chunks_complete_the_batch(self):
+        """Test: Chunks run on the executor and close the batch when done"""
+        pytest.importorskip("app.models.db_models")
+        db = FakeBatchDB(total_items=3)
+        items = [{"content": "Good content."}, {"content": "More."}, {"content": "Last."}]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            wait(submit_chunks(executor, "batch-1", chunk_items(items, 2), sessions=db.sessions))
+        
+        assert db.batch.status == "completed"
+        assert [r["index"] for r in db.batch.results] == [0, 1, 2]
+
+
+class TestBatchProgress:
+    """Test suite for throughput and ETA reporting"""
+    
+    def test_throughput_and_eta(self):
+        """Test: 30 of 90 items in 10s is 3 items/sec with 20s left"""
+        now = datetime(2026, 1, 1, 12, 0, 10)
+        batch = SimpleNamespace(
+            total_items=90, completed_items=28, failed_items=2,
+            started_at=now - timedelta(seconds=10), completed_at=None
+        )
+        
+        progress = batch_progress(batch, now)
+        
+        assert progress["processed_items"] == 30
+        assert progress["throughput_items_per_sec"] == 3.0
+        assert progress["eta_seconds"] == 20.0
+        assert progress["percent_complete"] == 33.3
+    
+    def test_not_started(self):
+        """Test: A queued batch has no ETA yet"""
+        batch = SimpleNamespace(total_items=5, completed_items=0, failed_items=0, started_at=None, completed_at=None)
+        
+        assert batch_progress(batch)["eta_seconds"] is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,82 @@
+"""
+Tests for section-aligned sliding windows
+"""
+
+import re
+
+import pytest
+from app.services.document_windows import plan_windows, pooled_perplexity, section_heatmap
+
+
+def _offsets(content):
+    """Whitespace tokenizer stand-in for the fast tokenizer's offset mapping"""
+    return [(m.start(), m.end()) for m in re.finditer(r'\S+', content)]
+
+
+def _paragraph(word, count):
+    return " ".join(f"{word}{i}" for i in range(count))
+
+
+class TestDocumentWindows:
+    """Test suite for window planning and the section heatmap"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.paragraphs = [_paragraph(word, 60) for word in ("alpha", "beta", "gamma", "delta", "omega")]
+        self.content = "\n\n".join(self.paragraphs)
+
+    def test_windows_cover_every_token(self):
+        """Test: Every token is inside at least one window, none exceeds the size"""
+        offsets = _offsets(self.content)
+        windows = plan_windows(self.content, offsets, window_tokens=50, stride=40, min_section_tokens=100)
+
+        covered = set()
+        for window in windows:
+            assert window.tokens <= 50
+            covered.update(range(window.token_start, window.token_end))
+        assert covered == set(range(len(offsets)))
+
+    def test_sections_start_on_paragraphs(self):
+        """Test: Short paragraphs merge into sections, a short tail joins the last one"""
+        offsets = _offsets(self.content)
+        windows = plan_windows(self.content, offsets, window_tokens=500, min_section_tokens=100)
+
+        # 60-token paragraphs: 1+2, 3+4, and 5 (too short) joins the second
+        assert [(w.token_start, w.token_end) for w in windows] == [(0, 120), (120, 300)]
+        assert self.content[windows[1].start:].startswith("gamma0")
+        assert windows[-1].end == len(self.content)
+
+    def test_edit_changes_only_its_section(self):
+        """Test: Editing the last paragraph leaves earlier window texts unchanged"""
+        edited = self.content.replace("omega59", "omega59 and one more sentence here")
+        before = plan_windows(self.content, _offsets(self.content), min_section_tokens=100)
+        after = plan_windows(edited, _offsets(edited), min_section_tokens=100)
+
+        texts_before = [self.content[w.start:w.end] for w in before]
+        texts_after = [edited[w.start:w.end] for w in after]
+        assert texts_before[0] == texts_after[0]
+        assert texts_before[-1] != texts_after[-1]
+
+    def test_empty_document_has_no_windows(self):
+        """Test: Nothing to score in an empty document"""
+        assert plan_windows("", []) == []
+
+    def test_heatmap_is_token_weighted(self):
+        """Test: Section scores weight windows by token count"""
+        offsets = _offsets(self.content)
+        windows = plan_windows(self.content, offsets, window_tokens=500, min_section_tokens=100)
+        heatmap = section_heatmap(windows, [1.0, 0.0], [1.0, 0.0])
+
+        assert [entry["section"] for entry in heatmap] == [0, 1]
+        assert heatmap[0]["ai_probability"] == 1.0
+        assert heatmap[1]["ai_probability"] == 0.0
+        assert heatmap[1]["tokens"] == 180
+
+    def test_pooled_perplexity(self):
+        """Test: Pooled perplexity is the token-weighted geometric mean"""
+        assert pooled_perplexity([10.0, 10.0], [5, 50]) == pytest.approx(10.0)
+        assert pooled_perplexity([4.0, 16.0], [1, 1]) == pytest.approx(8.0)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,87 @@
+"""
+Tests for the inference micro-batcher
+"""
+import asyncio
+import threading
+
+import pytest
+from app.services.inference_batcher import MicroBatcher
+
+
+class TestMicroBatcher:
+    """Test suite for dynamic micro-batching"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.batches = []
+        self.lock = threading.Lock()
+    
+    def _double(self, items):
+        with self.lock:
+            self.batches.append(list(items))
+        return [item * 2 for item in items]
+    
+    def test_concurrent_submits_share_a_batch(self):
+        """Test: Requests arriving together go out as one batch"""
+        batcher = MicroBatcher(self._double, max_batch_size=16, max_wait_ms=20)
+        
+        async def run():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        
+        results = asyncio.run(run())
+        batcher.shutdown()
+        
+        assert results == [i * 2 for i in range(10)]
+        assert len(self.batches) == 1
+        assert batcher.get_stats()["largest_batch"] == 10
+    
+    def test_respects_max_batch_size(self):
+        """Test: No batch exceeds max_batch_size and results stay in order"""
+        batcher = MicroBatcher(self._double, max_batch_size=4, max_wait_ms=5)
+        
+        results = asyncio.run(batcher.submit_many(list(range(11))))
+        batcher.shutdown()
+        
+        assert results == [i * 2 for i in range(11)]
+        assert max(len(b) for b in self.batches) <= 4
+        assert sum(len(b) for b in self.batches) == 11
+    
+    def test_errors_reach_every_caller(self):
+        """Test: A failing batch raises in each waiting request"""
+        def fail(items):
+            raise RuntimeError("model crashed")
+        
+        batcher = MicroBatcher(fail, max_batch_size=8, max_wait_ms=5)
+        
+        async def run():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+        
+        results = asyncio.run(run())
+        batcher.shutdown()
+        
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert batcher.get_stats()["errors"] == 1
+    
+    def test_result_count_mismatch_is_an_error(self):
+        """Test: process_batch must return one result per item"""
+        batcher = MicroBatcher(lambda items: items[:1], max_batch_size=8, max_wait_ms=5)
+        
+        async def run():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(2)), return_exceptions=True)
+        
+        results = asyncio.run(run())
+        batcher.shutdown()
+        
+        assert all(isinstance(r, RuntimeError) for r in results)
+    
+    def test_reusable_across_event_loops(self):
+        """Test: A fresh asyncio.run still works after the first loop closed"""
+        batcher = MicroBatcher(self._double, max_batch_size=4, max_wait_ms=1)
+        
+        assert asyncio.run(batcher.submit(1)) == 2
+        assert asyncio.run(batcher.submit(2)) == 4
+        batcher.shutdown()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,95 @@
+"""
+Tests for the compiled lexicon scanner
+"""
+import re
+from pathlib import Path
+
+import pytest
+import yaml
+from app.services.lexicon_scanner import LexiconScanner, TokenIndex
+
+RULES = Path(__file__).parent.parent / "app" / "config" / "content_rules.yaml"
+
+SAMPLE = """In today's fast-paced world, we delve into pivotal plumbing tips.
+It is important to note that we can boost uptime, and we optimize routes.
+Honestly, this is very robust: we reduced call-backs by 42% last year.
+Our ever-evolving team will really leverage new tools. In conclusion, just call.
+Justice and adjustment should not match "just"; neither should everyone or thusly.
+Within conclusion the phrase still matches. We've got you covered! Enhance everything.
+"""
+
+
+def _legacy_scan(config, content):
+    """Per-term re.finditer scan, as HumanizerValidator did before the scanner"""
+    content_lower = content.lower()
+    hits = []
+    for category in ['verbs', 'adjectives', 'adverbs', 'phrases']:
+        for word in config['tier1_kill_words'].get(category, []):
+            pattern = rf'\b{re.escape(word)}\b' if len(word.split()) == 1 else re.escape(word)
+            for match in re.finditer(pattern, content_lower, re.IGNORECASE):
+                hits.append((1, word, category, match.start()))
+    for word in config['tier2_proof_required']['words']:
+        for match in re.finditer(rf'\b{re.escape(word)}\b', content_lower, re.IGNORECASE):
+            hits.append((2, word, 'proof_required', match.start()))
+    return hits
+
+
+class TestLexiconScanner:
+    """Test suite for single-pass lexicon matching"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        with open(RULES) as f:
+            self.config = yaml.safe_load(f)
+        self.scanner = LexiconScanner.from_config(self.config)
+    
+    def test_matches_per_term_scan(self):
+        """Test: Same hits, same order as one re.finditer per term"""
+        hits = self.scanner.scan(SAMPLE.lower())
+        
+        assert [(h.tier, h.term, h.category, h.start) for h in hits] == _legacy_scan(self.config, SAMPLE)
+    
+    def test_word_boundaries(self):
+        """Test: Single words need boundaries, phrases do not"""
+        terms = {h.term for h in self.scanner.scan("adjustment everyone thusly within conclusion")}
+        
+        assert terms == {"in conclusion"}
+    
+    def test_overlapping_prefix_terms(self):
+        """Test: Terms sharing a prefix are all reported at the same position"""
+        scanner = LexiconScanner([
+            (1, "in today's world", "phrases", False),
+            (1, "in today's", "phrases", False),
+            (1, "in", "verbs", True),
+        ])
+        
+        hits = scanner.scan("in today's world")
+        
+        assert [(h.term, h.start) for h in hits] == [
+            ("in today's world", 0), ("in today's", 0), ("in", 0)
+        ]
+    
+    def test_proof_window(self):
+        """Test: Proof is only accepted within proximity words of the trigger"""
+        scanner = LexiconScanner([], proof_patterns=[r'\d+%'], proximity_words=3)
+        text = "we boost sales a lot and then much later grew 20%"
+        tokens = TokenIndex(text)
+        
+        assert not scanner.has_proof_near(tokens, text.index("boost"))
+        assert scanner.has_proof_near(tokens, text.index("grew"))
+
+
+class TestTokenIndex:
+    """Test suite for token offset lookups"""
+    
+    def test_index_matches_split(self):
+        """Test: index_at agrees with len(text[:offset].split())"""
+        text = "  one two\tthree\n\nfour-five  six "
+        tokens = TokenIndex(text)
+        
+        for offset in range(len(text) + 1):
+            assert tokens.index_at(offset) == len(text[:offset].split())
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
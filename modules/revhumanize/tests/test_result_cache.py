@@ -0,0 +1,275 @@
+"""
+Tests for the content-hash result cache
+"""
+
+import asyncio
+import threading
+
+import pytest
+from app.services import result_cache
+from app.services.result_cache import ResultCache, WatchedFile, normalize_content
+from app.services.voice_checker import VoiceConsistencyChecker
+
+
+class _DictBackend:
+    """In-memory stand-in for the Redis tier"""
+    
+    def __init__(self):
+        self.data = {}
+    
+    def get(self, key):
+        return self.data.get(key)
+    
+    def set(self, key, value):
+        self.data[key] = value
+
+
+class _ThreadRecordingBackend(_DictBackend):
+    """Records which threads touch the Redis tier"""
+    
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+    
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return super().get(key)
+    
+    def set(self, key, value):
+        self.threads.add(threading.get_ident())
+        super().set(key, value)
+
+
+class _BatchBackend(_ThreadRecordingBackend):
+    """Redis tier stand-in with MGET / pipelined writes"""
+    
+    def __init__(self):
+        super().__init__()
+        self.batch_calls = []
+    
+    def get_many(self, keys):
+        self.threads.add(threading.get_ident())
+        self.batch_calls.append(("get_many", len(keys)))
+        return [self.data.get(key) for key in keys]
+    
+    def set_many(self, items):
+        self.threads.add(threading.get_ident())
+        self.batch_calls.append(("set_many", len(items)))
+        self.data.update(items)
+
+
+class TestResultCache:
+    """Test suite for the two-tier result cache"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.calls = 0
+    
+    def _compute(self):
+        self.calls += 1
+        return {"score": 90.0, "calls": self.calls}
+    
+    def test_hit_skips_compute(self):
+        """Test: Same content and version is computed once"""
+        cache = ResultCache("test", backend=None)
+        
+        first = cache.get_or_compute("v1", "Hello world", (), self._compute)
+        second = cache.get_or_compute("v1", "Hello world", (), self._compute)
+        
+        assert first == second
+        assert self.calls == 1
+        assert cache.get_stats()["hits"] == 1
+    
+    def test_normalized_content_shares_entry(self):
+        """Test: CRLF and LF versions of an article hit the same entry"""
+        cache = ResultCache("test", backend=None)
+        
+        cache.get_or_compute("v1", normalize_content("a\r\nb"), (), self._compute)
+        cache.get_or_compute("v1", normalize_content("a\nb"), (), self._compute)
+        
+        assert self.calls == 1
+    
+    def test_params_and_version_change_key(self):
+        """Test: Different parameters or versions are cached separately"""
+        cache = ResultCache("test", backend=None)
+        
+        cache.get_or_compute("v1", "text", ("medical",), self._compute)
+        cache.get_or_compute("v1", "text", ("legal",), self._compute)
+        cache.get_or_compute("v2", "text", ("legal",), self._compute)
+        
+        assert self.calls == 3
+        assert cache.get_stats()["invalidations"] == 1
+    
+    def test_lru_bound(self):
+        """Test: L1 never holds more than max_entries"""
+        cache = ResultCache("test", max_entries=2, backend=None)
+        
+        for text in ("a", "b", "c"):
+            cache.get_or_compute("v1", text, (), self._compute)
+        cache.get_or_compute("v1", "a", (), self._compute)
+        
+        assert cache.get_stats()["entries"] == 2
+        assert self.calls == 4
+    
+    def test_l2_shared_between_processes(self):
+        """Test: A second cache with the same backend reuses stored results"""
+        backend = _DictBackend()
+        ResultCache("test", backend=backend).get_or_compute("v1", "text", (), self._compute)
+        
+        other = ResultCache("test", backend=backend)
+        result = other.get_or_compute("v1", "text", (), self._compute)
+        
+        assert result["calls"] == 1
+        assert other.get_stats()["l2_hits"] == 1
+    
+    def test_hits_are_copies(self):
+        """Test: Mutating a returned result does not change the cache"""
+        cache = ResultCache("test", backend=None)
+        cache.get_or_compute("v1", "text", (), self._compute)
+        
+        cache.get_or_compute("v1", "text", (), self._compute)["score"] = 0
+        
+        assert cache.get_or_compute("v1", "text", (), self._compute)["score"] == 90.0
+    
+    def test_code_version_change_skips_old_l2_entries(self, monkeypatch):
+        """Test: Results stored by older scoring code are not served from L2"""
+        backend = _DictBackend()
+        ResultCache("test", backend=backend).get_or_compute("v1", "text", (), self._compute)
+        
+        monkeypatch.setattr(result_cache, "CACHE_CODE_VERSION", result_cache.CACHE_CODE_VERSION + 1)
+        result = ResultCache("test", backend=backend).get_or_compute("v1", "text", (), self._compute)
+        
+        assert result["calls"] == 2
+        assert len(backend.data) == 2
+    
+    def test_async_l2_access_runs_off_the_event_loop(self):
+        """Test: aget_or_compute never calls the Redis tier on the loop thread"""
+        backend = _ThreadRecordingBackend()
+        cache = ResultCache("test", backend=backend)
+        
+        async def compute():
+            return self._compute()
+        
+        async def run():
+            first = await cache.aget_or_compute("v1", "text", (), compute)
+            second = await ResultCache("test", backend=backend).aget_or_compute("v1", "text", (), compute)
+            return first, second
+        
+        first, second = asyncio.run(run())
+        
+        assert first == second
+        assert self.calls == 1
+        assert backend.threads and threading.get_ident() not in backend.threads
+    
+    def test_many_keys_use_one_l2_round_trip(self):
+        """Test: aget_many/aset_many batch the L2 misses into one call each, off the loop"""
+        backend = _BatchBackend()
+        backend.data["k0"] = "stored"
+        cache = ResultCache("test", backend=backend)
+        
+        async def run():
+            values = await cache.aget_many("v1", ["k0", "k1", "k2"])
+            await cache.aset_many([("k1", "one"), ("k2", "two")])
+            return values, await cache.aget_many("v1", ["k0", "k1", "k2"])
+        
+        first, second = asyncio.run(run())
+        
+        assert first == ["stored", None, None]
+        assert second == ["stored", "one", "two"]
+        assert backend.batch_calls == [("get_many", 3), ("set_many", 2)]
+        assert threading.get_ident() not in backend.threads
+        assert cache.get_stats()["l2_hits"] == 1
+    
+    def test_stats_are_exact_under_concurrency(self):
+        """Test: Concurrent lookups do not lose counter updates"""
+        cache = ResultCache("test", backend=_DictBackend())
+        barrier = threading.Barrier(8)
+        
+        def lookups(n):
+            barrier.wait()
+            for i in range(500):
+                cache.get("v1", f"{n}:{i}")
+        
+        threads = [threading.Thread(target=lookups, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert cache.get_stats()["misses"] == 8 * 500
+
+
+class TestWatchedFile:
+    """Test suite for rules-file change detection"""
+    
+    def test_version_changes_with_content(self, tmp_path):
+        """Test: Editing the file changes its version"""
+        rules = tmp_path / "rules.yaml"
+        rules.write_text("a: 1\n")
+        watched = WatchedFile(rules, check_interval=0)
+        before = watched.version()
+        
+        rules.write_text("a: 2\n")
+        
+        assert watched.version() != before
+
+
+class TestCachedCheckers:
+    """Test suite for cached validator results"""
+    
+    def test_voice_check_unchanged_by_cache(self):
+        """Test: Cached voice results equal a fresh check"""
+        content = "It's important to note that we delve into pipes."
+        checker = VoiceConsistencyChecker()
+        
+        assert checker.check(content) == checker.check(content) == checker._check(content)
+        assert checker.cache.get_stats()["hits"] == 1
+
+
+class TestCachedDetection:
+    """Test suite for which AI detection results are cached"""
+    
+    def _engine(self, monkeypatch, transformer_batch):
+        pytest.importorskip("torch")
+        ai_detection = pytest.importorskip("app.services.ai_detection")
+        engine_class = ai_detection.AIDetectionEngine
+        
+        def load_transformer(engine):
+            engine.transformer_tokenizer = None
+            engine.transformer_model = object()
+        
+        def load_perplexity(engine):
+            engine.perplexity_tokenizer = None
+            engine.perplexity_model = None
+        
+        monkeypatch.setattr(engine_class, "_load_transformer_model", load_transformer)
+        monkeypatch.setattr(engine_class, "_load_perplexity_model", load_perplexity)
+        monkeypatch.setattr(engine_class, "_transformer_batch", lambda engine, items: transformer_batch(items))
+        return engine_class(max_wait_ms=0)
+    
+    def test_model_error_result_is_recomputed(self, monkeypatch):
+        """Test: A fallback score after a model error is not served from the cache"""
+        calls = []
+        
+        def transformer_batch(items):
+            calls.append(len(items))
+            if len(calls) == 1:
+                raise RuntimeError("CUDA out of memory")
+            return [0.9] * len(items)
+        
+        engine = self._engine(monkeypatch, transformer_batch)
+        content = "Plumbers fix pipes. Some jobs take an hour. Others take a week or more."
+        
+        async def run():
+            return [await engine.detect(content) for _ in range(3)]
+        
+        degraded, recovered, cached = asyncio.run(run())
+        
+        assert degraded.transformer_score == 0.5
+        assert recovered.transformer_score == cached.transformer_score == 0.9
+        assert len(calls) == 2
+        assert engine.cache.get_stats()["hits"] == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
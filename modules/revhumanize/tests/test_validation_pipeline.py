@@ -0,0 +1,73 @@
+"""
+Tests for shared document parsing and the validator fan-out
+"""
+import asyncio
+import re
+
+import pytest
+from app.services.parsed_document import ParsedDocument
+from app.services.validation_pipeline import run_validators
+
+
+class TestParsedDocument:
+    """Test suite for the shared parsed document"""
+    
+    def test_sentences_match_regex_split(self):
+        """Test: Sentences equal the stripped, non-blank pieces of re.split"""
+        content = "  First one. Second!!  Third?\n\nFourth without end  "
+        doc = ParsedDocument.parse(content)
+        
+        expected = [s.strip() for s in re.split(r'[.!?]+', content) if s.strip()]
+        assert doc.sentences == expected
+        assert [content[a:b] for a, b in doc.sentence_spans] == expected
+    
+    def test_plain_sentences_strip_html(self):
+        """Test: HTML tags are removed before splitting"""
+        doc = ParsedDocument("<p>Call us today.</p><p>We fix leaks fast!</p>")
+        
+        assert doc.plain_sentences == ["Call us today", "We fix leaks fast"]
+    
+    def test_views_are_cached(self):
+        """Test: Each view is computed once"""
+        doc = ParsedDocument.parse("One two. Three four.")
+        
+        assert doc.words is doc.words
+        assert doc.tokens.index_at(len("one two.")) == 2
+
+
+class TestRunValidators:
+    """Test suite for concurrent validator execution"""
+    
+    def test_results_and_timings(self):
+        """Test: Every validator gets the same document and is timed"""
+        seen = []
+        
+        def count_words(doc):
+            seen.append(doc)
+            return len(doc.words)
+        
+        def count_sentences(doc):
+            seen.append(doc)
+            return len(doc.sentences)
+        
+        results, timings = asyncio.run(run_validators(
+            "One two three. Four five.",
+            {"words": count_words, "sentences": count_sentences}
+        ))
+        
+        assert results == {"words": 5, "sentences": 2}
+        assert seen[0] is seen[1]
+        assert set(timings) == {"parse", "words", "sentences", "total"}
+        assert all(ms >= 0 for ms in timings.values())
+    
+    def test_validator_error_is_raised(self):
+        """Test: A failing validator fails the run"""
+        def broken(doc):
+            raise ValueError("bad rules")
+        
+        with pytest.raises(ValueError):
+            asyncio.run(run_validators("text", {"ok": len, "broken": broken}))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
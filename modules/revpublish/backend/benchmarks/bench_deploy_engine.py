@@ -0,0 +1,128 @@
+"""
+RevPublish Deploy Engine Benchmark - rows/sec vs. concurrency
+
+Starts a stub WordPress REST server on localhost that sleeps for a fixed
+latency per request (simulating Google Docs fetch + WP page update), then
+pushes a synthetic bulk import through DeployEngine at increasing
+concurrency levels.
+
+Usage (from revpublish/backend):
+    python benchmarks/bench_deploy_engine.py --rows 300 --sites 10 --latency-ms 80
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.deploy_engine import DeployEngine, RowJob  # noqa: E402
+
+
+def start_stub_wordpress(latency_s: float) -> ThreadingHTTPServer:
+    """Start a threaded stub WordPress server that answers every call after latency_s"""
+
+    class StubWordPressHandler(BaseHTTPRequestHandler):
+        page_ids = iter(range(1000, 10**9))
+
+        def _reply(self, payload):
+            time.sleep(latency_s)
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._reply({"content_html": "<h1>{{BUSINESS_NAME}}</h1><p>Serving {{CITY}}</p>"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            self._reply({"id": next(self.page_ids), "status": "draft"})
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWordPressHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_jobs(rows: int, sites: int):
+    jobs = []
+    for i in range(rows):
+        site = f"site{i % sites}.example.com"
+        jobs.append(RowJob(
+            row_number=i + 1,
+            site_key=site,
+            payload={"row": {"business_name": f"Biz {i}", "city": "Dallas"}, "site": site}
+        ))
+    return jobs
+
+
+def make_stages(base_url: str):
+    def fetch(job):
+        with urllib.request.urlopen(f"{base_url}/docs/{job.row_number}", timeout=30) as resp:
+            job.payload["template_html"] = json.loads(resp.read())["content_html"]
+
+    def merge(job):
+        html = job.payload["template_html"]
+        for key, value in job.payload["row"].items():
+            html = html.replace("{{" + key.upper() + "}}", value)
+        job.payload["html_content"] = html
+
+    def deploy(job):
+        data = json.dumps({"title": job.payload["row"]["business_name"], "content": job.payload["html_content"]})
+        req = urllib.request.Request(
+            f"{base_url}/wp-json/wp/v2/pages",
+            data=data.encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            job.result = {"row_number": job.row_number, "wp_post_id": json.loads(resp.read())["id"]}
+
+    return {"fetch": fetch, "merge": merge, "deploy": deploy}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=120)
+    parser.add_argument("--sites", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--per-site", type=int, default=2)
+    parser.add_argument("--levels", default="1,2,4,8,16,32")
+    args = parser.parse_args()
+
+    server = start_stub_wordpress(args.latency_ms / 1000.0)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    stages = make_stages(base_url)
+
+    print(f"rows={args.rows} sites={args.sites} latency={args.latency_ms}ms per_site={args.per_site}")
+    print(f"{'concurrency':>12} {'seconds':>9} {'rows/sec':>10} {'speedup':>8}")
+    baseline = None
+    try:
+        for level in [int(x) for x in args.levels.split(",") if x.strip()]:
+            engine = DeployEngine(max_concurrency=level, per_site_concurrency=args.per_site)
+            started = time.perf_counter()
+            done = asyncio.run(engine.run(build_jobs(args.rows, args.sites), **stages))
+            elapsed = time.perf_counter() - started
+            assert all(j.result and j.result.get("wp_post_id") for j in done)
+            rate = args.rows / elapsed
+            baseline = baseline or rate
+            print(f"{level:>12} {elapsed:>9.2f} {rate:>10.1f} {rate / baseline:>7.1f}x")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
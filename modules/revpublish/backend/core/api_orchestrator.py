@@ -38,6 +38,8 @@ import os
 import sys
 import hashlib
 import json
+import threading
+import time
 import psycopg2
 from typing import Dict, Optional, Literal, Any
 from datetime import datetime
@@ -46,6 +48,8 @@ import logging
 # Import our optimized clients
 sys.path.insert(0, '/opt/revpublish/backend')
 from core.cache_manager import get_cache
+from core.single_flight import SingleFlight
+from core.cost_audit import CostAuditWriter
 
 # These will be in /opt/revpublish/backend/services/
 try:
@@ -111,31 +115,38 @@ class APIOrchestrator:
     Central orchestrator implementing ALL cost-saving strategies
     """
     
-    def __init__(self, db_url: Optional[str] = None, redis_db: int = 0):
+    def __init__(self, db_url: Optional[str] = None, redis_db: int = 0, stale_ttl: int = 300):
         """
         Initialize orchestrator with cache and database
         
         Args:
             db_url: PostgreSQL connection URL (from env if not provided)
             redis_db: Redis database number for cache
+            stale_ttl: Default seconds an expired result may be served while refreshing
         """
         # Initialize cache manager
         self.cache = get_cache(redis_db=redis_db, default_ttl=3600)
         
-        # Initialize database connection
+        # Cost rows go through the audit writer; no connection is held here
         self.db_url = db_url or os.getenv("DATABASE_URL")
-        self.db_conn = None
         
-        if self.db_url:
-            try:
-                self.db_conn = psycopg2.connect(self.db_url)
-                logger.info("✓ PostgreSQL connected for cost audit")
-            except Exception as e:
-                logger.warning(f"⚠️  PostgreSQL connection failed: {e}")
+        # Cost rows are buffered and written off the request path
+        self.audit_writer = CostAuditWriter(
+            self.db_url,
+            batch_size=int(os.getenv("REVPUBLISH_AUDIT_BATCH_SIZE", "200")),
+            flush_interval=float(os.getenv("REVPUBLISH_AUDIT_FLUSH_SECONDS", "2.0"))
+        )
         
         # Initialize client cache (lazy loading)
         self.clients = {}
         
+        # In-flight deduplication and stale-while-revalidate bookkeeping
+        self.stale_ttl = stale_ttl
+        self._inflight = SingleFlight()
+        self._flight_stats = {"stale_served": 0, "revalidations": 0, "revalidation_errors": 0}
+        self._revalidating = set()
+        self._flight_lock = threading.Lock()
+        
         logger.info("API Orchestrator initialized (clients will load on demand)")
     
 
@@ -234,7 +245,8 @@ class APIOrchestrator:
         industry_tag: Optional[str] = None,
         priority: Literal["NORMAL", "HIGH", "LIVE"] = "NORMAL",
         use_cache: bool = True,
-        cache_ttl: int = 3600
+        cache_ttl: int = 3600,
+        stale_ttl: Optional[int] = None
     ) -> Dict:
         """
         Universal API caller with automatic optimization
@@ -246,6 +258,8 @@ class APIOrchestrator:
         4. ✓ Log costs to PostgreSQL
         5. ✓ Cache result
         6. ✓ Track savings
+        7. ✓ Coalesce concurrent identical calls (single flight)
+        8. ✓ Serve stale results while revalidating in the background
         
         Args:
             service: Which API service to call
@@ -254,29 +268,84 @@ class APIOrchestrator:
             industry_tag: Industry for cost tracking
             priority: NORMAL (cheap) or HIGH (expensive)
             use_cache: Whether to check cache first
-            cache_ttl: How long to cache result (seconds)
+            cache_ttl: How long a result stays fresh (seconds)
+            stale_ttl: Extra seconds an expired result may be served while it
+                       is refreshed in the background (None = orchestrator default)
         
         Returns:
             Dict with result, cost, and cache info
         """
         # Generate cache key
         cache_key = self._generate_cache_key(service, operation, params)
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
         
         # STRATEGY 1: Check cache first
         if use_cache:
             cached_result = self.cache.get(cache_key, namespace="api_results")
             
             if cached_result is not None:
-                logger.info(f"⚡ Cache HIT: {service}/{operation} (saved API call!)")
+                fresh_until = cached_result.get('fresh_until')
+                is_stale = bool(fresh_until) and time.time() >= fresh_until
                 
+                if is_stale:
+                    # STRATEGY 8: serve stale, refresh once in the background
+                    logger.info(f"⏳ Cache STALE: {service}/{operation} (serving stale, revalidating)")
+                    self._revalidate_in_background(
+                        cache_key, service, operation, params, industry_tag, priority, cache_ttl, stale_ttl
+                    )
+                    self._count("stale_served")
+                else:
+                    logger.info(f"⚡ Cache HIT: {service}/{operation} (saved API call!)")
+                
+                # fresh_until is cache bookkeeping, not part of the response
                 return {
-                    **cached_result,
+                    **{k: v for k, v in cached_result.items() if k != 'fresh_until'},
                     "cache_hit": True,
+                    "stale": is_stale,
                     "cost": 0.0,  # No API cost!
                     "savings": cached_result.get('original_cost', 0.0)
                 }
         
-        # STRATEGY 2: Cache MISS - call API
+        # STRATEGY 2: Cache MISS - call API once per key, however many callers are waiting
+        result, coalesced = self._inflight.do(
+            cache_key,
+            lambda: self._fetch_and_store(
+                cache_key, service, operation, params, industry_tag, priority,
+                use_cache, cache_ttl, stale_ttl
+            )
+        )
+        
+        if coalesced:
+            logger.info(f"🔗 Coalesced: {service}/{operation} (shared in-flight API call)")
+            return {
+                **result,
+                "cache_hit": False,
+                "coalesced": True,
+                "cost": 0.0,  # Paid once by the leading call
+                "savings": result.get('cost', 0.0)
+            }
+        
+        return {
+            **result,
+            "cache_hit": False,
+            "coalesced": False
+        }
+    
+    def _fetch_and_store(
+        self,
+        cache_key: str,
+        service: str,
+        operation: str,
+        params: Dict,
+        industry_tag: Optional[str],
+        priority: str,
+        use_cache: bool,
+        cache_ttl: int,
+        stale_ttl: int
+    ) -> Dict:
+        """
+        Call the provider, log its cost and cache the result (single-flight leader only)
+        """
         logger.info(f"💰 Cache MISS: {service}/{operation} (calling API)")
         
         start_time = datetime.now()
@@ -286,41 +355,85 @@ class APIOrchestrator:
         
         elapsed_ms = (datetime.now() - start_time).total_seconds() * 1000
         
-        # STRATEGY 3: Log cost to PostgreSQL
-        if self.db_conn:
-            self._log_to_database(
-                service=service,
-                operation=operation,
-                industry_tag=industry_tag,
-                cost=result.get('cost', 0.0),
-                usage=result.get('usage', {}),
-                model=result.get('model'),
-                priority=priority,
-                escalated=result.get('escalated', False),
-                response_time_ms=int(elapsed_ms)
-            )
-        
-        # STRATEGY 4: Cache result
+        # STRATEGY 3: Log cost to PostgreSQL (buffered, no DB round-trip here)
+        self._log_to_database(
+            service=service,
+            operation=operation,
+            industry_tag=industry_tag,
+            cost=result.get('cost', 0.0),
+            usage=result.get('usage', {}),
+            model=result.get('model'),
+            priority=priority,
+            escalated=result.get('escalated', False),
+            response_time_ms=int(elapsed_ms)
+        )
+        
+        # STRATEGY 4: Cache result (kept stale_ttl past freshness for STRATEGY 8)
         if use_cache:
             cache_data = {
                 **result,
                 "original_cost": result.get('cost', 0.0),
-                "cached_at": datetime.now().isoformat()
+                "cached_at": datetime.now().isoformat(),
+                "fresh_until": time.time() + cache_ttl
             }
             
             self.cache.set(
                 cache_key,
                 cache_data,
-                ttl=cache_ttl,
+                ttl=cache_ttl + max(0, stale_ttl),
                 namespace="api_results"
             )
             
-            logger.info(f"✓ Result cached for {cache_ttl}s")
+            logger.info(f"✓ Result cached for {cache_ttl}s (+{stale_ttl}s stale)")
         
-        return {
-            **result,
-            "cache_hit": False
-        }
+        return result
+    
+    def _revalidate_in_background(
+        self,
+        cache_key: str,
+        service: str,
+        operation: str,
+        params: Dict,
+        industry_tag: Optional[str],
+        priority: str,
+        cache_ttl: int,
+        stale_ttl: int
+    ):
+        """
+        Refresh a stale cache entry on a daemon thread (at most one refresh per key)
+        """
+        # Check and register atomically so concurrent stale hits start one thread
+        with self._flight_lock:
+            if cache_key in self._revalidating or self._inflight.in_flight(cache_key):
+                return
+            self._revalidating.add(cache_key)
+        
+        def refresh():
+            try:
+                self._inflight.do(
+                    cache_key,
+                    lambda: self._fetch_and_store(
+                        cache_key, service, operation, params, industry_tag, priority,
+                        True, cache_ttl, stale_ttl
+                    )
+                )
+                self._count("revalidations")
+            except Exception as e:
+                self._count("revalidation_errors")
+                logger.error(f"Background revalidation failed for {service}/{operation}: {e}")
+            finally:
+                with self._flight_lock:
+                    self._revalidating.discard(cache_key)
+        
+        threading.Thread(target=refresh, name=f"revalidate-{cache_key}", daemon=True).start()
+    
+    def _count(self, counter: str):
+        with self._flight_lock:
+            self._flight_stats[counter] += 1
+    
+    def _flight_snapshot(self) -> Dict[str, int]:
+        with self._flight_lock:
+            return dict(self._flight_stats, revalidating=len(self._revalidating))
     
     def _route_to_client(
         self,
@@ -450,7 +563,7 @@ class APIOrchestrator:
         response_time_ms: int
     ):
         """
-        Log API call to PostgreSQL for cost tracking
+        Queue API call cost for PostgreSQL (written in batches by CostAuditWriter)
         
         Args:
             service: Service name
@@ -463,51 +576,22 @@ class APIOrchestrator:
             escalated: Whether this was an escalation
             response_time_ms: Response time in milliseconds
         """
-        if not self.db_conn:
+        if not self.db_url:
             return
         
-        try:
-            cursor = self.db_conn.cursor()
-            
-            # Extract token info if available
-            input_tokens = usage.get('input_tokens') or usage.get('prompt_tokens', 0)
-            output_tokens = usage.get('output_tokens') or usage.get('completion_tokens', 0)
-            
-            cursor.execute("""
-                INSERT INTO api_audit_logs (
-                    service_name,
-                    endpoint,
-                    industry_tag,
-                    credits_spent,
-                    input_tokens,
-                    output_tokens,
-                    model_name,
-                    priority_level,
-                    escalated,
-                    response_time_ms,
-                    status_code
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                service,
-                operation,
-                industry_tag,
-                cost,
-                input_tokens,
-                output_tokens,
-                model,
-                1 if priority == "NORMAL" else 2,  # Map to priority code
-                escalated,
-                response_time_ms,
-                'SUCCESS'
-            ))
-            
-            self.db_conn.commit()
-            cursor.close()
-            
-            logger.info(f"✓ Cost logged: {service}/{operation} = ${cost:.6f}")
-            
-        except Exception as e:
-            logger.error(f"Failed to log to database: {e}")
+        self.audit_writer.record({
+            "service": service,
+            "operation": operation,
+            "industry_tag": industry_tag,
+            "cost": cost,
+            "usage": usage,
+            "model": model,
+            "priority": priority,
+            "escalated": escalated,
+            "response_time_ms": response_time_ms
+        })
+        
+        logger.debug(f"✓ Cost queued: {service}/{operation} = ${cost:.6f}")
     
     def get_stats(self) -> Dict:
         """
@@ -518,11 +602,13 @@ class APIOrchestrator:
         """
         cache_stats = self.cache.get_stats()
         
-        # Get today's cost from database
+        # Get today's cost from database (short-lived connection, stats are rare)
         today_cost = 0.0
-        if self.db_conn:
+        if self.db_url:
+            conn = None
             try:
-                cursor = self.db_conn.cursor()
+                conn = psycopg2.connect(self.db_url)
+                cursor = conn.cursor()
                 cursor.execute("""
                     SELECT COALESCE(SUM(credits_spent), 0)
                     FROM api_audit_logs
@@ -532,19 +618,25 @@ class APIOrchestrator:
                 cursor.close()
             except Exception as e:
                 logger.error(f"Failed to get cost stats: {e}")
+            finally:
+                if conn is not None:
+                    conn.close()
         
         return {
             "cache": cache_stats,
+            "requests": {
+                **self._inflight.get_stats(),
+                **self._flight_snapshot()
+            },
             "cost": {
                 "today_usd": today_cost
-            }
+            },
+            "audit_writer": self.audit_writer.get_stats()
         }
     
     def close(self):
-        """Close database connection"""
-        if self.db_conn:
-            self.db_conn.close()
-            logger.info("Database connection closed")
+        """Flush queued cost rows and stop the audit writer"""
+        self.audit_writer.close()
 
 
 # ============================================================================
@@ -2,71 +2,360 @@
 RevPublish Cache Manager - Production-Ready Caching Helper
 Supports both Redis and in-memory fallback with TTL, namespacing, and serialization
 
+Two tiers:
+    - Local: bounded LRU with per-entry TTL (always on; the whole cache when
+      Redis is unavailable, a short-lived front tier when it is). Values read
+      from Redis are kept for min(local_ttl, remaining Redis TTL).
+    - Redis: MGET for bulk reads, pipelined SETEX for bulk writes, SCAN + UNLINK
+      for namespace clears (never KEYS)
+
+Serialization is JSON by default; orjson or msgpack can be selected with
+serializer="orjson"/"msgpack" (or REVPUBLISH_CACHE_SERIALIZER). A value that
+cannot be serialized is not cached (the error is logged and any previous
+value under the key is dropped).
+
+Consistency: delete() and clear() drop keys from Redis and from this
+process's local tier only. Other workers are not notified, so they may
+serve their local copy for up to local_ttl seconds (default 30) after a
+delete or invalidation. Callers that need immediate cross-worker
+invalidation should pass a small local_ttl (0 turns the local tier off
+while Redis is up).
+
 Usage:
     from core.cache_manager import get_cache
-    
+
     cache = get_cache()
-    
+
     # Basic operations
     cache.set("site_config", {"domain": "example.com"}, ttl=3600)
     config = cache.get("site_config")
     cache.delete("site_config")
-    
+
     # With namespacing
     cache.set("dallasplumber.com", content, namespace="generated_content", ttl=86400)
     content = cache.get("dallasplumber.com", namespace="generated_content")
-    
+
     # Bulk operations
     cache.set_many({"site1": data1, "site2": data2}, ttl=3600)
     results = cache.get_many(["site1", "site2"])
+
+Async usage (redis.asyncio):
+    from core.cache_manager import get_async_cache
+
+    cache = await get_async_cache()
+    await cache.set_many({"site1": data1, "site2": data2}, ttl=3600)
+    results = await cache.get_many(["site1", "site2"])
 """
 
 import json
 import logging
+import os
+import threading
 import time
-from typing import Any, Dict, List, Optional, Union
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Keys per SCAN page / UNLINK batch when clearing a namespace
+SCAN_BATCH_SIZE = 500
+
+
+class CacheSerializer:
+    """Pluggable value serializer: json, orjson or msgpack"""
+
+    def __init__(self, name: Optional[str] = None):
+        """
+        Args:
+            name: "json", "orjson" or "msgpack" (None = REVPUBLISH_CACHE_SERIALIZER, else json)
+        """
+        name = (name or os.getenv("REVPUBLISH_CACHE_SERIALIZER") or "json").lower()
+        self.name = "json"
+        self._dumps = lambda value: json.dumps(value).encode("utf-8")
+        self._loads = json.loads
+
+        if name == "orjson":
+            try:
+                import orjson
+                self.name = "orjson"
+                # Non-str dict keys are stringified, as json.dumps does
+                self._dumps = lambda value: orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+                self._loads = orjson.loads
+            except ImportError:
+                logger.warning("⚠️  orjson not installed, using json serializer")
+        elif name == "msgpack":
+            try:
+                import msgpack
+                self.name = "msgpack"
+                self._dumps = lambda value: msgpack.packb(value, use_bin_type=True)
+                self._loads = lambda raw: msgpack.unpackb(raw, raw=False)
+            except ImportError:
+                logger.warning("⚠️  msgpack not installed, using json serializer")
+
+    def dumps(self, value: Any) -> Optional[bytes]:
+        """Serialized value, or None (logged) if it cannot be serialized"""
+        try:
+            return self._dumps(value)
+        except (TypeError, ValueError, OverflowError) as e:
+            logger.error(f"Serialization failed for {type(value)}, not caching it: {e}")
+            return None
+
+    def loads(self, raw: Union[bytes, str]) -> Any:
+        try:
+            return self._loads(raw)
+        except Exception:
+            return raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else raw
+
+
+class LocalLRUCache:
+    """
+    Thread-safe bounded LRU with per-entry expiry
 
-class CacheManager:
+    Expired entries are dropped when touched, and the least recently used
+    entries are evicted once max_entries is reached.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max(1, max_entries)
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            value, expiry = entry
+            if time.time() >= expiry:
+                del self._data[key]
+                self.expirations += 1
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self, prefix: Optional[str] = None) -> int:
+        with self._lock:
+            if prefix is None:
+                count = len(self._data)
+                self._data.clear()
+                return count
+            doomed = [k for k in self._data if k.startswith(prefix)]
+            for key in doomed:
+                del self._data[key]
+            return len(doomed)
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            doomed = [k for k, (_, expiry) in self._data.items() if now >= expiry]
+            for key in doomed:
+                del self._data[key]
+            self.expirations += len(doomed)
+            return len(doomed)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheStats:
+    """Hit/miss counters and per-operation latency for get_stats()"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {"local_hits": 0, "redis_hits": 0, "misses": 0, "sets": 0, "deletes": 0, "errors": 0}
+        self.latency: Dict[str, Dict[str, float]] = {}
+
+    def incr(self, counter: str, amount: int = 1):
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def observe(self, operation: str, started: float):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            op = self.latency.setdefault(operation, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            op["count"] += 1
+            op["total_ms"] += elapsed_ms
+            op["max_ms"] = max(op["max_ms"], elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.counters["local_hits"] + self.counters["redis_hits"]
+            lookups = hits + self.counters["misses"]
+            return {
+                **self.counters,
+                "hits": hits,
+                "hit_rate": round((hits / lookups) * 100, 2) if lookups else 0.0,
+                "latency_ms": {
+                    op: {
+                        "count": int(v["count"]),
+                        "avg": round(v["total_ms"] / v["count"], 3) if v["count"] else 0.0,
+                        "max": round(v["max_ms"], 3),
+                    }
+                    for op, v in self.latency.items()
+                },
+            }
+
+
+class _CacheBase:
+    """Key building, serialization, local tier and stats shared by sync/async managers"""
+
+    def __init__(
+        self,
+        redis_host: str,
+        redis_port: int,
+        redis_db: int,
+        default_ttl: int,
+        namespace_separator: str,
+        local_max_entries: int,
+        local_ttl: int,
+        serializer: Optional[str]
+    ):
+        self.redis_host = redis_host
+        self.redis_port = redis_port
+        self.redis_db = redis_db
+        self.default_ttl = default_ttl
+        self.namespace_separator = namespace_separator
+        self.local_ttl = local_ttl
+
+        self.serializer = CacheSerializer(serializer)
+        self.local = LocalLRUCache(local_max_entries)
+        self.metrics = CacheStats()
+
+        self.redis_client = None
+        self.use_redis = False
+
+    def _make_key(self, key: str, namespace: Optional[str] = None) -> str:
+        """Create namespaced key"""
+        if namespace:
+            return f"{namespace}{self.namespace_separator}{key}"
+        return key
+
+    def _serialize(self, value: Any) -> Optional[bytes]:
+        """Serialize value for Redis (None if it cannot be serialized)"""
+        return self.serializer.dumps(value)
+
+    def _serialize_many(self, mapping: Dict[str, Any], namespace: Optional[str]) -> Tuple[Dict[str, bytes], List[str]]:
+        """(full_key -> bytes for serializable values, keys whose values were not)"""
+        serialized, failed = {}, []
+        for key, value in mapping.items():
+            raw = self._serialize(value)
+            if raw is None:
+                failed.append(key)
+            else:
+                serialized[self._make_key(key, namespace)] = raw
+        if failed:
+            self.metrics.incr("serialize_errors", len(failed))
+        return serialized, failed
+
+    def _deserialize(self, value: Union[bytes, str]) -> Any:
+        """Deserialize a Redis value"""
+        return self.serializer.loads(value)
+
+    def _local_ttl(self, ttl: int) -> float:
+        # With Redis as the source of truth, keep the front tier short-lived so
+        # writes from other workers become visible quickly.
+        return min(ttl, self.local_ttl) if self.use_redis else ttl
+
+    def _front_ttl(self, pttl_ms: Optional[int]) -> float:
+        """Local TTL for a value read from Redis: never past its Redis expiry"""
+        if pttl_ms is None or pttl_ms == -1:  # no expiry set
+            return self.local_ttl
+        if pttl_ms < 0:  # expired between the read and PTTL
+            return 0
+        return min(self.local_ttl, pttl_ms / 1000)
+
+    def _fill_local(self, full_key: str, raw: Any, pttl_ms: Optional[int]):
+        ttl = self._front_ttl(pttl_ms)
+        if ttl > 0:
+            self.local.set(full_key, raw, ttl)
+
+    def _local_get(self, full_key: str) -> Tuple[bool, Any]:
+        found, value = self.local.get(full_key)
+        if found:
+            self.metrics.incr("local_hits")
+        return found, value
+
+    def _base_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis" if self.use_redis else "memory",
+            "redis_available": self.use_redis,
+            "serializer": self.serializer.name,
+            "local_tier": {
+                "entries": len(self.local),
+                "max_entries": self.local.max_entries,
+                "evictions": self.local.evictions,
+                "expirations": self.local.expirations,
+            },
+            "client": self.metrics.snapshot(),
+        }
+
+    def _calculate_hit_rate(self, hits: int, misses: int) -> float:
+        """Calculate cache hit rate percentage"""
+        total = hits + misses
+        if total == 0:
+            return 0.0
+        return round((hits / total) * 100, 2)
+
+
+class CacheManager(_CacheBase):
     """
     Unified cache manager with Redis primary and in-memory fallback
     """
-    
+
     def __init__(
         self,
         redis_host: str = "localhost",
         redis_port: int = 6379,
         redis_db: int = 0,
         default_ttl: int = 3600,
-        namespace_separator: str = ":"
+        namespace_separator: str = ":",
+        local_max_entries: int = 10000,
+        local_ttl: int = 30,
+        serializer: Optional[str] = None,
+        redis_client: Any = None
     ):
         """
         Initialize cache manager
-        
+
         Args:
             redis_host: Redis server host
             redis_port: Redis server port
             redis_db: Redis database number (0-4 available)
             default_ttl: Default time-to-live in seconds (1 hour)
             namespace_separator: Character to separate namespace from key
+            local_max_entries: Max entries held in the in-process LRU tier
+            local_ttl: Max seconds an entry lives in the LRU tier while Redis is up
+            serializer: "json", "orjson" or "msgpack" (None = REVPUBLISH_CACHE_SERIALIZER, else json)
+            redis_client: Pre-built redis.Redis client (skips connecting)
         """
-        self.redis_host = redis_host
-        self.redis_port = redis_port
-        self.redis_db = redis_db
-        self.default_ttl = default_ttl
-        self.namespace_separator = namespace_separator
-        
+        super().__init__(
+            redis_host, redis_port, redis_db, default_ttl, namespace_separator,
+            local_max_entries, local_ttl, serializer
+        )
+
         # Try to connect to Redis
-        self.redis_client = None
-        self.use_redis = False
-        self._connect_redis()
-        
-        # In-memory fallback
-        self._memory_cache: Dict[str, tuple] = {}  # {key: (value, expiry_timestamp)}
-        
+        if redis_client is not None:
+            self.redis_client = redis_client
+            self.use_redis = True
+        else:
+            self._connect_redis()
+
     def _connect_redis(self):
         """Attempt to connect to Redis"""
         try:
@@ -75,7 +364,7 @@ class CacheManager:
                 host=self.redis_host,
                 port=self.redis_port,
                 db=self.redis_db,
-                decode_responses=True,
+                decode_responses=False,
                 socket_connect_timeout=2
             )
             # Test connection
@@ -85,28 +374,7 @@ class CacheManager:
         except Exception as e:
             logger.warning(f"⚠️  Redis unavailable, using in-memory cache: {e}")
             self.use_redis = False
-    
-    def _make_key(self, key: str, namespace: Optional[str] = None) -> str:
-        """Create namespaced key"""
-        if namespace:
-            return f"{namespace}{self.namespace_separator}{key}"
-        return key
-    
-    def _serialize(self, value: Any) -> str:
-        """Serialize value to JSON string"""
-        try:
-            return json.dumps(value)
-        except (TypeError, ValueError) as e:
-            logger.error(f"Serialization failed for {type(value)}: {e}")
-            return json.dumps(str(value))
-    
-    def _deserialize(self, value: str) -> Any:
-        """Deserialize JSON string to value"""
-        try:
-            return json.loads(value)
-        except (TypeError, ValueError):
-            return value
-    
+
     def set(
         self,
         key: str,
@@ -116,177 +384,183 @@ class CacheManager:
     ) -> bool:
         """
         Set a cache value
-        
+
         Args:
             key: Cache key
-            value: Value to cache (will be JSON serialized)
+            value: Value to cache (will be serialized)
             ttl: Time-to-live in seconds (None = default_ttl)
             namespace: Optional namespace for key
-            
+
         Returns:
             True if successful, False otherwise
         """
         full_key = self._make_key(key, namespace)
         ttl = ttl if ttl is not None else self.default_ttl
+        started = time.perf_counter()
+        # Local tier stores serialized bytes too, so callers can't mutate cached state.
         serialized_value = self._serialize(value)
-        
+        if serialized_value is None:
+            self.metrics.incr("serialize_errors")
+            self.delete(key, namespace)
+            return False
+
         try:
             if self.use_redis:
                 self.redis_client.setex(full_key, ttl, serialized_value)
-            else:
-                expiry = time.time() + ttl
-                self._memory_cache[full_key] = (serialized_value, expiry)
-            
+            self.local.set(full_key, serialized_value, self._local_ttl(ttl))
+            self.metrics.incr("sets")
+
             logger.debug(f"Cache SET: {full_key} (TTL: {ttl}s)")
             return True
-            
+
         except Exception as e:
+            self.metrics.incr("errors")
             logger.error(f"Cache SET failed for {full_key}: {e}")
             return False
-    
+        finally:
+            self.metrics.observe("set", started)
+
     def get(self, key: str, namespace: Optional[str] = None, default: Any = None) -> Any:
         """
         Get a cache value
-        
+
         Args:
             key: Cache key
             namespace: Optional namespace for key
             default: Default value if key not found
-            
+
         Returns:
             Cached value or default
         """
         full_key = self._make_key(key, namespace)
-        
+        started = time.perf_counter()
+
         try:
+            found, raw = self._local_get(full_key)
+            if found:
+                logger.debug(f"Cache HIT (local): {full_key}")
+                return self._deserialize(raw)
+
             if self.use_redis:
-                value = self.redis_client.get(full_key)
-                if value is None:
-                    logger.debug(f"Cache MISS: {full_key}")
-                    return default
-                logger.debug(f"Cache HIT: {full_key}")
-                return self._deserialize(value)
-            else:
-                if full_key in self._memory_cache:
-                    value, expiry = self._memory_cache[full_key]
-                    # Check expiry
-                    if time.time() < expiry:
-                        logger.debug(f"Cache HIT (memory): {full_key}")
-                        return self._deserialize(value)
-                    else:
-                        # Expired
-                        del self._memory_cache[full_key]
-                        logger.debug(f"Cache EXPIRED: {full_key}")
-                        return default
-                logger.debug(f"Cache MISS (memory): {full_key}")
-                return default
-                
+                # GET + PTTL in one round trip
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.get(full_key)
+                pipe.pttl(full_key)
+                value, pttl = pipe.execute()
+                if value is not None:
+                    self.metrics.incr("redis_hits")
+                    self._fill_local(full_key, value, pttl)
+                    logger.debug(f"Cache HIT: {full_key}")
+                    return self._deserialize(value)
+
+            self.metrics.incr("misses")
+            logger.debug(f"Cache MISS: {full_key}")
+            return default
+
         except Exception as e:
+            self.metrics.incr("errors")
             logger.error(f"Cache GET failed for {full_key}: {e}")
             return default
-    
+        finally:
+            self.metrics.observe("get", started)
+
     def delete(self, key: str, namespace: Optional[str] = None) -> bool:
         """
         Delete a cache value
-        
+
         Args:
             key: Cache key
             namespace: Optional namespace for key
-            
+
         Returns:
             True if deleted, False otherwise
         """
         full_key = self._make_key(key, namespace)
-        
+
         try:
+            deleted_local = self.local.delete(full_key)
+            self.metrics.incr("deletes")
             if self.use_redis:
                 deleted = self.redis_client.delete(full_key)
                 logger.debug(f"Cache DELETE: {full_key} (deleted: {deleted})")
                 return deleted > 0
-            else:
-                if full_key in self._memory_cache:
-                    del self._memory_cache[full_key]
-                    logger.debug(f"Cache DELETE (memory): {full_key}")
-                    return True
-                return False
-                
+            logger.debug(f"Cache DELETE (memory): {full_key}")
+            return deleted_local
+
         except Exception as e:
+            self.metrics.incr("errors")
             logger.error(f"Cache DELETE failed for {full_key}: {e}")
             return False
-    
+
     def exists(self, key: str, namespace: Optional[str] = None) -> bool:
         """
         Check if key exists in cache
-        
+
         Args:
             key: Cache key
             namespace: Optional namespace for key
-            
+
         Returns:
             True if exists, False otherwise
         """
         full_key = self._make_key(key, namespace)
-        
+
         try:
+            found, _ = self.local.get(full_key)
+            if found:
+                return True
             if self.use_redis:
                 return self.redis_client.exists(full_key) > 0
-            else:
-                if full_key in self._memory_cache:
-                    _, expiry = self._memory_cache[full_key]
-                    if time.time() < expiry:
-                        return True
-                    else:
-                        del self._memory_cache[full_key]
-                return False
-                
+            return False
+
         except Exception as e:
             logger.error(f"Cache EXISTS check failed for {full_key}: {e}")
             return False
-    
+
     def clear(self, namespace: Optional[str] = None) -> int:
         """
         Clear cache (all keys or namespace)
-        
+
         Args:
             namespace: If provided, only clear keys in this namespace
-            
+
         Returns:
             Number of keys deleted
         """
+        started = time.perf_counter()
         try:
+            prefix = f"{namespace}{self.namespace_separator}" if namespace else None
+            local_count = self.local.clear(prefix)
             if self.use_redis:
                 if namespace:
-                    # Delete all keys with namespace prefix
-                    pattern = f"{namespace}{self.namespace_separator}*"
-                    keys = self.redis_client.keys(pattern)
-                    if keys:
-                        deleted = self.redis_client.delete(*keys)
-                        logger.info(f"Cache CLEAR: {namespace} ({deleted} keys)")
-                        return deleted
-                    return 0
+                    # SCAN + UNLINK in batches: never blocks Redis like KEYS does
+                    deleted = 0
+                    batch = []
+                    for key in self.redis_client.scan_iter(match=f"{prefix}*", count=SCAN_BATCH_SIZE):
+                        batch.append(key)
+                        if len(batch) >= SCAN_BATCH_SIZE:
+                            deleted += self.redis_client.unlink(*batch)
+                            batch = []
+                    if batch:
+                        deleted += self.redis_client.unlink(*batch)
+                    logger.info(f"Cache CLEAR: {namespace} ({deleted} keys)")
+                    return deleted
                 else:
                     # Clear entire database
                     self.redis_client.flushdb()
                     logger.info("Cache CLEAR: ALL")
                     return -1  # Unknown count
             else:
-                if namespace:
-                    prefix = f"{namespace}{self.namespace_separator}"
-                    keys_to_delete = [k for k in self._memory_cache.keys() if k.startswith(prefix)]
-                    for key in keys_to_delete:
-                        del self._memory_cache[key]
-                    logger.info(f"Cache CLEAR (memory): {namespace} ({len(keys_to_delete)} keys)")
-                    return len(keys_to_delete)
-                else:
-                    count = len(self._memory_cache)
-                    self._memory_cache.clear()
-                    logger.info(f"Cache CLEAR (memory): ALL ({count} keys)")
-                    return count
-                    
+                logger.info(f"Cache CLEAR (memory): {namespace or 'ALL'} ({local_count} keys)")
+                return local_count
+
         except Exception as e:
+            self.metrics.incr("errors")
             logger.error(f"Cache CLEAR failed: {e}")
             return 0
-    
+        finally:
+            self.metrics.observe("clear", started)
+
     def set_many(
         self,
         mapping: Dict[str, Any],
@@ -294,24 +568,47 @@ class CacheManager:
         namespace: Optional[str] = None
     ) -> int:
         """
-        Set multiple cache values at once
-        
+        Set multiple cache values at once (one pipelined round-trip on Redis)
+
         Args:
             mapping: Dictionary of {key: value}
             ttl: Time-to-live in seconds
             namespace: Optional namespace for all keys
-            
+
         Returns:
             Number of keys successfully set
         """
-        success_count = 0
-        for key, value in mapping.items():
-            if self.set(key, value, ttl=ttl, namespace=namespace):
-                success_count += 1
-        
+        if not mapping:
+            return 0
+        ttl = ttl if ttl is not None else self.default_ttl
+        started = time.perf_counter()
+        serialized, failed = self._serialize_many(mapping, namespace)
+        for key in failed:
+            self.delete(key, namespace)
+
+        try:
+            if self.use_redis:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for full_key, raw in serialized.items():
+                    pipe.setex(full_key, ttl, raw)
+                results = pipe.execute()
+                success_count = sum(1 for r in results if r)
+            else:
+                success_count = len(serialized)
+            local_ttl = self._local_ttl(ttl)
+            for full_key, raw in serialized.items():
+                self.local.set(full_key, raw, local_ttl)
+            self.metrics.incr("sets", success_count)
+        except Exception as e:
+            self.metrics.incr("errors")
+            logger.error(f"Cache SET_MANY failed: {e}")
+            return 0
+        finally:
+            self.metrics.observe("set_many", started)
+
         logger.debug(f"Cache SET_MANY: {success_count}/{len(mapping)} keys")
         return success_count
-    
+
     def get_many(
         self,
         keys: List[str],
@@ -319,36 +616,66 @@ class CacheManager:
         default: Any = None
     ) -> Dict[str, Any]:
         """
-        Get multiple cache values at once
-        
+        Get multiple cache values at once (local tier, then one MGET for the rest)
+
         Args:
             keys: List of cache keys
             namespace: Optional namespace for all keys
             default: Default value for missing keys
-            
+
         Returns:
             Dictionary of {key: value}
         """
-        results = {}
-        for key in keys:
-            results[key] = self.get(key, namespace=namespace, default=default)
-        
-        hit_count = sum(1 for v in results.values() if v != default)
-        logger.debug(f"Cache GET_MANY: {hit_count}/{len(keys)} hits")
+        started = time.perf_counter()
+        results: Dict[str, Any] = {}
+        remote: List[Tuple[str, str]] = []
+
+        try:
+            for key in keys:
+                full_key = self._make_key(key, namespace)
+                found, raw = self._local_get(full_key)
+                if found:
+                    results[key] = self._deserialize(raw)
+                else:
+                    remote.append((key, full_key))
+
+            if remote and self.use_redis:
+                # One MGET plus a PTTL per key, in a single round trip
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.mget([full_key for _, full_key in remote])
+                for _, full_key in remote:
+                    pipe.pttl(full_key)
+                values, *pttls = pipe.execute()
+                for (key, full_key), raw, pttl in zip(remote, values, pttls):
+                    if raw is None:
+                        continue
+                    self.metrics.incr("redis_hits")
+                    self._fill_local(full_key, raw, pttl)
+                    results[key] = self._deserialize(raw)
+        except Exception as e:
+            self.metrics.incr("errors")
+            logger.error(f"Cache GET_MANY failed: {e}")
+        finally:
+            self.metrics.observe("get_many", started)
+
+        missing = [key for key in keys if key not in results]
+        self.metrics.incr("misses", len(missing))
+        for key in missing:
+            results[key] = default
+
+        logger.debug(f"Cache GET_MANY: {len(keys) - len(missing)}/{len(keys)} hits")
         return results
-    
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get cache statistics
-        
+
         Returns:
-            Dictionary with cache stats
+            Dictionary with cache stats (backend info, local tier, client-side
+            hit/miss counters and per-operation latency)
         """
-        stats = {
-            "backend": "redis" if self.use_redis else "memory",
-            "redis_available": self.use_redis
-        }
-        
+        stats = self._base_stats()
+
         try:
             if self.use_redis:
                 info = self.redis_client.info("stats")
@@ -364,40 +691,288 @@ class CacheManager:
             else:
                 # Clean up expired entries first
                 self._cleanup_expired()
+                client = stats["client"]
                 stats.update({
-                    "total_keys": len(self._memory_cache),
+                    "total_keys": len(self.local),
+                    "hits": client["hits"],
+                    "misses": client["misses"],
+                    "hit_rate": client["hit_rate"],
                     "backend_note": "In-memory fallback (Redis unavailable)"
                 })
-                
+
         except Exception as e:
             logger.error(f"Failed to get cache stats: {e}")
             stats["error"] = str(e)
-        
+
         return stats
-    
-    def _calculate_hit_rate(self, hits: int, misses: int) -> float:
-        """Calculate cache hit rate percentage"""
-        total = hits + misses
-        if total == 0:
-            return 0.0
-        return round((hits / total) * 100, 2)
-    
+
     def _cleanup_expired(self):
         """Clean up expired entries from in-memory cache"""
-        if not self.use_redis:
-            current_time = time.time()
-            expired_keys = [
-                k for k, (_, expiry) in self._memory_cache.items()
-                if current_time >= expiry
-            ]
-            for key in expired_keys:
-                del self._memory_cache[key]
-            if expired_keys:
-                logger.debug(f"Cleaned up {len(expired_keys)} expired entries")
+        expired = self.local.purge_expired()
+        if expired:
+            logger.debug(f"Cleaned up {expired} expired entries")
+
+
+class AsyncCacheManager(_CacheBase):
+    """
+    asyncio-native cache manager (redis.asyncio) with the same API as CacheManager
+
+    Call ``await connect()`` once (get_async_cache() does this) before use.
+    """
+
+    def __init__(
+        self,
+        redis_host: str = "localhost",
+        redis_port: int = 6379,
+        redis_db: int = 0,
+        default_ttl: int = 3600,
+        namespace_separator: str = ":",
+        local_max_entries: int = 10000,
+        local_ttl: int = 30,
+        serializer: Optional[str] = None,
+        redis_client: Any = None
+    ):
+        super().__init__(
+            redis_host, redis_port, redis_db, default_ttl, namespace_separator,
+            local_max_entries, local_ttl, serializer
+        )
+        if redis_client is not None:
+            self.redis_client = redis_client
+            self.use_redis = True
+
+    async def connect(self):
+        """Attempt to connect to Redis"""
+        if self.redis_client is not None:
+            return
+        try:
+            import redis.asyncio as aioredis
+            client = aioredis.Redis(
+                host=self.redis_host,
+                port=self.redis_port,
+                db=self.redis_db,
+                decode_responses=False,
+                socket_connect_timeout=2
+            )
+            await client.ping()
+            self.redis_client = client
+            self.use_redis = True
+            logger.info(f"✅ Async Redis connected: {self.redis_host}:{self.redis_port} DB{self.redis_db}")
+        except Exception as e:
+            logger.warning(f"⚠️  Async Redis unavailable, using in-memory cache: {e}")
+            self.use_redis = False
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None, namespace: Optional[str] = None) -> bool:
+        """Set a cache value"""
+        full_key = self._make_key(key, namespace)
+        ttl = ttl if ttl is not None else self.default_ttl
+        started = time.perf_counter()
+        raw = self._serialize(value)
+        if raw is None:
+            self.metrics.incr("serialize_errors")
+            await self.delete(key, namespace)
+            return False
+        try:
+            if self.use_redis:
+                await self.redis_client.setex(full_key, ttl, raw)
+            self.local.set(full_key, raw, self._local_ttl(ttl))
+            self.metrics.incr("sets")
+            return True
+        except Exception as e:
+            self.metrics.incr("errors")
+            logger.error(f"Cache SET failed for {full_key}: {e}")
+            return False
+        finally:
+            self.metrics.observe("set", started)
+
+    async def get(self, key: str, namespace: Optional[str] = None, default: Any = None) -> Any:
+        """Get a cache value"""
+        full_key = self._make_key(key, namespace)
+        started = time.perf_counter()
+        try:
+            found, raw = self._local_get(full_key)
+            if found:
+                return self._deserialize(raw)
+            if self.use_redis:
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.get(full_key)
+                pipe.pttl(full_key)
+                raw, pttl = await pipe.execute()
+                if raw is not None:
+                    self.metrics.incr("redis_hits")
+                    self._fill_local(full_key, raw, pttl)
+                    return self._deserialize(raw)
+            self.metrics.incr("misses")
+            return default
+        except Exception as e:
+            self.metrics.incr("errors")
+            logger.error(f"Cache GET failed for {full_key}: {e}")
+            return default
+        finally:
+            self.metrics.observe("get", started)
+
+    async def delete(self, key: str, namespace: Optional[str] = None) -> bool:
+        """Delete a cache value"""
+        full_key = self._make_key(key, namespace)
+        try:
+            deleted_local = self.local.delete(full_key)
+            self.metrics.incr("deletes")
+            if self.use_redis:
+                return (await self.redis_client.delete(full_key)) > 0
+            return deleted_local
+        except Exception as e:
+            self.metrics.incr("errors")
+            logger.error(f"Cache DELETE failed for {full_key}: {e}")
+            return False
+
+    async def exists(self, key: str, namespace: Optional[str] = None) -> bool:
+        """Check if key exists in cache"""
+        full_key = self._make_key(key, namespace)
+        try:
+            found, _ = self.local.get(full_key)
+            if found:
+                return True
+            if self.use_redis:
+                return (await self.redis_client.exists(full_key)) > 0
+            return False
+        except Exception as e:
+            logger.error(f"Cache EXISTS check failed for {full_key}: {e}")
+            return False
+
+    async def clear(self, namespace: Optional[str] = None) -> int:
+        """Clear cache (all keys or namespace) using SCAN + UNLINK"""
+        started = time.perf_counter()
+        try:
+            prefix = f"{namespace}{self.namespace_separator}" if namespace else None
+            local_count = self.local.clear(prefix)
+            if not self.use_redis:
+                return local_count
+            if not namespace:
+                await self.redis_client.flushdb()
+                return -1  # Unknown count
+            deleted = 0
+            batch = []
+            async for key in self.redis_client.scan_iter(match=f"{prefix}*", count=SCAN_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    deleted += await self.redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.redis_client.unlink(*batch)
+            logger.info(f"Cache CLEAR: {namespace} ({deleted} keys)")
+            return deleted
+        except Exception as e:
+            self.metrics.incr("errors")
+            logger.error(f"Cache CLEAR failed: {e}")
+            return 0
+        finally:
+            self.metrics.observe("clear", started)
+
+    async def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None, namespace: Optional[str] = None) -> int:
+        """Set multiple cache values in one pipelined SETEX round-trip"""
+        if not mapping:
+            return 0
+        ttl = ttl if ttl is not None else self.default_ttl
+        started = time.perf_counter()
+        serialized, failed = self._serialize_many(mapping, namespace)
+        for key in failed:
+            await self.delete(key, namespace)
+        try:
+            if self.use_redis:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for full_key, raw in serialized.items():
+                    pipe.setex(full_key, ttl, raw)
+                results = await pipe.execute()
+                success_count = sum(1 for r in results if r)
+            else:
+                success_count = len(serialized)
+            local_ttl = self._local_ttl(ttl)
+            for full_key, raw in serialized.items():
+                self.local.set(full_key, raw, local_ttl)
+            self.metrics.incr("sets", success_count)
+            return success_count
+        except Exception as e:
+            self.metrics.incr("errors")
+            logger.error(f"Cache SET_MANY failed: {e}")
+            return 0
+        finally:
+            self.metrics.observe("set_many", started)
+
+    async def get_many(self, keys: List[str], namespace: Optional[str] = None, default: Any = None) -> Dict[str, Any]:
+        """Get multiple cache values: local tier, then one MGET for the rest"""
+        started = time.perf_counter()
+        results: Dict[str, Any] = {}
+        remote: List[Tuple[str, str]] = []
+        try:
+            for key in keys:
+                full_key = self._make_key(key, namespace)
+                found, raw = self._local_get(full_key)
+                if found:
+                    results[key] = self._deserialize(raw)
+                else:
+                    remote.append((key, full_key))
+            if remote and self.use_redis:
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.mget([full_key for _, full_key in remote])
+                for _, full_key in remote:
+                    pipe.pttl(full_key)
+                values, *pttls = await pipe.execute()
+                for (key, full_key), raw, pttl in zip(remote, values, pttls):
+                    if raw is None:
+                        continue
+                    self.metrics.incr("redis_hits")
+                    self._fill_local(full_key, raw, pttl)
+                    results[key] = self._deserialize(raw)
+        except Exception as e:
+            self.metrics.incr("errors")
+            logger.error(f"Cache GET_MANY failed: {e}")
+        finally:
+            self.metrics.observe("get_many", started)
+
+        missing = [key for key in keys if key not in results]
+        self.metrics.incr("misses", len(missing))
+        for key in missing:
+            results[key] = default
+        return results
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        stats = self._base_stats()
+        try:
+            if self.use_redis:
+                info = await self.redis_client.info("stats")
+                stats.update({
+                    "total_keys": await self.redis_client.dbsize(),
+                    "hits": info.get("keyspace_hits", 0),
+                    "misses": info.get("keyspace_misses", 0),
+                    "hit_rate": self._calculate_hit_rate(
+                        info.get("keyspace_hits", 0),
+                        info.get("keyspace_misses", 0)
+                    )
+                })
+            else:
+                self.local.purge_expired()
+                client = stats["client"]
+                stats.update({
+                    "total_keys": len(self.local),
+                    "hits": client["hits"],
+                    "misses": client["misses"],
+                    "hit_rate": client["hit_rate"],
+                    "backend_note": "In-memory fallback (Redis unavailable)"
+                })
+        except Exception as e:
+            logger.error(f"Failed to get cache stats: {e}")
+            stats["error"] = str(e)
+        return stats
+
+    async def close(self):
+        """Close the Redis connection"""
+        if self.redis_client is not None and hasattr(self.redis_client, "aclose"):
+            await self.redis_client.aclose()
 
 
 # Singleton instance
 _cache_instance = None
+_async_cache_instance = None
 
 
 def get_cache(
@@ -408,13 +983,13 @@ def get_cache(
 ) -> CacheManager:
     """
     Get or create cache manager singleton
-    
+
     Args:
         redis_host: Redis server host
         redis_port: Redis server port
         redis_db: Redis database number (0-4)
         default_ttl: Default TTL in seconds
-        
+
     Returns:
         CacheManager instance
     """
@@ -429,6 +1004,28 @@ def get_cache(
     return _cache_instance
 
 
+async def get_async_cache(
+    redis_host: str = "localhost",
+    redis_port: int = 6379,
+    redis_db: int = 0,
+    default_ttl: int = 3600
+) -> AsyncCacheManager:
+    """
+    Get or create the async cache manager singleton (connects on first call)
+    """
+    global _async_cache_instance
+    if _async_cache_instance is None:
+        instance = AsyncCacheManager(
+            redis_host=redis_host,
+            redis_port=redis_port,
+            redis_db=redis_db,
+            default_ttl=default_ttl
+        )
+        await instance.connect()
+        _async_cache_instance = instance
+    return _async_cache_instance
+
+
 # Convenience functions for direct use
 def set_cache(key: str, value: Any, ttl: int = 3600, namespace: str = None) -> bool:
     """Quick cache set"""
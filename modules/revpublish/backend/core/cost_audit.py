@@ -0,0 +1,435 @@
+"""
+RevPublish Cost Audit Writer - Buffered, batched api_audit_logs inserts
+
+APIOrchestrator used to INSERT + COMMIT one api_audit_logs row per API call on
+a connection shared by every thread. This writer takes cost events off the
+request path: record() only enqueues, and a background thread flushes batches
+with execute_values when either the batch size or the flush interval is hit.
+
+If PostgreSQL is unreachable, batches are appended to a local JSONL spool file
+and replayed (oldest first) once a connection succeeds again, so cost data is
+not lost during an outage or restart. Only connection failures are spooled: a
+batch the database rejects (bad value, constraint violation) is retried row by
+row and the offending rows go to a separate rejected-rows file, so one bad row
+cannot block every later flush.
+
+Usage:
+    from core.cost_audit import CostAuditWriter
+
+    writer = CostAuditWriter(db_url)
+    writer.record({"service": "dataforseo", "operation": "keyword_research", "cost": 0.002})
+    writer.get_stats()   # {'queue_depth': 0, 'written': 1, 'spooled': 0, ...}
+    writer.close()       # final flush
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+AUDIT_COLUMNS = (
+    "timestamp",
+    "service_name",
+    "endpoint",
+    "industry_tag",
+    "credits_spent",
+    "input_tokens",
+    "output_tokens",
+    "model_name",
+    "priority_level",
+    "escalated",
+    "response_time_ms",
+    "status_code",
+)
+
+INSERT_SQL = f"INSERT INTO api_audit_logs ({', '.join(AUDIT_COLUMNS)}) VALUES %s"
+
+DEFAULT_SPOOL_PATH = "/opt/revpublish/backend/logs/api_audit_spool.jsonl"
+
+_STOP = object()
+
+
+def _connection_errors() -> Tuple[type, ...]:
+    """Exceptions meaning "database unreachable" (spool and retry later)"""
+    errors: Tuple[type, ...] = (ConnectionError, TimeoutError)
+    try:
+        import psycopg2
+        errors += (psycopg2.OperationalError, psycopg2.InterfaceError)
+    except ImportError:
+        pass
+    return errors
+
+
+def build_audit_row(event: Dict[str, Any]) -> Tuple:
+    """
+    Convert a cost event into an api_audit_logs row (column order = AUDIT_COLUMNS)
+
+    Args:
+        event: Dict with service, operation, cost, usage, model, priority, ...
+
+    Returns:
+        Tuple ready for execute_values
+    """
+    usage = event.get("usage") or {}
+    input_tokens = usage.get("input_tokens") or usage.get("prompt_tokens", 0)
+    output_tokens = usage.get("output_tokens") or usage.get("completion_tokens", 0)
+
+    return (
+        event.get("timestamp") or datetime.now().isoformat(),
+        event.get("service"),
+        event.get("operation"),
+        event.get("industry_tag"),
+        event.get("cost", 0.0),
+        input_tokens,
+        output_tokens,
+        event.get("model"),
+        1 if event.get("priority", "NORMAL") == "NORMAL" else 2,  # Map to priority code
+        bool(event.get("escalated", False)),
+        event.get("response_time_ms", 0),
+        event.get("status_code", "SUCCESS"),
+    )
+
+
+class CostAuditWriter:
+    """Background writer that batches api_audit_logs inserts"""
+
+    def __init__(
+        self,
+        db_url: Optional[str],
+        batch_size: int = 200,
+        flush_interval: float = 2.0,
+        max_queue: int = 10000,
+        spool_path: Optional[str] = None,
+        retry_interval: float = 30.0,
+        rejected_path: Optional[str] = None
+    ):
+        """
+        Args:
+            db_url: PostgreSQL connection URL (None = spool only, no writer thread)
+            batch_size: Flush as soon as this many events are buffered
+            flush_interval: Flush at least this often (seconds) when events are buffered
+            max_queue: In-memory buffer bound; overflow goes straight to the spool
+            spool_path: JSONL file used while the database is unreachable
+            retry_interval: Seconds between reconnect attempts after a failure
+            rejected_path: JSONL file for rows the database refuses to accept
+        """
+        self.db_url = db_url
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.spool_path = spool_path or os.getenv("REVPUBLISH_AUDIT_SPOOL", DEFAULT_SPOOL_PATH)
+        self.rejected_path = rejected_path or f"{os.path.splitext(self.spool_path)[0]}_rejected.jsonl"
+        self._connection_errors = _connection_errors()
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._conn = None
+        self._next_connect_at = 0.0
+        self._spool_lock = threading.Lock()
+        self._rejected_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._flushed = threading.Condition()
+        self._pending = 0
+        self.stats = {
+            "recorded": 0,
+            "written": 0,
+            "batches": 0,
+            "spooled": 0,
+            "replayed": 0,
+            "rejected": 0,
+            "errors": 0,
+        }
+        self.last_error: Optional[str] = None
+        self._closed = False
+
+        self._thread: Optional[threading.Thread] = None
+        if self.db_url:
+            self._thread = threading.Thread(target=self._run, name="cost-audit-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Hot path
+    # ------------------------------------------------------------------
+
+    def record(self, event: Dict[str, Any]):
+        """
+        Buffer one cost event (never touches the database)
+
+        Args:
+            event: Cost event, see build_audit_row()
+        """
+        row = build_audit_row(event)
+        with self._stats_lock:
+            self.stats["recorded"] += 1
+            self._pending += 1
+        try:
+            if self._closed or self._thread is None:
+                raise queue.Full
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._spool([row])
+            self._done(1)
+
+    # ------------------------------------------------------------------
+    # Background thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch: List[Tuple] = []
+            deadline = None
+            while len(batch) < self.batch_size:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if batch:
+                self._flush_batch(batch)
+                self._done(len(batch))
+
+    def _flush_batch(self, batch: List[Tuple]):
+        conn = self._connection()
+        if conn is None:
+            self._spool(batch)
+            return
+
+        try:
+            self._replay_spool(conn)
+            written = self._write_rows(conn, batch)
+            with self._stats_lock:
+                self.stats["written"] += written
+                self.stats["batches"] += 1
+        except self._connection_errors as e:
+            self._record_error(e)
+            self._drop_connection()
+            self._spool(batch)
+
+    def _done(self, count: int):
+        with self._flushed:
+            with self._stats_lock:
+                self._pending -= count
+            self._flushed.notify_all()
+
+    # ------------------------------------------------------------------
+    # Database
+    # ------------------------------------------------------------------
+
+    def _connect(self):
+        """Open a dedicated connection (overridable for tests)"""
+        import psycopg2
+        return psycopg2.connect(self.db_url)
+
+    def _write_batch(self, conn, rows: List[Tuple]):
+        """Insert rows in one round-trip and commit"""
+        from psycopg2.extras import execute_values
+
+        with conn.cursor() as cursor:
+            execute_values(cursor, INSERT_SQL, rows, page_size=max(len(rows), 1))
+        conn.commit()
+
+    def _write_rows(self, conn, rows: List[Tuple]) -> int:
+        """
+        Write rows, isolating any the database rejects
+
+        Connection errors propagate (the caller spools). Any other failure
+        retries the rows one at a time and moves the failing ones to the
+        rejected file.
+
+        Returns:
+            Number of rows written
+        """
+        try:
+            self._write_batch(conn, rows)
+            return len(rows)
+        except self._connection_errors:
+            raise
+        except Exception as e:
+            self._rollback(conn)
+            if len(rows) == 1:
+                self._reject(rows, e)
+                return 0
+            logger.warning(f"⚠️  Cost audit batch rejected, retrying {len(rows)} rows individually: {e}")
+
+        written = 0
+        for row in rows:
+            try:
+                self._write_batch(conn, [row])
+                written += 1
+            except self._connection_errors:
+                raise
+            except Exception as e:
+                self._rollback(conn)
+                self._reject([row], e)
+        return written
+
+    def _rollback(self, conn):
+        try:
+            conn.rollback()
+        except self._connection_errors:
+            raise
+        except Exception:
+            pass
+
+    def _connection(self):
+        if self._conn is not None:
+            return self._conn
+        if not self.db_url or time.monotonic() < self._next_connect_at:
+            return None
+        try:
+            self._conn = self._connect()
+            logger.info("✓ Cost audit writer connected")
+        except Exception as e:
+            self._record_error(e)
+            self._next_connect_at = time.monotonic() + self.retry_interval
+            logger.warning(f"⚠️  Cost audit writer cannot reach PostgreSQL, spooling: {e}")
+        return self._conn
+
+    def _drop_connection(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+        self._next_connect_at = time.monotonic() + self.retry_interval
+
+    def _record_error(self, error: Exception):
+        with self._stats_lock:
+            self.stats["errors"] += 1
+        self.last_error = str(error)
+        logger.error(f"Failed to write cost audit batch: {error}")
+
+    # ------------------------------------------------------------------
+    # Spool
+    # ------------------------------------------------------------------
+
+    def _spool(self, rows: List[Tuple]):
+        try:
+            with self._spool_lock:
+                os.makedirs(os.path.dirname(self.spool_path) or ".", exist_ok=True)
+                with open(self.spool_path, "a", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps(list(row), default=str) + "\n")
+            with self._stats_lock:
+                self.stats["spooled"] += len(rows)
+        except OSError as e:
+            self._record_error(e)
+            logger.error(f"⚠️  Dropped {len(rows)} cost audit rows (spool unavailable)")
+
+    def _reject(self, rows: List[Tuple], error: Exception):
+        self._record_error(error)
+        try:
+            with self._rejected_lock:
+                os.makedirs(os.path.dirname(self.rejected_path) or ".", exist_ok=True)
+                with open(self.rejected_path, "a", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps({"row": list(row), "error": str(error)[:500]}, default=str) + "\n")
+        except OSError as e:
+            logger.error(f"⚠️  Dropped {len(rows)} rejected cost audit rows: {e}")
+        with self._stats_lock:
+            self.stats["rejected"] += len(rows)
+
+    def _replay_spool(self, conn):
+        """Write spooled rows back to PostgreSQL before new ones"""
+        with self._spool_lock:
+            if not os.path.exists(self.spool_path):
+                return
+            with open(self.spool_path, "r", encoding="utf-8") as f:
+                rows = [tuple(json.loads(line)) for line in f if line.strip()]
+
+            written = 0
+            try:
+                for start in range(0, len(rows), self.batch_size):
+                    self._write_rows(conn, rows[start:start + self.batch_size])
+                    written = min(start + self.batch_size, len(rows))
+            finally:
+                # Keep only what has not been committed yet
+                with open(self.spool_path, "w", encoding="utf-8") as f:
+                    for row in rows[written:]:
+                        f.write(json.dumps(list(row), default=str) + "\n")
+                if written == len(rows):
+                    os.remove(self.spool_path)
+
+        if rows:
+            with self._stats_lock:
+                self.stats["replayed"] += len(rows)
+            logger.info(f"✓ Replayed {len(rows)} spooled cost audit rows")
+
+    def spool_depth(self) -> int:
+        """Number of rows waiting in the spool file"""
+        with self._spool_lock:
+            if not os.path.exists(self.spool_path):
+                return 0
+            with open(self.spool_path, "r", encoding="utf-8") as f:
+                return sum(1 for line in f if line.strip())
+
+    # ------------------------------------------------------------------
+    # Control
+    # ------------------------------------------------------------------
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every recorded event has been written or spooled
+
+        Args:
+            timeout: Max seconds to wait (None = no limit)
+
+        Returns:
+            True if the buffer drained in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._flushed:
+            while self._pending > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._flushed.wait(remaining)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+            pending = self._pending
+        return {
+            **stats,
+            "queue_depth": self._queue.qsize(),
+            "pending": pending,
+            "spool_depth": self.spool_depth(),
+            "connected": self._conn is not None,
+            "last_error": self.last_error,
+        }
+
+    def close(self, timeout: float = 10.0):
+        """Flush buffered events and stop the background thread"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("⚠️  Cost audit writer did not drain before shutdown")
+        self._thread.join(timeout)
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
@@ -0,0 +1,306 @@
+"""
+RevPublish Credential Service - Pooled, cached WordPress credential lookups
+
+Bulk imports resolve credentials per row, per slug lookup and per page fetch.
+This service keeps a normalized-host -> credentials index in memory, backed by
+a psycopg2 connection pool, so those lookups are dict hits instead of new
+connections and full-table scans.
+
+Usage:
+    from core.credential_service import get_credential_service
+
+    service = get_credential_service()
+    creds = service.get("https://www.dallasplumber.com/")
+    # {'username': ..., 'password': ..., 'api_url': 'https://dallasplumber.com/wp-json/wp/v2'}
+
+    # After a Sites-tab edit / sync
+    service.invalidate()
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Mirrors normalize_url(): strip protocol, trailing slashes and a leading "www.",
+# then lowercase/trim. The stored normalized_host column (added by
+# migrations/001_wordpress_sites_normalized_host.sql) uses the same expression
+# so exact-host lookups can use an index.
+NORMALIZED_HOST_SQL = (
+    "lower(btrim(regexp_replace(regexp_replace(regexp_replace("
+    "site_url, 'https?://', '', 'g'), '/+$', ''), '^www\\.', '')))"
+)
+
+
+def normalize_host(url: str) -> str:
+    """Normalize URL for comparison (remove protocol, trailing slashes, www)"""
+    if not url:
+        return ""
+    url = url.replace('https://', '').replace('http://', '')
+    url = url.rstrip('/')
+    if url.startswith('www.'):
+        url = url[4:]
+    return url.lower().strip()
+
+
+def build_credentials(username: str, password: str, stored_url: str) -> Dict[str, str]:
+    """Build the credentials dict returned to callers from a wordpress_sites row"""
+    # Use the stored site_url from database, but normalize for API URL (prefer https)
+    protocol = 'http://' if stored_url.startswith('http://') else 'https://'
+    return {
+        'username': username,
+        'password': password,
+        'api_url': f"{protocol}{normalize_host(stored_url)}/wp-json/wp/v2"
+    }
+
+
+class WordPressCredentialService:
+    """
+    Thread-safe credential resolver with a connection pool and an in-memory index
+    """
+
+    def __init__(self, ttl: int = 300, min_connections: int = 1, max_connections: int = 10,
+                 miss_ttl: int = 30):
+        """
+        Initialize credential service
+
+        Args:
+            ttl: Seconds before the in-memory index is reloaded from the database
+            min_connections: Connections the pool keeps open
+            max_connections: Upper bound on pooled connections
+            miss_ttl: Seconds an unknown host is remembered as unknown
+        """
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+        self._index: Dict[str, Optional[Dict[str, str]]] = {}
+        # host -> time a direct lookup last found nothing (kept only miss_ttl)
+        self._misses: Dict[str, float] = {}
+        self._loaded_at = 0.0
+        self._index_lock = threading.RLock()
+
+        self._stats = {"hits": 0, "misses": 0, "reloads": 0, "db_lookups": 0, "invalidations": 0}
+        self._stats_lock = threading.Lock()
+
+    # ─── Connection pool ────────────────────────────────────────────────
+
+    def _connection_params(self) -> Dict[str, Any]:
+        """Resolve connection settings once (including the Docker 5433 probe)"""
+        import psycopg2
+
+        password = os.getenv("POSTGRES_PASSWORD") or "revflow2026"
+        host = os.getenv("POSTGRES_HOST", "localhost")
+        port = int(os.getenv("POSTGRES_PORT", "5432"))
+        database = os.getenv("POSTGRES_DB", "revflow")
+        user = os.getenv("POSTGRES_USER", "revflow")
+
+        # Try Docker port if localhost
+        if host == "localhost" and port == 5432:
+            try:
+                probe = psycopg2.connect(
+                    host=host, port=5433, database=database, user=user,
+                    password=password, connect_timeout=2
+                )
+                probe.close()
+                port = 5433
+            except Exception:
+                pass
+
+        return {"host": host, "port": port, "database": database, "user": user, "password": password}
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    from psycopg2.pool import ThreadedConnectionPool
+                    params = self._connection_params()
+                    self._pool = ThreadedConnectionPool(self.min_connections, self.max_connections, **params)
+                    logger.info(
+                        f"✅ Credential pool ready: {params['host']}:{params['port']} "
+                        f"({self.min_connections}-{self.max_connections} connections)"
+                    )
+        return self._pool
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection (committed on success, rolled back on error)"""
+        pool = self._get_pool()
+        conn = pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn)
+
+    # ─── Index ──────────────────────────────────────────────────────────
+
+    def _load_rows(self) -> List[Tuple[str, str, str]]:
+        """Fetch (wp_username, app_password, site_url) for every site"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT wp_username, app_password, site_url FROM wordpress_sites")
+            rows = cursor.fetchall()
+            cursor.close()
+        return rows
+
+    def _query_host(self, host: str) -> Optional[Tuple[str, str, str]]:
+        """Indexed lookup of a single site by normalized host"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("""
+                    SELECT wp_username, app_password, site_url
+                    FROM wordpress_sites
+                    WHERE normalized_host = %s
+                    ORDER BY (wp_username IS NOT NULL AND app_password IS NOT NULL) DESC
+                    LIMIT 1
+                """, (host,))
+            except Exception:
+                # Migration 001 not applied yet; compute the host in SQL instead.
+                conn.rollback()
+                cursor.execute(f"""
+                    SELECT wp_username, app_password, site_url
+                    FROM wordpress_sites
+                    WHERE {NORMALIZED_HOST_SQL} = %s
+                    LIMIT 1
+                """, (host,))
+            row = cursor.fetchone()
+            cursor.close()
+        return row
+
+    def _reload(self):
+        rows = self._load_rows()
+        index: Dict[str, Optional[Dict[str, str]]] = {}
+        for username, password, site_url in rows:
+            host = normalize_host(site_url or "")
+            if not host or not (username and password):
+                # Keep the first row that has credentials for a host.
+                index.setdefault(host, None)
+                continue
+            if index.get(host) is None:
+                index[host] = build_credentials(username, password, site_url)
+        self._index = index
+        self._misses = {}
+        self._loaded_at = time.time()
+        self._count("reloads")
+        logger.debug(f"Credential index loaded: {len(index)} hosts")
+
+    def _ensure_fresh(self):
+        if self._loaded_at and time.time() - self._loaded_at < self.ttl:
+            return
+        with self._index_lock:
+            if self._loaded_at and time.time() - self._loaded_at < self.ttl:
+                return
+            self._reload()
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def get(self, site_url: str) -> Optional[Dict[str, str]]:
+        """
+        Get WordPress credentials for a site URL (normalized match)
+
+        Returns:
+            Dict with username, password, api_url or None if not found
+        """
+        host = normalize_host(site_url)
+        if not host:
+            return None
+
+        self._ensure_fresh()
+        index = self._index
+        if host in index:
+            self._count("hits")
+            creds = index[host]
+            return dict(creds) if creds else None
+
+        # Not in the snapshot: the site may have been added since the last load.
+        self._count("misses")
+        missed_at = self._misses.get(host)
+        if missed_at is not None and time.time() - missed_at < self.miss_ttl:
+            return None
+
+        self._count("db_lookups")
+        row = self._query_host(host)
+        with self._index_lock:
+            if row is None:
+                # Short-lived, so a site added right after a miss is found soon
+                self._misses[host] = time.time()
+                return None
+            creds = build_credentials(row[0], row[1], row[2]) if row[0] and row[1] else None
+            self._index[host] = creds
+            self._misses.pop(host, None)
+        return dict(creds) if creds else None
+
+    def invalidate(self, site_url: Optional[str] = None):
+        """
+        Drop cached credentials
+
+        Args:
+            site_url: If provided, only forget this site; otherwise reload everything
+        """
+        with self._index_lock:
+            if site_url:
+                host = normalize_host(site_url)
+                self._index.pop(host, None)
+                self._misses.pop(host, None)
+            else:
+                self._loaded_at = 0.0
+            self._count("invalidations")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index and pool statistics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return {
+            **stats,
+            "indexed_hosts": len(self._index),
+            "index_age_seconds": round(time.time() - self._loaded_at, 1) if self._loaded_at else None,
+            "ttl": self.ttl,
+            "pool_max_connections": self.max_connections,
+        }
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+
+
+# Singleton instance
+_credential_service = None
+
+
+def get_credential_service() -> WordPressCredentialService:
+    """Get or create the credential service singleton"""
+    global _credential_service
+    if _credential_service is None:
+        _credential_service = WordPressCredentialService(
+            ttl=int(os.getenv("REVPUBLISH_CREDENTIALS_TTL", "300")),
+            max_connections=int(os.getenv("REVPUBLISH_DB_POOL_MAX", "10")),
+            miss_ttl=int(os.getenv("REVPUBLISH_CREDENTIALS_MISS_TTL", "30"))
+        )
+    return _credential_service
+
+
+def invalidate_credentials(site_url: Optional[str] = None):
+    """Quick invalidate (call after any wordpress_sites write)"""
+    get_credential_service().invalidate(site_url)
+    # Page indexes hold the credentials they were built with.
+    from core import page_index
+    if page_index._registry is not None:
+        page_index._registry.invalidate(site_url)
@@ -0,0 +1,163 @@
+"""
+RevPublish Deploy Engine - Bounded-concurrency row pipeline for bulk imports
+
+Each CSV row flows through three stages (fetch -> merge -> deploy). Stage
+functions are plain blocking callables (requests, psycopg2, Google APIs) and
+are run in a worker thread pool so the event loop stays responsive. Rows move
+through the stages independently, so one row's Google Doc fetch overlaps
+another row's WordPress deploy.
+
+Limits:
+    - max_concurrency: global cap on rows inside the deploy stage at once
+    - per_site_concurrency: cap on concurrent deploys against one WordPress site.
+      Only the deploy stage is bounded per site; fetch talks to Google Docs,
+      not the target site, so it is bounded by fetch_concurrency alone
+    - fetch_concurrency: cap on concurrent fetch stages (defaults to max_concurrency)
+    - All three are clamped to MAX_CONCURRENCY
+
+Usage:
+    from core.deploy_engine import DeployEngine, RowJob
+
+    engine = DeployEngine(max_concurrency=8, per_site_concurrency=2)
+    jobs = [RowJob(row_number=i, site_key=site, payload=row) for i, row in ...]
+
+    async for job in engine.stream(jobs, fetch=fetch_fn, merge=merge_fn, deploy=deploy_fn):
+        print(job.row_number, job.result)
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for any stage limit; the thread pool is sized from them and the
+# limits arrive straight from the import form.
+MAX_CONCURRENCY = 32
+
+StageFunc = Callable[["RowJob"], None]
+ErrorFunc = Callable[["RowJob", BaseException], Dict[str, Any]]
+
+
+@dataclass
+class RowJob:
+    """
+    One unit of work flowing through the pipeline.
+
+    Stage functions read and update ``payload``. Setting ``result`` from any
+    stage finishes the row early (e.g. validation failure) and skips the
+    remaining stages. ``stats`` carries per-row counters that the caller
+    folds into the import summary on the event loop thread.
+    """
+    row_number: int
+    site_key: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    stats: Dict[str, int] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def bump(self, counter: str, amount: int = 1):
+        """Increment a per-row summary counter"""
+        self.stats[counter] = self.stats.get(counter, 0) + amount
+
+
+class DeployEngine:
+    """Runs RowJobs through fetch/merge/deploy with global and per-site limits"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        per_site_concurrency: int = 2,
+        fetch_concurrency: Optional[int] = None
+    ):
+        """
+        Initialize deploy engine
+
+        Args:
+            max_concurrency: Max rows in the deploy stage across all sites
+            per_site_concurrency: Max rows in the deploy stage for one site
+                (fetch and merge are not limited per site)
+            fetch_concurrency: Max rows in the fetch stage (None = max_concurrency)
+        """
+        self.max_concurrency = max(1, min(int(max_concurrency), MAX_CONCURRENCY))
+        self.per_site_concurrency = max(1, min(int(per_site_concurrency), self.max_concurrency))
+        self.fetch_concurrency = max(1, min(int(fetch_concurrency or self.max_concurrency), MAX_CONCURRENCY))
+
+    async def stream(
+        self,
+        jobs: Iterable[RowJob],
+        fetch: Optional[StageFunc] = None,
+        merge: Optional[StageFunc] = None,
+        deploy: Optional[StageFunc] = None,
+        on_error: Optional[ErrorFunc] = None
+    ) -> AsyncIterator[RowJob]:
+        """
+        Run jobs through the pipeline, yielding each one as soon as it finishes.
+
+        Jobs are yielded in completion order, not input order. A stage that
+        raises finishes the row with ``on_error(job, exc)`` as its result.
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return
+
+        # Semaphores are created per run so they bind to the running loop.
+        fetch_sem = asyncio.Semaphore(self.fetch_concurrency)
+        deploy_sem = asyncio.Semaphore(self.max_concurrency)
+        site_sems: Dict[str, asyncio.Semaphore] = {}
+        # Dedicated pool sized to the limits; the loop's default executor is
+        # capped by CPU count and would silently throttle I/O-bound stages.
+        executor = ThreadPoolExecutor(
+            max_workers=self.fetch_concurrency + self.max_concurrency + 1,
+            thread_name_prefix="revpublish-deploy"
+        )
+        loop = asyncio.get_running_loop()
+
+        def site_sem(site_key: str) -> asyncio.Semaphore:
+            if site_key not in site_sems:
+                site_sems[site_key] = asyncio.Semaphore(self.per_site_concurrency)
+            return site_sems[site_key]
+
+        async def run_stage(name: str, func: Optional[StageFunc], job: RowJob):
+            if func is None or job.result is not None:
+                return
+            started = time.perf_counter()
+            await loop.run_in_executor(executor, func, job)
+            job.timings[f"{name}_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+        async def run_job(job: RowJob) -> RowJob:
+            try:
+                async with fetch_sem:
+                    await run_stage("fetch", fetch, job)
+                # Merge is CPU-light string work; it needs no network slot.
+                await run_stage("merge", merge, job)
+                if deploy is not None and job.result is None:
+                    async with site_sem(job.site_key), deploy_sem:
+                        await run_stage("deploy", deploy, job)
+            except Exception as e:
+                logger.error(f"Row {job.row_number} failed in pipeline: {e}")
+                if on_error is not None:
+                    job.result = on_error(job, e)
+                else:
+                    job.result = {"row_number": job.row_number, "status": "error", "message": str(e)}
+            return job
+
+        tasks = [asyncio.create_task(run_job(job)) for job in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer went away (e.g. client disconnected mid-stream).
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            executor.shutdown(wait=False)
+
+    async def run(self, jobs: Iterable[RowJob], **stages) -> List[RowJob]:
+        """Run all jobs and return them in input (row_number) order"""
+        finished = [job async for job in self.stream(jobs, **stages)]
+        finished.sort(key=lambda j: j.row_number)
+        return finished
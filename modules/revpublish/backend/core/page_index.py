@@ -0,0 +1,309 @@
+"""
+RevPublish Page Index - Per-site WordPress page catalog for slug/URL resolution
+
+Replaces one `/wp/v2/pages?slug=` request per CSV row with a single paginated
+crawl of `/wp/v2/pages` per site. Refreshes are conditional: after the TTL a
+one-page probe (X-WP-Total + newest `modified`, with If-None-Match on the
+probe's own earlier ETag) decides whether the site changed; the full crawl only
+reruns when it did.
+
+Usage:
+    from core.page_index import get_page_index_registry
+
+    registry = get_page_index_registry()
+    index = registry.get("https://dallasplumber.com")
+    page_id = index.find_by_slug("water-heater-repair")
+    pages = index.pages(limit=100)   # newest-modified first
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from core.credential_service import normalize_host
+
+logger = logging.getLogger(__name__)
+
+PAGE_FIELDS = "id,slug,link,title,status,modified"
+MAX_PER_PAGE = 100  # WordPress REST API hard limit
+
+
+class PageIndexError(Exception):
+    """Raised when a site's page list cannot be fetched"""
+
+
+class SitePageIndex:
+    """In-memory page catalog for one WordPress site"""
+
+    def __init__(
+        self,
+        site_url: str,
+        credentials: Dict[str, str],
+        session: Any = None,
+        ttl: int = 300,
+        timeout: int = 20
+    ):
+        """
+        Initialize page index
+
+        Args:
+            site_url: Site URL (informational)
+            credentials: Dict with username, password, api_url
+            session: requests.Session-like object (defaults to a new Session)
+            ttl: Seconds before a freshness probe is sent
+            timeout: Per-request timeout in seconds
+        """
+        if session is None:
+            import requests
+            session = requests.Session()
+        self.site_url = site_url
+        self.credentials = credentials
+        self.session = session
+        self.ttl = ttl
+        self.timeout = timeout
+
+        self._pages: List[Dict[str, Any]] = []
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._by_slug: Dict[str, int] = {}
+        self._by_path: Dict[str, int] = {}
+        # ETag of a probe response that matched the current index
+        self._probe_etag: Optional[str] = None
+        self._fingerprint: Optional[tuple] = None
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+        self.stats = {"builds": 0, "probes": 0, "probe_unchanged": 0, "requests": 0}
+
+    # ─── HTTP ───────────────────────────────────────────────────────────
+
+    def _get(self, params: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        self.stats["requests"] += 1
+        return self.session.get(
+            f"{self.credentials['api_url'].rstrip('/')}/pages",
+            params=params,
+            headers=headers or {},
+            auth=(self.credentials["username"], self.credentials["password"]),
+            timeout=self.timeout
+        )
+
+    @staticmethod
+    def _fingerprint_of(response) -> tuple:
+        """(total pages, newest modified) identifies a site's page-list state"""
+        body = response.json() if response.status_code == 200 else []
+        newest = body[0].get("modified") if isinstance(body, list) and body else None
+        return (response.headers.get("X-WP-Total"), newest)
+
+    def _probe(self) -> bool:
+        """Return True if the site's pages changed since the last build"""
+        self.stats["probes"] += 1
+        headers = {"If-None-Match": self._probe_etag} if self._probe_etag else None
+        response = self._get(
+            {"per_page": 1, "orderby": "modified", "order": "desc", "_fields": "id,modified"},
+            headers=headers
+        )
+        if response.status_code == 304:
+            return False
+        if response.status_code != 200:
+            # Can't tell; rebuild so callers see errors from the real crawl.
+            return True
+        if self._fingerprint_of(response) != self._fingerprint:
+            return True
+        # The crawl's ETag belongs to a different request; only this one can 304 a probe
+        self._probe_etag = response.headers.get("ETag")
+        return False
+
+    def _crawl(self) -> List[Dict[str, Any]]:
+        pages: List[Dict[str, Any]] = []
+        page_number = 1
+        total_pages = 1
+        first_response = None
+        while page_number <= total_pages:
+            response = self._get({
+                "per_page": MAX_PER_PAGE,
+                "page": page_number,
+                "orderby": "modified",
+                "order": "desc",
+                "_fields": PAGE_FIELDS
+            })
+            if response.status_code != 200:
+                raise PageIndexError(
+                    f"WordPress API returned {response.status_code}: {response.text[:180]}"
+                )
+            batch = response.json()
+            if not isinstance(batch, list):
+                break
+            pages.extend(batch)
+            if first_response is None:
+                first_response = response
+                try:
+                    total_pages = int(response.headers.get("X-WP-TotalPages") or 1)
+                except (TypeError, ValueError):
+                    total_pages = 1
+            if len(batch) < MAX_PER_PAGE:
+                break
+            page_number += 1
+
+        self._probe_etag = None
+        if first_response is not None:
+            newest = pages[0].get("modified") if pages else None
+            self._fingerprint = (first_response.headers.get("X-WP-Total"), newest)
+        return pages
+
+    # ─── Index maintenance ──────────────────────────────────────────────
+
+    def build(self):
+        """Crawl every page and rebuild the lookup tables"""
+        pages = self._crawl()
+        by_id: Dict[int, Dict[str, Any]] = {}
+        by_slug: Dict[str, int] = {}
+        by_path: Dict[str, int] = {}
+        normalized: List[Dict[str, Any]] = []
+        for p in pages:
+            try:
+                page_id = int(p.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if page_id <= 0:
+                continue
+            title = p.get("title")
+            title = (title or {}).get("rendered", "") if isinstance(title, dict) else (title or "")
+            entry = {
+                "id": page_id,
+                "title": title,
+                "slug": p.get("slug", "") or "",
+                "status": p.get("status", ""),
+                "link": p.get("link"),
+                "modified": p.get("modified"),
+            }
+            normalized.append(entry)
+            by_id[page_id] = entry
+            # Newest-modified first: keep the first page seen for a slug.
+            if entry["slug"]:
+                by_slug.setdefault(entry["slug"].lower(), page_id)
+            if entry["link"]:
+                path = urlparse(entry["link"]).path.strip("/").lower()
+                if path:
+                    by_path.setdefault(path, page_id)
+
+        with self._lock:
+            self._pages = normalized
+            self._by_id = by_id
+            self._by_slug = by_slug
+            self._by_path = by_path
+            self._checked_at = time.time()
+            self.stats["builds"] += 1
+        logger.info(f"Page index built for {self.site_url}: {len(normalized)} pages")
+
+    def ensure_fresh(self, force: bool = False):
+        """Build on first use; after the TTL, probe and rebuild only if changed"""
+        with self._lock:
+            if not self._checked_at or force:
+                self.build()
+                return
+            if time.time() - self._checked_at < self.ttl:
+                return
+            if self._probe():
+                self.build()
+            else:
+                self.stats["probe_unchanged"] += 1
+                self._checked_at = time.time()
+
+    def mark_stale(self):
+        """Force a probe on next access (e.g. after a page was created)"""
+        with self._lock:
+            if self._checked_at:
+                self._checked_at = 1.0
+
+    # ─── Lookups ────────────────────────────────────────────────────────
+
+    def find_by_slug(self, slug: str) -> Optional[int]:
+        """Page ID for a slug (case-insensitive)"""
+        if not slug:
+            return None
+        return self._by_slug.get(slug.strip().strip("/").lower())
+
+    def find_by_path(self, path: str) -> Optional[int]:
+        """Page ID for a URL path such as 'services/water-heater-repair'"""
+        if not path:
+            return None
+        return self._by_path.get(path.strip().strip("/").lower())
+
+    def has_page(self, page_id: int) -> bool:
+        return page_id in self._by_id
+
+    def pages(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Pages ordered by most recently modified"""
+        pages = self._pages if limit is None else self._pages[:limit]
+        return [dict(p) for p in pages]
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+
+class PageIndexRegistry:
+    """One SitePageIndex per site, keyed by normalized host"""
+
+    def __init__(
+        self,
+        credentials_func: Callable[[str], Optional[Dict[str, str]]],
+        session_factory: Optional[Callable[[], Any]] = None,
+        ttl: int = 300
+    ):
+        self.credentials_func = credentials_func
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self._indexes: Dict[str, SitePageIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self, site_url: str, refresh: bool = False) -> Optional[SitePageIndex]:
+        """
+        Get a fresh page index for a site
+
+        Returns:
+            SitePageIndex, or None when the site has no WordPress credentials
+
+        Raises:
+            PageIndexError: if the WordPress API cannot be read
+        """
+        key = normalize_host(site_url)
+        index = self._indexes.get(key)
+        if index is None:
+            credentials = self.credentials_func(site_url)
+            if not credentials:
+                return None
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is None:
+                    session = self.session_factory() if self.session_factory else None
+                    index = SitePageIndex(site_url, credentials, session=session, ttl=self.ttl)
+                    self._indexes[key] = index
+        index.ensure_fresh(force=refresh)
+        return index
+
+    def invalidate(self, site_url: Optional[str] = None):
+        """Drop one site's index (or all), e.g. after credentials change"""
+        with self._lock:
+            if site_url:
+                self._indexes.pop(normalize_host(site_url), None)
+            else:
+                self._indexes.clear()
+
+    def mark_stale(self, site_url: str):
+        """Ask a site's index to re-probe on next access"""
+        index = self._indexes.get(normalize_host(site_url))
+        if index is not None:
+            index.mark_stale()
+
+
+# Singleton instance
+_registry = None
+
+
+def get_page_index_registry() -> PageIndexRegistry:
+    """Get or create the page index registry singleton"""
+    global _registry
+    if _registry is None:
+        from core.credential_service import get_credential_service
+        _registry = PageIndexRegistry(credentials_func=get_credential_service().get)
+    return _registry
@@ -0,0 +1,91 @@
+"""
+RevPublish Single Flight - Coalesce concurrent identical calls into one
+
+When several threads ask for the same key at once, the first caller (the
+leader) runs the function and everyone else waits for its result instead of
+repeating the work. Used by APIOrchestrator so simultaneous bulk rows asking
+for the same DataForSEO/LLM query pay for one upstream request.
+
+Usage:
+    from core.single_flight import SingleFlight
+
+    flights = SingleFlight()
+    result, shared = flights.do(cache_key, lambda: expensive_call())
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class _Flight:
+    """One in-progress call"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Thread-safe in-flight call deduplication keyed by string"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self.stats = {"leaders": 0, "coalesced": 0, "errors": 0}
+
+    def do(self, key: str, func: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Run func once per key among concurrent callers
+
+        Args:
+            key: Deduplication key
+            func: Zero-arg callable executed by the leader
+            timeout: Max seconds a follower waits (None = wait for the leader)
+
+        Returns:
+            (result, shared) where shared is True for followers that reused
+            the leader's result. A leader's exception is re-raised in every
+            waiting follower.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                self.stats["coalesced"] += 1
+                leader = False
+            else:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.stats["leaders"] += 1
+                leader = True
+
+        if not leader:
+            if not flight.done.wait(timeout):
+                raise TimeoutError(f"Timed out waiting for in-flight call {key}")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = func()
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        return flight.result, False
+
+    def in_flight(self, key: str) -> bool:
+        """True if a call for key is currently running"""
+        with self._lock:
+            return key in self._flights
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, "in_flight": len(self._flights)}
@@ -11,6 +11,7 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from database import get_db_connection
+from core.credential_service import invalidate_credentials
 
 
 class WordPressClient:
@@ -116,11 +117,13 @@ class WordPressClientManager:
                 WHERE site_id = %s
             """, ('success' if test_result.get('success') else 'failed', site_id))
 
-            return {
-                'id': result['id'],
-                'site_id': site_id,
-                'connection_test': test_result
-            }
+        # After commit, so a concurrent lookup cannot re-cache the old row
+        invalidate_credentials(site_url)
+        return {
+            'id': result['id'],
+            'site_id': site_id,
+            'connection_test': test_result
+        }
 
     def get_client(self, site_id: str) -> WordPressClient:
         """Get WordPress client for site"""
@@ -178,9 +181,13 @@ class WordPressClientManager:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM wordpress_sites WHERE site_id = %s", (site_id,))
+            deleted = cursor.rowcount > 0
             if site_id in self._clients_cache:
                 del self._clients_cache[site_id]
-            return cursor.rowcount > 0
+
+        # After commit, so a concurrent lookup cannot re-cache the deleted row
+        invalidate_credentials()
+        return deleted
 
     def test_all_connections(self) -> List[Dict]:
         """Test connections to all configured sites"""
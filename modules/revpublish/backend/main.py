@@ -5,9 +5,13 @@ from routes.deployment_enhanced import router as deploy_router
 from routes.v2_routes import router as v2_router
 from routes.hostinger import router as hostinger_router
 from routes.wordpress_discovery import router as wordpress_discovery_router
+from core.deploy_engine import MAX_CONCURRENCY, DeployEngine, RowJob
+from core.credential_service import get_credential_service, normalize_host
+from core.page_index import PageIndexError, get_page_index_registry
 from fastapi import UploadFile, File, Form, HTTPException
 from typing import Optional, List, Dict, Any, Tuple
 import pandas as pd
+import asyncio
 import io
 import re
 from datetime import datetime
@@ -17,8 +21,8 @@ import sys
 import traceback
 import copy
 import builtins
+import time
 
-import psycopg2
 import os
 import json
 from urllib.parse import urlparse, parse_qs
@@ -81,7 +85,7 @@ app.add_middleware(
 )
 
 # Global exception handler to ensure JSON responses
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
@@ -324,16 +328,7 @@ def merge_template_fields(template: str, row_data: Dict[str, Any]) -> str:
 
 def normalize_url(url: str) -> str:
     """Normalize URL for comparison (remove protocol, trailing slashes, www)"""
-    if not url:
-        return ""
-    # Remove protocol
-    url = url.replace('https://', '').replace('http://', '')
-    # Remove trailing slash
-    url = url.rstrip('/')
-    # Remove www. prefix for comparison
-    if url.startswith('www.'):
-        url = url[4:]
-    return url.lower().strip()
+    return normalize_host(url)
 
 def get_wordpress_credentials(site_url: str) -> Optional[Dict[str, str]]:
     """
@@ -344,88 +339,17 @@ def get_wordpress_credentials(site_url: str) -> Optional[Dict[str, str]]:
     - wp_username: WordPress admin username
     - app_password: Application password (NOT regular password!)
     
-    URL matching is normalized (removes http/https, trailing slashes, www)
+    URL matching is normalized (removes http/https, trailing slashes, www).
+    Lookups go through the pooled credential service, which keeps an in-memory
+    normalized-host index (TTL + invalidation on Sites-tab edits).
     """
     try:
-        # Use same database connection pattern as dashboard routes
-        password = os.getenv("POSTGRES_PASSWORD") or "revflow2026"
-        host = os.getenv("POSTGRES_HOST", "localhost")
-        port = int(os.getenv("POSTGRES_PORT", "5432"))
-        
-        # Try Docker port if localhost
-        if host == "localhost" and port == 5432:
-            try:
-                test_conn = psycopg2.connect(
-                    host=host,
-                    port=5433,
-                    database=os.getenv("POSTGRES_DB", "revflow"),
-                    user=os.getenv("POSTGRES_USER", "revflow"),
-                    password=password,
-                    connect_timeout=2
-                )
-                test_conn.close()
-                port = 5433
-            except:
-                pass
-        
-        conn = psycopg2.connect(
-            host=host,
-            port=port,
-            database=os.getenv("POSTGRES_DB", "revflow"),
-            user=os.getenv("POSTGRES_USER", "revflow"),
-            password=password
-        )
-        cursor = conn.cursor()
-        
-        # Normalize the input URL for comparison
-        normalized_input = normalize_url(site_url)
-        
-        # Query wordpress_sites table - try exact match first, then normalized match
-        # First try exact match
-        cursor.execute("""
-            SELECT wp_username, app_password, site_url 
-            FROM wordpress_sites 
-            WHERE site_url = %s OR site_url = %s OR site_url = %s
-            LIMIT 1
-        """, (site_url, f"https://{normalized_input}", f"http://{normalized_input}"))
-        
-        row = cursor.fetchone()
-        
-        # If no exact match, try normalized comparison
-        if not row:
-            cursor.execute("""
-                SELECT wp_username, app_password, site_url 
-                FROM wordpress_sites
-            """)
-            all_rows = cursor.fetchall()
-            for db_row in all_rows:
-                db_url = db_row[2]
-                if normalize_url(db_url) == normalized_input:
-                    row = db_row
-                    break
-        
-        cursor.close()
-        conn.close()
-        
-        if row and row[0] and row[1]:  # Ensure username and password exist
-            # Use the stored site_url from database, but normalize for API URL
-            stored_url = row[2]
-            clean_url = normalize_url(stored_url)
-            
-            # Determine protocol (prefer https)
-            if stored_url.startswith('http://'):
-                protocol = 'http://'
-            else:
-                protocol = 'https://'
-            
-            return {
-                'username': row[0],
-                'password': row[1],
-                'api_url': f"{protocol}{clean_url}/wp-json/wp/v2"
-            }
-        
+        creds = get_credential_service().get(site_url)
+        if creds:
+            return creds
+
         # No credentials found
-        print(f"[WARN] No WordPress credentials found for {site_url} (normalized: {normalized_input})", flush=True)
+        print(f"[WARN] No WordPress credentials found for {site_url} (normalized: {normalize_url(site_url)})", flush=True)
         return None
     except Exception as e:
         print(f"[ERROR] Error getting WordPress credentials for {site_url}: {e}", file=sys.stderr, flush=True)
@@ -464,44 +388,61 @@ def _extract_slug_from_page_url(page_url: str) -> Optional[str]:
     return parts[-1].strip() or None
 
 
-def _find_page_id_by_slug(site_url: str, slug: str) -> Optional[int]:
-    """Find a WordPress page ID by slug on the selected site."""
-    creds = get_wordpress_credentials(site_url)
-    if not creds:
-        return None
-
+def _get_site_page_index(site_url: str):
+    """Fresh page index for a site, or None if it can't be built."""
     try:
-        response = requests.get(
-            f"{creds['api_url'].rstrip('/')}/pages",
-            params={"slug": slug, "per_page": 1, "_fields": "id"},
-            auth=(creds["username"], creds["password"]),
-            timeout=15
-        )
-        if response.status_code == 200:
-            pages = response.json()
-            if pages and isinstance(pages, list):
-                return _parse_int(pages[0].get("id"))
-        return None
-    except Exception:
+        return get_page_index_registry().get(site_url)
+    except Exception as e:
+        print(f"[WARN] Page index unavailable for {site_url}: {e}", flush=True)
         return None
 
 
-def resolve_target_page_id(row_data: Dict[str, Any], site_url: str) -> Tuple[Optional[int], Optional[str]]:
+# Passed as page_index when the caller already tried to build the site's index
+# and failed, so resolve_target_page_id doesn't crawl the site again per row.
+PAGE_INDEX_UNAVAILABLE = object()
+
+_PAGE_ID_COLUMNS = ["existing_page_id", "target_page_id", "page_id", "wp_post_id", "wordpress_page_id"]
+_PAGE_URL_COLUMNS = ["existing_page_url", "target_page_url", "page_url", "wp_page_url"]
+_PAGE_SLUG_COLUMNS = ["existing_page_slug", "target_page_slug", "page_slug", "slug"]
+
+
+def _row_needs_page_lookup(row_data: Dict[str, Any]) -> bool:
+    """True when a row can only be resolved through the site's page index."""
+    if any(_parse_int(row_data.get(col)) for col in _PAGE_ID_COLUMNS):
+        return False
+    return any(str(row_data.get(col, "")).strip() for col in _PAGE_URL_COLUMNS + _PAGE_SLUG_COLUMNS)
+
+
+def resolve_target_page_id(
+    row_data: Dict[str, Any],
+    site_url: str,
+    page_index: Any = None
+) -> Tuple[Optional[int], Optional[str]]:
     """
     Resolve a target WordPress page ID from CSV row fields.
     Priority:
     1) explicit page ID columns
-    2) page URL columns (supports ?page_id=123 and slug lookup)
+    2) page URL columns (supports ?page_id=123, full path and slug lookup)
     3) slug columns
+
+    Slug/URL lookups use the site's page index (one crawl per site, not one
+    request per row). Pass page_index to reuse an index already in hand, or
+    PAGE_INDEX_UNAVAILABLE to skip slug/URL lookups without retrying the build.
     """
-    id_columns = ["existing_page_id", "target_page_id", "page_id", "wp_post_id", "wordpress_page_id"]
-    for col in id_columns:
+    for col in _PAGE_ID_COLUMNS:
         parsed = _parse_int(row_data.get(col))
         if parsed:
             return parsed, col
 
-    url_columns = ["existing_page_url", "target_page_url", "page_url", "wp_page_url"]
-    for col in url_columns:
+    def index_for_site():
+        nonlocal page_index
+        if page_index is None:
+            page_index = _get_site_page_index(site_url)
+            if page_index is None:
+                page_index = PAGE_INDEX_UNAVAILABLE
+        return None if page_index is PAGE_INDEX_UNAVAILABLE else page_index
+
+    for col in _PAGE_URL_COLUMNS:
         raw_url = str(row_data.get(col, "")).strip()
         if not raw_url:
             continue
@@ -513,16 +454,20 @@ def resolve_target_page_id(row_data: Dict[str, Any], site_url: str) -> Tuple[Opt
 
         slug = _extract_slug_from_page_url(raw_url)
         if slug:
-            matched_id = _find_page_id_by_slug(site_url, slug)
-            if matched_id:
-                return matched_id, f"{col}:slug"
+            index = index_for_site()
+            if index is not None:
+                matched_id = index.find_by_path(parsed.path) or index.find_by_slug(slug)
+                if matched_id:
+                    return matched_id, f"{col}:slug"
 
-    slug_columns = ["existing_page_slug", "target_page_slug", "page_slug", "slug"]
-    for col in slug_columns:
+    for col in _PAGE_SLUG_COLUMNS:
         raw_slug = str(row_data.get(col, "")).strip().strip("/")
         if not raw_slug:
             continue
-        matched_id = _find_page_id_by_slug(site_url, raw_slug)
+        index = index_for_site()
+        if index is None:
+            continue
+        matched_id = index.find_by_slug(raw_slug)
         if matched_id:
             return matched_id, col
 
@@ -585,53 +530,30 @@ def collect_google_doc_urls_from_row(row_data: Dict[str, Any]) -> List[str]:
 
 
 @app.get("/api/site-pages")
-async def list_site_pages(site_url: str, per_page: int = 100):
+async def list_site_pages(site_url: str, per_page: int = 100, refresh: bool = False):
     """List pages for a registered WordPress site to support page-targeted updates."""
-    creds = get_wordpress_credentials(site_url)
-    if not creds:
-        raise HTTPException(status_code=400, detail=f"No WordPress credentials found for {site_url}")
-
     try:
-        response = requests.get(
-            f"{creds['api_url'].rstrip('/')}/pages",
-            params={
-                "per_page": per_page,
-                "orderby": "modified",
-                "order": "desc",
-                "_fields": "id,title,slug,link,status"
-            },
-            auth=(creds["username"], creds["password"]),
-            timeout=20
-        )
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=502,
-                detail=f"WordPress API returned {response.status_code}: {response.text[:180]}"
-            )
-
-        pages = response.json() if isinstance(response.json(), list) else []
-        normalized = []
-        for p in pages:
-            page_id = _parse_int(p.get("id"))
-            if not page_id:
-                continue
-            title = (p.get("title") or {}).get("rendered", "") or "(Untitled)"
-            slug = p.get("slug", "")
-            status = p.get("status", "")
-            normalized.append({
-                "id": page_id,
-                "title": title,
-                "slug": slug,
-                "status": status,
-                "link": p.get("link"),
-                "display_name": f"{title} (ID: {page_id})"
-            })
-
-        return {"status": "success", "site_url": site_url, "total": len(normalized), "pages": normalized}
-    except HTTPException:
-        raise
+        index = await asyncio.to_thread(get_page_index_registry().get, site_url, refresh)
+    except PageIndexError as e:
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch pages for {site_url}: {str(e)}")
+    if index is None:
+        raise HTTPException(status_code=400, detail=f"No WordPress credentials found for {site_url}")
+
+    normalized = []
+    for p in index.pages(limit=per_page):
+        title = p["title"] or "(Untitled)"
+        normalized.append({
+            "id": p["id"],
+            "title": title,
+            "slug": p["slug"],
+            "status": p["status"],
+            "link": p["link"],
+            "display_name": f"{title} (ID: {p['id']})"
+        })
+
+    return {"status": "success", "site_url": site_url, "total": len(normalized), "pages": normalized}
 
 
 def _count_elementor_widgets(data: Any) -> int:
@@ -2706,6 +2628,17 @@ def deploy_to_wordpress(
         return False, f"Unexpected deployment error: {str(e)[:100]}", None, None, None, None
 
 
+def _clean_import_row(row_dict: Dict[str, Any]) -> Dict[str, str]:
+    """Clean a CSV row: convert NaN/None to empty strings and strip text values."""
+    cleaned_row_dict = {}
+    for key, value in row_dict.items():
+        if value is None or pd.isna(value):
+            cleaned_row_dict[key] = ''
+        else:
+            cleaned_row_dict[key] = str(value).strip() if isinstance(value, str) else str(value)
+    return cleaned_row_dict
+
+
 @app.post("/api/import")
 async def bulk_import_csv_template(
     csv_file: UploadFile = File(...),
@@ -2718,7 +2651,10 @@ async def bulk_import_csv_template(
     preview_mode: bool = Form(False),
     post_status: str = Form("draft"),
     use_bridge_plugin: bool = Form(True),  # NEW: Use Bridge Plugin mode (HTML → Bridge Plugin converts)
-    preserve_formatting: bool = Form(True)
+    preserve_formatting: bool = Form(True),
+    stream_results: bool = Form(False),  # Stream one NDJSON line per row as it finishes
+    max_concurrency: int = Form(8, ge=1, le=MAX_CONCURRENCY),  # Rows deployed at once across all sites
+    per_site_concurrency: int = Form(2, ge=1, le=MAX_CONCURRENCY)  # Rows deployed at once against a single site
 ):
     """
     Bulk import CSV with template merging and deployment.
@@ -2729,6 +2665,10 @@ async def bulk_import_csv_template(
     - CSV-only mode with basic Elementor structure (existing)
     - Bridge Plugin mode: Send HTML, let Bridge Plugin convert to Elementor (NEW)
     - Direct Elementor JSON mode: Send Elementor JSON directly (existing)
+    - Concurrent row pipeline: fetch/merge/deploy stages overlap across rows,
+      bounded globally (max_concurrency) and per site (per_site_concurrency)
+    - Streaming: with stream_results=true, returns NDJSON ({"type": "row", ...}
+      per row in completion order, then a final {"type": "summary", ...} line)
     """
     try:
         csv_content = await csv_file.read()
@@ -2743,7 +2683,7 @@ async def bulk_import_csv_template(
         # Validate target site if provided from form
         form_selected_site = target_site.strip() if target_site and target_site.strip() else None
         if form_selected_site:
-            creds = get_wordpress_credentials(form_selected_site)
+            creds = await asyncio.to_thread(get_wordpress_credentials, form_selected_site)
             if not creds:
                 raise HTTPException(
                     status_code=400,
@@ -2786,37 +2726,22 @@ async def bulk_import_csv_template(
                 )
             )
         
-        for index, row in df.iterrows():
-            row_number = index + 1
-            row_dict = row.to_dict()
-            
-            # Clean row_dict: convert NaN/float values to empty strings
-            cleaned_row_dict = {}
-            for key, value in row_dict.items():
-                if pd.isna(value) or value is None:
-                    cleaned_row_dict[key] = ''
-                elif isinstance(value, (int, float)) and pd.isna(value):
-                    cleaned_row_dict[key] = ''
-                else:
-                    cleaned_row_dict[key] = str(value).strip() if isinstance(value, str) else str(value)
-            
-            row_dict = cleaned_row_dict
-            
-            # Get target site: use form parameter if provided, otherwise use CSV row
+        def fetch_stage(job: RowJob):
+            """Stage 1: resolve target page and fetch Google Docs (network-bound)."""
+            row_number = job.row_number
+            row_dict = job.payload["row"]
+            deployment_site = job.payload["site"]
+
             if form_selected_site:
                 # Use the selected site from the form dropdown (publish all rows to this site)
-                row_target_site = form_selected_site
-                print(f"[INFO] Row {row_number}: Using selected site from form: {row_target_site}", flush=True)
-            else:
+                print(f"[INFO] Row {row_number}: Using selected site from form: {deployment_site}", flush=True)
+            elif not deployment_site:
                 # Fallback to CSV site_url if no site selected in form
-                row_target_site = row_dict.get('site_url', '').strip()
-                if not row_target_site:
-                    results["deployments"].append({"row_number": row_number, "status": "error", "message": "Missing site_url. Either select a site in the form or include 'site_url' in CSV."})
-                    results["summary"]["failed_deployments"] += 1
-                    continue
-            
-            deployment_site = row_target_site
-            csv_target_page_id, csv_target_source = resolve_target_page_id(row_dict, deployment_site)
+                job.result = {"row_number": row_number, "status": "error", "message": "Missing site_url. Either select a site in the form or include 'site_url' in CSV."}
+                job.bump("failed_deployments")
+                return
+
+            csv_target_page_id, csv_target_source = job.payload["csv_target"]
             active_target_page_id = form_target_page_id or csv_target_page_id
             if active_target_page_id:
                 print(
@@ -2828,7 +2753,7 @@ async def bulk_import_csv_template(
                     flush=True
                 )
             elif update_selected_page_only:
-                results["deployments"].append({
+                job.result = {
                     "row_number": row_number,
                     "status": "failed",
                     "message": (
@@ -2836,19 +2761,21 @@ async def bulk_import_csv_template(
                         "existing_page_id/target_page_id/page_id in CSV."
                     ),
                     "site_info": {"site_url": deployment_site}
-                })
-                results["summary"]["failed_deployments"] += 1
-                continue
-            
+                }
+                job.bump("failed_deployments")
+                return
+            job.payload["csv_target_source"] = csv_target_source
+            job.payload["active_target_page_id"] = active_target_page_id
+
             corrections_applied = []
             if enable_smart_corrections and 'phone' in row_dict and row_dict['phone']:
                 normalized, changed = normalize_phone_number(row_dict['phone'])
                 if changed:
                     corrections_applied.append({"field": "phone", "from": row_dict['phone'], "to": normalized})
                     row_dict['phone'] = normalized
-                    results["corrections_summary"]["phone_normalized"] += 1
-                    results["summary"]["auto_corrections"] += 1
-            
+                    job.bump("phone_normalized")
+            job.payload["corrections_applied"] = corrections_applied
+
             template_html = None
             template_source = None
 
@@ -2865,13 +2792,13 @@ async def bulk_import_csv_template(
                             content_html = str(doc_content.get("content_html", "")).strip()
                             if content_html:
                                 fetched_docs_html.append(content_html)
-                                results["summary"]["google_docs_fetched"] += 1
+                                job.bump("google_docs_fetched")
                                 print(f"[OK] ROW {row_number}: Fetched Google Doc from {doc_url}", flush=True)
                             else:
-                                results["summary"]["google_docs_failed"] += 1
+                                job.bump("google_docs_failed")
                                 print(f"[WARN] ROW {row_number}: Empty Google Doc content for {doc_url}", flush=True)
                         except Exception as single_doc_error:
-                            results["summary"]["google_docs_failed"] += 1
+                            job.bump("google_docs_failed")
                             print(
                                 f"[ERROR] ROW {row_number}: Failed to fetch Google Doc {doc_url}: {str(single_doc_error)}",
                                 flush=True
@@ -2884,27 +2811,29 @@ async def bulk_import_csv_template(
                     elif uploaded_template_text:
                         template_html = uploaded_template_text
                         template_source = "Uploaded template file (fallback)"
-                    else:
-                        template_html = None
-                        template_source = None
                 except Exception as e:
                     print(f"[ERROR] ROW {row_number}: Google Docs client error: {str(e)}", flush=True)
                     if uploaded_template_text:
                         template_html = uploaded_template_text
                         template_source = "Uploaded template file (fallback)"
-                    else:
-                        template_html = None
-                        template_source = None
-            
+
             # Fallback: Use uploaded template file (priority 2, backward compatibility)
             elif uploaded_template_text:
                 template_html = uploaded_template_text
                 template_source = "Uploaded template file"
-            
+
+            job.payload["template_html"] = template_html
+            job.payload["template_source"] = template_source
+
+        def merge_stage(job: RowJob):
+            """Stage 2: merge row fields into the template and build page metadata."""
+            row_dict = job.payload["row"]
+            template_html = job.payload["template_html"]
+
             # Merge fields in template if we have one
             if template_html:
                 merged_content = merge_template_fields(template_html, row_dict)
-                content_source = template_source
+                content_source = job.payload["template_source"]
             else:
                 # Fallback: CSV-only mode - use basic HTML structure (backward compatibility)
                 merged_content = build_elementor_page_content(row_dict)
@@ -2915,71 +2844,94 @@ async def bulk_import_csv_template(
                 if pd.isna(val) or val is None:
                     return default
                 return str(val).strip() if isinstance(val, str) else str(val)
-            
+
             niche = safe_get('niche', 'Services')
             city = safe_get('city', '')
             state = safe_get('state', '')
             business_name = safe_get('business_name', '')
-            
+
             # Smart page title generation
             if business_name:
                 page_title = f"{business_name} - {niche} in {city}, {state}".strip()
             else:
                 page_title = f"Professional {niche} Services in {city}, {state}".strip()
-            
+
             page_slug = f"{niche.lower().replace(' ', '-')}-{city.lower().replace(' ', '-')}-{state.lower()}".strip('-')
-            
+
             # Prepare content for deployment
             # If using Bridge Plugin mode, send HTML directly
             # If using direct Elementor mode, build Elementor JSON
             if use_bridge_plugin:
                 # Mode 1: HTML → Bridge Plugin converts to Elementor
-                html_content = merged_content
                 elementor_data = None  # Bridge Plugin will generate this
             else:
                 # Mode 2: Direct Elementor JSON (backward compatibility)
                 elementor_data = build_elementor_json(row_dict)
-                html_content = merged_content  # Also send HTML as fallback
-            
+
+            # Prepare meta_data based on mode
+            meta_data = {
+                'excerpt': f"{niche} services in {city}, {state}",
+                'custom_meta': {
+                    'business_name': business_name,
+                    'phone': safe_get('phone', ''),
+                    'email': safe_get('email', ''),
+                    'city': city,
+                    'state': state,
+                    'niche': niche
+                }
+            }
+
+            # Add Elementor data only if NOT using Bridge Plugin mode
+            if not use_bridge_plugin and elementor_data:
+                meta_data['elementor_data'] = elementor_data
+
+            job.payload.update({
+                "html_content": merged_content,  # Also sent as fallback in direct Elementor mode
+                "content_source": content_source,
+                "page_title": page_title,
+                "page_slug": page_slug,
+                "meta_data": meta_data,
+                "site_info": {
+                    "site_url": job.payload["site"],
+                    "business_name": business_name,
+                    "niche": niche,
+                    "city": city,
+                    "state": state
+                },
+            })
+
+        def deploy_stage(job: RowJob):
+            """Stage 3: push the merged page to WordPress and build the row result."""
+            row_number = job.row_number
+            row_dict = job.payload["row"]
+            deployment_site = job.payload["site"]
+            page_title = job.payload["page_title"]
+            page_slug = job.payload["page_slug"]
+            content_source = job.payload["content_source"]
+            active_target_page_id = job.payload["active_target_page_id"]
+
             # Deploy to WordPress if not in preview mode
             wp_post_id = None
             wp_edit_url = None
             wp_permalink = None
             deployment_error = None
             deployment_diagnostics: Optional[Dict[str, Any]] = None
-            
+
             print(f"[INFO] ROW {row_number}: preview_mode={preview_mode}, target={deployment_site}, source={content_source}", flush=True)
-            
+
             if not preview_mode:
                 action_label = "UPDATING" if active_target_page_id else "DEPLOYING"
                 print(f"[RUN] {action_label} on {deployment_site}: {page_title}", flush=True)
                 print(f"   Mode: {'Bridge Plugin (HTML)' if use_bridge_plugin else 'Direct Elementor JSON'}", flush=True)
-                
-                # Prepare meta_data based on mode
-                meta_data = {
-                    'excerpt': f"{niche} services in {city}, {state}",
-                    'custom_meta': {
-                        'business_name': business_name,
-                        'phone': safe_get('phone', ''),
-                        'email': safe_get('email', ''),
-                        'city': city,
-                        'state': state,
-                        'niche': niche
-                    }
-                }
-                
-                # Add Elementor data only if NOT using Bridge Plugin mode
-                if not use_bridge_plugin and elementor_data:
-                    meta_data['elementor_data'] = elementor_data
-                
+
                 # Deploy to WordPress
                 preserve_existing_title = bool(active_target_page_id and update_selected_page_only)
                 success, error_msg, wp_post_id, wp_edit_url, wp_permalink, deployment_diagnostics = deploy_to_wordpress(
                     site_url=deployment_site,
                     title=page_title,
-                    content=html_content,  # HTML content (Bridge Plugin will convert if enabled)
+                    content=job.payload["html_content"],  # HTML content (Bridge Plugin will convert if enabled)
                     status=post_status,
-                    meta_data=meta_data,
+                    meta_data=job.payload["meta_data"],
                     use_bridge_plugin=use_bridge_plugin,  # NEW parameter
                     use_elementor=True,  # Create Elementor page
                     target_page_id=active_target_page_id,
@@ -2987,10 +2939,10 @@ async def bulk_import_csv_template(
                     preserve_existing_title=preserve_existing_title,
                     use_llm_assistance=use_llm_assistance,
                 )
-                
+
                 if not success:
                     deployment_error = error_msg
-                    results["summary"]["failed_deployments"] += 1
+                    job.bump("failed_deployments")
                     print(f"[ERROR] DEPLOYMENT FAILED for {deployment_site}: {error_msg}", flush=True)
                 else:
                     # Strict mode: never allow accidental new-page creation when update is intended.
@@ -2999,29 +2951,26 @@ async def bulk_import_csv_template(
                             f"Update mode violation: expected page ID {active_target_page_id}, "
                             f"but WordPress returned page ID {wp_post_id}."
                         )
-                        results["summary"]["failed_deployments"] += 1
+                        job.bump("failed_deployments")
                         print(f"[ERROR] {deployment_error}", flush=True)
                     else:
-                        results["summary"]["successful_deployments"] += 1
+                        job.bump("successful_deployments")
+                        if not active_target_page_id:
+                            # A new page exists now; re-probe the site's page index on next use.
+                            get_page_index_registry().mark_stale(deployment_site)
                         print(f"[OK] DEPLOYMENT SUCCESS for {deployment_site}: Post ID {wp_post_id}", flush=True)
                         print(f"   Edit URL: {wp_edit_url}", flush=True)
                         if wp_permalink:
                             print(f"   Page URL: {wp_permalink}", flush=True)
             else:
                 # Preview mode - just validation
-                results["summary"]["successful_deployments"] += 1
-            
+                job.bump("successful_deployments")
+
             # Build deployment result
             deployment_result = {
                 "row_number": row_number,
                 "status": "preview" if preview_mode else ("deployed" if wp_post_id else "failed"),
-                "site_info": {
-                    "site_url": deployment_site,
-                    "business_name": business_name,
-                    "niche": niche,
-                    "city": city,
-                    "state": state
-                },
+                "site_info": job.payload["site_info"],
                 "page_info": {
                     "title": page_title,
                     "slug": page_slug,
@@ -3032,22 +2981,102 @@ async def bulk_import_csv_template(
                     "uses_elementor": True,
                     "update_mode": bool(active_target_page_id),
                     "target_page_id": active_target_page_id,
-                    "target_page_source": "form" if form_target_page_id else (csv_target_source or None)
+                    "target_page_source": "form" if form_target_page_id else (job.payload["csv_target_source"] or None)
                 },
                 "merged_fields": {k.upper(): (str(v) if not pd.isna(v) and v is not None else '') for k, v in row_dict.items()},
-                "corrections_applied": corrections_applied,
+                "corrections_applied": job.payload["corrections_applied"],
                 "content_source": content_source,
                 "deployment_mode": "Bridge Plugin (HTML)" if use_bridge_plugin else "Direct Elementor JSON",
                 "message": "Preview only" if preview_mode else ("Deployed successfully" if wp_post_id else deployment_error)
             }
-            
+
             if deployment_error:
                 deployment_result["error"] = deployment_error
             if deployment_diagnostics:
                 deployment_result["diagnostics"] = deployment_diagnostics
-            
-            results["deployments"].append(deployment_result)
-        
+
+            job.result = deployment_result
+
+        def row_error(job: RowJob, exc: BaseException) -> Dict[str, Any]:
+            print(f"[ERROR] ROW {job.row_number}: pipeline error: {exc}", file=sys.stderr, flush=True)
+            job.bump("failed_deployments")
+            return {
+                "row_number": job.row_number,
+                "status": "error",
+                "message": f"Row failed: {str(exc)[:200]}",
+                "site_info": {"site_url": job.payload.get("site", "")}
+            }
+
+        def fold_row(job: RowJob):
+            """Fold a finished row's counters into the import summary (event loop thread only)."""
+            for counter, amount in job.stats.items():
+                if counter == "phone_normalized":
+                    results["corrections_summary"]["phone_normalized"] += amount
+                    results["summary"]["auto_corrections"] += amount
+                else:
+                    results["summary"][counter] += amount
+            if job.timings and isinstance(job.result, dict) and "row_number" in job.result:
+                job.result["timings"] = job.timings
+
+        rows = [_clean_import_row(row_dict) for row_dict in df.to_dict(orient="records")]
+        # Get target site: use form parameter if provided, otherwise use CSV row
+        row_sites = [form_selected_site or row_dict.get('site_url', '').strip() for row_dict in rows]
+
+        # Build each site's page index once (concurrently), then resolve every
+        # row's page ID/URL/slug columns against it in a single pass.
+        page_indexes: Dict[str, Any] = {}
+        if not form_target_page_id:
+            index_sites = {
+                normalize_url(site): site
+                for row_dict, site in zip(rows, row_sites)
+                if site and _row_needs_page_lookup(row_dict)
+            }
+            built = await asyncio.gather(*[
+                asyncio.to_thread(_get_site_page_index, site) for site in index_sites.values()
+            ])
+            page_indexes = dict(zip(index_sites.keys(), built))
+
+        jobs: List[RowJob] = []
+        for index, (row_dict, row_target_site) in enumerate(zip(rows, row_sites)):
+            site_key = normalize_url(row_target_site)
+            csv_target = (None, None)
+            if row_target_site and not form_target_page_id:
+                page_index = page_indexes.get(site_key)
+                csv_target = resolve_target_page_id(
+                    row_dict, row_target_site,
+                    PAGE_INDEX_UNAVAILABLE if page_index is None else page_index
+                )
+            jobs.append(RowJob(
+                row_number=index + 1,
+                site_key=site_key,
+                payload={"row": row_dict, "site": row_target_site, "csv_target": csv_target}
+            ))
+
+        engine = DeployEngine(max_concurrency=max_concurrency, per_site_concurrency=per_site_concurrency)
+        results["concurrency"] = {
+            "max_concurrency": engine.max_concurrency,
+            "per_site_concurrency": engine.per_site_concurrency
+        }
+        stages = {"fetch": fetch_stage, "merge": merge_stage, "deploy": deploy_stage, "on_error": row_error}
+
+        if stream_results:
+            async def ndjson_rows():
+                started = time.perf_counter()
+                async for job in engine.stream(jobs, **stages):
+                    fold_row(job)
+                    yield json.dumps({"type": "row", **job.result}, default=str) + "\n"
+                summary = {k: v for k, v in results.items() if k != "deployments"}
+                summary["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+                yield json.dumps({"type": "summary", **summary}, default=str) + "\n"
+
+            return StreamingResponse(ndjson_rows(), media_type="application/x-ndjson")
+
+        started = time.perf_counter()
+        for job in await engine.run(jobs, **stages):
+            fold_row(job)
+            results["deployments"].append(job.result)
+        results["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+
         return results
     except Exception as e:
         error_detail = traceback.format_exc()
@@ -0,0 +1,21 @@
+-- RevPublish migration: stored normalized_host on wordpress_sites
+--
+-- Credential lookups by URL (core/credential_service.py) use this column and
+-- its index. Adding a STORED generated column takes an ACCESS EXCLUSIVE lock
+-- and rewrites the table, so run it from a deploy step or maintenance window,
+-- never from the request path. Until it has run, the service falls back to
+-- computing the normalized host in SQL.
+--
+-- The expression must stay in sync with NORMALIZED_HOST_SQL in
+-- core/credential_service.py (setup_database.sql carries the same DDL for
+-- fresh installs).
+--
+-- Usage:
+--     psql "$DATABASE_URL" -f migrations/001_wordpress_sites_normalized_host.sql
+
+ALTER TABLE wordpress_sites
+    ADD COLUMN IF NOT EXISTS normalized_host VARCHAR(500)
+    GENERATED ALWAYS AS (lower(btrim(regexp_replace(regexp_replace(regexp_replace(
+        site_url, 'https?://', '', 'g'), '/+$', ''), '^www\.', '')))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_wordpress_sites_normalized_host ON wordpress_sites(normalized_host);
@@ -11,6 +11,7 @@ import os
 import sys
 from datetime import datetime
 from dotenv import load_dotenv
+from core.credential_service import NORMALIZED_HOST_SQL, invalidate_credentials
 
 # Load environment variables from .env file
 # Try multiple locations for .env file
@@ -46,7 +47,7 @@ def ensure_table_exists(conn):
         if not table_exists:
             print("⚠️  wordpress_sites table not found. Creating it automatically...")
             # Create the table
-            cursor.execute("""
+            cursor.execute(f"""
                 CREATE TABLE wordpress_sites (
                     id SERIAL PRIMARY KEY,
                     site_id VARCHAR(255) UNIQUE NOT NULL,
@@ -58,7 +59,8 @@ def ensure_table_exists(conn):
                     last_connection_test TIMESTAMP,
                     status VARCHAR(50) DEFAULT 'active',
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    normalized_host VARCHAR(500) GENERATED ALWAYS AS ({NORMALIZED_HOST_SQL}) STORED
                 )
             """)
             
@@ -71,6 +73,10 @@ def ensure_table_exists(conn):
                 CREATE INDEX IF NOT EXISTS idx_wordpress_sites_status 
                 ON wordpress_sites(status)
             """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_wordpress_sites_normalized_host 
+                ON wordpress_sites(normalized_host)
+            """)
             
             conn.commit()
             print("✅ wordpress_sites table created successfully")
@@ -329,6 +335,7 @@ async def update_site(
         query = f"UPDATE wordpress_sites SET {', '.join(updates)} WHERE id = %s"
         cursor.execute(query, values)
         conn.commit()
+        invalidate_credentials()
         
         # Get site details to return
         cursor.execute("""
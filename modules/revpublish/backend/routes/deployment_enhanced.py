@@ -106,6 +106,7 @@ async def configure_bulk_credentials(request: BulkCredentialsRequest):
     """Apply same credentials to multiple sites (for shared WordPress admin)"""
     try:
         from database import get_db_connection
+        from core.credential_service import invalidate_credentials
 
         with get_db_connection() as conn:
             cursor = conn.cursor()
@@ -129,6 +130,8 @@ async def configure_bulk_credentials(request: BulkCredentialsRequest):
 
             updated = [row['site_id'] for row in cursor.fetchall()]
 
+        invalidate_credentials()
+
         return {
             "success": True,
             "updated_count": len(updated),
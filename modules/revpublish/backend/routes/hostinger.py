@@ -228,6 +228,7 @@ async def sync_hostinger_websites():
         
         # Import database functions
         from routes.dashboard import get_db, ensure_table_exists
+        from core.credential_service import invalidate_credentials
         import psycopg2
         
         conn = get_db()
@@ -270,6 +271,7 @@ async def sync_hostinger_websites():
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate_credentials()
         
         return {
             "status": "success",
@@ -153,6 +153,7 @@ async def register_wordpress_site(
         
         # Store in database
         from routes.dashboard import get_db, ensure_table_exists
+        from core.credential_service import invalidate_credentials
         import psycopg2
         
         conn = get_db()
@@ -205,6 +206,7 @@ async def register_wordpress_site(
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate_credentials(site_data["site_url"])
         
         return {
             "status": "success",
@@ -20,6 +20,15 @@ CREATE TABLE IF NOT EXISTS wordpress_sites (
 CREATE INDEX IF NOT EXISTS idx_wordpress_sites_site_id ON wordpress_sites(site_id);
 CREATE INDEX IF NOT EXISTS idx_wordpress_sites_status ON wordpress_sites(status);
 
+-- Stored normalized host (protocol, trailing slashes and leading www. removed,
+-- lowercased) so credential lookups by URL can use an index.
+-- Must stay in sync with core/credential_service.py NORMALIZED_HOST_SQL.
+ALTER TABLE wordpress_sites
+    ADD COLUMN IF NOT EXISTS normalized_host VARCHAR(500)
+    GENERATED ALWAYS AS (lower(btrim(regexp_replace(regexp_replace(regexp_replace(
+        site_url, 'https?://', '', 'g'), '/+$', ''), '^www\.', '')))) STORED;
+CREATE INDEX IF NOT EXISTS idx_wordpress_sites_normalized_host ON wordpress_sites(normalized_host);
+
 -- Content Queue Table (if needed)
 CREATE TABLE IF NOT EXISTS content_queue (
     id SERIAL PRIMARY KEY,
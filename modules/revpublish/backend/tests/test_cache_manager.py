@@ -0,0 +1,288 @@
+import asyncio
+import fnmatch
+import time
+
+import pytest
+
+from core.cache_manager import AsyncCacheManager, CacheManager, CacheSerializer, LocalLRUCache
+
+
+class _FakeRedis:
+    """Just enough of redis.Redis to exercise the Redis code paths."""
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+        self.calls = []
+        self.pipelines = []
+
+    def _record(self, name):
+        self.calls.append(name)
+
+    def setex(self, key, ttl, value):
+        self._record("setex")
+        self.store[key] = value
+        self.ttls[key] = ttl
+        return True
+
+    def pttl(self, key):
+        if key not in self.store:
+            return -2
+        return int(self.ttls[key] * 1000) if key in self.ttls else -1
+
+    def get(self, key):
+        self._record("get")
+        return self.store.get(key)
+
+    def mget(self, keys):
+        self._record("mget")
+        return [self.store.get(k) for k in keys]
+
+    def delete(self, *keys):
+        self._record("delete")
+        return sum(1 for k in keys if self.store.pop(k, None) is not None)
+
+    def unlink(self, *keys):
+        self._record("unlink")
+        return self.delete(*keys)
+
+    def exists(self, key):
+        return int(key in self.store)
+
+    def scan_iter(self, match=None, count=None):
+        self._record("scan")
+        for key in list(self.store):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    def keys(self, pattern):
+        raise AssertionError("KEYS must not be used")
+
+    def pipeline(self, transaction=True):
+        fake = self
+
+        class _Pipeline:
+            def __init__(self):
+                self.ops = []
+
+            def __getattr__(self, name):
+                def queue(*args):
+                    self.ops.append((name, args))
+                    return self
+                return queue
+
+            def execute(self):
+                fake._record(f"pipeline:{len(self.ops)}")
+                fake.pipelines.append([name for name, _ in self.ops])
+                calls, fake.calls = fake.calls, []
+                try:
+                    return [getattr(_FakeRedis, name)(fake, *args) for name, args in self.ops]
+                finally:
+                    fake.calls = calls
+
+        return _Pipeline()
+
+    def info(self, section=None):
+        return {"keyspace_hits": 0, "keyspace_misses": 0}
+
+    def dbsize(self):
+        return len(self.store)
+
+
+class _FakeAsyncRedis(_FakeRedis):
+    async def setex(self, key, ttl, value):
+        return _FakeRedis.setex(self, key, ttl, value)
+
+    async def get(self, key):
+        return _FakeRedis.get(self, key)
+
+    async def mget(self, keys):
+        return _FakeRedis.mget(self, keys)
+
+    async def unlink(self, *keys):
+        self._record("unlink")
+        return _FakeRedis.delete(self, *keys)
+
+    async def scan_iter(self, match=None, count=None):
+        for key in _FakeRedis.scan_iter(self, match=match, count=count):
+            yield key
+
+    def pipeline(self, transaction=True):
+        pipe = _FakeRedis.pipeline(self, transaction)
+        sync_execute = pipe.execute
+
+        async def execute():
+            return sync_execute()
+
+        pipe.execute = execute
+        return pipe
+
+
+class TestLocalLRUCache:
+    def test_evicts_least_recently_used(self):
+        lru = LocalLRUCache(max_entries=2)
+        lru.set("a", 1, 60)
+        lru.set("b", 2, 60)
+        lru.get("a")
+        lru.set("c", 3, 60)
+        assert lru.get("b") == (False, None)
+        assert lru.get("a") == (True, 1)
+        assert lru.evictions == 1
+
+    def test_expired_entries_are_dropped(self):
+        lru = LocalLRUCache()
+        lru.set("a", 1, 0.01)
+        time.sleep(0.02)
+        assert lru.get("a") == (False, None)
+        assert len(lru) == 0
+
+
+class TestCacheManagerMemory:
+    def setup_method(self):
+        self.cache = CacheManager(redis_port=1, local_max_entries=100)
+        self.cache.use_redis = False
+
+    def test_roundtrip_and_copy_semantics(self):
+        value = {"domain": "example.com", "pages": [1, 2]}
+        assert self.cache.set("site", value, namespace="cfg")
+        value["pages"].append(3)
+        assert self.cache.get("site", namespace="cfg") == {"domain": "example.com", "pages": [1, 2]}
+
+    def test_bulk_ops_and_namespace_clear(self):
+        assert self.cache.set_many({"a": 1, "b": 2}, namespace="ns") == 2
+        self.cache.set("c", 3, namespace="other")
+        assert self.cache.get_many(["a", "b", "z"], namespace="ns") == {"a": 1, "b": 2, "z": None}
+        assert self.cache.clear(namespace="ns") == 2
+        assert self.cache.get("a", namespace="ns") is None
+        assert self.cache.get("c", namespace="other") == 3
+
+    def test_memory_fallback_is_bounded(self):
+        for i in range(250):
+            self.cache.set(f"k{i}", i)
+        assert len(self.cache.local) == 100
+
+    def test_stats_expose_counters_and_latency(self):
+        self.cache.set("a", 1)
+        self.cache.get("a")
+        self.cache.get("missing")
+        stats = self.cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 50.0
+        assert stats["client"]["latency_ms"]["get"]["count"] == 2
+
+
+class TestCacheManagerRedis:
+    def setup_method(self):
+        self.redis = _FakeRedis()
+        self.cache = CacheManager(redis_client=self.redis)
+
+    def test_set_many_is_one_pipeline(self):
+        assert self.cache.set_many({f"k{i}": i for i in range(50)}, namespace="ns") == 50
+        assert self.redis.calls == ["pipeline:50"]
+
+    def test_get_many_uses_single_mget_for_remote_keys(self):
+        self.redis.store["ns:a"] = b"1"
+        self.redis.store["ns:b"] = b'{"x": 2}'
+        result = self.cache.get_many(["a", "b", "c"], namespace="ns")
+        assert result == {"a": 1, "b": {"x": 2}, "c": None}
+        # One round trip: MGET plus a PTTL per key
+        assert self.redis.calls == ["pipeline:4"]
+        assert self.redis.pipelines == [["mget", "pttl", "pttl", "pttl"]]
+        # Second read is served entirely by the local tier.
+        self.cache.get_many(["a", "b"], namespace="ns")
+        assert self.redis.calls == ["pipeline:4"]
+
+    def test_local_copy_never_outlives_redis_ttl(self):
+        self.redis.setex("ns:short", 5, b"1")
+        self.redis.store["ns:forever"] = b"2"
+        assert self.cache.get("short", namespace="ns") == 1
+        assert self.cache.get_many(["forever"], namespace="ns") == {"forever": 2}
+
+        now = time.time()
+        short_expiry = self.cache.local._data["ns:short"][1]
+        forever_expiry = self.cache.local._data["ns:forever"][1]
+        assert now + 4 < short_expiry <= now + 5
+        assert now + self.cache.local_ttl - 1 < forever_expiry <= now + self.cache.local_ttl
+
+    def test_clear_namespace_uses_scan_and_unlink(self):
+        for i in range(3):
+            self.redis.store[f"ns:{i}"] = b"1"
+        self.redis.store["keep:1"] = b"1"
+        assert self.cache.clear(namespace="ns") == 3
+        assert "scan" in self.redis.calls and "unlink" in self.redis.calls
+        assert list(self.redis.store) == ["keep:1"]
+
+
+class TestAsyncCacheManager:
+    def test_bulk_ops_against_redis(self):
+        redis = _FakeAsyncRedis()
+        cache = AsyncCacheManager(redis_client=redis)
+
+        async def scenario():
+            assert await cache.set_many({"a": 1, "b": 2}, namespace="ns") == 2
+            cache.local.clear()
+            got = await cache.get_many(["a", "b", "c"], namespace="ns")
+            cleared = await cache.clear(namespace="ns")
+            stats = await cache.get_stats()
+            return got, cleared, stats
+
+        got, cleared, stats = asyncio.run(scenario())
+        assert got == {"a": 1, "b": 2, "c": None}
+        assert cleared == 2
+        assert redis.pipelines[-1] == ["mget", "pttl", "pttl", "pttl"]
+        assert stats["client"]["redis_hits"] == 2
+
+    def test_memory_mode(self):
+        cache = AsyncCacheManager()
+
+        async def scenario():
+            await cache.set("a", {"v": 1}, ttl=60)
+            return await cache.get("a"), await cache.get("b", default="x")
+
+        assert asyncio.run(scenario()) == ({"v": 1}, "x")
+
+
+def test_serializer_falls_back_to_json():
+    serializer = CacheSerializer("json")
+    assert serializer.loads(serializer.dumps({"a": [1, 2]})) == {"a": [1, 2]}
+
+
+def test_serializer_defaults_to_json(monkeypatch):
+    monkeypatch.delenv("REVPUBLISH_CACHE_SERIALIZER", raising=False)
+    assert CacheSerializer().name == "json"
+
+
+def test_orjson_keeps_non_str_keys():
+    pytest.importorskip("orjson")
+    serializer = CacheSerializer("orjson")
+    assert serializer.name == "orjson"
+    assert serializer.loads(serializer.dumps({1: "a", "b": [2]})) == {"1": "a", "b": [2]}
+
+
+class TestUnserializableValues:
+    def test_set_skips_and_drops_the_stale_value(self):
+        cache = CacheManager(redis_client=_FakeRedis())
+        cache.set("k", {"v": 1}, ttl=60)
+        assert cache.set("k", {"v": object()}, ttl=60) is False
+        assert cache.get("k", default="missing") == "missing"
+        assert cache.get_stats()["client"]["serialize_errors"] == 1
+
+    def test_set_many_caches_the_rest(self):
+        cache = CacheManager(redis_port=1)
+        cache.use_redis = False
+        assert cache.set_many({"a": 1, "b": {1, 2}}, ttl=60) == 1
+        assert cache.get_many(["a", "b"]) == {"a": 1, "b": None}
+
+    def test_async_set_skips(self):
+        cache = AsyncCacheManager()
+
+        async def scenario():
+            stored = await cache.set("k", object(), ttl=60)
+            return stored, await cache.get("k", default="missing")
+
+        assert asyncio.run(scenario()) == (False, "missing")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
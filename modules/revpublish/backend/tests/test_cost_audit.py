@@ -0,0 +1,132 @@
+import threading
+
+import pytest
+
+from core.cost_audit import AUDIT_COLUMNS, CostAuditWriter, build_audit_row
+
+
+class _FakeConn:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _RecordingWriter(CostAuditWriter):
+    """CostAuditWriter with the database swapped for an in-memory list."""
+
+    def __init__(self, *args, fail=False, **kwargs):
+        self.batches = []
+        self.fail = fail
+        self.connects = 0
+        self.lock = threading.Lock()
+        super().__init__("postgresql://test", *args, **kwargs)
+
+    def _connect(self):
+        self.connects += 1
+        if self.fail:
+            raise ConnectionError("database is down")
+        return _FakeConn()
+
+    def _write_batch(self, conn, rows):
+        if self.fail:
+            raise ConnectionError("connection lost")
+        if any(row[AUDIT_COLUMNS.index("endpoint")] == "bad" for row in rows):
+            raise ValueError("invalid input syntax for type numeric")
+        with self.lock:
+            self.batches.append(list(rows))
+
+
+def _event(i):
+    return {"service": "dataforseo", "operation": f"op{i}", "cost": 0.01,
+            "usage": {"prompt_tokens": 5}, "priority": "HIGH"}
+
+
+class TestBuildAuditRow:
+    def test_maps_event_to_columns(self):
+        row = dict(zip(AUDIT_COLUMNS, build_audit_row(_event(1))))
+        assert row["service_name"] == "dataforseo"
+        assert row["endpoint"] == "op1"
+        assert row["input_tokens"] == 5
+        assert row["priority_level"] == 2
+        assert row["status_code"] == "SUCCESS"
+
+
+class TestCostAuditWriter:
+    def test_batches_by_size(self, tmp_path):
+        writer = _RecordingWriter(batch_size=10, flush_interval=0.1, spool_path=str(tmp_path / "spool.jsonl"))
+        for i in range(25):
+            writer.record(_event(i))
+        assert writer.flush(timeout=10)
+        writer.close()
+        assert sum(len(b) for b in writer.batches) == 25
+        assert max(len(b) for b in writer.batches) == 10
+        assert writer.get_stats()["written"] == 25
+
+    def test_flushes_on_interval(self, tmp_path):
+        writer = _RecordingWriter(batch_size=1000, flush_interval=0.05, spool_path=str(tmp_path / "spool.jsonl"))
+        writer.record(_event(1))
+        assert writer.flush(timeout=5)
+        assert len(writer.batches) == 1
+        writer.close()
+
+    def test_spools_when_database_is_down_and_replays(self, tmp_path):
+        spool = str(tmp_path / "spool.jsonl")
+        writer = _RecordingWriter(batch_size=5, flush_interval=0.01, spool_path=spool, retry_interval=0)
+        writer.fail = True
+        for i in range(7):
+            writer.record(_event(i))
+        assert writer.flush(timeout=5)
+        stats = writer.get_stats()
+        assert stats["spooled"] == 7
+        assert stats["spool_depth"] == 7
+        assert writer.batches == []
+
+        writer.fail = False
+        writer.record(_event(99))
+        assert writer.flush(timeout=5)
+        writer.close()
+        endpoints = [row[AUDIT_COLUMNS.index("endpoint")] for batch in writer.batches for row in batch]
+        assert endpoints[-1] == "op99"
+        assert sorted(endpoints[:-1]) == sorted(f"op{i}" for i in range(7))
+        assert writer.get_stats()["spool_depth"] == 0
+        assert writer.get_stats()["replayed"] == 7
+
+    def test_overflow_spools_instead_of_blocking(self, tmp_path):
+        writer = _RecordingWriter(max_queue=1, spool_path=str(tmp_path / "spool.jsonl"))
+        writer.close()
+        writer.record(_event(1))
+        assert writer.get_stats()["spooled"] == 1
+        assert writer.get_stats()["pending"] == 0
+
+    def test_rejected_row_does_not_poison_later_flushes(self, tmp_path):
+        spool = tmp_path / "spool.jsonl"
+        writer = _RecordingWriter(batch_size=3, flush_interval=0.01, spool_path=str(spool))
+        writer.record(_event(1))
+        writer.record({**_event(2), "operation": "bad"})
+        writer.record(_event(3))
+        assert writer.flush(timeout=5)
+        writer.record(_event(4))
+        assert writer.flush(timeout=5)
+        writer.close()
+
+        endpoints = [row[AUDIT_COLUMNS.index("endpoint")] for batch in writer.batches for row in batch]
+        assert endpoints == ["op1", "op3", "op4"]
+        stats = writer.get_stats()
+        assert stats["rejected"] == 1
+        assert stats["spool_depth"] == 0
+        assert not spool.exists()
+        assert '"bad"' in (tmp_path / "spool_rejected.jsonl").read_text()
+
+    def test_no_writer_thread_without_database(self, tmp_path):
+        writer = CostAuditWriter(None, spool_path=str(tmp_path / "spool.jsonl"))
+        assert writer._thread is None
+        writer.record(_event(1))
+        assert writer.get_stats()["spooled"] == 1
+        assert writer.flush(timeout=1)
+        writer.close()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,101 @@
+import pytest
+
+from core.credential_service import WordPressCredentialService, normalize_host
+
+
+class _FakeCredentialService(WordPressCredentialService):
+    """Credential service backed by an in-memory table instead of PostgreSQL."""
+
+    def __init__(self, rows, **kwargs):
+        super().__init__(**kwargs)
+        self.rows = list(rows)
+        self.load_calls = 0
+        self.host_queries = []
+
+    def _load_rows(self):
+        self.load_calls += 1
+        return list(self.rows)
+
+    def _query_host(self, host):
+        self.host_queries.append(host)
+        for row in self.rows:
+            if normalize_host(row[2]) == host:
+                return row
+        return None
+
+
+class TestCredentialService:
+    def setup_method(self):
+        self.service = _FakeCredentialService([
+            ("admin", "app-pass-1", "https://www.DallasPlumber.com/"),
+            ("editor", "app-pass-2", "http://austin-hvac.com"),
+            (None, None, "https://pending-site.com"),
+        ])
+
+    def test_normalize_host(self):
+        assert normalize_host("https://www.Example.com///") == "example.com"
+        assert normalize_host("http://example.com/blog/") == "example.com/blog"
+        assert normalize_host("") == ""
+
+    def test_lookup_matches_any_url_variant(self):
+        for variant in ("dallasplumber.com", "https://dallasplumber.com", "http://www.dallasplumber.com/"):
+            creds = self.service.get(variant)
+            assert creds == {
+                "username": "admin",
+                "password": "app-pass-1",
+                "api_url": "https://dallasplumber.com/wp-json/wp/v2",
+            }
+        assert self.service.get("austin-hvac.com")["api_url"] == "http://austin-hvac.com/wp-json/wp/v2"
+
+    def test_repeated_lookups_load_once(self):
+        for _ in range(50):
+            self.service.get("https://dallasplumber.com")
+        assert self.service.load_calls == 1
+        assert self.service.host_queries == []
+        assert self.service.get_stats()["hits"] == 50
+
+    def test_site_without_credentials_returns_none(self):
+        assert self.service.get("pending-site.com") is None
+        assert self.service.host_queries == []
+
+    def test_unknown_site_is_negatively_cached(self):
+        assert self.service.get("unknown.com") is None
+        assert self.service.get("unknown.com") is None
+        assert self.service.host_queries == ["unknown.com"]
+
+    def test_unknown_site_is_found_after_miss_ttl(self):
+        assert self.service.get("late-site.com") is None
+        self.service.rows.append(("admin", "late-pass", "https://late-site.com"))
+        assert self.service.get("late-site.com") is None
+
+        self.service._misses["late-site.com"] -= self.service.miss_ttl
+        assert self.service.get("late-site.com")["password"] == "late-pass"
+        assert self.service.host_queries == ["late-site.com", "late-site.com"]
+
+    def test_invalidate_picks_up_new_site(self):
+        assert self.service.get("new-site.com") is None
+        self.service.rows.append(("admin", "new-pass", "https://new-site.com"))
+        self.service.invalidate("new-site.com")
+        assert self.service.get("new-site.com")["password"] == "new-pass"
+
+    def test_full_invalidate_reloads_index(self):
+        self.service.get("dallasplumber.com")
+        self.service.rows[0] = ("admin", "rotated", "https://www.dallasplumber.com/")
+        self.service.invalidate()
+        assert self.service.get("dallasplumber.com")["password"] == "rotated"
+        assert self.service.load_calls == 2
+
+    def test_ttl_expiry_reloads(self):
+        service = _FakeCredentialService(self.service.rows, ttl=0)
+        service.get("dallasplumber.com")
+        service.get("dallasplumber.com")
+        assert service.load_calls == 2
+
+    def test_returned_dict_is_a_copy(self):
+        creds = self.service.get("dallasplumber.com")
+        creds["password"] = "mutated"
+        assert self.service.get("dallasplumber.com")["password"] == "app-pass-1"
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.deploy_engine import MAX_CONCURRENCY, DeployEngine, RowJob
+
+
+class _Gauge:
+    """Tracks peak concurrent entries, globally and per key."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = {}
+        self.peak = {}
+
+    def enter(self, key):
+        with self.lock:
+            self.current[key] = self.current.get(key, 0) + 1
+            self.peak[key] = max(self.peak.get(key, 0), self.current[key])
+
+    def leave(self, key):
+        with self.lock:
+            self.current[key] -= 1
+
+
+def _jobs(sites, rows_per_site):
+    jobs = []
+    n = 0
+    for site in sites:
+        for _ in range(rows_per_site):
+            n += 1
+            jobs.append(RowJob(row_number=n, site_key=site, payload={"site": site}))
+    return jobs
+
+
+class TestDeployEngine:
+    def test_limits_are_clamped(self):
+        engine = DeployEngine(max_concurrency=10_000, per_site_concurrency=0, fetch_concurrency=10_000)
+
+        assert engine.max_concurrency == MAX_CONCURRENCY
+        assert engine.fetch_concurrency == MAX_CONCURRENCY
+        assert engine.per_site_concurrency == 1
+
+    def test_global_and_per_site_limits(self):
+        gauge = _Gauge()
+
+        def deploy(job):
+            gauge.enter("all")
+            gauge.enter(job.site_key)
+            time.sleep(0.02)
+            gauge.leave(job.site_key)
+            gauge.leave("all")
+            job.result = {"row_number": job.row_number, "status": "deployed"}
+
+        engine = DeployEngine(max_concurrency=4, per_site_concurrency=2)
+        done = asyncio.run(engine.run(_jobs(["a.com", "b.com", "c.com"], 6), deploy=deploy))
+
+        assert [j.row_number for j in done] == list(range(1, 19))
+        assert gauge.peak["all"] <= 4
+        assert all(gauge.peak[s] <= 2 for s in ("a.com", "b.com", "c.com"))
+        assert gauge.peak["all"] > 1
+
+    def test_stages_overlap_across_rows(self):
+        spans = {"fetch": [], "deploy": []}
+
+        def timed(stage):
+            def run(job):
+                started = time.perf_counter()
+                time.sleep(0.03)
+                spans[stage].append((started, time.perf_counter()))
+                if stage == "deploy":
+                    job.result = {"row_number": job.row_number}
+            return run
+
+        engine = DeployEngine(max_concurrency=2, per_site_concurrency=1, fetch_concurrency=4)
+        asyncio.run(engine.run(_jobs(["a.com"], 8), fetch=timed("fetch"), deploy=timed("deploy")))
+        overlapping = [
+            (f, d) for f in spans["fetch"] for d in spans["deploy"]
+            if min(f[1], d[1]) - max(f[0], d[0]) > 0.01
+        ]
+        assert overlapping
+
+    def test_early_result_skips_remaining_stages(self):
+        calls = []
+
+        def fetch(job):
+            if job.row_number == 1:
+                job.result = {"row_number": 1, "status": "failed"}
+                job.bump("failed_deployments")
+
+        def deploy(job):
+            calls.append(job.row_number)
+            job.result = {"row_number": job.row_number, "status": "deployed"}
+
+        done = asyncio.run(DeployEngine().run(_jobs(["a.com"], 2), fetch=fetch, deploy=deploy))
+        assert calls == [2]
+        assert done[0].result["status"] == "failed"
+        assert done[0].stats == {"failed_deployments": 1}
+
+    def test_stage_exception_uses_on_error(self):
+        def merge(job):
+            raise ValueError("bad template")
+
+        def on_error(job, exc):
+            return {"row_number": job.row_number, "status": "error", "message": str(exc)}
+
+        done = asyncio.run(DeployEngine().run(_jobs(["a.com"], 1), merge=merge, on_error=on_error))
+        assert done[0].result == {"row_number": 1, "status": "error", "message": "bad template"}
+
+    def test_stream_yields_in_completion_order(self):
+        def deploy(job):
+            time.sleep(0.05 if job.row_number == 1 else 0.0)
+            job.result = {"row_number": job.row_number}
+
+        async def collect():
+            engine = DeployEngine(max_concurrency=4, per_site_concurrency=4)
+            return [j.row_number async for j in engine.stream(_jobs(["a.com"], 3), deploy=deploy)]
+
+        order = asyncio.run(collect())
+        assert sorted(order) == [1, 2, 3]
+        assert order[-1] == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
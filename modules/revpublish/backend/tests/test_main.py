@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("aiohttp")
+
+
+def test_app_imports_and_mounts_routes():
+    """Smoke test: every router main.py includes must import cleanly."""
+    import main
+
+    paths = main.app.openapi()["paths"]
+    assert "/api/sites" in paths
+    assert "/api/dashboard-stats" in paths
+
+
+def test_resolve_target_page_id_respects_unavailable_index(monkeypatch):
+    import main
+
+    calls = []
+    monkeypatch.setattr(main, "_get_site_page_index", lambda site_url: calls.append(site_url))
+    row = {"page_slug": "about-us"}
+
+    assert main.resolve_target_page_id(row, "https://example.com", main.PAGE_INDEX_UNAVAILABLE) == (None, None)
+    assert calls == []
+
+    # None still means "build it here"; a failed build is remembered for the row
+    assert main.resolve_target_page_id({**row, "page_url": "https://example.com/about/"}, "https://example.com") == (None, None)
+    assert calls == ["https://example.com"]
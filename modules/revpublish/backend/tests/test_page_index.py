@@ -0,0 +1,123 @@
+import pytest
+
+from core.page_index import PageIndexError, PageIndexRegistry, SitePageIndex
+
+CREDS = {"username": "admin", "password": "pw", "api_url": "https://example.com/wp-json/wp/v2"}
+
+
+class _Response:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+        self.text = str(body)
+
+    def json(self):
+        return self._body
+
+
+class _FakeWordPress:
+    """Serves /pages like the WP REST API: paginated, newest-modified first."""
+
+    def __init__(self, count):
+        self.pages = [
+            {"id": i, "slug": f"page-{i}", "link": f"https://example.com/services/page-{i}/",
+             "title": {"rendered": f"Page {i}"}, "status": "publish", "modified": f"2026-01-01T00:{i % 60:02d}:00"}
+            for i in range(1, count + 1)
+        ]
+        self.calls = []
+        self.not_modified = 0
+
+    def get(self, url, params=None, headers=None, auth=None, timeout=None):
+        self.calls.append(dict(params or {}))
+        per_page = params["per_page"]
+        page = params.get("page", 1)
+        ordered = sorted(self.pages, key=lambda p: p["modified"], reverse=True)
+        chunk = ordered[(page - 1) * per_page: page * per_page]
+        total_pages = max(1, -(-len(ordered) // per_page))
+        # Like WordPress, the ETag is a hash of this response's body
+        etag = f'"{hash(repr((sorted(params.items()), chunk, len(ordered))))}"'
+        if headers and headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return _Response(304)
+        return _Response(200, chunk, {
+            "X-WP-Total": str(len(ordered)),
+            "X-WP-TotalPages": str(total_pages),
+            "ETag": etag,
+        })
+
+
+class TestSitePageIndex:
+    def test_build_paginates_all_pages(self):
+        wp = _FakeWordPress(250)
+        index = SitePageIndex("example.com", CREDS, session=wp)
+        index.ensure_fresh()
+        assert len(index) == 250
+        assert [c["page"] for c in wp.calls] == [1, 2, 3]
+        assert all(c["_fields"] == "id,slug,link,title,status,modified" for c in wp.calls)
+
+    def test_lookups_are_local(self):
+        wp = _FakeWordPress(120)
+        index = SitePageIndex("example.com", CREDS, session=wp)
+        index.ensure_fresh()
+        calls = len(wp.calls)
+        assert index.find_by_slug("page-42") == 42
+        assert index.find_by_slug("/PAGE-7/") == 7
+        assert index.find_by_path("/services/page-99/") == 99
+        assert index.find_by_slug("missing") is None
+        assert len(wp.calls) == calls
+
+    def test_pages_sorted_by_modified_with_limit(self):
+        index = SitePageIndex("example.com", CREDS, session=_FakeWordPress(5))
+        index.ensure_fresh()
+        pages = index.pages(limit=2)
+        assert len(pages) == 2
+        assert pages[0]["modified"] >= pages[1]["modified"]
+        assert pages[0]["title"].startswith("Page ")
+
+    def test_unchanged_site_is_not_recrawled(self):
+        wp = _FakeWordPress(10)
+        index = SitePageIndex("example.com", CREDS, session=wp, ttl=0)
+        for _ in range(3):
+            index.ensure_fresh()
+        assert index.stats["builds"] == 1
+        assert index.stats["probe_unchanged"] == 2
+        # The first probe learns its own ETag; later probes get a 304
+        assert wp.not_modified == 1
+
+    def test_changed_site_is_recrawled(self):
+        wp = _FakeWordPress(10)
+        index = SitePageIndex("example.com", CREDS, session=wp, ttl=0)
+        index.ensure_fresh()
+        index.ensure_fresh()
+        wp.pages.append({"id": 11, "slug": "new-page", "link": "https://example.com/new-page/",
+                         "title": {"rendered": "New"}, "status": "publish", "modified": "2026-02-01T00:00:00"})
+        index.ensure_fresh()
+        assert index.stats["builds"] == 2
+        assert index.find_by_slug("new-page") == 11
+
+    def test_api_error_raises(self):
+        class _Down:
+            def get(self, *args, **kwargs):
+                return _Response(401, {"code": "rest_forbidden"})
+
+        with pytest.raises(PageIndexError):
+            SitePageIndex("example.com", CREDS, session=_Down()).ensure_fresh()
+
+
+class TestPageIndexRegistry:
+    def test_one_index_per_normalized_site(self):
+        wp = _FakeWordPress(3)
+        registry = PageIndexRegistry(credentials_func=lambda url: CREDS, session_factory=lambda: wp)
+        a = registry.get("https://www.example.com/")
+        b = registry.get("example.com")
+        assert a is b
+        assert a.stats["builds"] == 1
+
+    def test_site_without_credentials(self):
+        registry = PageIndexRegistry(credentials_func=lambda url: None)
+        assert registry.get("nocreds.com") is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
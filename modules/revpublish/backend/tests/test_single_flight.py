@@ -0,0 +1,148 @@
+import threading
+import time
+
+import pytest
+
+from core.single_flight import SingleFlight
+
+
+def _run_concurrently(count, target):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self):
+        flights = SingleFlight()
+        calls = []
+
+        def upstream():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"keyword": "plumber", "volume": 100}
+
+        results = _run_concurrently(8, lambda: flights.do("kw", upstream))
+        assert len(calls) == 1
+        assert all(r[0] == {"keyword": "plumber", "volume": 100} for r in results)
+        assert sum(1 for r in results if not r[1]) == 1
+        stats = flights.get_stats()
+        assert stats["leaders"] == 1
+        assert stats["coalesced"] == 7
+        assert stats["in_flight"] == 0
+
+    def test_distinct_keys_do_not_coalesce(self):
+        flights = SingleFlight()
+        assert flights.do("a", lambda: 1) == (1, False)
+        assert flights.do("b", lambda: 2) == (2, False)
+        assert flights.do("a", lambda: 3) == (3, False)
+
+    def test_leader_error_propagates_to_followers(self):
+        flights = SingleFlight()
+
+        def upstream():
+            time.sleep(0.1)
+            raise RuntimeError("rate limited")
+
+        results = _run_concurrently(4, lambda: flights.do("kw", upstream))
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flights.get_stats()["errors"] == 1
+        assert not flights.in_flight("kw")
+
+    def test_follower_timeout(self):
+        flights = SingleFlight()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            time.sleep(0.2)
+            return "done"
+
+        leader = threading.Thread(target=flights.do, args=("kw", slow))
+        leader.start()
+        started.wait()
+        with pytest.raises(TimeoutError):
+            flights.do("kw", lambda: "unused", timeout=0.01)
+        leader.join()
+
+
+class TestBackgroundRevalidation:
+    def test_concurrent_stale_hits_start_one_refresh(self):
+        api_orchestrator = pytest.importorskip("core.api_orchestrator")
+        orchestrator = object.__new__(api_orchestrator.APIOrchestrator)
+        orchestrator._inflight = SingleFlight()
+        orchestrator._revalidating = set()
+        orchestrator._flight_lock = threading.Lock()
+        orchestrator._flight_stats = {"stale_served": 0, "revalidations": 0, "revalidation_errors": 0}
+        calls = []
+        release = threading.Event()
+
+        def fetch_and_store(*args):
+            calls.append(args[0])
+            release.wait(1)
+            return {"volume": 100}
+
+        orchestrator._fetch_and_store = fetch_and_store
+        _run_concurrently(16, lambda: orchestrator._revalidate_in_background(
+            "kw", "dataforseo", "search_volume", {}, None, "normal", 60, 300
+        ))
+        release.set()
+        deadline = time.time() + 1
+        while orchestrator._flight_snapshot()["revalidating"] and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert calls == ["kw"]
+        stats = orchestrator._flight_snapshot()
+        assert stats["revalidations"] == 1
+        assert stats["revalidating"] == 0
+
+    def test_responses_do_not_expose_fresh_until(self):
+        api_orchestrator = pytest.importorskip("core.api_orchestrator")
+        orchestrator = object.__new__(api_orchestrator.APIOrchestrator)
+        orchestrator._inflight = SingleFlight()
+        orchestrator._revalidating = set()
+        orchestrator._flight_lock = threading.Lock()
+        orchestrator._flight_stats = {"stale_served": 0, "revalidations": 0, "revalidation_errors": 0}
+        orchestrator.stale_ttl = 300
+        stored = {}
+
+        class _Cache:
+            def get(self, key, namespace=None):
+                return stored.get(key)
+
+            def set(self, key, value, ttl=None, namespace=None):
+                stored[key] = value
+
+        orchestrator.cache = _Cache()
+        orchestrator._log_to_database = lambda **kwargs: None
+        orchestrator._route_to_client = lambda *args: {"volume": 100, "cost": 0.01}
+        orchestrator._revalidate_in_background = lambda *args: None
+
+        miss = orchestrator.call_api("dataforseo", "search_volume", {"kw": "plumber"})
+        hit = orchestrator.call_api("dataforseo", "search_volume", {"kw": "plumber"})
+        (key,) = stored
+        stored[key]["fresh_until"] = time.time() - 1
+        stale = orchestrator.call_api("dataforseo", "search_volume", {"kw": "plumber"})
+
+        assert "fresh_until" in stored[key]
+        assert hit["cache_hit"] and stale["stale"]
+        for response in (miss, hit, stale):
+            assert response["volume"] == 100
+            assert "fresh_until" not in response
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,133 @@
+"""
+RevRank Market Index Benchmark - grid radius / top-k vs. linear scan
+
+Builds a MarketIndex over a synthetic catalog (random cities scattered around
+a few state centres, no external data needed), then times:
+
+    build         scoring every (category, city) and building the grid
+    radius        GeoGrid.within() vs. checking every market
+    top_k         sorted-list heap merge vs. sorting every candidate
+    top_k radius  top_k() restricted to a radius query
+
+Usage (from backend/):
+    python benchmarks/bench_market_index.py --cities 20000 --queries 300
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.market_index import MarketIndex, haversine_miles  # noqa: E402
+
+STATES = {
+    "TX": (31.5, -97.5),
+    "FL": (28.0, -81.7),
+    "AZ": (33.5, -112.0),
+    "GA": (33.5, -84.4),
+    "CA": (36.5, -119.5),
+    "NC": (35.5, -79.5),
+}
+CATEGORIES = [f"Category {i}" for i in range(12)]
+
+
+def random_markets(rng, cities):
+    markets = {state: {"cities": []} for state in STATES}
+    for i in range(cities):
+        state = rng.choice(list(STATES))
+        lat0, lng0 = STATES[state]
+        markets[state]["cities"].append({
+            "city": f"City {i}",
+            "population": rng.randrange(10000, 400000),
+            "competition": rng.choice(["very_low", "low", "moderate", "high", "very_high"]),
+            "lat": lat0 + rng.gauss(0, 1.5),
+            "lng": lng0 + rng.gauss(0, 1.5),
+        })
+    return markets
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{name:<28} p50 {statistics.median(samples):9.3f} ms   p95 {p95:9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Market index benchmark")
+    parser.add_argument("--cities", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--radius", type=float, default=50)
+    parser.add_argument("--cell-degrees", type=float, default=0.5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    markets = random_markets(rng, args.cities)
+    categories = {c: {} for c in CATEGORIES}
+    scores = {}
+
+    def scorer(category, city_data, state_data):
+        return scores.setdefault((category, city_data["city"]), round(rng.uniform(1, 5), 2))
+
+    start = time.perf_counter()
+    index = MarketIndex(markets, categories, scorer=scorer, cell_degrees=args.cell_degrees)
+    print(f"build: {args.cities} cities x {len(CATEGORIES)} categories in {time.perf_counter() - start:.2f} s")
+
+    all_markets = [
+        ((state, i), city["lat"], city["lng"])
+        for state, data in markets.items() for i, city in enumerate(data["cities"])
+    ]
+    points = []
+    for _ in range(args.queries):
+        lat0, lng0 = STATES[rng.choice(list(STATES))]
+        points.append((lat0 + rng.uniform(-2, 2), lng0 + rng.uniform(-2, 2)))
+
+    def scan(lat, lng):
+        return {
+            key: d for key, mlat, mlng in all_markets
+            for d in (haversine_miles(lat, lng, mlat, mlng),) if d <= args.radius
+        }
+
+    query = iter(points * 2)
+    report(f"radius {args.radius:g} mi (grid)", timed(lambda: index.nearby(*next(query), args.radius), args.queries))
+    report(f"radius {args.radius:g} mi (linear scan)", timed(lambda: scan(*next(query)), min(args.queries, 30)))
+    for lat, lng in points[:30]:
+        assert set(index.nearby(lat, lng, args.radius)) == set(scan(lat, lng))
+
+    def accept(key):
+        return index.city(key)["competition"] in ("very_low", "low", "moderate")
+
+    chosen = CATEGORIES[:4]
+
+    def full_sort():
+        candidates = [
+            e for c in chosen for e in index.by_category[c]
+            if e.score >= 3.5 and accept(e.market)
+        ]
+        return sorted(candidates, key=lambda e: (-e.score, e.order))[:50]
+
+    report("top_k 50 (heap merge)", timed(lambda: index.top_k(chosen, 50, 3.5, accept), args.queries))
+    report("top_k 50 (full sort)", timed(full_sort, min(args.queries, 30)))
+    assert index.top_k(chosen, 50, 3.5, accept) == full_sort()
+
+    query = iter(points)
+    report("top_k 50 within radius", timed(
+        lambda: index.top_k(chosen, 50, 3.5, accept, markets=set(index.nearby(*next(query), args.radius))),
+        args.queries
+    ))
+
+
+if __name__ == "__main__":
+    main()
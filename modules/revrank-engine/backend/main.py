@@ -123,7 +123,7 @@ async def score_site(site: SiteCreate):
 @app.post("/api/score/bulk", response_model=List[SiteScore])
 async def score_bulk_sites(sites: List[SiteCreate]):
     """Score multiple sites at once"""
-    return [scoring_engine.calculate_score(site) for site in sites]
+    return scoring_engine.calculate_scores(sites)
 
 @app.get("/api/score/criteria")
 async def get_scoring_criteria():
@@ -161,6 +161,14 @@ async def analyze_weight_sensitivity(
         steps=steps
     )
 
+@app.post("/api/whatif/weight-sensitivity/batch")
+async def analyze_weight_sensitivity_batch(
+    sweeps: List[Dict[str, Any]],
+    site_id: Optional[str] = None
+):
+    """Run several criterion weight sweeps in one batch (live weights are not modified)"""
+    return whatif_analyzer.multi_weight_sensitivity_analysis(sweeps, site_id=site_id)
+
 @app.post("/api/whatif/tier-threshold")
 async def analyze_tier_thresholds(
     activate_threshold: float = Query(3.7, description="Threshold for Activate tier"),
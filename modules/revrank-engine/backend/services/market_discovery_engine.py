@@ -25,6 +25,8 @@ from datetime import datetime
 import json
 import random
 
+from services.market_index import MarketIndex
+
 # =============================================================================
 # ENUMS & CONSTANTS
 # =============================================================================
@@ -447,100 +449,100 @@ MARKET_DATABASE = {
         "sun_belt": True,
         "avg_housing_age": 20,
         "cities": [
-            {"city": "Duncanville", "population": 40000, "growth": 0.02, "competition": "low", "housing_age": 25, "nearby_metro": "Dallas"},
-            {"city": "Lancaster", "population": 39000, "growth": 0.03, "competition": "low", "housing_age": 22, "nearby_metro": "Dallas"},
-            {"city": "Kingsville", "population": 26000, "growth": 0.01, "competition": "very_low", "housing_age": 30, "nearby_metro": "Corpus Christi"},
-            {"city": "Socorro", "population": 35000, "growth": 0.04, "competition": "low", "housing_age": 18, "nearby_metro": "El Paso"},
-            {"city": "La Porte", "population": 36000, "growth": 0.02, "competition": "moderate", "housing_age": 28, "nearby_metro": "Houston"},
-            {"city": "Harker Heights", "population": 33000, "growth": 0.05, "competition": "low", "housing_age": 15, "nearby_metro": "Killeen"},
-            {"city": "Cedar Hill", "population": 50000, "growth": 0.02, "competition": "low", "housing_age": 20, "nearby_metro": "Dallas"},
-            {"city": "DeSoto", "population": 55000, "growth": 0.01, "competition": "low", "housing_age": 25, "nearby_metro": "Dallas"},
-            {"city": "Waxahachie", "population": 40000, "growth": 0.04, "competition": "low", "housing_age": 18, "nearby_metro": "Dallas"},
-            {"city": "Wylie", "population": 55000, "growth": 0.06, "competition": "moderate", "housing_age": 12, "nearby_metro": "Dallas"},
-            {"city": "Rockwall", "population": 50000, "growth": 0.05, "competition": "moderate", "housing_age": 15, "nearby_metro": "Dallas"},
-            {"city": "Midlothian", "population": 35000, "growth": 0.07, "competition": "low", "housing_age": 10, "nearby_metro": "Dallas"},
-            {"city": "Kyle", "population": 55000, "growth": 0.08, "competition": "low", "housing_age": 8, "nearby_metro": "Austin"},
-            {"city": "Pflugerville", "population": 68000, "growth": 0.06, "competition": "moderate", "housing_age": 12, "nearby_metro": "Austin"},
-            {"city": "New Braunfels", "population": 95000, "growth": 0.07, "competition": "moderate", "housing_age": 15, "nearby_metro": "San Antonio"},
+            {"city": "Duncanville", "population": 40000, "growth": 0.02, "competition": "low", "housing_age": 25, "nearby_metro": "Dallas", "lat": 32.6518, "lng": -96.9083},
+            {"city": "Lancaster", "population": 39000, "growth": 0.03, "competition": "low", "housing_age": 22, "nearby_metro": "Dallas", "lat": 32.5921, "lng": -96.7561},
+            {"city": "Kingsville", "population": 26000, "growth": 0.01, "competition": "very_low", "housing_age": 30, "nearby_metro": "Corpus Christi", "lat": 27.5159, "lng": -97.8561},
+            {"city": "Socorro", "population": 35000, "growth": 0.04, "competition": "low", "housing_age": 18, "nearby_metro": "El Paso", "lat": 31.6546, "lng": -106.3033},
+            {"city": "La Porte", "population": 36000, "growth": 0.02, "competition": "moderate", "housing_age": 28, "nearby_metro": "Houston", "lat": 29.6658, "lng": -95.0194},
+            {"city": "Harker Heights", "population": 33000, "growth": 0.05, "competition": "low", "housing_age": 15, "nearby_metro": "Killeen", "lat": 31.0835, "lng": -97.6597},
+            {"city": "Cedar Hill", "population": 50000, "growth": 0.02, "competition": "low", "housing_age": 20, "nearby_metro": "Dallas", "lat": 32.5885, "lng": -96.9561},
+            {"city": "DeSoto", "population": 55000, "growth": 0.01, "competition": "low", "housing_age": 25, "nearby_metro": "Dallas", "lat": 32.5899, "lng": -96.857},
+            {"city": "Waxahachie", "population": 40000, "growth": 0.04, "competition": "low", "housing_age": 18, "nearby_metro": "Dallas", "lat": 32.3866, "lng": -96.8483},
+            {"city": "Wylie", "population": 55000, "growth": 0.06, "competition": "moderate", "housing_age": 12, "nearby_metro": "Dallas", "lat": 33.0151, "lng": -96.5389},
+            {"city": "Rockwall", "population": 50000, "growth": 0.05, "competition": "moderate", "housing_age": 15, "nearby_metro": "Dallas", "lat": 32.9312, "lng": -96.4597},
+            {"city": "Midlothian", "population": 35000, "growth": 0.07, "competition": "low", "housing_age": 10, "nearby_metro": "Dallas", "lat": 32.4824, "lng": -96.9945},
+            {"city": "Kyle", "population": 55000, "growth": 0.08, "competition": "low", "housing_age": 8, "nearby_metro": "Austin", "lat": 29.9891, "lng": -97.8772},
+            {"city": "Pflugerville", "population": 68000, "growth": 0.06, "competition": "moderate", "housing_age": 12, "nearby_metro": "Austin", "lat": 30.4394, "lng": -97.62},
+            {"city": "New Braunfels", "population": 95000, "growth": 0.07, "competition": "moderate", "housing_age": 15, "nearby_metro": "San Antonio", "lat": 29.703, "lng": -98.1245},
         ]
     },
     "FL": {
         "sun_belt": True,
         "avg_housing_age": 22,
         "cities": [
-            {"city": "Palm Bay", "population": 120000, "growth": 0.05, "competition": "low", "housing_age": 25, "nearby_metro": "Melbourne"},
-            {"city": "Cape Coral", "population": 210000, "growth": 0.07, "competition": "moderate", "housing_age": 20, "nearby_metro": "Fort Myers"},
-            {"city": "Lehigh Acres", "population": 130000, "growth": 0.05, "competition": "low", "housing_age": 15, "nearby_metro": "Fort Myers"},
-            {"city": "Port St. Lucie", "population": 220000, "growth": 0.06, "competition": "moderate", "housing_age": 18, "nearby_metro": "Stuart"},
-            {"city": "Deltona", "population": 95000, "growth": 0.04, "competition": "low", "housing_age": 22, "nearby_metro": "Daytona"},
-            {"city": "North Port", "population": 80000, "growth": 0.08, "competition": "low", "housing_age": 12, "nearby_metro": "Sarasota"},
-            {"city": "Poinciana", "population": 70000, "growth": 0.06, "competition": "very_low", "housing_age": 15, "nearby_metro": "Orlando"},
-            {"city": "Spring Hill", "population": 115000, "growth": 0.04, "competition": "low", "housing_age": 20, "nearby_metro": "Tampa"},
-            {"city": "Palm Coast", "population": 95000, "growth": 0.05, "competition": "low", "housing_age": 18, "nearby_metro": "Daytona"},
-            {"city": "Ocala", "population": 65000, "growth": 0.04, "competition": "low", "housing_age": 25, "nearby_metro": "Gainesville"},
+            {"city": "Palm Bay", "population": 120000, "growth": 0.05, "competition": "low", "housing_age": 25, "nearby_metro": "Melbourne", "lat": 28.0345, "lng": -80.5887},
+            {"city": "Cape Coral", "population": 210000, "growth": 0.07, "competition": "moderate", "housing_age": 20, "nearby_metro": "Fort Myers", "lat": 26.5629, "lng": -81.9495},
+            {"city": "Lehigh Acres", "population": 130000, "growth": 0.05, "competition": "low", "housing_age": 15, "nearby_metro": "Fort Myers", "lat": 26.6254, "lng": -81.6248},
+            {"city": "Port St. Lucie", "population": 220000, "growth": 0.06, "competition": "moderate", "housing_age": 18, "nearby_metro": "Stuart", "lat": 27.273, "lng": -80.3582},
+            {"city": "Deltona", "population": 95000, "growth": 0.04, "competition": "low", "housing_age": 22, "nearby_metro": "Daytona", "lat": 28.9005, "lng": -81.2637},
+            {"city": "North Port", "population": 80000, "growth": 0.08, "competition": "low", "housing_age": 12, "nearby_metro": "Sarasota", "lat": 27.0442, "lng": -82.2359},
+            {"city": "Poinciana", "population": 70000, "growth": 0.06, "competition": "very_low", "housing_age": 15, "nearby_metro": "Orlando", "lat": 28.1403, "lng": -81.4584},
+            {"city": "Spring Hill", "population": 115000, "growth": 0.04, "competition": "low", "housing_age": 20, "nearby_metro": "Tampa", "lat": 28.4769, "lng": -82.5255},
+            {"city": "Palm Coast", "population": 95000, "growth": 0.05, "competition": "low", "housing_age": 18, "nearby_metro": "Daytona", "lat": 29.5845, "lng": -81.2079},
+            {"city": "Ocala", "population": 65000, "growth": 0.04, "competition": "low", "housing_age": 25, "nearby_metro": "Gainesville", "lat": 29.1872, "lng": -82.1401},
         ]
     },
     "AZ": {
         "sun_belt": True,
         "avg_housing_age": 15,
         "cities": [
-            {"city": "Buckeye", "population": 90000, "growth": 0.10, "competition": "low", "housing_age": 8, "nearby_metro": "Phoenix"},
-            {"city": "Queen Creek", "population": 65000, "growth": 0.09, "competition": "low", "housing_age": 10, "nearby_metro": "Phoenix"},
-            {"city": "San Tan Valley", "population": 100000, "growth": 0.08, "competition": "low", "housing_age": 12, "nearby_metro": "Phoenix"},
-            {"city": "Maricopa", "population": 60000, "growth": 0.06, "competition": "low", "housing_age": 10, "nearby_metro": "Phoenix"},
-            {"city": "El Mirage", "population": 38000, "growth": 0.04, "competition": "low", "housing_age": 15, "nearby_metro": "Phoenix"},
-            {"city": "Florence", "population": 30000, "growth": 0.04, "competition": "very_low", "housing_age": 15, "nearby_metro": "Phoenix"},
-            {"city": "Casa Grande", "population": 58000, "growth": 0.05, "competition": "low", "housing_age": 20, "nearby_metro": "Phoenix"},
-            {"city": "Prescott Valley", "population": 48000, "growth": 0.04, "competition": "low", "housing_age": 18, "nearby_metro": "Prescott"},
+            {"city": "Buckeye", "population": 90000, "growth": 0.10, "competition": "low", "housing_age": 8, "nearby_metro": "Phoenix", "lat": 33.3703, "lng": -112.5838},
+            {"city": "Queen Creek", "population": 65000, "growth": 0.09, "competition": "low", "housing_age": 10, "nearby_metro": "Phoenix", "lat": 33.2487, "lng": -111.6343},
+            {"city": "San Tan Valley", "population": 100000, "growth": 0.08, "competition": "low", "housing_age": 12, "nearby_metro": "Phoenix", "lat": 33.1911, "lng": -111.528},
+            {"city": "Maricopa", "population": 60000, "growth": 0.06, "competition": "low", "housing_age": 10, "nearby_metro": "Phoenix", "lat": 33.0581, "lng": -112.0476},
+            {"city": "El Mirage", "population": 38000, "growth": 0.04, "competition": "low", "housing_age": 15, "nearby_metro": "Phoenix", "lat": 33.6131, "lng": -112.3246},
+            {"city": "Florence", "population": 30000, "growth": 0.04, "competition": "very_low", "housing_age": 15, "nearby_metro": "Phoenix", "lat": 33.0314, "lng": -111.3873},
+            {"city": "Casa Grande", "population": 58000, "growth": 0.05, "competition": "low", "housing_age": 20, "nearby_metro": "Phoenix", "lat": 32.8795, "lng": -111.7574},
+            {"city": "Prescott Valley", "population": 48000, "growth": 0.04, "competition": "low", "housing_age": 18, "nearby_metro": "Prescott", "lat": 34.61, "lng": -112.3157},
         ]
     },
     "NC": {
         "sun_belt": True,
         "avg_housing_age": 17,
         "cities": [
-            {"city": "Holly Springs", "population": 45000, "growth": 0.10, "competition": "low", "housing_age": 12, "nearby_metro": "Raleigh"},
-            {"city": "Apex", "population": 60000, "growth": 0.08, "competition": "moderate", "housing_age": 15, "nearby_metro": "Raleigh"},
-            {"city": "Wake Forest", "population": 50000, "growth": 0.07, "competition": "moderate", "housing_age": 18, "nearby_metro": "Raleigh"},
-            {"city": "Garner", "population": 35000, "growth": 0.04, "competition": "low", "housing_age": 22, "nearby_metro": "Raleigh"},
-            {"city": "Clayton", "population": 25000, "growth": 0.06, "competition": "low", "housing_age": 15, "nearby_metro": "Raleigh"},
-            {"city": "Mooresville", "population": 48000, "growth": 0.05, "competition": "moderate", "housing_age": 18, "nearby_metro": "Charlotte"},
-            {"city": "Indian Trail", "population": 42000, "growth": 0.04, "competition": "low", "housing_age": 15, "nearby_metro": "Charlotte"},
-            {"city": "Kannapolis", "population": 55000, "growth": 0.03, "competition": "low", "housing_age": 25, "nearby_metro": "Charlotte"},
+            {"city": "Holly Springs", "population": 45000, "growth": 0.10, "competition": "low", "housing_age": 12, "nearby_metro": "Raleigh", "lat": 35.6513, "lng": -78.8336},
+            {"city": "Apex", "population": 60000, "growth": 0.08, "competition": "moderate", "housing_age": 15, "nearby_metro": "Raleigh", "lat": 35.7327, "lng": -78.8503},
+            {"city": "Wake Forest", "population": 50000, "growth": 0.07, "competition": "moderate", "housing_age": 18, "nearby_metro": "Raleigh", "lat": 35.9799, "lng": -78.5097},
+            {"city": "Garner", "population": 35000, "growth": 0.04, "competition": "low", "housing_age": 22, "nearby_metro": "Raleigh", "lat": 35.7113, "lng": -78.6142},
+            {"city": "Clayton", "population": 25000, "growth": 0.06, "competition": "low", "housing_age": 15, "nearby_metro": "Raleigh", "lat": 35.6507, "lng": -78.4564},
+            {"city": "Mooresville", "population": 48000, "growth": 0.05, "competition": "moderate", "housing_age": 18, "nearby_metro": "Charlotte", "lat": 35.5849, "lng": -80.8101},
+            {"city": "Indian Trail", "population": 42000, "growth": 0.04, "competition": "low", "housing_age": 15, "nearby_metro": "Charlotte", "lat": 35.0768, "lng": -80.6692},
+            {"city": "Kannapolis", "population": 55000, "growth": 0.03, "competition": "low", "housing_age": 25, "nearby_metro": "Charlotte", "lat": 35.4874, "lng": -80.6217},
         ]
     },
     "GA": {
         "sun_belt": True,
         "avg_housing_age": 19,
         "cities": [
-            {"city": "Newnan", "population": 45000, "growth": 0.05, "competition": "low", "housing_age": 20, "nearby_metro": "Atlanta"},
-            {"city": "Douglasville", "population": 35000, "growth": 0.04, "competition": "low", "housing_age": 22, "nearby_metro": "Atlanta"},
-            {"city": "Woodstock", "population": 35000, "growth": 0.05, "competition": "low", "housing_age": 18, "nearby_metro": "Atlanta"},
-            {"city": "Canton", "population": 32000, "growth": 0.06, "competition": "low", "housing_age": 15, "nearby_metro": "Atlanta"},
-            {"city": "Acworth", "population": 25000, "growth": 0.04, "competition": "low", "housing_age": 20, "nearby_metro": "Atlanta"},
-            {"city": "Dallas", "population": 15000, "growth": 0.07, "competition": "very_low", "housing_age": 12, "nearby_metro": "Atlanta"},
-            {"city": "Peachtree City", "population": 38000, "growth": 0.02, "competition": "moderate", "housing_age": 25, "nearby_metro": "Atlanta"},
+            {"city": "Newnan", "population": 45000, "growth": 0.05, "competition": "low", "housing_age": 20, "nearby_metro": "Atlanta", "lat": 33.3807, "lng": -84.7997},
+            {"city": "Douglasville", "population": 35000, "growth": 0.04, "competition": "low", "housing_age": 22, "nearby_metro": "Atlanta", "lat": 33.7515, "lng": -84.7477},
+            {"city": "Woodstock", "population": 35000, "growth": 0.05, "competition": "low", "housing_age": 18, "nearby_metro": "Atlanta", "lat": 34.1015, "lng": -84.5194},
+            {"city": "Canton", "population": 32000, "growth": 0.06, "competition": "low", "housing_age": 15, "nearby_metro": "Atlanta", "lat": 34.2368, "lng": -84.4908},
+            {"city": "Acworth", "population": 25000, "growth": 0.04, "competition": "low", "housing_age": 20, "nearby_metro": "Atlanta", "lat": 34.0659, "lng": -84.6769},
+            {"city": "Dallas", "population": 15000, "growth": 0.07, "competition": "very_low", "housing_age": 12, "nearby_metro": "Atlanta", "lat": 33.9237, "lng": -84.8408},
+            {"city": "Peachtree City", "population": 38000, "growth": 0.02, "competition": "moderate", "housing_age": 25, "nearby_metro": "Atlanta", "lat": 33.3968, "lng": -84.5958},
         ]
     },
     "TN": {
         "sun_belt": True,
         "avg_housing_age": 20,
         "cities": [
-            {"city": "Mt. Juliet", "population": 40000, "growth": 0.07, "competition": "low", "housing_age": 12, "nearby_metro": "Nashville"},
-            {"city": "Spring Hill", "population": 55000, "growth": 0.08, "competition": "low", "housing_age": 10, "nearby_metro": "Nashville"},
-            {"city": "Smyrna", "population": 55000, "growth": 0.04, "competition": "moderate", "housing_age": 18, "nearby_metro": "Nashville"},
-            {"city": "Lebanon", "population": 40000, "growth": 0.05, "competition": "low", "housing_age": 20, "nearby_metro": "Nashville"},
-            {"city": "Gallatin", "population": 45000, "growth": 0.05, "competition": "low", "housing_age": 18, "nearby_metro": "Nashville"},
+            {"city": "Mt. Juliet", "population": 40000, "growth": 0.07, "competition": "low", "housing_age": 12, "nearby_metro": "Nashville", "lat": 36.2001, "lng": -86.5186},
+            {"city": "Spring Hill", "population": 55000, "growth": 0.08, "competition": "low", "housing_age": 10, "nearby_metro": "Nashville", "lat": 35.7512, "lng": -86.93},
+            {"city": "Smyrna", "population": 55000, "growth": 0.04, "competition": "moderate", "housing_age": 18, "nearby_metro": "Nashville", "lat": 35.9828, "lng": -86.5186},
+            {"city": "Lebanon", "population": 40000, "growth": 0.05, "competition": "low", "housing_age": 20, "nearby_metro": "Nashville", "lat": 36.2081, "lng": -86.2911},
+            {"city": "Gallatin", "population": 45000, "growth": 0.05, "competition": "low", "housing_age": 18, "nearby_metro": "Nashville", "lat": 36.3884, "lng": -86.4467},
         ]
     },
     "SC": {
         "sun_belt": True,
         "avg_housing_age": 18,
         "cities": [
-            {"city": "Fort Mill", "population": 25000, "growth": 0.08, "competition": "low", "housing_age": 12, "nearby_metro": "Charlotte"},
-            {"city": "Rock Hill", "population": 75000, "growth": 0.04, "competition": "moderate", "housing_age": 20, "nearby_metro": "Charlotte"},
-            {"city": "Summerville", "population": 55000, "growth": 0.06, "competition": "low", "housing_age": 15, "nearby_metro": "Charleston"},
-            {"city": "Goose Creek", "population": 45000, "growth": 0.04, "competition": "low", "housing_age": 18, "nearby_metro": "Charleston"},
-            {"city": "Mauldin", "population": 28000, "growth": 0.05, "competition": "low", "housing_age": 20, "nearby_metro": "Greenville"},
+            {"city": "Fort Mill", "population": 25000, "growth": 0.08, "competition": "low", "housing_age": 12, "nearby_metro": "Charlotte", "lat": 35.0074, "lng": -80.9451},
+            {"city": "Rock Hill", "population": 75000, "growth": 0.04, "competition": "moderate", "housing_age": 20, "nearby_metro": "Charlotte", "lat": 34.9249, "lng": -81.0251},
+            {"city": "Summerville", "population": 55000, "growth": 0.06, "competition": "low", "housing_age": 15, "nearby_metro": "Charleston", "lat": 33.0185, "lng": -80.1756},
+            {"city": "Goose Creek", "population": 45000, "growth": 0.04, "competition": "low", "housing_age": 18, "nearby_metro": "Charleston", "lat": 32.981, "lng": -80.0326},
+            {"city": "Mauldin", "population": 28000, "growth": 0.05, "competition": "low", "housing_age": 20, "nearby_metro": "Greenville", "lat": 34.7787, "lng": -82.3101},
         ]
     }
 }
@@ -559,6 +561,24 @@ class MarketDiscoveryEngine:
         self.categories = CATEGORY_INTELLIGENCE
         self.markets = MARKET_DATABASE
         self.favorites: List[MarketOpportunity] = []
+        self._index: Optional[MarketIndex] = None
+    
+    @property
+    def index(self) -> MarketIndex:
+        """Precomputed scores + spatial grid (built on first search)"""
+        if self._index is None:
+            self._index = MarketIndex(
+                self.markets,
+                self.categories,
+                scorer=lambda category, city_data, state_data: self._score_components(
+                    category, city_data, state_data
+                )["score"]
+            )
+        return self._index
+    
+    def rebuild_index(self):
+        """Drop the precomputed index after editing markets or categories"""
+        self._index = None
         
     def turbo_search(
         self,
@@ -576,7 +596,8 @@ class MarketDiscoveryEngine:
         """
         Turbo Search: Rapidly find opportunities (NFP-style)
         
-        If base_city/state provided, finds nearby markets.
+        If base_city/state provided, finds nearby markets (ValueError if the
+        base city is not in the market catalog or a known nearby metro).
         Otherwise searches all markets in selected states.
         """
         min_pop = min_population or self.thresholds["min_population"]
@@ -598,54 +619,57 @@ class MarketDiscoveryEngine:
             "very_low": 1, "low": 2, "moderate": 3, "high": 4, "very_high": 5
         }
         max_comp_level = competition_levels.get(max_competition, 3)
+        allowed_states = set(states)
         
-        opportunities = []
+        index = self.index
         
-        for state in states:
-            if state not in self.markets:
-                continue
-                
-            state_data = self.markets[state]
-            
-            for city_data in state_data["cities"]:
-                # Population filter
-                pop = city_data["population"]
-                if pop < min_pop or pop > max_pop:
-                    continue
-                
-                # Competition filter
-                city_comp = competition_levels.get(city_data["competition"], 3)
-                if city_comp > max_comp_level:
-                    continue
-                
-                # Evaluate each category in this market
-                for category in categories:
-                    if category not in self.categories:
-                        continue
-                    
-                    opp = self._evaluate_opportunity(
-                        category=category,
-                        city_data=city_data,
-                        state=state,
-                        state_data=state_data
-                    )
-                    
-                    if opp.score >= min_sc:
-                        opportunities.append(opp)
-        
-        # Sort by score descending
-        opportunities.sort(key=lambda x: x.score, reverse=True)
-        
-        return opportunities[:limit]
+        def accept(market) -> bool:
+            state, _ = market
+            if state not in allowed_states:
+                return False
+            city_data = index.city(market)
+            # Population filter
+            pop = city_data["population"]
+            if pop < min_pop or pop > max_pop:
+                return False
+            # Competition filter
+            return competition_levels.get(city_data["competition"], 3) <= max_comp_level
+        
+        # Radius search: only markets in grid cells near the base city
+        nearby = None
+        if base_city:
+            origin = index.locate(base_city, base_state)
+            if origin is None:
+                where = f"{base_city}, {base_state}" if base_state else base_city
+                raise ValueError(f"Unknown base city for radius search: {where}")
+            nearby = index.nearby(origin[0], origin[1], radius_miles)
+        
+        top = index.top_k(
+            categories,
+            limit=limit,
+            min_score=min_sc,
+            accept=accept,
+            markets=set(nearby) if nearby is not None else None
+        )
+        
+        # Full opportunity objects (SERP estimates, next steps) only for the winners
+        return [
+            self._evaluate_opportunity(
+                category=entry.category,
+                city_data=index.city(entry.market),
+                state=entry.state,
+                state_data=self.markets[entry.state]
+            )
+            for entry in top
+        ]
     
-    def _evaluate_opportunity(
+    def _score_components(
         self,
         category: str,
         city_data: Dict,
-        state: str,
         state_data: Dict
-    ) -> MarketOpportunity:
-        """Evaluate a specific category + market combination"""
+    ) -> Dict:
+        """Deterministic score and components for a category + market"""
         
         cat_intel = self.categories.get(category, {})
         
@@ -718,6 +742,42 @@ class MarketDiscoveryEngine:
         )
         score = round(score, 2)
         
+        return {
+            "score": score,
+            "category_score": category_score,
+            "competition_score": competition_score,
+            "growth_score": growth_score,
+            "pop_score": pop_score,
+            "housing_score": housing_score,
+            "sun_belt_bonus": sun_belt_bonus,
+            "urgency": urgency,
+            "renter_density": renter_density
+        }
+    
+    def _evaluate_opportunity(
+        self,
+        category: str,
+        city_data: Dict,
+        state: str,
+        state_data: Dict
+    ) -> MarketOpportunity:
+        """Evaluate a specific category + market combination"""
+        
+        cat_intel = self.categories.get(category, {})
+        components = self._score_components(category, city_data, state_data)
+        score = components["score"]
+        category_score = components["category_score"]
+        competition_score = components["competition_score"]
+        growth_score = components["growth_score"]
+        pop_score = components["pop_score"]
+        housing_score = components["housing_score"]
+        sun_belt_bonus = components["sun_belt_bonus"]
+        urgency = urgency_score = components["urgency"]
+        renter_density = renter_score = components["renter_density"]
+        growth_rate = city_data["growth"]
+        pop = city_data["population"]
+        housing_age = city_data.get("housing_age", 20)
+        
         # === DETERMINE TIER & RECOMMENDATION ===
         if score >= 4.0:
             tier = "high_opportunity"
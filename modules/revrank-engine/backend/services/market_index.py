@@ -0,0 +1,215 @@
+"""
+Market Index Service
+Precomputed opportunity scores and spatial lookup for Turbo Search
+
+The deterministic part of an opportunity score depends only on the category
+and the market, so it is computed once per (category, city) and kept in
+per-category lists sorted by score. A lat/lng grid (geohash-style buckets)
+answers radius queries around a base city by checking only nearby cells, and
+top-k selection walks the sorted lists through a heap, stopping as soon as
+`limit` matches are found or scores drop below the minimum.
+"""
+
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+def haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in miles"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+# (state, index into MARKET_DATABASE[state]["cities"])
+MarketKey = Tuple[str, int]
+
+
+@dataclass(frozen=True)
+class IndexedOpportunity:
+    """One precomputed (category, market) score"""
+    score: float
+    category: str
+    state: str
+    city_index: int
+    order: int  # catalog order, used to break score ties deterministically
+
+    @property
+    def market(self) -> MarketKey:
+        return (self.state, self.city_index)
+
+
+class GeoGrid:
+    """
+    Fixed-size lat/lng bucket grid for radius queries.
+
+    Each market is stored in the cell containing it; a radius query only
+    visits the cells overlapping the query's bounding box and then checks
+    exact great-circle distance.
+    """
+
+    def __init__(self, cell_degrees: float = 0.5):
+        self.cell_degrees = cell_degrees
+        self.cells: Dict[Tuple[int, int], List[Tuple[MarketKey, float, float]]] = {}
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (int(math.floor(lat / self.cell_degrees)), int(math.floor(lng / self.cell_degrees)))
+
+    def add(self, key: MarketKey, lat: float, lng: float):
+        self.cells.setdefault(self._cell(lat, lng), []).append((key, lat, lng))
+
+    def within(self, lat: float, lng: float, radius_miles: float) -> Dict[MarketKey, float]:
+        """Markets within radius_miles of (lat, lng), mapped to their distance"""
+        dlat = radius_miles / 69.0
+        dlng = radius_miles / max(1e-6, 69.0 * math.cos(math.radians(lat)))
+        lat_lo, lng_lo = self._cell(lat - dlat, lng - dlng)
+        lat_hi, lng_hi = self._cell(lat + dlat, lng + dlng)
+
+        found = {}
+        for ci in range(lat_lo, lat_hi + 1):
+            for cj in range(lng_lo, lng_hi + 1):
+                for key, mlat, mlng in self.cells.get((ci, cj), ()):
+                    distance = haversine_miles(lat, lng, mlat, mlng)
+                    if distance <= radius_miles:
+                        found[key] = distance
+        return found
+
+
+class MarketIndex:
+    """Per-category sorted opportunity scores plus a spatial grid of markets"""
+
+    def __init__(self, markets: Dict, categories: Dict,
+                 scorer: Callable[[str, Dict, Dict], float], cell_degrees: float = 0.5):
+        """
+        Args:
+            markets: MARKET_DATABASE-shaped dict (cities carry lat/lng)
+            categories: CATEGORY_INTELLIGENCE-shaped dict
+            scorer: (category, city_data, state_data) -> deterministic score
+            cell_degrees: Grid cell size for radius queries
+        """
+        self.markets = markets
+        self.grid = GeoGrid(cell_degrees)
+        self.by_category: Dict[str, List[IndexedOpportunity]] = {}
+        self.scores: Dict[Tuple[str, MarketKey], IndexedOpportunity] = {}
+        self._city_lookup: Dict[str, List[MarketKey]] = {}
+        self._metro_lookup: Dict[str, List[MarketKey]] = {}
+
+        order = 0
+        for state, state_data in markets.items():
+            for i, city_data in enumerate(state_data["cities"]):
+                key = (state, i)
+                if "lat" in city_data and "lng" in city_data:
+                    self.grid.add(key, city_data["lat"], city_data["lng"])
+                self._city_lookup.setdefault(city_data["city"].lower(), []).append(key)
+                metro = city_data.get("nearby_metro")
+                if metro:
+                    self._metro_lookup.setdefault(metro.lower(), []).append(key)
+
+                for category in categories:
+                    entry = IndexedOpportunity(
+                        score=scorer(category, city_data, state_data),
+                        category=category,
+                        state=state,
+                        city_index=i,
+                        order=order
+                    )
+                    order += 1
+                    self.by_category.setdefault(category, []).append(entry)
+                    self.scores[(category, key)] = entry
+
+        for entries in self.by_category.values():
+            entries.sort(key=lambda e: (-e.score, e.order))
+
+    def city(self, key: MarketKey) -> Dict:
+        state, i = key
+        return self.markets[state]["cities"][i]
+
+    def locate(self, city: str, state: Optional[str] = None) -> Optional[Tuple[float, float]]:
+        """
+        Coordinates for a base city.
+
+        A catalog city is used as-is; a name that is only a nearby_metro (e.g.
+        "Dallas", TX) uses the centroid of its markets. When the name resolves
+        in several states and no state is given, the largest match by
+        population wins, so "Dallas" is the TX metro rather than Dallas, GA.
+        """
+        name = (city or "").strip().lower()
+        state = state.upper() if state else None
+
+        # Per state: the catalog city itself, else the markets around that metro
+        groups: Dict[str, List[MarketKey]] = {}
+        for key in self._city_lookup.get(name, []):
+            groups.setdefault(key[0], []).append(key)
+        city_states = set(groups)
+        for key in self._metro_lookup.get(name, []):
+            if key[0] not in city_states:
+                groups.setdefault(key[0], []).append(key)
+        matches = [
+            [k for k in keys if "lat" in self.city(k)]
+            for group_state, keys in groups.items()
+            if state is None or group_state == state
+        ]
+        matches = [keys for keys in matches if keys]
+        if not matches:
+            return None
+        keys = max(matches, key=lambda g: sum(self.city(k)["population"] for k in g))
+        points = [(self.city(k)["lat"], self.city(k)["lng"]) for k in keys]
+        return (sum(p[0] for p in points) / len(points), sum(p[1] for p in points) / len(points))
+
+    def nearby(self, lat: float, lng: float, radius_miles: float) -> Dict[MarketKey, float]:
+        return self.grid.within(lat, lng, radius_miles)
+
+    def top_k(
+        self,
+        categories: Iterable[str],
+        limit: int,
+        min_score: float,
+        accept: Callable[[MarketKey], bool],
+        markets: Optional[Set[MarketKey]] = None
+    ) -> List[IndexedOpportunity]:
+        """
+        Highest-scoring opportunities passing the filters.
+
+        Args:
+            categories: Categories to consider
+            limit: Max results
+            min_score: Stop once scores fall below this
+            accept: Market filter (population, competition, state, ...)
+            markets: Optional candidate set from a radius query; when given,
+                     only those markets are scored (via a bounded heap)
+        """
+        categories = [c for c in dict.fromkeys(categories) if c in self.by_category]
+        if limit <= 0 or not categories:
+            return []
+
+        if markets is not None:
+            candidates = (
+                self.scores[(category, key)]
+                for key in markets if accept(key)
+                for category in categories
+            )
+            kept = (e for e in candidates if e.score >= min_score)
+            return heapq.nsmallest(limit, kept, key=lambda e: (-e.score, e.order))
+
+        results = []
+        for entry in self._merged(categories):
+            if entry.score < min_score:
+                break
+            if accept(entry.market):
+                results.append(entry)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def _merged(self, categories: List[str]) -> Iterator[IndexedOpportunity]:
+        """All entries for the categories, best first (k-way heap merge)"""
+        return heapq.merge(
+            *(self.by_category[c] for c in categories),
+            key=lambda e: (-e.score, e.order)
+        )
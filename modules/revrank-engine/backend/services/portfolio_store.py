@@ -0,0 +1,293 @@
+"""
+Portfolio Store Service
+Columnar, NumPy-backed portfolio state for the Rank & Rent Decision Tool
+
+Sites are kept as a sites x criteria score matrix plus per-site columns
+(score, tier, monthly potential, category). Rescoring the whole portfolio
+after a weight change is one matrix-vector product, tier counts and revenue
+totals are maintained incrementally on add/update/remove, and derived views
+(sort orders, summaries) are cached until the portfolio or weights change.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+TIER_NAMES = ("activate", "watchlist", "sunset")
+TIER_DECISIONS = ("KEEP & ACTIVATE", "MONITOR 90 DAYS", "SUNSET")
+ACTIVATE_THRESHOLD = 3.7
+WATCHLIST_THRESHOLD = 3.2
+
+
+def as_number(value: float):
+    """Return whole-number totals as int so API payloads keep their old shape"""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def tier_codes(scores: np.ndarray) -> np.ndarray:
+    """Map scores to tier codes (0=activate, 1=watchlist, 2=sunset)"""
+    return np.where(
+        scores >= ACTIVATE_THRESHOLD, 0,
+        np.where(scores >= WATCHLIST_THRESHOLD, 1, 2)
+    ).astype(np.int8)
+
+
+def weighted_scores(matrix: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted average of each row of a criteria matrix, rounded like calculate_score"""
+    total_weight = weights.sum()
+    if total_weight <= 0:
+        return np.zeros(matrix.shape[0])
+    return np.round(matrix @ weights / total_weight, 2)
+
+
+class PortfolioStore:
+    """
+    Sites x criteria matrix with cached portfolio views.
+
+    Site dicts stay the public representation (the API returns them as-is);
+    the store keeps their score/tier/decision fields in sync with the arrays.
+    Sites with criteria_scores are model-scored and follow weight changes;
+    sites without them keep their stored score.
+    """
+
+    def __init__(self, criteria_names: Sequence[str], weights: Sequence[float],
+                 row_builder: Callable[[Dict], Optional[List[float]]]):
+        """
+        Args:
+            criteria_names: Column order of the criteria matrix
+            weights: Weight per criterion, same order
+            row_builder: Returns a site's criteria vector, or None if the site
+                         has no criteria scores (score is taken as stored)
+        """
+        self.criteria_names = list(criteria_names)
+        self.weights = np.asarray(weights, dtype=float)
+        self.row_builder = row_builder
+
+        k = len(self.criteria_names)
+        self.sites: List[Dict] = []
+        self._index: Dict[str, int] = {}
+        self.matrix = np.zeros((0, k))
+        self.model_scored = np.zeros(0, dtype=bool)
+        self.scores = np.zeros(0)
+        self.tiers = np.zeros(0, dtype=np.int8)
+        self.potential = np.zeros(0)
+        self.category_codes = np.zeros(0, dtype=np.int32)
+        self.categories: List[Any] = []
+        self._category_index: Dict[Any, int] = {}
+
+        self.tier_counts = np.zeros(len(TIER_NAMES), dtype=np.int64)
+        self.tier_potential = np.zeros(len(TIER_NAMES))
+
+        self.version = 0
+        self._cache: Dict[str, Any] = {}
+        self._cache_version = -1
+
+    # ------------------------------------------------------------------
+    # Loading and mutation
+    # ------------------------------------------------------------------
+
+    def load(self, sites: List[Dict]):
+        """Replace the portfolio with sites (one vectorized scoring pass)"""
+        n, k = len(sites), len(self.criteria_names)
+        self.sites = sites
+        self._index = {site["id"]: i for i, site in enumerate(sites)}
+        self.matrix = np.zeros((n, k))
+        self.model_scored = np.zeros(n, dtype=bool)
+        self.scores = np.zeros(n)
+        self.potential = np.zeros(n)
+        self.category_codes = np.zeros(n, dtype=np.int32)
+
+        for i, site in enumerate(sites):
+            row = self.row_builder(site)
+            if row is not None:
+                self.matrix[i] = row
+                self.model_scored[i] = True
+            self.scores[i] = site.get("score", 3.0)
+            self.potential[i] = site.get("monthly_potential", 0)
+            self.category_codes[i] = self._category_code(site.get("category"))
+
+        self.rescore()
+
+    def add(self, site: Dict) -> Dict:
+        """Append a site and score it"""
+        row = self.row_builder(site)
+        self.sites.append(site)
+        self._index[site["id"]] = len(self.sites) - 1
+        self.matrix = np.vstack([self.matrix, np.zeros((1, len(self.criteria_names)))])
+        self.model_scored = np.append(self.model_scored, row is not None)
+        if row is not None:
+            self.matrix[-1] = row
+        self.scores = np.append(self.scores, site.get("score", 3.0))
+        self.tiers = np.append(self.tiers, np.int8(0))
+        self.potential = np.append(self.potential, site.get("monthly_potential", 0))
+        self.category_codes = np.append(self.category_codes, self._category_code(site.get("category")))
+
+        self._score_row(len(self.sites) - 1)
+        self._count_row(len(self.sites) - 1, +1)
+        self._touch()
+        return site
+
+    def update(self, site_id: str, changes: Dict) -> Optional[Dict]:
+        """
+        Apply changes to a site and rescore that row only
+
+        Whether the site is model-scored afterwards is up to row_builder, so a
+        caller can pin a stored score by making it return None.
+        """
+        i = self._index.get(site_id)
+        if i is None:
+            return None
+
+        site = self.sites[i]
+        self._count_row(i, -1)
+        site.update(changes)
+        row = self.row_builder(site)
+        self.model_scored[i] = row is not None
+        self.matrix[i] = row if row is not None else 0.0
+        self.scores[i] = site.get("score", 3.0)
+        self.potential[i] = site.get("monthly_potential", 0)
+        self.category_codes[i] = self._category_code(site.get("category"))
+        self._score_row(i)
+        self._count_row(i, +1)
+        self._touch()
+        return site
+
+    def remove(self, site_id: str) -> bool:
+        """Remove a site (keeps the remaining order)"""
+        i = self._index.pop(site_id, None)
+        if i is None:
+            return False
+
+        self._count_row(i, -1)
+        self.sites.pop(i)
+        self.matrix = np.delete(self.matrix, i, axis=0)
+        self.model_scored = np.delete(self.model_scored, i)
+        self.scores = np.delete(self.scores, i)
+        self.tiers = np.delete(self.tiers, i)
+        self.potential = np.delete(self.potential, i)
+        self.category_codes = np.delete(self.category_codes, i)
+        for j in range(i, len(self.sites)):
+            self._index[self.sites[j]["id"]] = j
+        self._touch()
+        return True
+
+    def set_weights(self, weights: Sequence[float]):
+        """Change the weight vector and rescore every model-scored site"""
+        weights = np.asarray(weights, dtype=float)
+        if np.array_equal(weights, self.weights):
+            return
+        self.weights = weights
+        self.rescore()
+
+    def rescore(self):
+        """Recompute scores, tiers and tier totals for the whole portfolio"""
+        if self.model_scored.any():
+            computed = weighted_scores(self.matrix[self.model_scored], self.weights)
+            self.scores[self.model_scored] = computed
+        self.tiers = tier_codes(self.scores)
+        self.tier_counts = np.bincount(self.tiers, minlength=len(TIER_NAMES)).astype(np.int64)
+        self.tier_potential = np.bincount(self.tiers, weights=self.potential, minlength=len(TIER_NAMES))
+
+        for i in range(len(self.sites)):
+            self._sync_site(i)
+        self._touch()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get(self, site_id: str) -> Optional[Dict]:
+        i = self._index.get(site_id)
+        return self.sites[i] if i is not None else None
+
+    def tier_sites(self, tier: str) -> List[Dict]:
+        """Sites in a tier, in portfolio order"""
+        if tier not in TIER_NAMES:
+            return []
+        code = TIER_NAMES.index(tier)
+        return [self.sites[i] for i in np.flatnonzero(self.tiers == code)]
+
+    def order(self, descending: bool = True) -> np.ndarray:
+        """Row indices sorted by score (stable, cached)"""
+        key = "order_desc" if descending else "order_asc"
+        return self.cached(key, lambda: np.argsort(-self.scores if descending else self.scores, kind="stable"))
+
+    def top(self, n: int) -> List[Dict]:
+        return [self.sites[i] for i in self.order(descending=True)[:n]]
+
+    def bottom(self, n: int) -> List[Dict]:
+        return [self.sites[i] for i in self.order(descending=False)[:n]]
+
+    def tier_count(self, tier: str) -> int:
+        return int(self.tier_counts[TIER_NAMES.index(tier)])
+
+    def tier_total(self, tier: str):
+        return as_number(self.tier_potential[TIER_NAMES.index(tier)])
+
+    def total_potential(self):
+        return as_number(self.tier_potential.sum())
+
+    def category_stats(self) -> List[Dict]:
+        """Site count, average score and potential per category (first-seen order)"""
+        def build():
+            size = len(self.categories)
+            counts = np.bincount(self.category_codes, minlength=size)
+            score_sums = np.bincount(self.category_codes, weights=self.scores, minlength=size)
+            potential_sums = np.bincount(self.category_codes, weights=self.potential, minlength=size)
+            return [
+                {
+                    "category": self.categories[code],
+                    "site_count": int(counts[code]),
+                    "avg_score": float(score_sums[code] / counts[code]),
+                    "total_potential": as_number(potential_sums[code])
+                }
+                for code in range(size) if counts[code]
+            ]
+        return self.cached("category_stats", build)
+
+    def cached(self, key: str, builder: Callable[[], Any]) -> Any:
+        """Return builder() memoized until the portfolio or weights change"""
+        if self._cache_version != self.version:
+            self._cache = {}
+            self._cache_version = self.version
+        if key not in self._cache:
+            self._cache[key] = builder()
+        return self._cache[key]
+
+    def __len__(self) -> int:
+        return len(self.sites)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _category_code(self, category: Any) -> int:
+        code = self._category_index.get(category)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(category)
+            self._category_index[category] = code
+        return code
+
+    def _score_row(self, i: int):
+        if self.model_scored[i]:
+            self.scores[i] = weighted_scores(self.matrix[i:i + 1], self.weights)[0]
+        self.tiers[i] = tier_codes(self.scores[i:i + 1])[0]
+        self._sync_site(i)
+
+    def _count_row(self, i: int, sign: int):
+        tier = self.tiers[i]
+        self.tier_counts[tier] += sign
+        self.tier_potential[tier] += sign * self.potential[i]
+
+    def _sync_site(self, i: int):
+        site = self.sites[i]
+        tier = int(self.tiers[i])
+        if self.model_scored[i]:
+            site["score"] = float(self.scores[i])
+        site["tier"] = TIER_NAMES[tier]
+        site["decision"] = TIER_DECISIONS[tier]
+
+    def _touch(self):
+        self.version += 1
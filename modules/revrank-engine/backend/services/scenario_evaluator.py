@@ -0,0 +1,138 @@
+"""
+Scenario Evaluator Service
+Immutable, vectorized what-if scoring for the Rank & Rent Decision Tool
+
+A ScenarioEvaluator is a snapshot of the scoring inputs: the sites x criteria
+matrix and a private copy of the weight vector. Every scenario (a weight
+change, a sensitivity step, many criteria sweeps) becomes one row of a
+scenario x criteria weight matrix, and all rows are scored against all sites
+in a single matrix product. Nothing on the live ScoringEngine is modified, so
+concurrent what-if requests cannot disturb each other or the live weights.
+Sites without criteria scores are scored from their category benchmark
+components, so a scenario shows how the model would rate them against their
+recorded score; only sites with a caller-pinned score keep it in every scenario.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from services.portfolio_store import TIER_NAMES, tier_codes
+
+
+class ScenarioEvaluator:
+    """Read-only snapshot of sites and weights that scores weight scenarios in batches"""
+
+    def __init__(self, criteria_names: Sequence[str], weights: Sequence[float],
+                 matrix: np.ndarray, sites: List[Dict],
+                 fixed_scores: Optional[Sequence[float]] = None):
+        """
+        Args:
+            criteria_names: Column order of matrix and weights
+            weights: Baseline weight per criterion (copied)
+            matrix: Sites x criteria component scores (copied, read-only)
+            sites: Site metadata rows aligned with matrix
+            fixed_scores: Per-site score that weights do not change, NaN for
+                model-scored sites (default: every site is model-scored)
+        """
+        self.criteria_names = list(criteria_names)
+        self._column = {name: j for j, name in enumerate(self.criteria_names)}
+        self.weights = np.array(weights, dtype=float)
+        self.weights.flags.writeable = False
+        self.matrix = np.array(matrix, dtype=float).reshape(len(sites), len(self.criteria_names))
+        self.matrix.flags.writeable = False
+        self.sites = [dict(site) for site in sites]
+        if fixed_scores is None:
+            fixed_scores = np.full(len(sites), np.nan)
+        self.fixed_scores = np.array(fixed_scores, dtype=float)
+        self.fixed_scores.flags.writeable = False
+
+    @classmethod
+    def from_engine(cls, engine) -> "ScenarioEvaluator":
+        """
+        Snapshot a ScoringEngine.
+
+        The component-score matrix is cached on the engine's portfolio store,
+        so repeated scenarios against an unchanged portfolio skip rebuilding it.
+        """
+        names = list(engine.criteria)
+        weights = [engine.criteria[c].get("weight", 0) for c in names]
+
+        def build():
+            rows = []
+            for site in engine.portfolio:
+                # Same inputs the live store scores: {**site, **criteria_scores}
+                scores = engine._component_scores({**site, **(site.get("criteria_scores") or {})})
+                rows.append([scores[c] for c in names])
+            return np.array(rows, dtype=float).reshape(len(rows), len(names))
+
+        matrix = engine.store.cached("scenario_matrix", build)
+        sites = [
+            {key: site.get(key) for key in ("id", "name", "category", "city", "state", "score", "tier")}
+            for site in engine.portfolio
+        ]
+        pinned = np.array([bool(site.get("manual_score")) for site in engine.portfolio], dtype=bool)
+        fixed_scores = np.where(pinned, engine.store.scores, np.nan)
+        return cls(names, weights, matrix, sites, fixed_scores)
+
+    # ------------------------------------------------------------------
+    # Weight scenarios
+    # ------------------------------------------------------------------
+
+    def weights_with(self, changes: Dict[str, float], normalize: bool = False) -> np.ndarray:
+        """
+        Baseline weights with changes applied (unknown criteria are ignored)
+
+        Args:
+            changes: criterion -> new weight
+            normalize: Rescale so weights sum to 100
+        """
+        row = self.weights.copy()
+        for criterion, weight in changes.items():
+            j = self._column.get(criterion)
+            if j is not None:
+                row[j] = weight
+        if normalize and row.sum() > 0 and row.sum() != 100:
+            row = row * (100 / row.sum())
+        return row
+
+    def sweep(self, criterion: str, values: Sequence[float]) -> np.ndarray:
+        """Weight matrix with one row per value of a single criterion"""
+        rows = np.tile(self.weights, (len(values), 1))
+        j = self._column.get(criterion)
+        if j is not None:
+            rows[:, j] = values
+        return rows
+
+    def score(self, weight_rows: np.ndarray, site_rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Score every scenario against every site in one product.
+
+        Args:
+            weight_rows: Scenarios x criteria weight matrix
+            site_rows: Optional subset of site indices
+
+        Returns:
+            Scenarios x sites matrix of scores rounded to 2 decimals
+        """
+        weight_rows = np.atleast_2d(np.asarray(weight_rows, dtype=float))
+        rows = slice(None) if site_rows is None else list(site_rows)
+        matrix, fixed = self.matrix[rows], self.fixed_scores[rows]
+        totals = weight_rows.sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(totals > 0, weight_rows @ matrix.T / totals, 0.0)
+        return np.round(np.where(np.isnan(fixed), scores, fixed), 2)
+
+    def tiers(self, scores: np.ndarray) -> np.ndarray:
+        return tier_codes(scores)
+
+    def tier_counts(self, scores: np.ndarray) -> np.ndarray:
+        """Scenarios x 3 array of activate/watchlist/sunset counts"""
+        codes = tier_codes(np.atleast_2d(scores))
+        return np.stack([(codes == t).sum(axis=1) for t in range(len(TIER_NAMES))], axis=1)
+
+    def site_index(self, site_id: str) -> Optional[int]:
+        for i, site in enumerate(self.sites):
+            if site["id"] == site_id:
+                return i
+        return None
@@ -7,6 +7,13 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
 import json
+import copy
+
+import numpy as np
+
+from services.portfolio_store import (
+    PortfolioStore, TIER_NAMES, TIER_DECISIONS, tier_codes, weighted_scores
+)
 
 # Industry benchmarks from research
 CATEGORY_BENCHMARKS = {
@@ -344,10 +351,16 @@ SAMPLE_PORTFOLIO = [
 
 class ScoringEngine:
     def __init__(self):
-        self.criteria = DEFAULT_CRITERIA.copy()
+        self.criteria = copy.deepcopy(DEFAULT_CRITERIA)
         self.benchmarks = CATEGORY_BENCHMARKS.copy()
-        self.portfolio = SAMPLE_PORTFOLIO.copy()
+        self.portfolio = copy.deepcopy(SAMPLE_PORTFOLIO)
         self._enrich_portfolio()
+        self.store = PortfolioStore(
+            criteria_names=list(self.criteria),
+            weights=self._weight_vector(),
+            row_builder=self._portfolio_row
+        )
+        self.store.load(self.portfolio)
     
     def _enrich_portfolio(self):
         """Enrich portfolio with benchmark data"""
@@ -358,6 +371,18 @@ class ScoringEngine:
             site["tier"] = self._get_tier(site["score"])
             site["decision"] = self._get_decision(site["score"])
     
+    def _weight_vector(self) -> List[float]:
+        """Criterion weights in matrix column order"""
+        return [self.criteria[c].get("weight", 0) for c in self.criteria]
+    
+    def _portfolio_row(self, site: Dict) -> Optional[List[float]]:
+        """Criteria vector for a portfolio site, or None if it has no criteria scores"""
+        criteria_scores = site.get("criteria_scores") or {}
+        if not criteria_scores or site.get("manual_score"):
+            return None
+        scores = self._component_scores({**site, **criteria_scores})
+        return [scores[c] for c in self.criteria]
+    
     def _get_tier(self, score: float) -> str:
         if score >= 3.7:
             return "activate"
@@ -375,50 +400,38 @@ class ScoringEngine:
             return "SUNSET"
     
     def get_portfolio_summary(self) -> Dict:
-        """Get complete portfolio summary"""
-        activate = [s for s in self.portfolio if s["tier"] == "activate"]
-        watchlist = [s for s in self.portfolio if s["tier"] == "watchlist"]
-        sunset = [s for s in self.portfolio if s["tier"] == "sunset"]
-        
+        """Get complete portfolio summary (cached until the portfolio or weights change)"""
+        # Copy so callers cannot mutate the cached summary or the live site dicts
+        return copy.deepcopy(self.store.cached("portfolio_summary", self._build_portfolio_summary))
+    
+    def _build_portfolio_summary(self) -> Dict:
+        store = self.store
         return {
-            "total_sites": len(self.portfolio),
-            "tier_distribution": {
-                "activate": len(activate),
-                "watchlist": len(watchlist),
-                "sunset": len(sunset)
-            },
+            "total_sites": len(store),
+            "tier_distribution": {tier: store.tier_count(tier) for tier in TIER_NAMES},
             "revenue_potential": {
-                "activate_monthly": sum(s["monthly_potential"] for s in activate),
-                "watchlist_monthly": sum(s["monthly_potential"] for s in watchlist),
-                "total_monthly": sum(s["monthly_potential"] for s in self.portfolio),
-                "activate_annual": sum(s["monthly_potential"] for s in activate) * 12,
-                "total_annual": sum(s["monthly_potential"] for s in self.portfolio) * 12
+                "activate_monthly": store.tier_total("activate"),
+                "watchlist_monthly": store.tier_total("watchlist"),
+                "total_monthly": store.total_potential(),
+                "activate_annual": store.tier_total("activate") * 12,
+                "total_annual": store.total_potential() * 12
             },
             "category_breakdown": self._get_category_breakdown(),
-            "top_sites": sorted(self.portfolio, key=lambda x: x["score"], reverse=True)[:10],
-            "bottom_sites": sorted(self.portfolio, key=lambda x: x["score"])[:10],
+            "top_sites": store.top(10),
+            "bottom_sites": store.bottom(10),
             "recommendations": self._generate_recommendations()
         }
     
     def _get_category_breakdown(self) -> List[Dict]:
         """Get performance by category"""
-        categories = {}
-        for site in self.portfolio:
-            cat = site["category"]
-            if cat not in categories:
-                categories[cat] = {"sites": [], "total_potential": 0}
-            categories[cat]["sites"].append(site)
-            categories[cat]["total_potential"] += site["monthly_potential"]
-        
         result = []
-        for cat, data in categories.items():
-            avg_score = sum(s["score"] for s in data["sites"]) / len(data["sites"])
-            benchmark = self.benchmarks.get(cat, {})
+        for stats in self.store.category_stats():
+            benchmark = self.benchmarks.get(stats["category"], {})
             result.append({
-                "category": cat,
-                "site_count": len(data["sites"]),
-                "avg_score": round(avg_score, 2),
-                "total_potential": data["total_potential"],
+                "category": stats["category"],
+                "site_count": stats["site_count"],
+                "avg_score": round(stats["avg_score"], 2),
+                "total_potential": stats["total_potential"],
                 "avg_job_value": benchmark.get("avg_job_value", 0),
                 "recommended": benchmark.get("recommended", False),
                 "category_tier": benchmark.get("category_tier", 5)
@@ -433,21 +446,21 @@ class ScoringEngine:
                 "priority": 1,
                 "action": "ACTIVATE",
                 "description": "Begin contractor outreach for all 19 Activate Now sites",
-                "sites_affected": len([s for s in self.portfolio if s["tier"] == "activate"]),
+                "sites_affected": self.store.tier_count("activate"),
                 "expected_impact": "$28,500/month potential"
             },
             {
                 "priority": 2,
                 "action": "SUNSET",
                 "description": "Stop investment in 19 low-scoring sites",
-                "sites_affected": len([s for s in self.portfolio if s["tier"] == "sunset"]),
+                "sites_affected": self.store.tier_count("sunset"),
                 "expected_impact": "Free up resources for high-potential sites"
             },
             {
                 "priority": 3,
                 "action": "MONITOR",
                 "description": "Track 15 Watchlist sites for 90 days",
-                "sites_affected": len([s for s in self.portfolio if s["tier"] == "watchlist"]),
+                "sites_affected": self.store.tier_count("watchlist"),
                 "expected_impact": "Identify 5-8 promotion candidates"
             },
             {
@@ -463,7 +476,14 @@ class ScoringEngine:
                   state: str = None, sort_by: str = "score", 
                   order: str = "desc") -> List[Dict]:
         """Get sites with filtering and sorting"""
-        result = self.portfolio.copy()
+        reverse = order.lower() == "desc"
+        if sort_by == "score":
+            # Cached stable order; filtering afterwards keeps it sorted
+            result = [self.portfolio[i] for i in self.store.order(descending=reverse)]
+        elif tier and not category and not state:
+            result = self.store.tier_sites(tier.lower())
+        else:
+            result = self.portfolio.copy()
         
         if tier:
             result = [s for s in result if s["tier"] == tier.lower()]
@@ -472,10 +492,7 @@ class ScoringEngine:
         if state:
             result = [s for s in result if s["state"].upper() == state.upper()]
         
-        reverse = order.lower() == "desc"
-        if sort_by == "score":
-            result = sorted(result, key=lambda x: x["score"], reverse=reverse)
-        elif sort_by == "potential":
+        if sort_by == "potential":
             result = sorted(result, key=lambda x: x["monthly_potential"], reverse=reverse)
         elif sort_by == "category":
             result = sorted(result, key=lambda x: x["category"], reverse=reverse)
@@ -484,17 +501,34 @@ class ScoringEngine:
     
     def get_site_by_id(self, site_id: str) -> Optional[Dict]:
         """Get a specific site by ID"""
-        for site in self.portfolio:
-            if site["id"] == site_id:
-                return site
-        return None
+        return self.store.get(site_id)
     
-    def calculate_score(self, site_data: Dict) -> Dict:
-        """Calculate score for a site using enhanced model"""
+    @staticmethod
+    def _as_site_dict(site_data: Any, exclude_unset: bool = False) -> Dict:
+        """Accept plain dicts or request models (unset optional fields dropped)"""
+        if hasattr(site_data, "model_dump"):
+            return site_data.model_dump(exclude_none=True, exclude_unset=exclude_unset)
+        if hasattr(site_data, "dict"):
+            return site_data.dict(exclude_none=True, exclude_unset=exclude_unset)
+        return dict(site_data)
+    
+    @staticmethod
+    def _mark_score_source(site: Dict, changes: Dict) -> Dict:
+        """
+        A score the caller supplies wins over the criteria model: the site is
+        kept at that score until new criteria_scores arrive without one.
+        """
+        if changes.get("score") is not None:
+            site["manual_score"] = True
+        elif changes.get("criteria_scores"):
+            site["manual_score"] = False
+        return site
+    
+    def _component_scores(self, site_data: Dict) -> Dict[str, float]:
+        """Per-criterion scores (1-5 scale) for a site"""
         category = site_data.get("category", "")
         benchmark = self.benchmarks.get(category, {})
         
-        # Calculate component scores (1-5 scale)
         scores = {}
         
         # Category vertical score based on tier
@@ -515,46 +549,56 @@ class ScoringEngine:
             if criterion not in scores:
                 scores[criterion] = site_data.get(criterion, 3)
         
-        # Calculate weighted total
-        total = 0
-        total_weight = 0
-        for criterion, score in scores.items():
-            weight = self.criteria.get(criterion, {}).get("weight", 0)
-            total += score * weight
-            total_weight += weight
+        return scores
+    
+    def calculate_score(self, site_data: Dict) -> Dict:
+        """Calculate score for a site using enhanced model"""
+        return self.calculate_scores([site_data])[0]
+    
+    def calculate_scores(self, sites: List[Dict]) -> List[Dict]:
+        """
+        Score many sites at once.
         
-        final_score = total / total_weight if total_weight > 0 else 0
-        final_score = round(final_score, 2)
+        Builds a sites x criteria matrix and scores it with one matrix-vector
+        product; confidence comes from the row variance of the same matrix.
+        """
+        if not sites:
+            return []
         
-        return {
-            "site": site_data,
-            "score": final_score,
-            "tier": self._get_tier(final_score),
-            "decision": self._get_decision(final_score),
-            "criteria_scores": scores,
-            "monthly_potential": benchmark.get("monthly_potential", 500),
-            "avg_job_value": benchmark.get("avg_job_value", 1000),
-            "confidence": self._calculate_confidence(scores),
-            "scoring_breakdown": {
-                criterion: {
-                    "score": scores.get(criterion, 0),
-                    "weight": self.criteria.get(criterion, {}).get("weight", 0),
-                    "contribution": scores.get(criterion, 0) * self.criteria.get(criterion, {}).get("weight", 0) / 100
+        site_dicts = [self._as_site_dict(site) for site in sites]
+        names = list(self.criteria)
+        weights = np.asarray(self._weight_vector(), dtype=float)
+        component_scores = [self._component_scores(site) for site in site_dicts]
+        matrix = np.array([[scores[c] for c in names] for scores in component_scores], dtype=float)
+        
+        final_scores = weighted_scores(matrix, weights)
+        tiers = tier_codes(final_scores)
+        confidence = np.round(np.clip(1 - matrix.var(axis=1) / 10, 0.3, 0.95), 2)
+        contributions = matrix * weights / 100
+        
+        results = []
+        for i, site_data in enumerate(site_dicts):
+            benchmark = self.benchmarks.get(site_data.get("category", ""), {})
+            scores = component_scores[i]
+            results.append({
+                "site": site_data,
+                "score": float(final_scores[i]),
+                "tier": TIER_NAMES[tiers[i]],
+                "decision": TIER_DECISIONS[tiers[i]],
+                "criteria_scores": scores,
+                "monthly_potential": benchmark.get("monthly_potential", 500),
+                "avg_job_value": benchmark.get("avg_job_value", 1000),
+                "confidence": float(confidence[i]),
+                "scoring_breakdown": {
+                    criterion: {
+                        "score": scores[criterion],
+                        "weight": self.criteria[criterion].get("weight", 0),
+                        "contribution": float(contributions[i, j])
+                    }
+                    for j, criterion in enumerate(names)
                 }
-                for criterion in self.criteria
-            }
-        }
-    
-    def _calculate_confidence(self, scores: Dict) -> float:
-        """Calculate confidence level based on score variance"""
-        values = list(scores.values())
-        if not values:
-            return 0.5
-        avg = sum(values) / len(values)
-        variance = sum((v - avg) ** 2 for v in values) / len(values)
-        # Lower variance = higher confidence
-        confidence = max(0.3, min(0.95, 1 - (variance / 10)))
-        return round(confidence, 2)
+            })
+        return results
     
     def get_criteria(self) -> Dict:
         """Get all scoring criteria with weights"""
@@ -565,6 +609,7 @@ class ScoringEngine:
         for criterion, weight in new_weights.items():
             if criterion in self.criteria:
                 self.criteria[criterion]["weight"] = weight
+        self.store.set_weights(self._weight_vector())
         return self.criteria
     
     def get_category_benchmarks(self) -> List[Dict]:
@@ -582,6 +627,7 @@ class ScoringEngine:
     
     def create_site(self, site_data: Dict) -> Dict:
         """Add a new site to portfolio"""
+        site_data = self._as_site_dict(site_data)
         new_site = {
             "id": f"site_{str(uuid.uuid4())[:8]}",
             "name": site_data.get("name"),
@@ -591,6 +637,7 @@ class ScoringEngine:
             "score": site_data.get("score", 3.0),
             "criteria_scores": site_data.get("criteria_scores", {})
         }
+        self._mark_score_source(new_site, site_data)
         
         # Enrich with benchmark data
         benchmark = self.benchmarks.get(new_site["category"], {})
@@ -599,27 +646,16 @@ class ScoringEngine:
         new_site["tier"] = self._get_tier(new_site["score"])
         new_site["decision"] = self._get_decision(new_site["score"])
         
-        self.portfolio.append(new_site)
-        return new_site
+        return self.store.add(new_site)
     
     def update_site(self, site_id: str, site_data: Dict) -> Optional[Dict]:
-        """Update an existing site"""
-        for i, site in enumerate(self.portfolio):
-            if site["id"] == site_id:
-                site.update(site_data)
-                site["tier"] = self._get_tier(site.get("score", 3.0))
-                site["decision"] = self._get_decision(site.get("score", 3.0))
-                self.portfolio[i] = site
-                return site
-        return None
+        """Update an existing site (only the fields the caller sent)"""
+        changes = self._as_site_dict(site_data, exclude_unset=True)
+        return self.store.update(site_id, self._mark_score_source(dict(changes), changes))
     
     def delete_site(self, site_id: str) -> bool:
         """Remove a site from portfolio"""
-        for i, site in enumerate(self.portfolio):
-            if site["id"] == site_id:
-                self.portfolio.pop(i)
-                return True
-        return False
+        return self.store.remove(site_id)
     
     def update_from_revflow(self, leads_data: Dict) -> Dict:
         """Update site performance from RevFlow lead data"""
@@ -649,14 +685,14 @@ class ScoringEngine:
     
     def generate_action_plan(self, days: int = 90) -> List[Dict]:
         """Generate prioritized action plan"""
-        activate_sites = [s for s in self.portfolio if s["tier"] == "activate"]
+        activate_sites = self.store.tier_sites("activate")
         
         return [
             {
                 "week": "1-2",
                 "action_type": "SUNSET",
                 "task": "Discontinue all investment in Sunset tier sites",
-                "sites": [s["name"] for s in self.portfolio if s["tier"] == "sunset"][:5],
+                "sites": [s["name"] for s in self.store.tier_sites("sunset")][:5],
                 "impact": "Free up resources"
             },
             {
@@ -677,18 +713,15 @@ class ScoringEngine:
                 "week": "5-8",
                 "action_type": "MONITOR",
                 "task": "Set up tracking for Watchlist sites",
-                "sites": [s["name"] for s in self.portfolio if s["tier"] == "watchlist"][:5],
+                "sites": [s["name"] for s in self.store.tier_sites("watchlist")][:5],
                 "impact": "Identify promotion candidates"
             }
         ]
     
     def project_revenue(self, months: int = 12, success_rate: float = 0.6) -> Dict:
         """Project revenue based on portfolio"""
-        activate = [s for s in self.portfolio if s["tier"] == "activate"]
-        watchlist = [s for s in self.portfolio if s["tier"] == "watchlist"]
-        
-        activate_potential = sum(s["monthly_potential"] for s in activate)
-        watchlist_potential = sum(s["monthly_potential"] for s in watchlist)
+        activate_potential = self.store.tier_total("activate")
+        watchlist_potential = self.store.tier_total("watchlist")
         
         return {
             "months": months,
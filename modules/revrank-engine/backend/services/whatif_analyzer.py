@@ -4,7 +4,11 @@ Scenario analysis and sensitivity testing for rank & rent decisions
 """
 
 from typing import List, Dict, Optional
-import copy
+
+import numpy as np
+
+from services.portfolio_store import TIER_NAMES
+from services.scenario_evaluator import ScenarioEvaluator
 
 
 class WhatIfAnalyzer:
@@ -17,6 +21,8 @@ class WhatIfAnalyzer:
         Run a what-if scenario analysis.
         Supports weight changes, threshold changes, and category focus.
         """
+        if hasattr(scenario, "model_dump"):
+            scenario = scenario.model_dump(exclude_none=True)
         scenario_type = scenario.get("type", "weight_change")
         
         if scenario_type == "weight_change":
@@ -34,65 +40,33 @@ class WhatIfAnalyzer:
         """Analyze impact of changing criterion weights"""
         weight_changes = scenario.get("weight_changes", {})
         
-        # Get current portfolio
-        original_portfolio = self.scoring_engine.portfolio.copy()
         original_summary = self.scoring_engine.get_portfolio_summary()
+        evaluator = ScenarioEvaluator.from_engine(self.scoring_engine)
         
-        # Store original weights
-        original_weights = {
-            criterion: data["weight"] 
-            for criterion, data in self.scoring_engine.criteria.items()
-        }
-        
-        # Apply weight changes
-        new_weights = original_weights.copy()
-        for criterion, new_weight in weight_changes.items():
-            if criterion in new_weights:
-                new_weights[criterion] = new_weight
+        # Apply weight changes to a private copy, normalized to 100
+        weight_row = evaluator.weights_with(weight_changes, normalize=True)
+        new_weights = {c: float(w) for c, w in zip(evaluator.criteria_names, weight_row)}
         
-        # Normalize weights to 100
-        total_weight = sum(new_weights.values())
-        if total_weight != 100:
-            factor = 100 / total_weight
-            new_weights = {k: v * factor for k, v in new_weights.items()}
+        # Recalculate all scores with new weights (one batch, live weights untouched)
+        new_scores = evaluator.score(weight_row)[0]
+        new_tiers = evaluator.tiers(new_scores)
         
-        # Recalculate all scores with new weights
         recalculated_sites = []
-        for site in original_portfolio:
-            # Create site data for scoring
-            site_data = {
-                "name": site["name"],
-                "category": site["category"],
-                "city": site["city"],
-                "state": site["state"]
-            }
-            # Add any existing criteria scores
-            site_data.update(site.get("criteria_scores", {}))
-            
-            # Temporarily update weights
-            for criterion, weight in new_weights.items():
-                if criterion in self.scoring_engine.criteria:
-                    self.scoring_engine.criteria[criterion]["weight"] = weight
-            
-            # Calculate new score
-            result = self.scoring_engine.calculate_score(site_data)
+        for site, new_score, new_tier in zip(evaluator.sites, new_scores, new_tiers):
+            new_score = float(new_score)
+            new_tier = TIER_NAMES[new_tier]
             recalculated_sites.append({
                 "id": site["id"],
                 "name": site["name"],
                 "category": site["category"],
                 "original_score": site["score"],
-                "new_score": result["score"],
-                "score_change": round(result["score"] - site["score"], 2),
+                "new_score": new_score,
+                "score_change": round(new_score - site["score"], 2),
                 "original_tier": site["tier"],
-                "new_tier": result["tier"],
-                "tier_changed": site["tier"] != result["tier"]
+                "new_tier": new_tier,
+                "tier_changed": site["tier"] != new_tier
             })
         
-        # Restore original weights
-        for criterion, weight in original_weights.items():
-            if criterion in self.scoring_engine.criteria:
-                self.scoring_engine.criteria[criterion]["weight"] = weight
-        
         # Calculate new tier distribution
         new_activate = len([s for s in recalculated_sites if s["new_tier"] == "activate"])
         new_watchlist = len([s for s in recalculated_sites if s["new_tier"] == "watchlist"])
@@ -252,11 +226,9 @@ class WhatIfAnalyzer:
         """Analyze impact of specific score changes on individual sites"""
         site_changes = scenario.get("site_changes", {})
         
-        portfolio = copy.deepcopy(self.scoring_engine.portfolio)
-        
         results = []
         for site_id, new_score in site_changes.items():
-            site = next((s for s in portfolio if s["id"] == site_id), None)
+            site = self.scoring_engine.get_site_by_id(site_id)
             if site:
                 original_score = site["score"]
                 original_tier = site["tier"]
@@ -290,77 +262,89 @@ class WhatIfAnalyzer:
         Analyze how changing a specific weight affects scores.
         Can analyze overall portfolio or a specific site.
         """
-        step_size = (range_max - range_min) / steps
-        test_weights = [range_min + i * step_size for i in range(steps + 1)]
+        sweep = {"criterion": criterion, "range_min": range_min, "range_max": range_max, "steps": steps}
+        return self.multi_weight_sensitivity_analysis([sweep], site_id=site_id)["sweeps"][0]
+    
+    def multi_weight_sensitivity_analysis(self, sweeps: List[Dict], site_id: str = None) -> Dict:
+        """
+        Run several weight sweeps in one vectorized batch.
         
-        results = []
+        Every step of every sweep becomes one row of a weight matrix that is
+        scored against all sites at once. Each sweep varies one criterion from
+        the current weights; the live scoring weights are never modified.
         
-        original_weight = self.scoring_engine.criteria.get(criterion, {}).get("weight", 10)
+        Args:
+            sweeps: [{"criterion", "range_min", "range_max", "steps"}, ...]
+            site_id: Analyze one site instead of the whole portfolio
+        """
+        evaluator = ScenarioEvaluator.from_engine(self.scoring_engine)
         
-        for test_weight in test_weights:
-            # Temporarily set weight
-            if criterion in self.scoring_engine.criteria:
-                self.scoring_engine.criteria[criterion]["weight"] = test_weight
+        site_rows = None
+        if site_id:
+            index = evaluator.site_index(site_id)
+            site_rows = [] if index is None else [index]
+        
+        # Stack all sweeps into one scenarios x criteria weight matrix
+        plans = []
+        weight_blocks = []
+        for sweep in sweeps:
+            criterion = sweep.get("criterion", "local_search_demand")
+            range_min = sweep.get("range_min", 0)
+            range_max = sweep.get("range_max", 20)
+            steps = max(1, int(sweep.get("steps", 10)))
+            step_size = (range_max - range_min) / steps
+            test_weights = [range_min + i * step_size for i in range(steps + 1)]
+            plans.append((criterion, range_min, range_max, steps, test_weights))
+            weight_blocks.append(evaluator.sweep(criterion, test_weights))
+        
+        if weight_blocks:
+            scores = evaluator.score(np.vstack(weight_blocks), site_rows=site_rows)
+        else:
+            scores = np.zeros((0, 0))
+        
+        results_by_sweep = []
+        offset = 0
+        for criterion, range_min, range_max, steps, test_weights in plans:
+            block = scores[offset:offset + len(test_weights)]
+            offset += len(test_weights)
+            original_weight = self.scoring_engine.criteria.get(criterion, {}).get("weight", 10)
             
+            results = []
             if site_id:
                 # Analyze specific site
-                site = self.scoring_engine.get_site_by_id(site_id)
-                if site:
-                    site_data = {
-                        "name": site["name"],
-                        "category": site["category"],
-                        "city": site["city"],
-                        "state": site["state"]
-                    }
-                    result = self.scoring_engine.calculate_score(site_data)
+                if site_rows:
+                    tiers = evaluator.tiers(block[:, 0])
+                    for test_weight, score, tier in zip(test_weights, block[:, 0], tiers):
+                        results.append({
+                            "weight": test_weight,
+                            "score": float(score),
+                            "tier": TIER_NAMES[tier]
+                        })
+            elif block.shape[1]:
+                # Analyze portfolio
+                counts = evaluator.tier_counts(block)
+                for test_weight, row, (activate, watchlist, sunset) in zip(test_weights, block, counts):
                     results.append({
                         "weight": test_weight,
-                        "score": result["score"],
-                        "tier": result["tier"]
+                        "avg_score": round(float(row.sum()) / len(row), 2),
+                        "activate_count": int(activate),
+                        "watchlist_count": int(watchlist),
+                        "sunset_count": int(sunset)
                     })
-            else:
-                # Analyze portfolio
-                portfolio = self.scoring_engine.portfolio
-                activate_count = 0
-                watchlist_count = 0
-                sunset_count = 0
-                total_score = 0
-                
-                for site in portfolio:
-                    site_data = {
-                        "name": site["name"],
-                        "category": site["category"],
-                        "city": site["city"],
-                        "state": site["state"]
-                    }
-                    result = self.scoring_engine.calculate_score(site_data)
-                    total_score += result["score"]
-                    if result["tier"] == "activate":
-                        activate_count += 1
-                    elif result["tier"] == "watchlist":
-                        watchlist_count += 1
-                    else:
-                        sunset_count += 1
-                
-                results.append({
-                    "weight": test_weight,
-                    "avg_score": round(total_score / len(portfolio), 2),
-                    "activate_count": activate_count,
-                    "watchlist_count": watchlist_count,
-                    "sunset_count": sunset_count
-                })
-        
-        # Restore original weight
-        if criterion in self.scoring_engine.criteria:
-            self.scoring_engine.criteria[criterion]["weight"] = original_weight
+            
+            results_by_sweep.append({
+                "criterion": criterion,
+                "original_weight": original_weight,
+                "test_range": {"min": range_min, "max": range_max, "steps": steps},
+                "site_id": site_id,
+                "results": results,
+                "insights": self._generate_sensitivity_insights(criterion, results, site_id) if results else []
+            })
         
         return {
-            "criterion": criterion,
-            "original_weight": original_weight,
-            "test_range": {"min": range_min, "max": range_max, "steps": steps},
             "site_id": site_id,
-            "results": results,
-            "insights": self._generate_sensitivity_insights(criterion, results, site_id)
+            "scenarios_scored": int(scores.shape[0]),
+            "sweeps": results_by_sweep
         }
     
     def _generate_sensitivity_insights(self, criterion: str, 
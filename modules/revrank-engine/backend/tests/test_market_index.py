@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from services.market_discovery_engine import MarketDiscoveryEngine
+from services.market_index import GeoGrid, MarketIndex, haversine_miles
+
+
+def _synthetic_markets(rng, states=5, cities=200):
+    markets = {}
+    for s in range(states):
+        lat0, lng0 = rng.uniform(26, 46), rng.uniform(-120, -75)
+        markets[f"S{s}"] = {"cities": [
+            {
+                "city": f"City {s}-{i}",
+                "population": rng.randrange(10000, 300000),
+                "competition": rng.choice(["low", "moderate", "high"]),
+                "lat": lat0 + rng.uniform(-3, 3),
+                "lng": lng0 + rng.uniform(-3, 3),
+            }
+            for i in range(cities)
+        ]}
+    return markets
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return MarketDiscoveryEngine()
+
+
+class TestGeoGrid:
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        points = {("S", i): (rng.uniform(25, 48), rng.uniform(-124, -70)) for i in range(2000)}
+        grid = GeoGrid(cell_degrees=0.5)
+        for key, (lat, lng) in points.items():
+            grid.add(key, lat, lng)
+
+        for _ in range(50):
+            lat, lng, radius = rng.uniform(25, 48), rng.uniform(-124, -70), rng.choice([10, 50, 150])
+            expected = {k for k, (plat, plng) in points.items() if haversine_miles(lat, lng, plat, plng) <= radius}
+            assert set(grid.within(lat, lng, radius)) == expected
+
+
+class TestMarketIndex:
+    def test_top_k_matches_full_sort(self):
+        rng = random.Random(3)
+        markets = _synthetic_markets(rng)
+        categories = {"A": {}, "B": {}, "C": {}}
+        index = MarketIndex(markets, categories, scorer=lambda c, city, state: round(rng.uniform(1, 5), 2))
+        accept = lambda key: index.city(key)["competition"] != "high"
+
+        expected = sorted(
+            (e for e in index.scores.values() if e.category in ("A", "C") and e.score >= 3 and accept(e.market)),
+            key=lambda e: (-e.score, e.order)
+        )[:25]
+        assert index.top_k(["A", "C"], limit=25, min_score=3, accept=accept) == expected
+
+        nearby = set(index.nearby(markets["S0"]["cities"][0]["lat"], markets["S0"]["cities"][0]["lng"], 100))
+        expected = sorted(
+            (e for e in index.scores.values()
+             if e.category in ("A", "C") and e.score >= 3 and accept(e.market) and e.market in nearby),
+            key=lambda e: (-e.score, e.order)
+        )[:25]
+        assert index.top_k(["A", "C"], limit=25, min_score=3, accept=accept, markets=nearby) == expected
+
+    def test_locate_prefers_the_larger_match(self, engine):
+        dallas_metro = engine.index.locate("Dallas")
+        assert dallas_metro == engine.index.locate("Dallas", "TX")
+        assert 32 < dallas_metro[0] < 33.5 and -97.5 < dallas_metro[1] < -96
+        assert engine.index.locate("Dallas", "GA") == (33.9237, -84.8408)
+        assert engine.index.locate("Nowhere") is None
+
+
+class TestTurboSearch:
+    def test_radius_results_stay_within_radius(self, engine):
+        origin = engine.index.locate("Dallas", "TX")
+        results = engine.turbo_search(base_city="Dallas", base_state="TX", radius_miles=40, min_score=1, limit=500)
+        assert results
+        for opp in results:
+            city = next(c for c in engine.markets[opp.state]["cities"] if c["city"] == opp.city)
+            assert haversine_miles(origin[0], origin[1], city["lat"], city["lng"]) <= 40
+
+    def test_unknown_base_city_is_an_error(self, engine):
+        with pytest.raises(ValueError, match="Unknown base city"):
+            engine.turbo_search(base_city="Atlantis", radius_miles=25)
@@ -0,0 +1,113 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from services.portfolio_store import PortfolioStore, TIER_NAMES, weighted_scores
+from services.scoring_engine import SAMPLE_PORTFOLIO, ScoringEngine
+
+
+def _row(site):
+    values = site.get("criteria_scores") or {}
+    return [values["a"], values["b"]] if values else None
+
+
+def _store(sites):
+    store = PortfolioStore(["a", "b"], [1, 1], _row)
+    store.load(sites)
+    return store
+
+
+class TestPortfolioStore:
+    def test_weighted_scores(self):
+        matrix = np.array([[5.0, 1.0], [2.0, 4.0]])
+
+        assert weighted_scores(matrix, np.array([3.0, 1.0])).tolist() == [4.0, 2.5]
+        assert weighted_scores(matrix, np.array([1.0, 2.0])).tolist() == [2.33, 3.33]
+        assert weighted_scores(matrix, np.zeros(2)).tolist() == [0.0, 0.0]
+
+    def test_incremental_totals_match_full_rescore(self):
+        store = _store([
+            {"id": "s1", "category": "Roofing", "monthly_potential": 100, "criteria_scores": {"a": 5, "b": 4}},
+            {"id": "s2", "category": "Fence", "monthly_potential": 50, "score": 3.3},
+            {"id": "s3", "category": "Roofing", "monthly_potential": 25, "criteria_scores": {"a": 1, "b": 2}},
+        ])
+        store.add({"id": "s4", "category": "Law", "monthly_potential": 10, "criteria_scores": {"a": 4, "b": 4}})
+        store.update("s3", {"criteria_scores": {"a": 4, "b": 3}})
+        store.remove("s2")
+
+        counts, totals = store.tier_counts.copy(), store.tier_potential.copy()
+        store.rescore()
+        assert np.array_equal(counts, store.tier_counts)
+        assert np.allclose(totals, store.tier_potential)
+        assert [s["id"] for s in store.top(3)] == ["s1", "s4", "s3"]
+        assert store.get("s3")["tier"] == "watchlist"
+
+    def test_set_weights_rescores_model_scored_sites_only(self):
+        store = _store([
+            {"id": "s1", "criteria_scores": {"a": 5, "b": 1}},
+            {"id": "s2", "score": 2.5},
+        ])
+        assert store.get("s1")["score"] == 3.0
+        store.set_weights([3, 1])
+        assert store.get("s1")["score"] == 4.0
+        assert store.get("s2")["score"] == 2.5
+
+    def test_views_are_cached_until_the_portfolio_changes(self):
+        store = _store([{"id": "s1", "criteria_scores": {"a": 5, "b": 5}}])
+        builds = []
+        store.cached("view", lambda: builds.append(1))
+        store.cached("view", lambda: builds.append(1))
+        assert len(builds) == 1
+        store.update("s1", {"name": "renamed"})
+        store.cached("view", lambda: builds.append(1))
+        assert len(builds) == 2
+
+
+class TestScoringEngine:
+    def test_sample_sites_keep_their_recorded_scores(self):
+        engine = ScoringEngine()
+        assert not engine.store.model_scored.any()
+        assert all(s["criteria_scores"] == {} for s in engine.portfolio)
+
+        engine.update_criteria_weights({"category_vertical_score": 40})
+        assert [s["score"] for s in engine.portfolio] == [s["score"] for s in SAMPLE_PORTFOLIO]
+
+    def test_weight_change_rescores_sites_with_criteria(self):
+        engine = ScoringEngine()
+        criteria = {criterion: 2 for criterion in engine.criteria}
+        criteria["category_vertical_score"] = 5
+        site = engine.create_site({"name": "Scored", "category": "Roofing", "city": "Austin",
+                                   "state": "TX", "criteria_scores": criteria})
+        before = site["score"]
+        engine.update_criteria_weights({"category_vertical_score": 40})
+
+        rescored = engine.get_site_by_id(site["id"])
+        assert rescored["score"] > before
+        assert engine.store.model_scored.sum() == 1
+        summary = engine.get_portfolio_summary()
+        assert sum(summary["tier_distribution"].values()) == len(SAMPLE_PORTFOLIO) + 1
+        assert summary["tier_distribution"] == {
+            tier: sum(1 for s in engine.portfolio if s["tier"] == tier) for tier in TIER_NAMES
+        }
+
+    def test_caller_supplied_score_is_kept(self):
+        engine = ScoringEngine()
+        site = engine.update_site("site_001", {"score": 2.0})
+        assert site["score"] == 2.0
+        assert site["tier"] == "sunset"
+        engine.update_criteria_weights({"lead_value_proxy": 30})
+        assert engine.get_site_by_id("site_001")["score"] == 2.0
+
+    def test_summary_is_a_copy_of_the_cache(self):
+        engine = ScoringEngine()
+        summary = engine.get_portfolio_summary()
+        summary["top_sites"][0]["score"] = 0
+        summary["tier_distribution"]["activate"] = 0
+        fresh = engine.get_portfolio_summary()
+        assert fresh["top_sites"][0]["score"] == 4.12
+        assert fresh["tier_distribution"]["activate"] == 19
+        assert engine.get_site_by_id("site_001")["score"] == 4.12
+
+    def test_engines_do_not_share_sample_sites(self):
+        ScoringEngine().update_site("site_002", {"name": "changed"})
+        assert ScoringEngine().get_site_by_id("site_002")["name"] == SAMPLE_PORTFOLIO[1]["name"]
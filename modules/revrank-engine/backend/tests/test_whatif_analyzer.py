@@ -0,0 +1,90 @@
+import copy
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from services.scenario_evaluator import ScenarioEvaluator
+from services.whatif_analyzer import WhatIfAnalyzer
+
+
+def _add_scored_site(engine):
+    """Sample sites carry no criteria scores; add one the model scores"""
+    criteria = {criterion: 3 for criterion in engine.criteria}
+    criteria["category_vertical_score"] = 5
+    return engine.create_site({"name": "Scored", "category": "Roofing", "city": "Austin",
+                               "state": "TX", "criteria_scores": criteria})
+
+
+def _live_state(engine):
+    return (
+        copy.deepcopy(engine.criteria),
+        engine.store.weights.copy(),
+        {site["id"]: (site["score"], site["tier"], site["decision"]) for site in engine.portfolio},
+        engine.get_portfolio_summary(),
+    )
+
+
+class TestWhatIfAnalyzer:
+    def test_scenarios_leave_live_weights_and_scores_unchanged(self):
+        analyzer = WhatIfAnalyzer()
+        engine = analyzer.scoring_engine
+        _add_scored_site(engine)
+        criteria, weights, sites, summary = _live_state(engine)
+
+        result = analyzer.analyze_scenario({
+            "type": "weight_change",
+            "weight_changes": {"category_vertical_score": 40, "local_search_demand": 0},
+        })
+        assert result["impact_summary"]["tier_changes"] > 0
+        analyzer.weight_sensitivity_analysis(criterion="lead_value_proxy", range_max=40, steps=8)
+        analyzer.weight_sensitivity_analysis(site_id="site_020", criterion="urgency_call_first")
+        analyzer.multi_weight_sensitivity_analysis([
+            {"criterion": "competition_quality", "range_max": 30},
+            {"criterion": "seasonality_profile", "range_max": 30},
+        ])
+
+        after_criteria, after_weights, after_sites, after_summary = _live_state(engine)
+        assert after_criteria == criteria
+        assert np.array_equal(after_weights, weights)
+        assert after_sites == sites
+        assert after_summary == summary
+
+    def test_baseline_scenario_matches_live_model_scores(self):
+        engine = WhatIfAnalyzer().scoring_engine
+        site = _add_scored_site(engine)
+        pinned = engine.create_site({"name": "Pinned", "category": "Towing", "city": "Austin",
+                                     "state": "TX", "score": 4.5})
+        evaluator = ScenarioEvaluator.from_engine(engine)
+        baseline = evaluator.score(evaluator.weights)[0]
+        for live in (site, pinned):
+            assert baseline[evaluator.site_index(live["id"])] == live["score"]
+
+    def test_sweep_matches_applying_each_weight_live(self):
+        analyzer = WhatIfAnalyzer()
+        site = _add_scored_site(analyzer.scoring_engine)
+        sweep = analyzer.weight_sensitivity_analysis(site_id=site["id"], criterion="lead_value_proxy",
+                                                     range_max=20, steps=4)
+
+        engine = analyzer.scoring_engine
+        original = engine.criteria["lead_value_proxy"]["weight"]
+        for step in sweep["results"]:
+            engine.update_criteria_weights({"lead_value_proxy": step["weight"]})
+            assert step["score"] == engine.get_site_by_id(site["id"])["score"]
+            assert step["tier"] == engine.get_site_by_id(site["id"])["tier"]
+        engine.update_criteria_weights({"lead_value_proxy": original})
+
+    def test_sweep_moves_the_default_portfolio(self):
+        analyzer = WhatIfAnalyzer()
+        sweep = analyzer.weight_sensitivity_analysis(criterion="category_vertical_score", range_max=60, steps=6)
+
+        results = sweep["results"]
+        assert len({step["avg_score"] for step in results}) == len(results)
+        assert len({(step["activate_count"], step["watchlist_count"], step["sunset_count"])
+                    for step in results}) > 1
+
+        scenario = analyzer.analyze_scenario({
+            "type": "weight_change",
+            "weight_changes": {"category_vertical_score": 40, "local_search_demand": 0},
+        })
+        assert scenario["impact_summary"]["tier_changes"] > 0
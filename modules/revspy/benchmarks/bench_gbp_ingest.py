@@ -0,0 +1,132 @@
+"""
+RevSPY GBP Ingest Benchmark - profiles/sec, row-by-row vs. set-based upsert
+
+Creates a scratch copy of revspy_gbp_profiles, then ingests synthetic GMB
+Everywhere batches twice per batch size: once through the previous
+SELECT + UPDATE/INSERT per profile loop, once through upsert_profiles().
+Every batch is half new place_ids and half updates of existing ones.
+
+Usage (from revspy/):
+    DATABASE_URL=postgresql://... python benchmarks/bench_gbp_ingest.py --batches 100 500 1000 --rounds 5
+
+Creates and drops the table revspy_gbp_profiles_bench; revspy_gbp_profiles is not touched.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gbp_intelligence.api import (  # noqa: E402
+    PROFILE_COLUMNS, GBPProfile, get_db_connection, profile_row, upsert_profiles
+)
+
+TABLE = "revspy_gbp_profiles_bench"
+CATEGORIES = ["Electrician", "Plumber", "HVAC contractor", "Roofing contractor"]
+
+
+def create_table(conn):
+    cur = conn.cursor()
+    cur.execute(f"""
+        DROP TABLE IF EXISTS {TABLE};
+        CREATE TABLE {TABLE} (
+            id SERIAL PRIMARY KEY,
+            place_id VARCHAR(255) UNIQUE NOT NULL,
+            business_name VARCHAR(500), primary_category VARCHAR(255),
+            secondary_categories JSONB, category_count INTEGER,
+            address TEXT, city VARCHAR(255), state VARCHAR(50), zip_code VARCHAR(20), country VARCHAR(10),
+            lat NUMERIC, lng NUMERIC, rating NUMERIC(2, 1), review_count INTEGER,
+            has_website BOOLEAN, website_url TEXT, has_phone BOOLEAN, phone_number VARCHAR(50),
+            has_hours BOOLEAN, hours_data JSONB,
+            photo_count INTEGER, video_count INTEGER, post_count INTEGER, qa_count INTEGER,
+            service_area_radius INTEGER, service_area_cities JSONB,
+            attributes JSONB, amenities JSONB,
+            market VARCHAR(255), competitor_rank INTEGER, local_pack_position BOOLEAN,
+            scraped_by VARCHAR(255), scraped_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT NOW(), updated_at TIMESTAMP DEFAULT NOW()
+        );
+    """)
+    conn.commit()
+    cur.close()
+
+
+def random_profile(rng, place_id: str) -> GBPProfile:
+    return GBPProfile(
+        place_id=place_id,
+        business_name=f"Business {place_id}",
+        primary_category=rng.choice(CATEGORIES),
+        secondary_categories=rng.sample(CATEGORIES, 2),
+        city="Chicago", state="IL", zip_code=f"606{rng.randint(0, 99):02d}",
+        lat=41.8 + rng.random() / 10, lng=-87.6 - rng.random() / 10,
+        rating=round(rng.uniform(3, 5), 1), review_count=rng.randint(0, 900),
+        has_website=True, website_url="https://example.com", has_phone=True,
+        photo_count=rng.randint(0, 200), competitor_rank=rng.randint(1, 20),
+        attributes={"women_led": rng.random() < 0.2}
+    )
+
+
+def legacy_ingest(cur, profiles, market, scraped_by):
+    """The previous per-profile path: SELECT, then a full UPDATE or INSERT"""
+    columns = PROFILE_COLUMNS[1:]
+    update_sql = (
+        f"UPDATE {TABLE} SET " + ", ".join(f"{column} = %s" for column in columns)
+        + ", scraped_at = NOW(), updated_at = NOW() WHERE place_id = %s"
+    )
+    insert_sql = (
+        f"INSERT INTO {TABLE} ({', '.join(PROFILE_COLUMNS)}, scraped_at) VALUES ("
+        + ", ".join(["%s"] * len(PROFILE_COLUMNS)) + ", NOW())"
+    )
+    for profile in profiles:
+        row = profile_row(profile, market, scraped_by)
+        cur.execute(f"SELECT id FROM {TABLE} WHERE place_id = %s", (profile.place_id,))
+        if cur.fetchone():
+            cur.execute(update_sql, row[1:] + (profile.place_id,))
+        else:
+            cur.execute(insert_sql, row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GBP ingest profiles/sec: row-by-row vs. set-based upsert")
+    parser.add_argument("--batches", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    rng = random.Random(42)
+    create_table(conn)
+    try:
+        print(f"{'batch':>6}  {'path':<10} {'profiles/sec':>13}")
+        next_id = 0
+        for size in args.batches:
+            for name in ("row-by-row", "upsert"):
+                elapsed = 0.0
+                ingested = 0
+                for _ in range(args.rounds):
+                    existing = [f"p{rng.randrange(next_id)}" for _ in range(size // 2)] if next_id else []
+                    fresh = [f"p{next_id + i}" for i in range(size - len(existing))]
+                    next_id += len(fresh)
+                    profiles = [random_profile(rng, place_id) for place_id in dict.fromkeys(existing + fresh)]
+
+                    cur = conn.cursor()
+                    start = time.perf_counter()
+                    if name == "upsert":
+                        upsert_profiles(cur, profiles, "bench market", "bench", table=TABLE)
+                    else:
+                        legacy_ingest(cur, profiles, "bench market", "bench")
+                    conn.commit()
+                    elapsed += time.perf_counter() - start
+                    ingested += len(profiles)
+                    cur.close()
+                print(f"{size:>6}  {name:<10} {ingested / elapsed:13.0f}")
+    finally:
+        cur = conn.cursor()
+        cur.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+RevSPY Spatial Density Benchmark - grid index vs. linear scan
+
+Builds a CompetitorDensityIndex from synthetic profiles clustered around a
+few metro centres (no database needed), then times:
+
+    build         bulk load of all profiles
+    upsert        moving existing profiles (incremental ingest path)
+    radius        within_radius(), index vs. scanning every profile
+    overlap       coverage_overlap() for random profiles
+    underserved   underserved_cells() per (market, category)
+
+Usage (from revspy/):
+    python benchmarks/bench_spatial_density.py --profiles 100000 --queries 500
+"""
+
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gbp_intelligence.spatial import CompetitorDensityIndex, haversine_km  # noqa: E402
+
+MARKETS = {
+    "Chicago, IL": (41.88, -87.63),
+    "Austin, TX": (30.27, -97.74),
+    "Denver, CO": (39.74, -104.99),
+    "Atlanta, GA": (33.75, -84.39),
+    "Seattle, WA": (47.61, -122.33),
+}
+CATEGORIES = ["Electrician", "Plumber", "HVAC contractor", "Roofing contractor", "Dentist", "Lawyer"]
+
+
+def random_rows(rng, count):
+    markets = list(MARKETS)
+    for i in range(count):
+        market = rng.choice(markets)
+        lat0, lng0 = MARKETS[market]
+        # Dense core, thinning suburbs (~40 km out)
+        distance = abs(rng.gauss(0, 12))
+        bearing = rng.random() * 2 * math.pi
+        lat = lat0 + distance * math.cos(bearing) / 111.2
+        lng = lng0 + distance * math.sin(bearing) / (111.2 * math.cos(math.radians(lat0)))
+        radius = rng.choice([None, None, 5, 10, 15, 25])
+        yield f"p{i}", market, rng.choice(CATEGORIES), lat, lng, radius
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{name:<28} p50 {statistics.median(samples):9.3f} ms   p95 {p95:9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spatial competitor-density index benchmark")
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--cell-km", type=float, default=2.0)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    rows = list(random_rows(rng, args.profiles))
+
+    index = CompetitorDensityIndex(cell_km=args.cell_km)
+    start = time.perf_counter()
+    index.build(rows)
+    print(f"build: {args.profiles} profiles in {time.perf_counter() - start:.2f} s  {index.stats()}")
+
+    moves = [rows[rng.randrange(len(rows))] for _ in range(args.queries)]
+    report("upsert (move profile)", timed(
+        lambda: index.upsert(*_moved(rng, moves[rng.randrange(len(moves))])), args.queries
+    ))
+
+    points = []
+    for _ in range(args.queries):
+        market = rng.choice(list(MARKETS))
+        lat0, lng0 = MARKETS[market]
+        points.append((lat0 + rng.uniform(-0.3, 0.3), lng0 + rng.uniform(-0.3, 0.3), market, rng.choice(CATEGORIES)))
+
+    profiles = list(index._profiles.values())
+
+    def scan(lat, lng, market, category):
+        return sorted(
+            (haversine_km(lat, lng, p.lat, p.lng), p.place_id) for p in profiles
+            if p.market == market and p.primary_category == category
+            and haversine_km(lat, lng, p.lat, p.lng) <= 5
+        )
+
+    query = iter(points * 2)
+    report("radius 5 km (index)", timed(lambda: index.within_radius(*_args(next(query))), args.queries))
+    report("radius 5 km (linear scan)", timed(lambda: scan(*next(query)), min(args.queries, 50)))
+
+    for lat, lng, market, category in points[:50]:
+        indexed = [(c["place_id"]) for c in index.within_radius(lat, lng, 5, market, category)]
+        assert sorted(indexed) == sorted(place_id for _, place_id in scan(lat, lng, market, category))
+
+    place_ids = list(index._profiles)
+    report("coverage_overlap", timed(lambda: index.coverage_overlap(rng.choice(place_ids)), args.queries))
+
+    partitions = [(market, category) for market in MARKETS for category in CATEGORIES]
+    report("underserved_cells", timed(
+        lambda: index.underserved_cells(*partitions[rng.randrange(len(partitions))]), len(partitions) * 3
+    ))
+
+
+def _moved(rng, row):
+    place_id, market, category, lat, lng, radius = row
+    return place_id, market, category, lat + rng.uniform(-0.01, 0.01), lng + rng.uniform(-0.01, 0.01), radius
+
+
+def _args(point):
+    lat, lng, market, category = point
+    return lat, lng, 5, market, category
+
+
+if __name__ == "__main__":
+    main()
@@ -18,11 +18,13 @@ Date: 2026-02-08
 
 from fastapi import APIRouter, HTTPException, Request, Header
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any
-import psycopg2
+from typing import List, Optional, Dict, Any, Set, Tuple
 from psycopg2.extras import Json, execute_values
 import json
 import os
+import sys
+import threading
+import time
 from datetime import datetime
 import logging
 from dotenv import load_dotenv
@@ -30,6 +32,11 @@ from dotenv import load_dotenv
 # Load shared .env file (RevFlow OS standard)
 load_dotenv('/opt/shared-api-engine/.env')
 
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from revspy_db import get_database
+from .spatial import get_spatial_index, update_spatial_index
+
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,6 +45,17 @@ logger = logging.getLogger(__name__)
 # Create API router
 router = APIRouter(prefix="/api/v1/revspy", tags=["RevSPY GBP Intelligence"])
 
+# Ingestion is one set-based upsert per batch, so the cap is about payload
+# size rather than per-row round trips
+MAX_PROFILES_PER_REQUEST = int(os.getenv("REVSPY_MAX_PROFILES", "1000"))
+
+# Seconds to wait before refreshing a (market, category); further ingests in
+# that window share the one refresh
+ANALYSIS_DELAY_SECONDS = float(os.getenv("REVSPY_ANALYSIS_DELAY", "5"))
+
+# Store the full request body in revspy_webhook_log (default: summary only)
+LOG_FULL_PAYLOAD = os.getenv("REVSPY_LOG_FULL_PAYLOAD", "false").lower() in ("1", "true", "yes")
+
 # ============================================================================
 # PYDANTIC MODELS (Data Validation)
 # ============================================================================
@@ -101,8 +119,8 @@ class GBPProfile(BaseModel):
 class GBPBulkImport(BaseModel):
     """Bulk import payload from GMB Everywhere"""
     
-    profiles: List[GBPProfile] = Field(..., min_items=1, max_items=100, 
-                                       description="List of GBP profiles (max 100)")
+    profiles: List[GBPProfile] = Field(..., min_items=1, max_items=MAX_PROFILES_PER_REQUEST,
+                                       description=f"List of GBP profiles (max {MAX_PROFILES_PER_REQUEST})")
     market: str = Field(..., description="Market identifier (e.g., 'electrician chicago')")
     scraped_by: str = Field(..., description="User email who ran the audit")
     notes: Optional[str] = None
@@ -149,22 +167,9 @@ class GBPIngestResponse(BaseModel):
 # ============================================================================
 
 def get_db_connection():
-    """Get PostgreSQL database connection"""
+    """Borrow a pooled PostgreSQL connection (conn.close() returns it to the pool)"""
     try:
-        # Prefer DATABASE_URL if available (correctly set in docker-compose)
-        database_url = os.getenv("DATABASE_URL")
-        if database_url:
-            conn = psycopg2.connect(database_url, connect_timeout=10)
-        else:
-            conn = psycopg2.connect(
-                host=os.getenv("POSTGRES_HOST", os.getenv("DATABASE_HOST", "localhost")),
-                port=int(os.getenv("POSTGRES_PORT", os.getenv("DATABASE_PORT", "5432"))),
-                database=os.getenv("POSTGRES_DB", os.getenv("DATABASE_NAME", "revflow")),
-                user=os.getenv("POSTGRES_USER", os.getenv("DATABASE_USER", "revflow")),
-                password=os.getenv("POSTGRES_PASSWORD", os.getenv("DATABASE_PASSWORD", "")),
-                connect_timeout=10
-            )
-        return conn
+        return get_database().acquire()
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
         raise HTTPException(status_code=500, detail="Database connection failed")
@@ -174,8 +179,144 @@ def get_db_connection():
 # MAIN WEBHOOK ENDPOINT
 # ============================================================================
 
+# Column order shared by the upsert statement and profile_row()
+PROFILE_COLUMNS = (
+    "place_id", "business_name", "primary_category",
+    "secondary_categories", "category_count",
+    "address", "city", "state", "zip_code", "country",
+    "lat", "lng", "rating", "review_count",
+    "has_website", "website_url", "has_phone", "phone_number",
+    "has_hours", "hours_data",
+    "photo_count", "video_count", "post_count", "qa_count",
+    "service_area_radius", "service_area_cities",
+    "attributes", "amenities",
+    "market", "competitor_rank", "local_pack_position",
+    "scraped_by"
+)
+
+UPSERT_TEMPLATE = "(" + ", ".join(["%s"] * len(PROFILE_COLUMNS)) + ", NOW())"
+
+
+def profile_row(profile: GBPProfile, market: str, scraped_by: str) -> tuple:
+    """One revspy_gbp_profiles row, in PROFILE_COLUMNS order"""
+    category_count = 1 + len(profile.secondary_categories)
+    local_pack = profile.competitor_rank <= 3 if profile.competitor_rank else False
+    return (
+        profile.place_id,
+        profile.business_name,
+        profile.primary_category,
+        Json(profile.secondary_categories),
+        category_count,
+        profile.address,
+        profile.city,
+        profile.state,
+        profile.zip_code,
+        profile.country,
+        profile.lat,
+        profile.lng,
+        profile.rating,
+        profile.review_count,
+        profile.has_website,
+        profile.website_url,
+        profile.has_phone,
+        profile.phone_number,
+        profile.has_hours,
+        Json(profile.hours_data) if profile.hours_data else None,
+        profile.photo_count,
+        profile.video_count,
+        profile.post_count,
+        profile.qa_count,
+        profile.service_area_radius,
+        Json(profile.service_area_cities),
+        Json(profile.attributes),
+        Json(profile.amenities),
+        market,
+        profile.competitor_rank,
+        local_pack,
+        scraped_by
+    )
+
+
+def _upsert_sql(table: str) -> str:
+    updates = ",\n                ".join(
+        f"{column} = EXCLUDED.{column}" for column in PROFILE_COLUMNS if column != "place_id"
+    )
+    # xmax = 0 only for rows this statement inserted
+    return f"""
+        INSERT INTO {table} ({", ".join(PROFILE_COLUMNS)}, scraped_at)
+        VALUES %s
+        ON CONFLICT (place_id) DO UPDATE SET
+                {updates},
+                scraped_at = NOW(),
+                updated_at = NOW()
+        RETURNING (xmax = 0) AS inserted
+    """
+
+
+def upsert_profiles(cur, profiles: List[GBPProfile], market: str, scraped_by: str,
+                    table: str = "revspy_gbp_profiles", page_size: int = 500,
+                    failed_ids: Optional[Set[str]] = None) -> Tuple[int, int, int]:
+    """
+    Insert or update a batch of profiles with one INSERT ... ON CONFLICT
+
+    Repeated place_ids keep the last profile (as the row-by-row path did,
+    the earlier copies count as updates). If the batch statement fails, rows
+    are retried one at a time under savepoints so one bad profile only fails
+    itself; their place_ids are added to failed_ids when given.
+
+    Returns:
+        (inserted, updated, failed)
+    """
+    latest: Dict[str, GBPProfile] = {}
+    for profile in profiles:
+        latest[profile.place_id] = profile
+    duplicates = len(profiles) - len(latest)
+    rows = [profile_row(profile, market, scraped_by) for profile in latest.values()]
+    sql = _upsert_sql(table)
+
+    cur.execute("SAVEPOINT revspy_upsert")
+    try:
+        flags = execute_values(cur, sql, rows, template=UPSERT_TEMPLATE, page_size=page_size, fetch=True)
+        cur.execute("RELEASE SAVEPOINT revspy_upsert")
+        inserted = sum(1 for (was_inserted,) in flags if was_inserted)
+        return inserted, len(rows) - inserted + duplicates, 0
+    except Exception as e:
+        cur.execute("ROLLBACK TO SAVEPOINT revspy_upsert")
+        logger.warning(f"Batch upsert failed, retrying row by row: {e}")
+
+    inserted = updated = failed = 0
+    for row in rows:
+        try:
+            cur.execute("SAVEPOINT revspy_upsert_row")
+            flags = execute_values(cur, sql, [row], template=UPSERT_TEMPLATE, fetch=True)
+            cur.execute("RELEASE SAVEPOINT revspy_upsert_row")
+            if flags[0][0]:
+                inserted += 1
+            else:
+                updated += 1
+        except Exception as e:
+            cur.execute("ROLLBACK TO SAVEPOINT revspy_upsert_row")
+            logger.error(f"Failed to process profile {row[0]}: {e}")
+            failed += 1
+            if failed_ids is not None:
+                failed_ids.add(row[0])
+    return inserted, updated + duplicates, failed
+
+
+def webhook_log_payload(data: GBPBulkImport) -> Dict[str, Any]:
+    """What revspy_webhook_log keeps of a request (full body only if configured)"""
+    if LOG_FULL_PAYLOAD:
+        return data.dict()
+    return {
+        "market": data.market,
+        "scraped_by": data.scraped_by,
+        "notes": data.notes,
+        "place_ids": [profile.place_id for profile in data.profiles]
+    }
+
+
 @router.post("/gbp/ingest", response_model=GBPIngestResponse)
-async def ingest_gbp_data(
+def ingest_gbp_data(
     data: GBPBulkImport,
     request: Request,
     x_api_key: Optional[str] = Header(None)
@@ -185,18 +326,20 @@ async def ingest_gbp_data(
     
     **Workflow:**
     1. Validate incoming data
-    2. Log webhook call for debugging
-    3. Insert/update profiles in database
-    4. Calculate competitive metrics
-    5. Trigger category and geographic analysis
-    6. Return summary
+    2. Upsert all profiles in one set-based statement
+    3. Log webhook call for debugging (same transaction)
+    4. Queue category and geographic analysis per (market, category);
+       the background worker coalesces repeated requests
+    5. Return summary
+    
+    A plain def, so FastAPI runs it in the threadpool: the database calls
+    and spatial index updates block and must stay off the event loop.
     
     **Authentication:**
     - Requires X-API-Key header (optional, can be enforced)
     
     **Rate Limiting:**
-    - Max 100 profiles per request
-    - Recommended: 1 request per minute
+    - Max REVSPY_MAX_PROFILES profiles per request (default 1000)
     """
     
     start_time = datetime.now()
@@ -209,162 +352,9 @@ async def ingest_gbp_data(
     try:
         cur = conn.cursor()
         
-        # Counters
-        inserted = 0
-        updated = 0
-        failed = 0
-        
-        # Process each profile
-        for profile in data.profiles:
-            try:
-                # Check if profile exists
-                cur.execute(
-                    "SELECT id FROM revspy_gbp_profiles WHERE place_id = %s",
-                    (profile.place_id,)
-                )
-                existing = cur.fetchone()
-                
-                # Prepare data
-                category_count = 1 + len(profile.secondary_categories)
-                local_pack = profile.competitor_rank <= 3 if profile.competitor_rank else False
-                
-                if existing:
-                    # Update existing profile
-                    cur.execute("""
-                        UPDATE revspy_gbp_profiles 
-                        SET 
-                            business_name = %s,
-                            primary_category = %s,
-                            secondary_categories = %s,
-                            category_count = %s,
-                            address = %s,
-                            city = %s,
-                            state = %s,
-                            zip_code = %s,
-                            country = %s,
-                            lat = %s,
-                            lng = %s,
-                            rating = %s,
-                            review_count = %s,
-                            has_website = %s,
-                            website_url = %s,
-                            has_phone = %s,
-                            phone_number = %s,
-                            has_hours = %s,
-                            hours_data = %s,
-                            photo_count = %s,
-                            video_count = %s,
-                            post_count = %s,
-                            qa_count = %s,
-                            service_area_radius = %s,
-                            service_area_cities = %s,
-                            attributes = %s,
-                            amenities = %s,
-                            market = %s,
-                            competitor_rank = %s,
-                            local_pack_position = %s,
-                            scraped_at = NOW(),
-                            scraped_by = %s,
-                            updated_at = NOW()
-                        WHERE place_id = %s
-                    """, (
-                        profile.business_name,
-                        profile.primary_category,
-                        Json(profile.secondary_categories),
-                        category_count,
-                        profile.address,
-                        profile.city,
-                        profile.state,
-                        profile.zip_code,
-                        profile.country,
-                        profile.lat,
-                        profile.lng,
-                        profile.rating,
-                        profile.review_count,
-                        profile.has_website,
-                        profile.website_url,
-                        profile.has_phone,
-                        profile.phone_number,
-                        profile.has_hours,
-                        Json(profile.hours_data) if profile.hours_data else None,
-                        profile.photo_count,
-                        profile.video_count,
-                        profile.post_count,
-                        profile.qa_count,
-                        profile.service_area_radius,
-                        Json(profile.service_area_cities),
-                        Json(profile.attributes),
-                        Json(profile.amenities),
-                        data.market,
-                        profile.competitor_rank,
-                        local_pack,
-                        data.scraped_by,
-                        profile.place_id
-                    ))
-                    updated += 1
-                else:
-                    # Insert new profile
-                    cur.execute("""
-                        INSERT INTO revspy_gbp_profiles (
-                            place_id, business_name, primary_category,
-                            secondary_categories, category_count,
-                            address, city, state, zip_code, country,
-                            lat, lng, rating, review_count,
-                            has_website, website_url, has_phone, phone_number,
-                            has_hours, hours_data,
-                            photo_count, video_count, post_count, qa_count,
-                            service_area_radius, service_area_cities,
-                            attributes, amenities,
-                            market, competitor_rank, local_pack_position,
-                            scraped_by, scraped_at
-                        ) VALUES (
-                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                            %s, %s, NOW()
-                        )
-                    """, (
-                        profile.place_id,
-                        profile.business_name,
-                        profile.primary_category,
-                        Json(profile.secondary_categories),
-                        category_count,
-                        profile.address,
-                        profile.city,
-                        profile.state,
-                        profile.zip_code,
-                        profile.country,
-                        profile.lat,
-                        profile.lng,
-                        profile.rating,
-                        profile.review_count,
-                        profile.has_website,
-                        profile.website_url,
-                        profile.has_phone,
-                        profile.phone_number,
-                        profile.has_hours,
-                        Json(profile.hours_data) if profile.hours_data else None,
-                        profile.photo_count,
-                        profile.video_count,
-                        profile.post_count,
-                        profile.qa_count,
-                        profile.service_area_radius,
-                        Json(profile.service_area_cities),
-                        Json(profile.attributes),
-                        Json(profile.amenities),
-                        data.market,
-                        profile.competitor_rank,
-                        local_pack,
-                        data.scraped_by
-                    ))
-                    inserted += 1
-                    
-            except Exception as e:
-                logger.error(f"Failed to process profile {profile.place_id}: {e}")
-                failed += 1
-                continue
-        
-        conn.commit()
+        failed_ids: Set[str] = set()
+        inserted, updated, failed = upsert_profiles(cur, data.profiles, data.market, data.scraped_by,
+                                                    failed_ids=failed_ids)
         
         # Calculate processing time
         processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
@@ -386,7 +376,7 @@ async def ingest_gbp_data(
             RETURNING id
         """, (
             client_ip,
-            Json(data.dict()),
+            Json(webhook_log_payload(data)),
             len(data.profiles),
             inserted,
             updated,
@@ -399,12 +389,21 @@ async def ingest_gbp_data(
         
         webhook_log_id = cur.fetchone()[0]
         conn.commit()
+        get_database().invalidate("markets:")
         
-        # Trigger analysis (async - don't block response)
-        try:
-            trigger_market_analysis(data.market, data.profiles[0].primary_category)
-        except Exception as e:
-            logger.warning(f"Analysis trigger failed (non-fatal): {e}")
+        # Keep the in-process spatial index current (if it has been built)
+        update_spatial_index(
+            [profile for profile in data.profiles if profile.place_id not in failed_ids], data.market
+        )
+        
+        # Trigger analysis (deferred - don't block response)
+        analysis_triggered = True
+        for category in dict.fromkeys(profile.primary_category for profile in data.profiles):
+            try:
+                analysis_queue.schedule(data.market, category)
+            except Exception as e:
+                analysis_triggered = False
+                logger.warning(f"Analysis trigger failed (non-fatal): {e}")
         
         logger.info(f"Successfully processed: {inserted} inserted, {updated} updated, {failed} failed")
         
@@ -415,7 +414,7 @@ async def ingest_gbp_data(
             profiles_updated=updated,
             profiles_failed=failed,
             market=data.market,
-            analysis_triggered=True,
+            analysis_triggered=analysis_triggered,
             webhook_log_id=str(webhook_log_id)
         )
         
@@ -489,6 +488,8 @@ def trigger_market_analysis(market: str, primary_category: str):
         """, (market, primary_category, market, primary_category))
         
         conn.commit()
+        get_database().invalidate("category_opportunities:")
+        get_database().invalidate("geographic_gaps:")
         logger.info(f"Analysis triggered for market: {market}, category: {primary_category}")
         
     except Exception as e:
@@ -500,19 +501,91 @@ def trigger_market_analysis(market: str, primary_category: str):
         conn.close()
 
 
+class MarketAnalysisQueue:
+    """
+    Deferred, coalesced trigger_market_analysis runs
+
+    schedule() only records the (market, category); a daemon thread runs the
+    refresh once the oldest request for a key is `delay` seconds old. Any
+    number of ingests for a key inside that window cost one refresh.
+    """
+
+    def __init__(self, delay: float = ANALYSIS_DELAY_SECONDS, runner=None):
+        self.delay = delay
+        self.runner = runner or trigger_market_analysis
+        self._pending: Dict[Tuple[str, str], float] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"scheduled": 0, "coalesced": 0, "runs": 0, "failures": 0}
+
+    def schedule(self, market: str, primary_category: str):
+        key = (market, primary_category)
+        with self._cond:
+            self.stats["scheduled"] += 1
+            if key in self._pending:
+                self.stats["coalesced"] += 1
+            else:
+                self._pending[key] = time.monotonic()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="revspy-analysis", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _due(self) -> List[Tuple[str, str]]:
+        """Block until some key is due, then take all due keys"""
+        with self._cond:
+            while True:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                due = [key for key, queued_at in self._pending.items() if now - queued_at >= self.delay]
+                if due:
+                    for key in due:
+                        del self._pending[key]
+                    return due
+                self._cond.wait(self.delay - (now - min(self._pending.values())))
+
+    def _run(self, keys: List[Tuple[str, str]]):
+        for market, primary_category in keys:
+            try:
+                self.runner(market, primary_category)
+                self.stats["runs"] += 1
+            except Exception as e:
+                self.stats["failures"] += 1
+                logger.warning(f"Deferred analysis failed for {market}/{primary_category}: {e}")
+
+    def _worker(self):
+        while True:
+            self._run(self._due())
+
+    def flush(self):
+        """Run everything pending now (shutdown, scripts)"""
+        with self._cond:
+            keys = list(self._pending)
+            self._pending.clear()
+        self._run(keys)
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+
+analysis_queue = MarketAnalysisQueue()
+
+
+@router.on_event("shutdown")
+def flush_analysis_queue():
+    """Run deferred market analyses before the process exits (the worker is a daemon)"""
+    analysis_queue.flush()
+
+
 # ============================================================================
 # QUERY ENDPOINTS (For retrieving analyzed data)
 # ============================================================================
 
-@router.get("/gbp/markets")
-async def get_markets():
-    """Get list of all analyzed markets"""
-    
-    conn = get_db_connection()
-    
-    try:
-        cur = conn.cursor()
-        
+def _load_markets() -> List[Dict]:
+    with get_database().cursor() as cur:
         cur.execute("""
             SELECT DISTINCT
                 market,
@@ -524,42 +597,32 @@ async def get_markets():
             ORDER BY last_updated DESC
         """)
         
-        markets = []
-        for row in cur.fetchall():
-            markets.append({
+        return [
+            {
                 "market": row[0],
                 "primary_category": row[1],
                 "profile_count": row[2],
                 "last_updated": row[3].isoformat() if row[3] else None
-            })
-        
-        return {"markets": markets, "count": len(markets)}
-        
-    finally:
-        cur.close()
-        conn.close()
+            }
+            for row in cur.fetchall()
+        ]
+
+
+@router.get("/gbp/markets")
+def get_markets():
+    """Get list of all analyzed markets (cached; refreshed on ingest)"""
+    
+    markets = get_database().cached("markets:api", _load_markets)
+    return {"markets": markets, "count": len(markets)}
 
 
 @router.get("/gbp/profiles/{market}")
-async def get_market_profiles(market: str, limit: int = 50):
+def get_market_profiles(market: str, limit: int = 50):
     """Get all GBP profiles for a specific market"""
     
-    conn = get_db_connection()
-    
-    try:
-        cur = conn.cursor()
-        
-        cur.execute("""
-            SELECT 
-                place_id, business_name, primary_category,
-                rating, review_count, competitor_rank,
-                city, state, zip_code,
-                gbp_health_score, competitive_threat
-            FROM revspy_gbp_profiles
-            WHERE market = %s
-            ORDER BY competitor_rank ASC, rating DESC
-            LIMIT %s
-        """, (market, limit))
+    db = get_database()
+    with db.cursor() as cur:
+        db.execute_prepared(cur, "market_profiles", (market, limit))
         
         profiles = []
         for row in cur.fetchall():
@@ -576,23 +639,12 @@ async def get_market_profiles(market: str, limit: int = 50):
                 "gbp_health_score": row[9],
                 "competitive_threat": row[10]
             })
-        
-        return {"profiles": profiles, "count": len(profiles), "market": market}
-        
-    finally:
-        cur.close()
-        conn.close()
+    
+    return {"profiles": profiles, "count": len(profiles), "market": market}
 
 
-@router.get("/gbp/gaps/geographic")
-async def get_geographic_gaps(market: str = None, min_opportunity: int = 70):
-    """Get geographic gaps (underserved zip codes)"""
-    
-    conn = get_db_connection()
-    
-    try:
-        cur = conn.cursor()
-        
+def _load_geographic_gaps(market: Optional[str], min_opportunity: int) -> List[Dict]:
+    with get_database().cursor() as cur:
         query = """
             SELECT 
                 zip_code, city, state, market, primary_category,
@@ -611,9 +663,8 @@ async def get_geographic_gaps(market: str = None, min_opportunity: int = 70):
         
         cur.execute(query, params)
         
-        gaps = []
-        for row in cur.fetchall():
-            gaps.append({
+        return [
+            {
                 "zip_code": row[0],
                 "city": row[1],
                 "state": row[2],
@@ -622,24 +673,24 @@ async def get_geographic_gaps(market: str = None, min_opportunity: int = 70):
                 "competitor_count": row[5],
                 "opportunity_score": row[6],
                 "gap_severity": row[7]
-            })
-        
-        return {"gaps": gaps, "count": len(gaps)}
-        
-    finally:
-        cur.close()
-        conn.close()
+            }
+            for row in cur.fetchall()
+        ]
 
 
-@router.get("/gbp/opportunities/categories")
-async def get_category_opportunities(market: str = None):
-    """Get category opportunities (underserved categories)"""
-    
-    conn = get_db_connection()
+@router.get("/gbp/gaps/geographic")
+def get_geographic_gaps(market: str = None, min_opportunity: int = 70):
+    """Get geographic gaps (underserved zip codes; cached, refreshed by analysis)"""
     
-    try:
-        cur = conn.cursor()
-        
+    gaps = get_database().cached(
+        f"geographic_gaps:api:{market}:{min_opportunity}",
+        lambda: _load_geographic_gaps(market, min_opportunity)
+    )
+    return {"gaps": gaps, "count": len(gaps)}
+
+
+def _load_category_opportunities(market: Optional[str]) -> List[Dict]:
+    with get_database().cursor() as cur:
         query = """
             SELECT 
                 category, market, total_competitors,
@@ -657,22 +708,81 @@ async def get_category_opportunities(market: str = None):
         
         cur.execute(query, params)
         
-        opportunities = []
-        for row in cur.fetchall():
-            opportunities.append({
+        return [
+            {
                 "category": row[0],
                 "market": row[1],
                 "total_competitors": row[2],
                 "saturation_level": row[3],
                 "opportunity_score": row[4],
                 "recommended_action": row[5]
-            })
-        
-        return {"opportunities": opportunities, "count": len(opportunities)}
-        
-    finally:
-        cur.close()
-        conn.close()
+            }
+            for row in cur.fetchall()
+        ]
+
+
+@router.get("/gbp/opportunities/categories")
+def get_category_opportunities(market: str = None):
+    """Get category opportunities (underserved categories; cached, refreshed by analysis)"""
+    
+    opportunities = get_database().cached(
+        f"category_opportunities:api:{market}",
+        lambda: _load_category_opportunities(market)
+    )
+    return {"opportunities": opportunities, "count": len(opportunities)}
+
+
+# ============================================================================
+# SPATIAL ENDPOINTS (in-process competitor density index)
+# ============================================================================
+
+@router.get("/gbp/spatial/nearby")
+def get_nearby_competitors(
+    lat: float,
+    lng: float,
+    radius_km: float = 5.0,
+    market: str = None,
+    category: str = None,
+    limit: int = 50
+):
+    """Profiles within radius_km of a point, nearest first"""
+    
+    if radius_km <= 0 or radius_km > 200:
+        raise HTTPException(status_code=400, detail="radius_km must be between 0 and 200")
+    competitors = get_spatial_index().within_radius(lat, lng, radius_km, market, category, limit)
+    return {"competitors": competitors, "count": len(competitors), "radius_km": radius_km}
+
+
+@router.get("/gbp/spatial/overlap/{place_id}")
+def get_service_area_overlap(place_id: str, limit: int = 50):
+    """Same-category competitors whose service areas overlap this profile's"""
+    
+    overlap = get_spatial_index().coverage_overlap(place_id, limit)
+    if overlap is None:
+        raise HTTPException(status_code=404, detail="Profile not found or has no location")
+    return overlap
+
+
+@router.get("/gbp/gaps/spatial")
+def get_spatial_gaps(market: str, category: str, min_coverage: int = 3, limit: int = 50):
+    """Grid cells with businesses in the market but thin service-area coverage for a category"""
+    
+    gaps = get_spatial_index().underserved_cells(market, category, min_coverage, limit)
+    return {"gaps": gaps, "count": len(gaps), "market": market, "category": category}
+
+
+@router.get("/gbp/spatial/stats")
+def get_spatial_stats():
+    """Spatial index size and build time"""
+    
+    return get_spatial_index().stats()
+
+
+@router.get("/db/stats")
+async def get_db_stats():
+    """Connection pool wait and query latency histograms, cache counters"""
+    
+    return get_database().stats()
 
 
 # ============================================================================
@@ -680,16 +790,13 @@ async def get_category_opportunities(market: str = None):
 # ============================================================================
 
 @router.get("/health")
-async def health_check():
+def health_check():
     """Health check endpoint"""
     
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM revspy_gbp_profiles")
-        profile_count = cur.fetchone()[0]
-        cur.close()
-        conn.close()
+        with get_database().cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM revspy_gbp_profiles")
+            profile_count = cur.fetchone()[0]
         
         return {
             "status": "healthy",
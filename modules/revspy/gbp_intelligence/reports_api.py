@@ -5,7 +5,8 @@ Now includes: Health scores, Email templates, PDF export
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+import re
 import sys
 import os
 
@@ -14,9 +15,12 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from reports.generator import ReportGenerator
 from reports.email_templates import generate_prospect_email, generate_client_email
 from reports.pdf_export import export_to_pdf
+from reports.batch import BatchReportJobs, BatchReportPipeline
 
 router = APIRouter(prefix="/api/v1/revspy/reports", tags=["RevSPY Reports"])
 generator = ReportGenerator()
+batch_pipeline = BatchReportPipeline(generator)
+batch_jobs = BatchReportJobs(batch_pipeline)
 
 class ProspectReportRequest(BaseModel):
     place_id: str
@@ -28,8 +32,13 @@ class ClientReportRequest(BaseModel):
     market: str
     recipient_name: Optional[str] = None
 
+class BatchReportRequest(BaseModel):
+    place_ids: List[str]
+    market: str
+    report_type: str = "prospect"
+
 @router.post("/prospect")
-async def generate_prospect_report(request: ProspectReportRequest):
+def generate_prospect_report(request: ProspectReportRequest):
     """Generate competitive analysis report for prospect"""
     try:
         report = generator.generate_prospect_report(request.place_id, request.market)
@@ -40,7 +49,7 @@ async def generate_prospect_report(request: ProspectReportRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/prospect/email")
-async def generate_prospect_email_template(request: ProspectReportRequest):
+def generate_prospect_email_template(request: ProspectReportRequest):
     """Generate sales email template for prospect"""
     try:
         report = generator.generate_prospect_report(request.place_id, request.market)
@@ -53,7 +62,7 @@ async def generate_prospect_email_template(request: ProspectReportRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/prospect/pdf")
-async def generate_prospect_pdf(request: ProspectReportRequest):
+def generate_prospect_pdf(request: ProspectReportRequest):
     """Generate PDF report for prospect"""
     try:
         report = generator.generate_prospect_report(request.place_id, request.market)
@@ -73,7 +82,7 @@ async def generate_prospect_pdf(request: ProspectReportRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/client/monthly")
-async def generate_monthly_client_report(request: ClientReportRequest):
+def generate_monthly_client_report(request: ClientReportRequest):
     """Generate monthly progress report for existing client"""
     try:
         report = generator.generate_monthly_client_report(request.place_id, request.market)
@@ -84,7 +93,7 @@ async def generate_monthly_client_report(request: ClientReportRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/client/monthly/email")
-async def generate_client_email_template(request: ClientReportRequest):
+def generate_client_email_template(request: ClientReportRequest):
     """Generate monthly email template for client"""
     try:
         report = generator.generate_monthly_client_report(request.place_id, request.market)
@@ -96,33 +105,55 @@ async def generate_client_email_template(request: ClientReportRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/batch", status_code=202)
+async def generate_batch_reports(request: BatchReportRequest):
+    """
+    Queue PDFs for many places into the report store (unchanged reports are
+    skipped); poll the returned job id for the per-place summary
+    """
+    if request.report_type not in BatchReportPipeline.REPORT_TYPES:
+        raise HTTPException(status_code=400, detail=f"report_type must be one of {BatchReportPipeline.REPORT_TYPES}")
+    job = batch_jobs.submit(request.place_ids, request.market, request.report_type)
+    return {**job, "status_url": f"{router.prefix}/batch/{job['job_id']}"}
+
+@router.get("/batch/{job_id}")
+async def get_batch_job(job_id: str):
+    """Status of a batch job; includes the run summary once completed"""
+    job = batch_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return job
+
+@router.on_event("shutdown")
+def close_batch_jobs():
+    """Let the running batch finish and stop the render workers"""
+    batch_jobs.close()
+
+@router.get("/store/{key}")
+async def get_stored_report(key: str):
+    """Download a PDF from the report store by key"""
+    if not re.fullmatch(r"[0-9a-f]{64}", key):
+        raise HTTPException(status_code=400, detail="Invalid report key")
+    path = batch_pipeline.store.get(key)
+    if not path:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return FileResponse(path, media_type="application/pdf", filename=f"revspy_report_{key[:12]}.pdf")
+
 @router.get("/markets/{market}/summary")
-async def get_market_summary(market: str):
+def get_market_summary(market: str):
     """Get summary statistics for a market"""
     try:
-        conn = generator.get_connection()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            SELECT 
-                COUNT(*) as total_competitors,
-                AVG(rating) as avg_rating,
-                AVG(review_count) as avg_reviews,
-                AVG(gbp_health_score) as avg_health_score
-            FROM revspy_gbp_profiles
-            WHERE market = %s
-        """, (market,))
-        
-        result = cur.fetchone()
-        cur.close()
-        conn.close()
+        db = generator.db
+        with db.cursor() as cur:
+            db.execute_prepared(cur, "market_averages", (market,))
+            total, avg_rating, avg_reviews, _, _, avg_health = cur.fetchone()
         
         return {
             "market": market,
-            "total_competitors": result[0],
-            "avg_rating": round(float(result[1] or 0), 2),
-            "avg_reviews": int(result[2] or 0),
-            "avg_health_score": int(result[3] or 0)
+            "total_competitors": total,
+            "avg_rating": round(float(avg_rating or 0), 2),
+            "avg_reviews": int(avg_reviews or 0),
+            "avg_health_score": int(avg_health or 0)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -136,6 +167,7 @@ async def health_check():
             "competitive_analysis",
             "health_scores",
             "email_templates",
-            "pdf_export"
+            "pdf_export",
+            "batch_reports"
         ]
     }
@@ -0,0 +1,567 @@
+"""
+RevSPY™ GBP Intelligence - Spatial Competitor Density
+In-process grid index over profile lat/lng and service areas
+
+The zip-code density in revspy_geographic_density can only say "few
+competitors are *located* in 60614". This index works on coordinates:
+
+    - radius queries ("competitors within 5 km of this point")
+    - service-area overlap ("whose service areas overlap this profile's")
+    - underserved cells ("where does the market have businesses but fewer
+      than N plumbers serve the area")
+
+Profiles are bucketed into a grid of roughly square cells (REVSPY_GRID_CELL_KM
+on a side at any latitude). For each (market, category), service-area
+coverage is kept as a per-row difference array, so adding or removing a
+profile touches one entry pair per grid row its service area spans. Reading
+coverage for a cell is a prefix sum over its row. The index is built
+from revspy_gbp_profiles on first use and updated in place on every ingest.
+Once older than REVSPY_SPATIAL_TTL seconds it is rebuilt in the background
+(queries keep using the old one meanwhile), which picks up rows written or
+deleted outside the ingest endpoint and by other worker processes.
+
+Distances are great-circle (haversine); coverage uses a local flat-earth
+approximation per grid row, which is well inside a cell at metro scale. The
+grid does not wrap at the antimeridian.
+
+Usage:
+    from gbp_intelligence.spatial import get_spatial_index
+
+    index = get_spatial_index()
+    index.within_radius(41.92, -87.65, 5, market="Chicago, IL", category="Plumber")
+    index.underserved_cells("Chicago, IL", "Plumber", min_coverage=3)
+"""
+
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from revspy_db import get_database
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+MILE_KM = 1.609344
+
+# Grid cell edge length
+GRID_CELL_KM = float(os.getenv("REVSPY_GRID_CELL_KM", "2"))
+
+# service_area_radius is treated as miles; storefronts without one are
+# assumed to draw customers from this radius
+DEFAULT_SERVICE_RADIUS_MILES = float(os.getenv("REVSPY_DEFAULT_SERVICE_RADIUS", "5"))
+
+# Larger radii are clamped (bad scrapes report whole-state service areas)
+MAX_SERVICE_RADIUS_MILES = float(os.getenv("REVSPY_MAX_SERVICE_RADIUS", "60"))
+
+# Seconds before the index is rebuilt from the database (0 = never)
+SPATIAL_INDEX_TTL = float(os.getenv("REVSPY_SPATIAL_TTL", "900"))
+
+# Rows applied per lock hold during a bulk load, so live upserts and
+# queries on a loading index are not held up for the whole load
+BUILD_CHUNK_ROWS = 1000
+
+Cell = Tuple[int, int]
+Partition = Tuple[str, str]
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in km"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def circle_overlap_area(r1: float, r2: float, d: float) -> float:
+    """Area shared by two circles with radii r1, r2 whose centres are d apart"""
+    if d >= r1 + r2:
+        return 0.0
+    if d <= abs(r1 - r2):
+        return math.pi * min(r1, r2) ** 2
+    a1 = math.acos(max(-1.0, min(1.0, (d * d + r1 * r1 - r2 * r2) / (2 * d * r1))))
+    a2 = math.acos(max(-1.0, min(1.0, (d * d + r2 * r2 - r1 * r1) / (2 * d * r2))))
+    kite = (-d + r1 + r2) * (d + r1 - r2) * (d - r1 + r2) * (d + r1 + r2)
+    return r1 * r1 * a1 + r2 * r2 * a2 - 0.5 * math.sqrt(max(0.0, kite))
+
+
+def service_radius_km(service_area_radius: Optional[float]) -> float:
+    miles = service_area_radius if service_area_radius and service_area_radius > 0 else DEFAULT_SERVICE_RADIUS_MILES
+    return min(float(miles), MAX_SERVICE_RADIUS_MILES) * MILE_KM
+
+
+@dataclass
+class SpatialProfile:
+    """What the index keeps per profile"""
+    place_id: str
+    market: str
+    primary_category: str
+    lat: float
+    lng: float
+    radius_km: float
+    cell: Cell
+
+
+class Grid:
+    """
+    Latitude rows of fixed height; each row is split into columns whose width
+    in degrees grows with 1/cos(latitude), so cells stay roughly cell_km square
+    """
+
+    def __init__(self, cell_km: float = GRID_CELL_KM):
+        self.cell_km = cell_km
+        self.dlat = cell_km / KM_PER_DEGREE
+        self._widths: Dict[int, float] = {}
+
+    def row(self, lat: float) -> int:
+        return math.floor((lat + 90.0) / self.dlat)
+
+    def row_lat(self, row: int) -> float:
+        """Latitude of a row's centre line"""
+        return -90.0 + (row + 0.5) * self.dlat
+
+    def dlng(self, row: int) -> float:
+        """Column width of a row in degrees of longitude"""
+        width = self._widths.get(row)
+        if width is None:
+            width = self._widths[row] = self.dlat / max(math.cos(math.radians(self.row_lat(row))), 0.01)
+        return width
+
+    def cell(self, lat: float, lng: float) -> Cell:
+        row = self.row(lat)
+        return row, math.floor((lng + 180.0) / self.dlng(row))
+
+    def center(self, cell: Cell) -> Tuple[float, float]:
+        row, col = cell
+        return self.row_lat(row), -180.0 + (col + 0.5) * self.dlng(row)
+
+    def cells_near(self, lat: float, lng: float, radius_km: float) -> Iterable[Cell]:
+        """Every cell that may hold a point within radius_km (superset)"""
+        radius_deg = radius_km / KM_PER_DEGREE
+        poleward = min(89.9, abs(lat) + radius_deg)
+        lng_half = radius_deg / max(math.cos(math.radians(poleward)), 0.01)
+        for row in range(self.row(lat - radius_deg), self.row(lat + radius_deg) + 1):
+            width = self.dlng(row)
+            first = math.floor((lng - lng_half + 180.0) / width)
+            last = math.floor((lng + lng_half + 180.0) / width)
+            for col in range(first, last + 1):
+                yield row, col
+
+    def disk_spans(self, lat: float, lng: float, radius_km: float) -> List[Tuple[int, int, int]]:
+        """
+        (row, first_col, last_col) for cells whose centre lies within the disk;
+        the cell holding the centre is always included
+        """
+        home_row, home_col = self.cell(lat, lng)
+        radius_deg = radius_km / KM_PER_DEGREE
+        spans = []
+        for row in range(self.row(lat - radius_deg), self.row(lat + radius_deg) + 1):
+            dy_km = abs(self.row_lat(row) - lat) * KM_PER_DEGREE
+            if dy_km > radius_km:
+                first, last = 0, -1
+            else:
+                # A row's columns are cell_km wide, so the chord measured in columns is km / cell_km
+                half_cols = math.sqrt(radius_km * radius_km - dy_km * dy_km) / self.cell_km
+                position = (lng + 180.0) / self.dlng(row) - 0.5
+                first = math.ceil(position - half_cols)
+                last = math.floor(position + half_cols)
+            if row == home_row:
+                if first > last:
+                    first = last = home_col
+                else:
+                    first, last = min(first, home_col), max(last, home_col)
+            if first <= last:
+                spans.append((row, first, last))
+        return spans
+
+
+class CompetitorDensityIndex:
+    """
+    Thread-safe grid index of GBP profiles
+
+    Build with load_from_db() (or build() from rows), keep current with
+    upsert()/upsert_profiles()/remove(). All queries are in-memory.
+    """
+
+    def __init__(self, cell_km: float = GRID_CELL_KM):
+        self.grid = Grid(cell_km)
+        self._lock = threading.RLock()
+        self._profiles: Dict[str, SpatialProfile] = {}
+        self._cells: Dict[Cell, Set[str]] = {}
+        # Same cells split by (market, category), for filtered queries
+        self._partition_cells: Dict[Partition, Dict[Cell, Set[str]]] = {}
+        # market -> cell -> profiles of any category there (where the customers are)
+        self._market_cells: Dict[str, Dict[Cell, int]] = {}
+        # (market, category) -> row -> {col: delta}; a prefix sum along the row
+        # is the number of service areas covering that cell
+        self._coverage: Dict[Partition, Dict[int, Dict[int, int]]] = {}
+        self._max_radius_km: Dict[Partition, float] = {}
+        self.built_at: Optional[float] = None
+        self.build_ms: Optional[float] = None
+        self.stats_counters = {"upserts": 0, "removals": 0, "skipped_no_location": 0}
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _add(self, profile: SpatialProfile):
+        self._profiles[profile.place_id] = profile
+        self._cells.setdefault(profile.cell, set()).add(profile.place_id)
+        partition = (profile.market, profile.primary_category)
+        self._partition_cells.setdefault(partition, {}).setdefault(profile.cell, set()).add(profile.place_id)
+        market_cells = self._market_cells.setdefault(profile.market, {})
+        market_cells[profile.cell] = market_cells.get(profile.cell, 0) + 1
+        self._apply_coverage(profile, 1)
+        # Upper bound for overlap searches; not lowered on removal
+        self._max_radius_km[partition] = max(self._max_radius_km.get(partition, 0.0), profile.radius_km)
+
+    def _discard(self, profile: SpatialProfile):
+        del self._profiles[profile.place_id]
+        members = self._cells[profile.cell]
+        members.discard(profile.place_id)
+        if not members:
+            del self._cells[profile.cell]
+        partition_cells = self._partition_cells[(profile.market, profile.primary_category)]
+        members = partition_cells[profile.cell]
+        members.discard(profile.place_id)
+        if not members:
+            del partition_cells[profile.cell]
+        market_cells = self._market_cells[profile.market]
+        market_cells[profile.cell] -= 1
+        if not market_cells[profile.cell]:
+            del market_cells[profile.cell]
+            if not market_cells:
+                del self._market_cells[profile.market]
+        self._apply_coverage(profile, -1)
+
+    def _apply_coverage(self, profile: SpatialProfile, sign: int):
+        rows = self._coverage.setdefault((profile.market, profile.primary_category), {})
+        for row, first, last in self.grid.disk_spans(profile.lat, profile.lng, profile.radius_km):
+            deltas = rows.setdefault(row, {})
+            for col, delta in ((first, sign), (last + 1, -sign)):
+                value = deltas.get(col, 0) + delta
+                if value:
+                    deltas[col] = value
+                else:
+                    del deltas[col]
+            if not deltas:
+                del rows[row]
+
+    def upsert(self, place_id: str, market: str, primary_category: str,
+               lat: Optional[float], lng: Optional[float],
+               service_area_radius: Optional[float] = None):
+        """Insert or move one profile; a profile without coordinates is dropped"""
+        with self._lock:
+            existing = self._profiles.get(place_id)
+            if existing is not None:
+                self._discard(existing)
+            if lat is None or lng is None:
+                self.stats_counters["skipped_no_location"] += 1
+                return
+            lat, lng = float(lat), float(lng)
+            self._add(SpatialProfile(
+                place_id=place_id,
+                market=market,
+                primary_category=primary_category,
+                lat=lat,
+                lng=lng,
+                radius_km=service_radius_km(service_area_radius),
+                cell=self.grid.cell(lat, lng)
+            ))
+            self.stats_counters["upserts"] += 1
+
+    def upsert_profiles(self, profiles: Iterable[Any], market: str):
+        """Apply an ingested batch (GBPProfile objects) for one market"""
+        with self._lock:
+            for profile in profiles:
+                self.upsert(profile.place_id, market, profile.primary_category,
+                            profile.lat, profile.lng, profile.service_area_radius)
+
+    def remove(self, place_id: str) -> bool:
+        with self._lock:
+            existing = self._profiles.get(place_id)
+            if existing is None:
+                return False
+            self._discard(existing)
+            self.stats_counters["removals"] += 1
+            return True
+
+    def build(self, rows: Iterable[Tuple], overwrite: bool = True) -> int:
+        """
+        Bulk load (place_id, market, primary_category, lat, lng, service_area_radius) rows
+
+        overwrite=False keeps entries already present, which were upserted
+        live while a load from the database was running and are newer.
+        The lock is taken per BUILD_CHUNK_ROWS rows, not across the load.
+        """
+        start = time.perf_counter()
+        loaded = 0
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, BUILD_CHUNK_ROWS))
+            if not chunk:
+                break
+            with self._lock:
+                for place_id, market, primary_category, lat, lng, radius in chunk:
+                    if not overwrite and place_id in self._profiles:
+                        continue
+                    self.upsert(place_id, market, primary_category, lat, lng, radius)
+                    loaded += 1
+        with self._lock:
+            self.built_at = time.time()
+            self.build_ms = round((time.perf_counter() - start) * 1000, 1)
+        return loaded
+
+    def load_from_db(self, db=None, table: str = "revspy_gbp_profiles", batch_size: int = 10000) -> int:
+        """Build from the profiles table, streaming rows through a server-side cursor"""
+        db = db or get_database()
+        with db.connection() as conn:
+            cur = conn.cursor(name="revspy_spatial_load")
+            cur.itersize = batch_size
+            try:
+                cur.execute(f"""
+                    SELECT place_id, market, primary_category, lat, lng, service_area_radius
+                    FROM {table}
+                    WHERE lat IS NOT NULL AND lng IS NOT NULL
+                """)
+                loaded = self.build(cur, overwrite=False)
+            finally:
+                cur.close()
+                conn.rollback()
+        logger.info(f"Spatial index loaded {loaded} profiles in {self.build_ms} ms")
+        return loaded
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _row_coverage(self, deltas: Dict[int, int]) -> Tuple[List[int], List[int]]:
+        cols = sorted(deltas)
+        running, totals = 0, []
+        for col in cols:
+            running += deltas[col]
+            totals.append(running)
+        return cols, totals
+
+    def coverage_at(self, market: str, category: str, lat: float, lng: float) -> int:
+        """How many of the category's service areas cover the cell holding (lat, lng)"""
+        row, col = self.grid.cell(lat, lng)
+        with self._lock:
+            deltas = self._coverage.get((market, category), {}).get(row)
+            if not deltas:
+                return 0
+            return sum(delta for c, delta in deltas.items() if c <= col)
+
+    def _nearby(self, lat: float, lng: float, radius_km: float,
+                market: Optional[str], category: Optional[str]) -> List[Tuple[float, SpatialProfile]]:
+        found = []
+        if market is not None and category is not None:
+            cells = self._partition_cells.get((market, category), {})
+        else:
+            cells = self._cells
+        for cell in self.grid.cells_near(lat, lng, radius_km):
+            for place_id in cells.get(cell, ()):
+                profile = self._profiles[place_id]
+                if market is not None and profile.market != market:
+                    continue
+                if category is not None and profile.primary_category != category:
+                    continue
+                distance = haversine_km(lat, lng, profile.lat, profile.lng)
+                if distance <= radius_km:
+                    found.append((distance, profile))
+        return found
+
+    def within_radius(self, lat: float, lng: float, radius_km: float,
+                      market: Optional[str] = None, category: Optional[str] = None,
+                      limit: Optional[int] = None) -> List[Dict]:
+        """Profiles within radius_km of a point, nearest first"""
+        with self._lock:
+            found = self._nearby(lat, lng, radius_km, market, category)
+        found.sort(key=lambda item: item[0])
+        if limit is not None:
+            found = found[:limit]
+        return [
+            {
+                "place_id": profile.place_id,
+                "market": profile.market,
+                "primary_category": profile.primary_category,
+                "lat": profile.lat,
+                "lng": profile.lng,
+                "distance_km": round(distance, 3)
+            }
+            for distance, profile in found
+        ]
+
+    def coverage_overlap(self, place_id: str, limit: int = 50) -> Optional[Dict]:
+        """
+        Same-market, same-category competitors whose service areas overlap
+        this profile's, by share of this profile's service area they cover
+        """
+        with self._lock:
+            profile = self._profiles.get(place_id)
+            if profile is None:
+                return None
+            partition = (profile.market, profile.primary_category)
+            candidates = self._nearby(
+                profile.lat, profile.lng, profile.radius_km + self._max_radius_km[partition],
+                profile.market, profile.primary_category
+            )
+            own_area = math.pi * profile.radius_km ** 2
+            overlaps = []
+            for distance, other in candidates:
+                if other.place_id == place_id:
+                    continue
+                shared = circle_overlap_area(profile.radius_km, other.radius_km, distance)
+                if shared <= 0:
+                    continue
+                overlaps.append({
+                    "place_id": other.place_id,
+                    "distance_km": round(distance, 3),
+                    "service_radius_km": round(other.radius_km, 2),
+                    "shared_area_km2": round(shared, 2),
+                    "shared_pct": round(100 * shared / own_area, 1)
+                })
+        overlaps.sort(key=lambda item: -item["shared_area_km2"])
+        return {
+            "place_id": place_id,
+            "market": profile.market,
+            "primary_category": profile.primary_category,
+            "service_radius_km": round(profile.radius_km, 2),
+            "overlapping_competitors": len(overlaps),
+            "overlaps": overlaps[:limit]
+        }
+
+    def underserved_cells(self, market: str, category: str, min_coverage: int = 3,
+                          limit: int = 50) -> List[Dict]:
+        """
+        Cells where the market has businesses (of any category) but fewer than
+        min_coverage of the category's service areas reach
+
+        Ranked by how far below min_coverage the cell is, then by how many
+        businesses it holds.
+        """
+        min_coverage = max(1, min_coverage)
+        gaps = []
+        with self._lock:
+            demand = self._market_cells.get(market, {})
+            coverage_rows = self._coverage.get((market, category), {})
+            partition_cells = self._partition_cells.get((market, category), {})
+            row_cache: Dict[int, Tuple[List[int], List[int]]] = {}
+            for cell, businesses in demand.items():
+                row, col = cell
+                if row not in row_cache:
+                    deltas = coverage_rows.get(row)
+                    row_cache[row] = self._row_coverage(deltas) if deltas else ([], [])
+                cols, totals = row_cache[row]
+                position = bisect_right(cols, col)
+                coverage = totals[position - 1] if position else 0
+                if coverage >= min_coverage:
+                    continue
+                located_here = len(partition_cells.get(cell, ()))
+                lat, lng = self.grid.center(cell)
+                gaps.append({
+                    "cell": f"{row}:{col}",
+                    "lat": round(lat, 5),
+                    "lng": round(lng, 5),
+                    "market_businesses": businesses,
+                    "competitors_in_cell": located_here,
+                    "coverage": coverage,
+                    "opportunity_score": round(100 * (min_coverage - coverage) / min_coverage),
+                    "gap_severity": "CRITICAL" if coverage == 0 else (
+                        "HIGH" if coverage * 2 < min_coverage else "MODERATE"
+                    )
+                })
+        gaps.sort(key=lambda gap: (-gap["opportunity_score"], -gap["market_businesses"], gap["cell"]))
+        return gaps[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "profiles": len(self._profiles),
+                "cells": len(self._cells),
+                "markets": len(self._market_cells),
+                "partitions": len(self._coverage),
+                "cell_km": self.grid.cell_km,
+                "max_service_radius_km": round(max(self._max_radius_km.values(), default=0.0), 2),
+                "built_at": self.built_at,
+                "build_ms": self.build_ms,
+                **self.stats_counters
+            }
+
+
+_index: Optional[CompetitorDensityIndex] = None
+_loading: Optional[CompetitorDensityIndex] = None
+_index_lock = threading.Lock()
+# time.monotonic() after which the next query starts a background rebuild
+_refresh_due = 0.0
+
+
+def _load() -> CompetitorDensityIndex:
+    """Build a new index from the database and make it the current one"""
+    global _index, _loading, _refresh_due
+    _loading = CompetitorDensityIndex()
+    try:
+        _loading.load_from_db()
+        _index = _loading
+    finally:
+        _loading = None
+        _refresh_due = time.monotonic() + SPATIAL_INDEX_TTL
+
+
+def _refresh():
+    try:
+        with _index_lock:
+            _load()
+    except Exception as e:
+        logger.error(f"Spatial index refresh failed, keeping the current index: {e}")
+
+
+def get_spatial_index(load: bool = True) -> Optional[CompetitorDensityIndex]:
+    """
+    Process-wide index, loaded from the database on first use
+
+    Once older than SPATIAL_INDEX_TTL, a call starts a rebuild on a
+    background thread and gets the current index until the new one is in.
+
+    load=False never loads: it returns the index if one exists or is being
+    loaded, else None.
+    """
+    global _refresh_due
+    if not load:
+        return _index or _loading
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _load()
+    elif SPATIAL_INDEX_TTL > 0 and time.monotonic() >= _refresh_due and _loading is None:
+        with _index_lock:
+            if time.monotonic() < _refresh_due or _loading is not None:
+                return _index
+            # Push the deadline out first so only one caller starts a rebuild
+            _refresh_due = time.monotonic() + SPATIAL_INDEX_TTL
+        threading.Thread(target=_refresh, name="revspy-spatial-refresh", daemon=True).start()
+    return _index
+
+
+def update_spatial_index(profiles: Iterable[Any], market: str):
+    """
+    Apply ingested profiles to the current index and to one being loaded
+
+    An index being loaded takes them too: its snapshot of the table may
+    predate the ingest, and build(overwrite=False) keeps these newer rows.
+    """
+    profiles = list(profiles)
+    current, loading = _index, _loading
+    for index in (current, loading if loading is not current else None):
+        if index is not None:
+            index.upsert_profiles(profiles, market)
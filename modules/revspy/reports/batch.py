@@ -0,0 +1,307 @@
+"""
+RevSPY™ Batch Report Pipeline
+Monthly / bulk PDF runs across hundreds of places
+
+Reports are fetched with the generator's batch queries (a fixed number of
+queries per chunk of place_ids, not per report), rendered across a process
+pool whose workers build the ReportLab styles and fonts once, and streamed
+straight into a content-addressed store. A report whose data has not changed
+since the last run hashes to an existing key and is not rendered again.
+
+The render pool lives as long as the pipeline, so runs after the first skip
+the worker start-up. BatchReportJobs runs batches in the background for the
+API, which hands out job ids instead of holding a request open.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from .generator import ReportGenerator
+from .pdf_export import PDFReportGenerator, warm_up
+
+REPORT_STORE_DIR = os.getenv('REVSPY_REPORT_STORE', '/var/lib/revspy/reports')
+BATCH_CHUNK_SIZE = int(os.getenv('REVSPY_REPORT_CHUNK', '250'))
+
+# Bump when a PDF layout changes so every stored report is re-rendered
+LAYOUT_VERSION = 1
+
+# Fields that change on every run without the report itself changing
+VOLATILE_FIELDS = ('generated_at',)
+
+
+class ReportStore:
+    """PDFs on disk, addressed by a hash of the report data they render"""
+
+    def __init__(self, root: str = REPORT_STORE_DIR):
+        self.root = root
+
+    @staticmethod
+    def key(report: Dict) -> str:
+        """sha256 of the canonical report JSON (minus volatile fields) and layout version"""
+        content = {k: v for k, v in report.items() if k not in VOLATILE_FIELDS}
+        payload = json.dumps(
+            {'layout': LAYOUT_VERSION, 'report': content},
+            sort_keys=True, separators=(',', ':'), default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.pdf")
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of a stored report, or None"""
+        path = self.path(key)
+        return path if os.path.exists(path) else None
+
+    @contextmanager
+    def writer(self, key: str) -> Iterator:
+        """
+        Binary stream for a new report; it only appears under its key once
+        fully written (temp file + rename), so readers never see a partial PDF
+        """
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as stream:
+                yield stream
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+# ------------------------------------------------------------------
+# Worker side (runs in the pool processes)
+# ------------------------------------------------------------------
+
+_worker_pdf: Optional[PDFReportGenerator] = None
+
+
+def _init_worker():
+    """Pool initializer: styles and font metrics are loaded once per worker"""
+    global _worker_pdf
+    warm_up()
+    _worker_pdf = PDFReportGenerator()
+
+
+def _render_to_store(root: str, key: str, report: Dict) -> str:
+    if _worker_pdf is None:
+        _init_worker()
+    store = ReportStore(root)
+    with store.writer(key) as stream:
+        _worker_pdf.render_report(report, stream)
+    return store.path(key)
+
+
+# ------------------------------------------------------------------
+# Pipeline
+# ------------------------------------------------------------------
+
+class BatchReportPipeline:
+    """Fetch, render and store reports for many place_ids"""
+
+    REPORT_TYPES = ('prospect', 'client')
+
+    def __init__(self, generator: ReportGenerator = None, store: ReportStore = None,
+                 workers: int = None, chunk_size: int = BATCH_CHUNK_SIZE):
+        self.generator = generator or ReportGenerator()
+        self.store = store or ReportStore()
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """Render pool, started on first use and kept across runs"""
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: workers must not inherit the parent's pooled DB sockets
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+            return self._executor
+
+    def _discard_pool(self, executor: ProcessPoolExecutor):
+        """Drop a broken pool so the next run starts a fresh one"""
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def close(self):
+        """Stop the render workers"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def _fetch(self, report_type: str, place_ids: List[str], market: str) -> Dict[str, Dict]:
+        if report_type == 'client':
+            return self.generator.generate_monthly_client_reports(place_ids, market)
+        return self.generator.generate_prospect_reports(place_ids, market)
+
+    def run(self, place_ids: List[str], market: str, report_type: str = 'prospect') -> Dict:
+        """
+        Produce one stored PDF per place_id
+
+        Args:
+            place_ids: Places to report on (duplicates are ignored)
+            market: Market the places belong to
+            report_type: 'prospect' or 'client' (monthly progress)
+
+        Returns:
+            Summary with per-place status ('rendered', 'unchanged', 'not_found',
+            'failed') and store key
+        """
+        if report_type not in self.REPORT_TYPES:
+            raise ValueError(f"Unknown report_type: {report_type}")
+
+        started = time.perf_counter()
+        place_ids = list(dict.fromkeys(place_ids))
+        results: Dict[str, Dict] = {}
+
+        executor = None
+        broken = False
+        futures = {}
+        for start in range(0, len(place_ids), self.chunk_size):
+            chunk = place_ids[start:start + self.chunk_size]
+            reports = self._fetch(report_type, chunk, market)
+
+            for place_id in chunk:
+                report = reports.get(place_id)
+                if report is None:
+                    results[place_id] = {'status': 'not_found'}
+                    continue
+
+                key = self.store.key(report)
+                if self.store.exists(key):
+                    results[place_id] = {'status': 'unchanged', 'key': key}
+                    continue
+
+                if self.workers <= 1:
+                    results[place_id] = self._render_inline(key, report)
+                    continue
+
+                executor = executor or self._pool()
+                try:
+                    futures[executor.submit(_render_to_store, self.store.root, key, report)] = (place_id, key)
+                except BrokenProcessPool as e:
+                    broken = True
+                    results[place_id] = {'status': 'failed', 'key': key, 'error': str(e)[:200]}
+
+        for future in as_completed(futures):
+            place_id, key = futures[future]
+            try:
+                future.result()
+                results[place_id] = {'status': 'rendered', 'key': key}
+            except Exception as e:
+                broken = broken or isinstance(e, BrokenProcessPool)
+                results[place_id] = {'status': 'failed', 'key': key, 'error': str(e)[:200]}
+        if broken:
+            self._discard_pool(executor)
+
+        elapsed = time.perf_counter() - started
+        counts = {status: 0 for status in ('rendered', 'unchanged', 'not_found', 'failed')}
+        for result in results.values():
+            counts[result['status']] += 1
+
+        return {
+            'report_type': report_type,
+            'market': market,
+            'requested': len(place_ids),
+            **counts,
+            'elapsed_seconds': round(elapsed, 2),
+            'reports_per_second': round(len(place_ids) / elapsed, 1) if elapsed else 0,
+            'results': {place_id: results[place_id] for place_id in place_ids}
+        }
+
+    def _render_inline(self, key: str, report: Dict) -> Dict:
+        try:
+            _render_to_store(self.store.root, key, report)
+            return {'status': 'rendered', 'key': key}
+        except Exception as e:
+            return {'status': 'failed', 'key': key, 'error': str(e)[:200]}
+
+
+class BatchReportJobs:
+    """
+    Background batch runs, polled by job id
+
+    submit() returns at once; jobs run one at a time on a single thread (the
+    pipeline's render pool does the parallel work). The last `keep`
+    finished jobs stay available for polling.
+    """
+
+    def __init__(self, pipeline: BatchReportPipeline, keep: int = 100):
+        self.pipeline = pipeline
+        self.keep = keep
+        self._jobs: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._runner = ThreadPoolExecutor(max_workers=1, thread_name_prefix='revspy-reports')
+
+    def submit(self, place_ids: List[str], market: str, report_type: str = 'prospect') -> Dict:
+        """Queue a pipeline run; returns the job record"""
+        if report_type not in BatchReportPipeline.REPORT_TYPES:
+            raise ValueError(f"Unknown report_type: {report_type}")
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'status': 'queued',
+            'report_type': report_type,
+            'market': market,
+            'requested': len(dict.fromkeys(place_ids)),
+            'submitted_at': datetime.now().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'summary': None,
+            'error': None
+        }
+        with self._lock:
+            self._jobs[job['job_id']] = job
+            self._prune()
+            snapshot = dict(job)
+        self._runner.submit(self._run, job, list(place_ids), market, report_type)
+        return snapshot
+
+    def _run(self, job: Dict, place_ids: List[str], market: str, report_type: str):
+        with self._lock:
+            job['status'] = 'running'
+            job['started_at'] = datetime.now().isoformat()
+        try:
+            summary = self.pipeline.run(place_ids, market, report_type)
+            update = {'status': 'completed', 'summary': summary}
+        except Exception as e:
+            update = {'status': 'failed', 'error': str(e)[:500]}
+        with self._lock:
+            job.update(update, finished_at=datetime.now().isoformat())
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job['finished_at']]
+        for job_id in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def close(self):
+        """Finish the running job, drop queued ones, stop the render pool"""
+        self._runner.shutdown(cancel_futures=True)
+        self.pipeline.close()
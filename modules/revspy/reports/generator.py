@@ -2,91 +2,129 @@
 RevSPY™ Report Generator
 Main engine for generating competitive analysis reports
 """
-import psycopg2
 from psycopg2.extras import RealDictCursor
 import json
 from datetime import datetime
 from typing import Dict, List, Optional
 import os
+import sys
 from dotenv import load_dotenv
 
 # Load shared environment
 load_dotenv('/opt/shared-api-engine/.env')
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from revspy_db import get_database
+
 class ReportGenerator:
     """Main report generation engine"""
     
     def __init__(self):
-        self.database_url = os.getenv('DATABASE_URL')
-        self.db_config = {
-            'host': os.getenv('POSTGRES_HOST', os.getenv('DATABASE_HOST', 'localhost')),
-            'port': int(os.getenv('POSTGRES_PORT', os.getenv('DATABASE_PORT', '5432'))),
-            'database': os.getenv('POSTGRES_DB', os.getenv('DATABASE_NAME', 'revflow')),
-            'user': os.getenv('POSTGRES_USER', os.getenv('DATABASE_USER', 'revflow')),
-            'password': os.getenv('POSTGRES_PASSWORD', os.getenv('DATABASE_PASSWORD', ''))
-        }
+        self.db = get_database()
 
     def get_connection(self):
-        """Get database connection, preferring DATABASE_URL"""
-        if self.database_url:
-            return psycopg2.connect(self.database_url)
-        return psycopg2.connect(**self.db_config)
+        """Borrow a connection from the shared RevSPY pool (close() returns it)"""
+        return self.db.acquire()
     
     def generate_prospect_report(self, prospect_place_id: str, market: str) -> Dict:
         """
         Generate competitive analysis for prospect
         Used for: Sales outreach, initial assessments
         """
-        conn = self.get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        reports = self.generate_prospect_reports([prospect_place_id], market)
+        return reports.get(prospect_place_id, {"error": "Prospect not found"})
+    
+    def generate_prospect_reports(self, place_ids: List[str], market: str) -> Dict[str, Dict]:
+        """
+        Generate prospect reports for many place_ids in one market
+        
+        Three queries in total, whatever the number of place_ids: the
+        prospects, market averages per category, and the top competitors
+        per category.
         
-        # Get prospect data
-        cur.execute("""
-            SELECT 
-                business_name, primary_category, rating, review_count,
-                photo_count, post_count, competitor_rank, gbp_health_score,
-                competitive_threat, city, state, zip_code
-            FROM revspy_gbp_profiles
-            WHERE place_id = %s
-        """, (prospect_place_id,))
+        Returns:
+            {place_id: report}; place_ids not found are left out
+        """
+        place_ids = list(dict.fromkeys(place_ids))
+        if not place_ids:
+            return {}
         
-        prospect = cur.fetchone()
-        if not prospect:
+        conn = self.get_connection()
+        try:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+            
+            # Get prospect data
+            cur.execute("""
+                SELECT 
+                    place_id,
+                    business_name, primary_category, rating, review_count,
+                    photo_count, post_count, competitor_rank, gbp_health_score,
+                    competitive_threat, city, state, zip_code
+                FROM revspy_gbp_profiles
+                WHERE place_id = ANY(%s)
+            """, (place_ids,))
+            prospects = {row.pop('place_id'): row for row in cur.fetchall()}
+            if not prospects:
+                return {}
+            categories = list({p['primary_category'] for p in prospects.values()})
+            
+            # Get market averages per category
+            cur.execute("""
+                SELECT 
+                    primary_category,
+                    AVG(rating) as avg_rating,
+                    AVG(review_count) as avg_reviews,
+                    AVG(photo_count) as avg_photos,
+                    AVG(post_count) as avg_posts,
+                    COUNT(*) as total_competitors
+                FROM revspy_gbp_profiles
+                WHERE market = %s AND primary_category = ANY(%s)
+                GROUP BY primary_category
+            """, (market, categories))
+            averages = {row.pop('primary_category'): row for row in cur.fetchall()}
+            
+            # Get top 4 competitors per category (top 3 once the prospect itself is dropped)
+            cur.execute("""
+                SELECT place_id, primary_category,
+                       business_name, rating, review_count, photo_count,
+                       post_count, competitor_rank, gbp_health_score
+                FROM (
+                    SELECT *,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY primary_category ORDER BY competitor_rank ASC
+                           ) AS position
+                    FROM revspy_gbp_profiles
+                    WHERE market = %s AND primary_category = ANY(%s)
+                ) ranked
+                WHERE position <= 4
+                ORDER BY primary_category, position
+            """, (market, categories))
+            leaders: Dict[str, List[Dict]] = {}
+            for row in cur.fetchall():
+                leaders.setdefault(row.pop('primary_category'), []).append(row)
+            
             cur.close()
+        finally:
             conn.close()
-            return {"error": "Prospect not found"}
-        
-        # Get market averages
-        cur.execute("""
-            SELECT 
-                AVG(rating) as avg_rating,
-                AVG(review_count) as avg_reviews,
-                AVG(photo_count) as avg_photos,
-                AVG(post_count) as avg_posts,
-                COUNT(*) as total_competitors
-            FROM revspy_gbp_profiles
-            WHERE market = %s AND primary_category = %s
-        """, (market, prospect['primary_category']))
-        
-        market_data = cur.fetchone()
         
-        # Get top 3 competitors
-        cur.execute("""
-            SELECT 
-                business_name, rating, review_count, photo_count,
-                post_count, competitor_rank, gbp_health_score
-            FROM revspy_gbp_profiles
-            WHERE market = %s 
-                AND primary_category = %s
-                AND place_id != %s
-            ORDER BY competitor_rank ASC
-            LIMIT 3
-        """, (market, prospect['primary_category'], prospect_place_id))
-        
-        competitors = cur.fetchall()
-        
-        # Build report
-        report = {
+        empty_market = {'avg_rating': None, 'avg_reviews': None, 'avg_photos': None,
+                        'avg_posts': None, 'total_competitors': 0}
+        reports = {}
+        for place_id, prospect in prospects.items():
+            category = prospect['primary_category']
+            competitors = [
+                {key: value for key, value in c.items() if key != 'place_id'}
+                for c in leaders.get(category, []) if c['place_id'] != place_id
+            ][:3]
+            reports[place_id] = self._build_prospect_report(
+                prospect, averages.get(category, empty_market), competitors
+            )
+        return reports
+    
+    def _build_prospect_report(self, prospect: Dict, market_data: Dict, competitors: List[Dict]) -> Dict:
+        """Assemble a prospect report from its query rows"""
+        return {
             "report_type": "prospect_analysis",
             "generated_at": datetime.now().isoformat(),
             "prospect": dict(prospect),
@@ -111,47 +149,67 @@ class ReportGenerator:
                 prospect['competitor_rank']
             )
         }
-        
-        cur.close()
-        conn.close()
-        
-        return report
     
     def generate_monthly_client_report(self, client_place_id: str, market: str) -> Dict:
         """
         Generate monthly progress report for existing client
         Used for: Retention, progress tracking
         """
-        conn = self.get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        reports = self.generate_monthly_client_reports([client_place_id], market)
+        return reports.get(client_place_id, {"error": "Client not found"})
+    
+    def generate_monthly_client_reports(self, place_ids: List[str], market: str) -> Dict[str, Dict]:
+        """
+        Generate monthly client reports for many place_ids (two queries in total)
         
-        # Get current data
-        cur.execute("""
-            SELECT 
-                business_name, rating, review_count, photo_count,
-                competitor_rank, gbp_health_score, competitive_threat
-            FROM revspy_gbp_profiles
-            WHERE place_id = %s
-        """, (client_place_id,))
+        Returns:
+            {place_id: report}; place_ids not found are left out
+        """
+        place_ids = list(dict.fromkeys(place_ids))
+        if not place_ids:
+            return {}
         
-        current = cur.fetchone()
-        if not current:
+        conn = self.get_connection()
+        try:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+            
+            # Get current data
+            cur.execute("""
+                SELECT 
+                    place_id,
+                    business_name, rating, review_count, photo_count,
+                    competitor_rank, gbp_health_score, competitive_threat
+                FROM revspy_gbp_profiles
+                WHERE place_id = ANY(%s)
+            """, (place_ids,))
+            current = {row.pop('place_id'): row for row in cur.fetchall()}
+            if not current:
+                return {}
+            
+            # Get previous month data (second most recent benchmark snapshot)
+            cur.execute("""
+                SELECT place_id, rating, review_count, competitor_rank, gbp_health_score
+                FROM (
+                    SELECT place_id, rating, review_count, competitor_rank, gbp_health_score,
+                           ROW_NUMBER() OVER (PARTITION BY place_id ORDER BY snapshot_date DESC) AS position
+                    FROM revspy_competitive_benchmarks
+                    WHERE place_id = ANY(%s)
+                ) snapshots
+                WHERE position = 2
+            """, (list(current),))
+            previous = {row.pop('place_id'): row for row in cur.fetchall()}
+            
             cur.close()
+        finally:
             conn.close()
-            return {"error": "Client not found"}
-        
-        # Get previous month data (from benchmarks)
-        cur.execute("""
-            SELECT 
-                rating, review_count, competitor_rank, gbp_health_score
-            FROM revspy_competitive_benchmarks
-            WHERE place_id = %s
-            ORDER BY snapshot_date DESC
-            LIMIT 1 OFFSET 1
-        """, (client_place_id,))
-        
-        previous = cur.fetchone()
         
+        return {
+            place_id: self._build_client_report(row, previous.get(place_id))
+            for place_id, row in current.items()
+        }
+    
+    def _build_client_report(self, current: Dict, previous: Optional[Dict]) -> Dict:
+        """Assemble a monthly client report from its query rows"""
         # Calculate changes
         changes = None
         if previous:
@@ -162,7 +220,7 @@ class ReportGenerator:
                 "score": (current['gbp_health_score'] or 0) - (previous['gbp_health_score'] or 0)
             }
         
-        report = {
+        return {
             "report_type": "monthly_client_progress",
             "generated_at": datetime.now().isoformat(),
             "client": dict(current),
@@ -170,11 +228,6 @@ class ReportGenerator:
             "performance": self._calculate_performance(changes) if changes else "NEW CLIENT",
             "report_month": datetime.now().strftime("%B %Y")
         }
-        
-        cur.close()
-        conn.close()
-        
-        return report
     
     def _generate_recommendation(self, health_score: int, total_competitors: int, rank: int) -> Dict:
         """Generate sales recommendation"""
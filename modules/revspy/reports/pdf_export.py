@@ -9,52 +9,102 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.platypus import Image as RLImage
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
+from reportlab.pdfbase import pdfmetrics
 from datetime import datetime
-from typing import Dict
+from typing import BinaryIO, Dict, Union
 import os
 
-class PDFReportGenerator:
-    """Generate professional PDF reports"""
-    
-    def __init__(self, output_dir: str = "/tmp"):
-        self.output_dir = output_dir
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-    
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles"""
-        self.styles.add(ParagraphStyle(
+# Fonts used by the report layouts (standard Type 1, loaded on first use)
+REPORT_FONTS = ('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique')
+
+HEADER_BLUE = colors.HexColor('#2c5aa0')
+
+_styles = None
+
+
+def get_styles():
+    """Report stylesheet, built once per process and shared by every generator"""
+    global _styles
+    if _styles is None:
+        styles = getSampleStyleSheet()
+        styles.add(ParagraphStyle(
             name='CustomTitle',
-            parent=self.styles['Heading1'],
+            parent=styles['Heading1'],
             fontSize=24,
             textColor=colors.HexColor('#1a1a1a'),
             spaceAfter=30,
             alignment=TA_CENTER
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SectionHeader',
-            parent=self.styles['Heading2'],
+            parent=styles['Heading2'],
             fontSize=16,
-            textColor=colors.HexColor('#2c5aa0'),
+            textColor=HEADER_BLUE,
             spaceBefore=20,
             spaceAfter=12
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='MetricLabel',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=10,
             textColor=colors.HexColor('#666666')
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='MetricValue',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=14,
             textColor=colors.HexColor('#1a1a1a'),
             fontName='Helvetica-Bold'
         ))
+        _styles = styles
+    return _styles
+
+
+def warm_up():
+    """Load styles and font metrics up front (process pool initializer)"""
+    get_styles()
+    for font in REPORT_FONTS:
+        pdfmetrics.getFont(font)
+
+
+def _grid_style(align: str, header_font_size: int) -> TableStyle:
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), HEADER_BLUE),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), align),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), header_font_size),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
+    ])
+
+
+POSITION_TABLE_STYLE = _grid_style('LEFT', 12)
+GRID_TABLE_STYLE = _grid_style('CENTER', 10)
+
+RECOMMENDATION_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), HEADER_BLUE),
+    ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('PADDING', (0, 0), (-1, -1), 12),
+    ('BACKGROUND', (1, 0), (-1, -1), colors.HexColor('#fff8dc')),
+    ('GRID', (0, 0), (-1, -1), 1, colors.grey)
+])
+
+
+class PDFReportGenerator:
+    """Generate professional PDF reports"""
+    
+    def __init__(self, output_dir: str = "/tmp"):
+        self.output_dir = output_dir
+        self.styles = get_styles()
     
     def generate_prospect_report(self, report: Dict, filename: str = None) -> str:
         """
@@ -66,11 +116,12 @@ class PDFReportGenerator:
             filename = f"prospect_report_{timestamp}.pdf"
         
         filepath = os.path.join(self.output_dir, filename)
-        
-        # Create document
-        doc = SimpleDocTemplate(filepath, pagesize=letter,
-                              rightMargin=72, leftMargin=72,
-                              topMargin=72, bottomMargin=18)
+        self.render_prospect_report(report, filepath)
+        return filepath
+    
+    def render_prospect_report(self, report: Dict, output: Union[str, BinaryIO]):
+        """Render a prospect report to a path or a writable binary stream"""
+        doc = self._document(output)
         
         # Build content
         story = []
@@ -102,17 +153,7 @@ class PDFReportGenerator:
         ]
         
         position_table = Table(position_data, colWidths=[3*inch, 3*inch])
-        position_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5aa0')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
-        ]))
+        position_table.setStyle(POSITION_TABLE_STYLE)
         
         story.append(position_table)
         story.append(Spacer(1, 20))
@@ -134,17 +175,7 @@ class PDFReportGenerator:
         ]
         
         comparison_table = Table(comparison_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-        comparison_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5aa0')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
-        ]))
+        comparison_table.setStyle(GRID_TABLE_STYLE)
         
         story.append(comparison_table)
         story.append(Spacer(1, 20))
@@ -164,17 +195,7 @@ class PDFReportGenerator:
                 ])
             
             comp_table = Table(comp_data, colWidths=[0.75*inch, 2.5*inch, 1*inch, 1*inch, 1.25*inch])
-            comp_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5aa0')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
-            ]))
+            comp_table.setStyle(GRID_TABLE_STYLE)
             
             story.append(comp_table)
             story.append(Spacer(1, 20))
@@ -190,16 +211,7 @@ class PDFReportGenerator:
         ]
         
         rec_table = Table(rec_data, colWidths=[2*inch, 4*inch])
-        rec_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#2c5aa0')),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('PADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (1, 0), (-1, -1), colors.HexColor('#fff8dc')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-        ]))
+        rec_table.setStyle(RECOMMENDATION_TABLE_STYLE)
         
         story.append(rec_table)
         story.append(Spacer(1, 30))
@@ -213,8 +225,87 @@ class PDFReportGenerator:
         
         # Build PDF
         doc.build(story)
+    
+    def generate_client_report(self, report: Dict, filename: str = None) -> str:
+        """
+        Generate PDF report for monthly client progress
+        Returns: Path to generated PDF file
+        """
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"client_report_{timestamp}.pdf"
         
+        filepath = os.path.join(self.output_dir, filename)
+        self.render_client_report(report, filepath)
         return filepath
+    
+    def render_client_report(self, report: Dict, output: Union[str, BinaryIO]):
+        """Render a monthly client report to a path or a writable binary stream"""
+        doc = self._document(output)
+        story = []
+        
+        # Title
+        story.append(Paragraph("Monthly Progress Report", self.styles['CustomTitle']))
+        story.append(Spacer(1, 12))
+        
+        client = report['client']
+        story.append(Paragraph(f"<b>{client.get('business_name', 'Unknown Business')}</b>", self.styles['Heading2']))
+        story.append(Paragraph(f"Report Month: {report.get('report_month', '')}", self.styles['Normal']))
+        story.append(Spacer(1, 20))
+        
+        # Current Position
+        story.append(Paragraph("Current Position", self.styles['SectionHeader']))
+        
+        position_data = [
+            ['Metric', 'Value'],
+            ['Market Rank', f"#{client.get('competitor_rank')}"],
+            ['Rating', f"{client.get('rating')} ⭐"],
+            ['Total Reviews', str(client.get('review_count'))],
+            ['Health Score', f"{client.get('gbp_health_score', 0)}/100"],
+            ['Threat Level', client.get('competitive_threat', 'Unknown')]
+        ]
+        position_table = Table(position_data, colWidths=[3*inch, 3*inch])
+        position_table.setStyle(POSITION_TABLE_STYLE)
+        story.append(position_table)
+        story.append(Spacer(1, 20))
+        
+        # Monthly Changes
+        story.append(Paragraph("This Month", self.styles['SectionHeader']))
+        
+        changes = report.get('monthly_changes')
+        if changes:
+            change_data = [
+                ['Rating', 'Reviews', 'Rank', 'Health Score'],
+                [f"{changes.get('rating', 0):+.2f}", f"{changes.get('reviews', 0):+}",
+                 f"{changes.get('rank', 0):+}", f"{changes.get('score', 0):+}"]
+            ]
+            change_table = Table(change_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch, 1.5*inch])
+            change_table.setStyle(GRID_TABLE_STYLE)
+            story.append(change_table)
+            story.append(Spacer(1, 12))
+        
+        story.append(Paragraph(f"<b>Performance:</b> {report.get('performance', 'N/A')}", self.styles['Normal']))
+        story.append(Spacer(1, 30))
+        
+        story.append(Paragraph(
+            f"<i>This report was generated by RevSPY™ GBP Intelligence on {datetime.now().strftime('%B %d, %Y')}.</i>",
+            self.styles['Normal']
+        ))
+        
+        doc.build(story)
+    
+    def render_report(self, report: Dict, output: Union[str, BinaryIO]):
+        """Render any generator report, picking the layout from its report_type"""
+        if report.get('report_type') == 'monthly_client_progress':
+            self.render_client_report(report, output)
+        else:
+            self.render_prospect_report(report, output)
+    
+    def _document(self, output: Union[str, BinaryIO]) -> SimpleDocTemplate:
+        # SimpleDocTemplate writes to anything with .write(), not just paths
+        return SimpleDocTemplate(output, pagesize=letter,
+                                 rightMargin=72, leftMargin=72,
+                                 topMargin=72, bottomMargin=18)
 
 
 # Convenience function
@@ -0,0 +1,474 @@
+"""
+REVSPY™ DATA ACCESS LAYER
+Module 15: RevSPY™ Enhancement
+
+Purpose: One thread-safe PostgreSQL connection pool shared by every RevSPY
+         endpoint, report generator and the query library
+Features:
+    - Blocking pool (waits up to REVSPY_DB_POOL_TIMEOUT instead of failing)
+      that keeps up to REVSPY_DB_POOL_MAX idle connections open
+    - Server-side prepared statements for the hot market/profile queries
+    - Read-through TTL cache for slow-changing aggregates
+    - Pool wait and query latency histograms (get_database().stats())
+
+Usage:
+    from revspy_db import get_database
+
+    db = get_database()
+    with db.cursor() as cur:
+        db.execute_prepared(cur, "profile_by_place_id", (place_id,))
+        row = cur.fetchone()
+
+Date: 2026-02-08
+"""
+
+import copy
+import os
+import threading
+import time
+import logging
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+from dotenv import load_dotenv
+
+# Load shared .env file (RevFlow OS standard)
+load_dotenv('/opt/shared-api-engine/.env')
+
+logger = logging.getLogger(__name__)
+
+# Connections opened up front; idle ones are kept up to POOL_MAX either way
+POOL_MIN = int(os.getenv("REVSPY_DB_POOL_MIN", "1"))
+POOL_MAX = int(os.getenv("REVSPY_DB_POOL_MAX", "10"))
+POOL_TIMEOUT = float(os.getenv("REVSPY_DB_POOL_TIMEOUT", "10"))
+CACHE_TTL = float(os.getenv("REVSPY_CACHE_TTL", "300"))
+
+# Milliseconds; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Hot queries, prepared once per pooled connection: name -> (parameter types, SQL)
+PREPARED_STATEMENTS: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "profile_by_place_id": (("text",), """
+        SELECT
+            place_id, business_name, primary_category, secondary_categories,
+            rating, review_count, photo_count, post_count,
+            competitor_rank, gbp_health_score, competitive_threat,
+            market, city, state, zip_code
+        FROM revspy_gbp_profiles
+        WHERE place_id = $1
+    """),
+    "market_profiles": (("text", "integer"), """
+        SELECT
+            place_id, business_name, primary_category,
+            rating, review_count, competitor_rank,
+            city, state, zip_code,
+            gbp_health_score, competitive_threat
+        FROM revspy_gbp_profiles
+        WHERE market = $1
+        ORDER BY competitor_rank ASC, rating DESC
+        LIMIT $2
+    """),
+    "market_top_competitors": (("text", "integer"), """
+        SELECT
+            place_id, business_name, primary_category,
+            rating, review_count, photo_count, post_count,
+            competitor_rank, gbp_health_score, competitive_threat,
+            has_website, city, state, zip_code
+        FROM revspy_gbp_profiles
+        WHERE market = $1
+        ORDER BY competitor_rank ASC
+        LIMIT $2
+    """),
+    "market_averages": (("text",), """
+        SELECT
+            COUNT(*) as total_competitors,
+            AVG(rating) as avg_rating,
+            AVG(review_count) as avg_reviews,
+            AVG(photo_count) as avg_photos,
+            AVG(post_count) as avg_posts,
+            AVG(gbp_health_score) as avg_health_score
+        FROM revspy_gbp_profiles
+        WHERE market = $1
+    """),
+}
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus style), thread-safe"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value_ms: float):
+        with self.lock:
+            self.counts[bisect_left(self.buckets, value_ms)] += 1
+            self.count += 1
+            self.total += value_ms
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th observation"""
+        with self.lock:
+            if not self.count:
+                return 0.0
+            target = pct / 100 * self.count
+            seen = 0
+            for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+                seen += count
+                if seen >= target:
+                    return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p99 = self.percentile(50), self.percentile(99)
+        with self.lock:
+            cumulative, buckets = 0, {}
+            for bound, count in zip(self.buckets, self.counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = self.count
+            return {
+                "count": self.count,
+                "sum_ms": round(self.total, 3),
+                "p50_ms": p50,
+                "p99_ms": p99,
+                "buckets": buckets
+            }
+
+
+class _TimedCursorMixin:
+    """Records execute() latency on the owning connection's Database"""
+
+    def execute(self, query, vars=None):
+        start = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            database = getattr(self.connection, "database", None)
+            if database is not None:
+                database.query_latency.observe((time.perf_counter() - start) * 1000)
+
+
+class TimedCursor(_TimedCursorMixin, psycopg2.extensions.cursor):
+    pass
+
+
+class TimedRealDictCursor(_TimedCursorMixin, RealDictCursor):
+    pass
+
+
+class PoolMemberMixin:
+    """
+    Pool bookkeeping for a connection (mixed into PooledConnection)
+
+    While borrowed from a Database, close() hands it back to the pool, so
+    code written as connect() ... finally: conn.close() pools unchanged.
+    Once returned, further close() calls are no-ops: the connection now
+    sits idle in the pool. Only the pool itself (discarding a connection)
+    and Database.close() really close it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+        self.database = None    # Database it is lent out from
+        self.idle_in = None     # Database whose pool holds it idle
+
+    def close(self):
+        owner = self.database or self.idle_in
+        if owner is not None and not owner._closing:
+            if self.database is not None:
+                self.database.release(self)
+            return
+        super().close()
+
+
+class PooledConnection(PoolMemberMixin, psycopg2.extensions.connection):
+    """Pooled connection that remembers which statements it has prepared"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cursor_factory = TimedCursor
+
+    def cursor(self, *args, **kwargs):
+        if kwargs.get("cursor_factory") is RealDictCursor:
+            kwargs["cursor_factory"] = TimedRealDictCursor
+        return super().cursor(*args, **kwargs)
+
+
+class KeepIdleConnectionPool(ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool that keeps up to maxconn idle connections
+
+    The stock pool really closes any connection returned while minconn are
+    already idle, so under concurrent load most connections (and the
+    statements PREPAREd on them) would be opened and closed per request.
+    Here minconn only sets how many are opened up front.
+
+    getconn() hands out idle connections under the pool lock but opens new
+    ones outside it, so one slow TCP/TLS connect does not hold up every
+    other getconn()/putconn().
+    """
+
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        self._connecting = 0
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        # _putconn keeps a returned connection while fewer than minconn are idle
+        self.minconn = self.maxconn
+
+    def getconn(self, key=None):
+        with self._lock:
+            if self.closed:
+                raise PoolError("connection pool is closed")
+            if key is None:
+                key = self._getkey()
+            if key in self._used:
+                return self._used[key]
+            if self._pool:
+                conn = self._used[key] = self._pool.pop()
+                self._rused[id(conn)] = key
+                return conn
+            if len(self._used) + self._connecting >= self.maxconn:
+                raise PoolError("connection pool exhausted")
+            self._connecting += 1
+
+        try:
+            conn = psycopg2.connect(*self._args, **self._kwargs)
+        finally:
+            with self._lock:
+                self._connecting -= 1
+
+        with self._lock:
+            if self.closed:
+                conn.close()
+                raise PoolError("connection pool is closed")
+            self._used[key] = conn
+            self._rused[id(conn)] = key
+        return conn
+
+
+class Database:
+    """Shared pool + prepared statements + aggregate cache"""
+
+    def __init__(self, minconn: int = POOL_MIN, maxconn: int = POOL_MAX,
+                 timeout: float = POOL_TIMEOUT, cache_ttl: float = CACHE_TTL):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+
+        self._pool: Optional[KeepIdleConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        # ThreadedConnectionPool raises when exhausted; this makes callers wait
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._in_use = 0
+        self._closing = False
+
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._cache_lock = threading.Lock()
+        # Bumped by invalidate(); a load that started before it is not stored
+        self._cache_generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self.pool_wait = Histogram()
+        self.query_latency = Histogram()
+        self.prepared_latency: Dict[str, Histogram] = {name: Histogram() for name in PREPARED_STATEMENTS}
+
+    @staticmethod
+    def _connect_kwargs() -> Dict[str, Any]:
+        # Prefer DATABASE_URL if available (correctly set in docker-compose)
+        database_url = os.getenv("DATABASE_URL")
+        if database_url:
+            return {"dsn": database_url, "connect_timeout": 10}
+        return {
+            "host": os.getenv("POSTGRES_HOST", os.getenv("DATABASE_HOST", "localhost")),
+            "port": int(os.getenv("POSTGRES_PORT", os.getenv("DATABASE_PORT", "5432"))),
+            "database": os.getenv("POSTGRES_DB", os.getenv("DATABASE_NAME", "revflow")),
+            "user": os.getenv("POSTGRES_USER", os.getenv("DATABASE_USER", "revflow")),
+            "password": os.getenv("POSTGRES_PASSWORD", os.getenv("DATABASE_PASSWORD", "")),
+            "connect_timeout": 10
+        }
+
+    @property
+    def pool(self) -> KeepIdleConnectionPool:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = KeepIdleConnectionPool(
+                        self.minconn, self.maxconn,
+                        connection_factory=PooledConnection,
+                        **self._connect_kwargs()
+                    )
+        return self._pool
+
+    # ------------------------------------------------------------------
+    # Connections and cursors
+    # ------------------------------------------------------------------
+
+    def acquire(self) -> PooledConnection:
+        """Borrow a pooled connection, waiting up to `timeout` for a free slot"""
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            self.pool_wait.observe((time.perf_counter() - start) * 1000)
+            raise PoolError(f"No database connection available within {self.timeout}s")
+        try:
+            # May open a new connection: not under _pool_lock
+            conn = self.pool.getconn()
+            with self._pool_lock:
+                conn.database = self
+                conn.idle_in = None
+                self._in_use += 1
+        except Exception:
+            self._slots.release()
+            raise
+        self.pool_wait.observe((time.perf_counter() - start) * 1000)
+        return conn
+
+    def release(self, conn: PooledConnection):
+        """
+        Return a borrowed connection
+
+        Commits are the borrower's job; anything left uncommitted is rolled
+        back first, and broken connections are discarded.
+        """
+        if conn.database is not self:
+            return  # already released
+        broken = bool(conn.closed)
+        if not broken:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                broken = True
+        pool = self.pool
+        try:
+            with self._pool_lock:
+                self._in_use -= 1
+                # Not owned while the pool decides, so it can really close surplus/broken ones
+                conn.database = None
+                pool.putconn(conn, close=broken)
+                if not conn.closed:
+                    conn.idle_in = self
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection for the duration of a with block"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def cursor(self, dict_rows: bool = False, commit: bool = False):
+        """Borrow a connection and open a timed cursor on it"""
+        with self.connection() as conn:
+            cur = conn.cursor(cursor_factory=RealDictCursor if dict_rows else None)
+            try:
+                yield cur
+                if commit:
+                    conn.commit()
+            finally:
+                cur.close()
+
+    def execute_prepared(self, cur, name: str, params: Sequence = ()):
+        """EXECUTE a PREPARED_STATEMENTS entry, preparing it on first use per connection"""
+        conn = cur.connection
+        types, sql = PREPARED_STATEMENTS[name]
+        if name not in conn.prepared:
+            cur.execute(f"PREPARE {name} ({', '.join(types)}) AS {sql}")
+            conn.prepared.add(name)
+        start = time.perf_counter()
+        try:
+            cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(types))})", tuple(params))
+        finally:
+            self.prepared_latency[name].observe((time.perf_counter() - start) * 1000)
+
+    # ------------------------------------------------------------------
+    # Read-through cache for aggregates
+    # ------------------------------------------------------------------
+
+    def cached(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Return the cached value for key, calling loader() on a miss or expiry"""
+        ttl = self.cache_ttl if ttl is None else ttl
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > now:
+                self.cache_hits += 1
+                return copy.deepcopy(entry[1])
+            self.cache_misses += 1
+            generation = self._cache_generation
+
+        value = loader()
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                self._cache[key] = (time.monotonic() + ttl, value)
+        return copy.deepcopy(value)
+
+    def invalidate(self, prefix: str = ""):
+        """Drop cached entries whose key starts with prefix (all by default)"""
+        with self._cache_lock:
+            self._cache_generation += 1
+            for key in [key for key in self._cache if key.startswith(prefix)]:
+                del self._cache[key]
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pool": {
+                "min": self.minconn,
+                "max": self.maxconn,
+                "in_use": self._in_use,
+                "wait": self.pool_wait.snapshot()
+            },
+            "queries": self.query_latency.snapshot(),
+            "prepared": {
+                name: histogram.snapshot()
+                for name, histogram in self.prepared_latency.items()
+                if histogram.count
+            },
+            "cache": {
+                "entries": len(self._cache),
+                "hits": self.cache_hits,
+                "misses": self.cache_misses
+            }
+        }
+
+    def close(self):
+        """Really close every pooled connection (borrowed ones included)"""
+        if self._pool is not None:
+            self._closing = True
+            try:
+                self._pool.closeall()
+            finally:
+                self._pool = None
+                self._closing = False
+
+
+_database: Optional[Database] = None
+_database_lock = threading.Lock()
+
+
+def get_database() -> Database:
+    """Process-wide Database (pool created on first use)"""
+    global _database
+    if _database is None:
+        with _database_lock:
+            if _database is None:
+                _database = Database()
+    return _database
@@ -8,11 +8,11 @@ Usage: Import and use in reports, dashboards, and analysis scripts
 Date: 2026-02-08
 """
 
-import psycopg2
 from typing import List, Dict, Optional, Tuple
-import os
 from datetime import datetime, timedelta
 
+from revspy_db import Database, get_database
+
 
 class RevSpyGBPQueries:
     """
@@ -20,24 +20,9 @@ class RevSpyGBPQueries:
     All common competitive analysis queries in one place
     """
     
-    def __init__(self):
-        """Initialize database connection, preferring DATABASE_URL"""
-        database_url = os.getenv("DATABASE_URL")
-        if database_url:
-            self.conn = psycopg2.connect(database_url)
-        else:
-            self.conn = psycopg2.connect(
-                host=os.getenv("POSTGRES_HOST", os.getenv("DATABASE_HOST", "localhost")),
-                port=int(os.getenv("POSTGRES_PORT", os.getenv("DATABASE_PORT", "5432"))),
-                database=os.getenv("POSTGRES_DB", os.getenv("DATABASE_NAME", "revflow")),
-                user=os.getenv("POSTGRES_USER", os.getenv("DATABASE_USER", "revflow")),
-                password=os.getenv("POSTGRES_PASSWORD", os.getenv("DATABASE_PASSWORD", ""))
-            )
-    
-    def __del__(self):
-        """Close connection on cleanup"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+    def __init__(self, database: Optional[Database] = None):
+        """Use the shared RevSPY connection pool"""
+        self.db = database or get_database()
     
     # ========================================================================
     # MARKET OVERVIEW QUERIES
@@ -50,37 +35,37 @@ class RevSpyGBPQueries:
         Returns:
             List of markets with profile counts and last update times
         """
-        cur = self.conn.cursor()
-        
-        cur.execute("""
-            SELECT 
-                market,
-                primary_category,
-                COUNT(*) as profile_count,
-                COUNT(*) FILTER (WHERE local_pack_position = TRUE) as local_pack_count,
-                AVG(rating) as avg_rating,
-                AVG(review_count) as avg_reviews,
-                MAX(scraped_at) as last_updated,
-                COUNT(DISTINCT scraped_by) as users_tracked
-            FROM revspy_gbp_profiles
-            GROUP BY market, primary_category
-            ORDER BY last_updated DESC
-        """)
-        
-        markets = []
-        for row in cur.fetchall():
-            markets.append({
-                "market": row[0],
-                "category": row[1],
-                "total_profiles": row[2],
-                "local_pack_count": row[3],
-                "avg_rating": float(row[4]) if row[4] else 0,
-                "avg_reviews": int(row[5]) if row[5] else 0,
-                "last_updated": row[6].isoformat() if row[6] else None,
-                "users_tracked": row[7]
-            })
-        
-        cur.close()
+        return self.db.cached("markets:all", self._load_all_markets)
+    
+    def _load_all_markets(self) -> List[Dict]:
+        with self.db.cursor() as cur:
+            cur.execute("""
+                SELECT 
+                    market,
+                    primary_category,
+                    COUNT(*) as profile_count,
+                    COUNT(*) FILTER (WHERE local_pack_position = TRUE) as local_pack_count,
+                    AVG(rating) as avg_rating,
+                    AVG(review_count) as avg_reviews,
+                    MAX(scraped_at) as last_updated,
+                    COUNT(DISTINCT scraped_by) as users_tracked
+                FROM revspy_gbp_profiles
+                GROUP BY market, primary_category
+                ORDER BY last_updated DESC
+            """)
+
+            markets = []
+            for row in cur.fetchall():
+                markets.append({
+                    "market": row[0],
+                    "category": row[1],
+                    "total_profiles": row[2],
+                    "local_pack_count": row[3],
+                    "avg_rating": float(row[4]) if row[4] else 0,
+                    "avg_reviews": int(row[5]) if row[5] else 0,
+                    "last_updated": row[6].isoformat() if row[6] else None,
+                    "users_tracked": row[7]
+                })
         return markets
     
     def get_market_summary(self, market: str) -> Dict:
@@ -93,61 +78,58 @@ class RevSpyGBPQueries:
         Returns:
             Dict with complete market overview
         """
-        cur = self.conn.cursor()
-        
-        # Overall stats
-        cur.execute("""
-            SELECT 
-                COUNT(*) as total_competitors,
-                COUNT(*) FILTER (WHERE local_pack_position = TRUE) as local_pack_count,
-                AVG(rating) as avg_rating,
-                AVG(review_count) as avg_reviews,
-                AVG(photo_count) as avg_photos,
-                AVG(gbp_health_score) as avg_health_score,
-                MAX(gbp_health_score) as top_score,
-                MIN(gbp_health_score) as lowest_score
-            FROM revspy_gbp_profiles
-            WHERE market = %s
-        """, (market,))
-        
-        stats = cur.fetchone()
-        
-        # Category breakdown
-        cur.execute("""
-            SELECT 
-                primary_category,
-                COUNT(*) as count,
-                AVG(rating) as avg_rating
-            FROM revspy_gbp_profiles
-            WHERE market = %s
-            GROUP BY primary_category
-            ORDER BY count DESC
-        """, (market,))
-        
-        categories = [
-            {
-                "category": row[0],
-                "count": row[1],
-                "avg_rating": float(row[2]) if row[2] else 0
-            }
-            for row in cur.fetchall()
-        ]
-        
-        # Geographic distribution
-        cur.execute("""
-            SELECT 
-                city,
-                COUNT(*) as count
-            FROM revspy_gbp_profiles
-            WHERE market = %s AND city IS NOT NULL
-            GROUP BY city
-            ORDER BY count DESC
-            LIMIT 10
-        """, (market,))
-        
-        cities = [{"city": row[0], "count": row[1]} for row in cur.fetchall()]
-        
-        cur.close()
+        with self.db.cursor() as cur:
+            # Overall stats
+            cur.execute("""
+                SELECT 
+                    COUNT(*) as total_competitors,
+                    COUNT(*) FILTER (WHERE local_pack_position = TRUE) as local_pack_count,
+                    AVG(rating) as avg_rating,
+                    AVG(review_count) as avg_reviews,
+                    AVG(photo_count) as avg_photos,
+                    AVG(gbp_health_score) as avg_health_score,
+                    MAX(gbp_health_score) as top_score,
+                    MIN(gbp_health_score) as lowest_score
+                FROM revspy_gbp_profiles
+                WHERE market = %s
+            """, (market,))
+
+            stats = cur.fetchone()
+
+            # Category breakdown
+            cur.execute("""
+                SELECT 
+                    primary_category,
+                    COUNT(*) as count,
+                    AVG(rating) as avg_rating
+                FROM revspy_gbp_profiles
+                WHERE market = %s
+                GROUP BY primary_category
+                ORDER BY count DESC
+            """, (market,))
+
+            categories = [
+                {
+                    "category": row[0],
+                    "count": row[1],
+                    "avg_rating": float(row[2]) if row[2] else 0
+                }
+                for row in cur.fetchall()
+            ]
+
+            # Geographic distribution
+            cur.execute("""
+                SELECT 
+                    city,
+                    COUNT(*) as count
+                FROM revspy_gbp_profiles
+                WHERE market = %s AND city IS NOT NULL
+                GROUP BY city
+                ORDER BY count DESC
+                LIMIT 10
+            """, (market,))
+
+            cities = [{"city": row[0], "count": row[1]} for row in cur.fetchall()]
         
         return {
             "market": market,
@@ -180,48 +162,25 @@ class RevSpyGBPQueries:
         Returns:
             List of top competitors with full details
         """
-        cur = self.conn.cursor()
-        
-        cur.execute("""
-            SELECT 
-                place_id,
-                business_name,
-                primary_category,
-                rating,
-                review_count,
-                photo_count,
-                post_count,
-                competitor_rank,
-                gbp_health_score,
-                competitive_threat,
-                has_website,
-                city,
-                state,
-                zip_code
-            FROM revspy_gbp_profiles
-            WHERE market = %s
-            ORDER BY competitor_rank ASC
-            LIMIT %s
-        """, (market, limit))
-        
-        competitors = []
-        for row in cur.fetchall():
-            competitors.append({
-                "place_id": row[0],
-                "business_name": row[1],
-                "category": row[2],
-                "rating": float(row[3]) if row[3] else 0,
-                "reviews": row[4],
-                "photos": row[5],
-                "posts": row[6],
-                "rank": row[7],
-                "health_score": row[8],
-                "threat_level": row[9],
-                "has_website": row[10],
-                "location": f"{row[11]}, {row[12]} {row[13]}" if row[11] else None
-            })
-        
-        cur.close()
+        with self.db.cursor() as cur:
+            self.db.execute_prepared(cur, "market_top_competitors", (market, limit))
+
+            competitors = []
+            for row in cur.fetchall():
+                competitors.append({
+                    "place_id": row[0],
+                    "business_name": row[1],
+                    "category": row[2],
+                    "rating": float(row[3]) if row[3] else 0,
+                    "reviews": row[4],
+                    "photos": row[5],
+                    "posts": row[6],
+                    "rank": row[7],
+                    "health_score": row[8],
+                    "threat_level": row[9],
+                    "has_website": row[10],
+                    "location": f"{row[11]}, {row[12]} {row[13]}" if row[11] else None
+                })
         return competitors
     
     def get_weak_competitors(self, market: str, max_score: int = 60) -> List[Dict]:
@@ -235,40 +194,37 @@ class RevSpyGBPQueries:
         Returns:
             List of weak competitors
         """
-        cur = self.conn.cursor()
-        
-        cur.execute("""
-            SELECT 
-                business_name,
-                rating,
-                review_count,
-                photo_count,
-                competitor_rank,
-                gbp_health_score,
-                competitive_threat,
-                local_pack_position
-            FROM revspy_gbp_profiles
-            WHERE market = %s 
-                AND gbp_health_score IS NOT NULL
-                AND gbp_health_score <= %s
-            ORDER BY competitor_rank ASC
-        """, (market, max_score))
-        
-        competitors = []
-        for row in cur.fetchall():
-            competitors.append({
-                "business_name": row[0],
-                "rating": float(row[1]) if row[1] else 0,
-                "reviews": row[2],
-                "photos": row[3],
-                "rank": row[4],
-                "health_score": row[5],
-                "threat_level": row[6],
-                "in_local_pack": row[7],
-                "vulnerability": "HIGH" if row[7] and row[5] < 50 else "MEDIUM"
-            })
-        
-        cur.close()
+        with self.db.cursor() as cur:
+            cur.execute("""
+                SELECT 
+                    business_name,
+                    rating,
+                    review_count,
+                    photo_count,
+                    competitor_rank,
+                    gbp_health_score,
+                    competitive_threat,
+                    local_pack_position
+                FROM revspy_gbp_profiles
+                WHERE market = %s 
+                    AND gbp_health_score IS NOT NULL
+                    AND gbp_health_score <= %s
+                ORDER BY competitor_rank ASC
+            """, (market, max_score))
+
+            competitors = []
+            for row in cur.fetchall():
+                competitors.append({
+                    "business_name": row[0],
+                    "rating": float(row[1]) if row[1] else 0,
+                    "reviews": row[2],
+                    "photos": row[3],
+                    "rank": row[4],
+                    "health_score": row[5],
+                    "threat_level": row[6],
+                    "in_local_pack": row[7],
+                    "vulnerability": "HIGH" if row[7] and row[5] < 50 else "MEDIUM"
+                })
         return competitors
     
     def benchmark_against_market(self, place_id: str, market: str) -> Dict:
@@ -282,44 +238,40 @@ class RevSpyGBPQueries:
         Returns:
             Dict with business stats vs market averages
         """
-        cur = self.conn.cursor()
-        
-        # Get business data
-        cur.execute("""
-            SELECT 
-                business_name,
-                rating,
-                review_count,
-                photo_count,
-                post_count,
-                competitor_rank,
-                gbp_health_score
-            FROM revspy_gbp_profiles
-            WHERE place_id = %s
-        """, (place_id,))
-        
-        business = cur.fetchone()
-        
-        if not business:
-            cur.close()
-            return {"error": "Business not found"}
-        
-        # Get market averages
-        cur.execute("""
-            SELECT 
-                AVG(rating) as avg_rating,
-                AVG(review_count) as avg_reviews,
-                AVG(photo_count) as avg_photos,
-                AVG(post_count) as avg_posts,
-                AVG(gbp_health_score) as avg_score,
-                COUNT(*) as total_competitors
-            FROM revspy_gbp_profiles
-            WHERE market = %s
-        """, (market,))
-        
-        market_avg = cur.fetchone()
-        
-        cur.close()
+        with self.db.cursor() as cur:
+            # Get business data
+            cur.execute("""
+                SELECT 
+                    business_name,
+                    rating,
+                    review_count,
+                    photo_count,
+                    post_count,
+                    competitor_rank,
+                    gbp_health_score
+                FROM revspy_gbp_profiles
+                WHERE place_id = %s
+            """, (place_id,))
+
+            business = cur.fetchone()
+
+            if not business:
+                return {"error": "Business not found"}
+
+            # Get market averages
+            cur.execute("""
+                SELECT 
+                    AVG(rating) as avg_rating,
+                    AVG(review_count) as avg_reviews,
+                    AVG(photo_count) as avg_photos,
+                    AVG(post_count) as avg_posts,
+                    AVG(gbp_health_score) as avg_score,
+                    COUNT(*) as total_competitors
+                FROM revspy_gbp_profiles
+                WHERE market = %s
+            """, (market,))
+
+            market_avg = cur.fetchone()
         
         return {
             "business": {
@@ -363,48 +315,51 @@ class RevSpyGBPQueries:
         Returns:
             List of geographic opportunities
         """
-        cur = self.conn.cursor()
-        
-        query = """
-            SELECT 
-                zip_code,
-                city,
-                state,
-                market,
-                primary_category,
-                competitor_count,
-                opportunity_score,
-                gap_severity,
-                deployment_priority
-            FROM revspy_geographic_density
-            WHERE is_geographic_gap = TRUE
-                AND opportunity_score >= %s
-        """
-        params = [min_opportunity]
-        
-        if market:
-            query += " AND market = %s"
-            params.append(market)
-        
-        query += " ORDER BY opportunity_score DESC LIMIT 50"
-        
-        cur.execute(query, params)
-        
-        gaps = []
-        for row in cur.fetchall():
-            gaps.append({
-                "zip_code": row[0],
-                "city": row[1],
-                "state": row[2],
-                "market": row[3],
-                "category": row[4],
-                "competitor_count": row[5],
-                "opportunity_score": row[6],
-                "gap_severity": row[7],
-                "priority": row[8]
-            })
-        
-        cur.close()
+        return self.db.cached(
+            f"geographic_gaps:{market}:{min_opportunity}",
+            lambda: self._load_geographic_gaps(market, min_opportunity)
+        )
+    
+    def _load_geographic_gaps(self, market: str = None, min_opportunity: int = 70) -> List[Dict]:
+        with self.db.cursor() as cur:
+            query = """
+                SELECT 
+                    zip_code,
+                    city,
+                    state,
+                    market,
+                    primary_category,
+                    competitor_count,
+                    opportunity_score,
+                    gap_severity,
+                    deployment_priority
+                FROM revspy_geographic_density
+                WHERE is_geographic_gap = TRUE
+                    AND opportunity_score >= %s
+            """
+            params = [min_opportunity]
+
+            if market:
+                query += " AND market = %s"
+                params.append(market)
+
+            query += " ORDER BY opportunity_score DESC LIMIT 50"
+
+            cur.execute(query, params)
+
+            gaps = []
+            for row in cur.fetchall():
+                gaps.append({
+                    "zip_code": row[0],
+                    "city": row[1],
+                    "state": row[2],
+                    "market": row[3],
+                    "category": row[4],
+                    "competitor_count": row[5],
+                    "opportunity_score": row[6],
+                    "gap_severity": row[7],
+                    "priority": row[8]
+                })
         return gaps
     
     def get_category_opportunities(self, market: str = None) -> List[Dict]:
@@ -417,45 +372,48 @@ class RevSpyGBPQueries:
         Returns:
             List of category opportunities
         """
-        cur = self.conn.cursor()
-        
-        query = """
-            SELECT 
-                category,
-                market,
-                total_competitors,
-                saturation_level,
-                opportunity_score,
-                recommended_action,
-                avg_rating,
-                avg_review_count
-            FROM revspy_category_intelligence
-            WHERE opportunity_level IN ('HIGH', 'CRITICAL')
-        """
-        params = []
-        
-        if market:
-            query += " AND market = %s"
-            params.append(market)
-        
-        query += " ORDER BY opportunity_score DESC"
-        
-        cur.execute(query, params)
-        
-        opportunities = []
-        for row in cur.fetchall():
-            opportunities.append({
-                "category": row[0],
-                "market": row[1],
-                "competitors": row[2],
-                "saturation": row[3],
-                "opportunity_score": row[4],
-                "recommendation": row[5],
-                "avg_rating": float(row[6]) if row[6] else 0,
-                "avg_reviews": int(row[7]) if row[7] else 0
-            })
-        
-        cur.close()
+        return self.db.cached(
+            f"category_opportunities:{market}",
+            lambda: self._load_category_opportunities(market)
+        )
+    
+    def _load_category_opportunities(self, market: str = None) -> List[Dict]:
+        with self.db.cursor() as cur:
+            query = """
+                SELECT 
+                    category,
+                    market,
+                    total_competitors,
+                    saturation_level,
+                    opportunity_score,
+                    recommended_action,
+                    avg_rating,
+                    avg_review_count
+                FROM revspy_category_intelligence
+                WHERE opportunity_level IN ('HIGH', 'CRITICAL')
+            """
+            params = []
+
+            if market:
+                query += " AND market = %s"
+                params.append(market)
+
+            query += " ORDER BY opportunity_score DESC"
+
+            cur.execute(query, params)
+
+            opportunities = []
+            for row in cur.fetchall():
+                opportunities.append({
+                    "category": row[0],
+                    "market": row[1],
+                    "competitors": row[2],
+                    "saturation": row[3],
+                    "opportunity_score": row[4],
+                    "recommendation": row[5],
+                    "avg_rating": float(row[6]) if row[6] else 0,
+                    "avg_reviews": int(row[7]) if row[7] else 0
+                })
         return opportunities
     
     def get_best_opportunities(self, limit: int = 10) -> List[Dict]:
@@ -469,65 +427,62 @@ class RevSpyGBPQueries:
         Returns:
             Ranked list of best opportunities
         """
-        cur = self.conn.cursor()
-        
-        cur.execute("""
-            WITH combined_opportunities AS (
-                -- Geographic opportunities
-                SELECT 
-                    market,
-                    primary_category as category,
-                    zip_code as location,
-                    'GEOGRAPHIC' as type,
-                    opportunity_score,
-                    competitor_count,
-                    deployment_priority as priority
-                FROM revspy_geographic_density
-                WHERE is_geographic_gap = TRUE
-                
-                UNION ALL
-                
-                -- Category opportunities
+        with self.db.cursor() as cur:
+            cur.execute("""
+                WITH combined_opportunities AS (
+                    -- Geographic opportunities
+                    SELECT 
+                        market,
+                        primary_category as category,
+                        zip_code as location,
+                        'GEOGRAPHIC' as type,
+                        opportunity_score,
+                        competitor_count,
+                        deployment_priority as priority
+                    FROM revspy_geographic_density
+                    WHERE is_geographic_gap = TRUE
+
+                    UNION ALL
+
+                    -- Category opportunities
+                    SELECT 
+                        market,
+                        category,
+                        'Multiple zips' as location,
+                        'CATEGORY' as type,
+                        opportunity_score,
+                        total_competitors as competitor_count,
+                        CASE 
+                            WHEN recommended_action = 'ENTER' THEN 'URGENT'
+                            ELSE 'HIGH'
+                        END as priority
+                    FROM revspy_category_intelligence
+                    WHERE opportunity_level IN ('HIGH', 'CRITICAL')
+                )
                 SELECT 
                     market,
                     category,
-                    'Multiple zips' as location,
-                    'CATEGORY' as type,
+                    location,
+                    type,
                     opportunity_score,
-                    total_competitors as competitor_count,
-                    CASE 
-                        WHEN recommended_action = 'ENTER' THEN 'URGENT'
-                        ELSE 'HIGH'
-                    END as priority
-                FROM revspy_category_intelligence
-                WHERE opportunity_level IN ('HIGH', 'CRITICAL')
-            )
-            SELECT 
-                market,
-                category,
-                location,
-                type,
-                opportunity_score,
-                competitor_count,
-                priority
-            FROM combined_opportunities
-            ORDER BY opportunity_score DESC, competitor_count ASC
-            LIMIT %s
-        """, (limit,))
-        
-        opportunities = []
-        for row in cur.fetchall():
-            opportunities.append({
-                "market": row[0],
-                "category": row[1],
-                "location": row[2],
-                "type": row[3],
-                "opportunity_score": row[4],
-                "competitor_count": row[5],
-                "priority": row[6]
-            })
-        
-        cur.close()
+                    competitor_count,
+                    priority
+                FROM combined_opportunities
+                ORDER BY opportunity_score DESC, competitor_count ASC
+                LIMIT %s
+            """, (limit,))
+
+            opportunities = []
+            for row in cur.fetchall():
+                opportunities.append({
+                    "market": row[0],
+                    "category": row[1],
+                    "location": row[2],
+                    "type": row[3],
+                    "opportunity_score": row[4],
+                    "competitor_count": row[5],
+                    "priority": row[6]
+                })
         return opportunities
     
     # ========================================================================
@@ -545,48 +500,45 @@ class RevSpyGBPQueries:
         Returns:
             Dict with trend analysis
         """
-        cur = self.conn.cursor()
-        
-        since_date = datetime.now() - timedelta(days=days)
-        
-        cur.execute("""
-            SELECT 
-                snapshot_date,
-                competitor_rank,
-                gbp_health_score,
-                rating,
-                review_count
-            FROM revspy_competitive_benchmarks
-            WHERE place_id = %s
-                AND snapshot_date >= %s
-            ORDER BY snapshot_date ASC
-        """, (place_id, since_date))
-        
-        snapshots = []
-        for row in cur.fetchall():
-            snapshots.append({
-                "date": row[0].isoformat(),
-                "rank": row[1],
-                "score": row[2],
-                "rating": float(row[3]) if row[3] else 0,
-                "reviews": row[4]
-            })
-        
-        # Calculate trends
-        if len(snapshots) >= 2:
-            first = snapshots[0]
-            last = snapshots[-1]
-            
-            trends = {
-                "rank_change": first["rank"] - last["rank"] if first["rank"] and last["rank"] else 0,
-                "score_change": last["score"] - first["score"] if last["score"] and first["score"] else 0,
-                "review_growth": last["reviews"] - first["reviews"],
-                "trend_direction": "IMPROVING" if (last["score"] or 0) > (first["score"] or 0) else "DECLINING"
-            }
-        else:
-            trends = None
-        
-        cur.close()
+        with self.db.cursor() as cur:
+            since_date = datetime.now() - timedelta(days=days)
+
+            cur.execute("""
+                SELECT 
+                    snapshot_date,
+                    competitor_rank,
+                    gbp_health_score,
+                    rating,
+                    review_count
+                FROM revspy_competitive_benchmarks
+                WHERE place_id = %s
+                    AND snapshot_date >= %s
+                ORDER BY snapshot_date ASC
+            """, (place_id, since_date))
+
+            snapshots = []
+            for row in cur.fetchall():
+                snapshots.append({
+                    "date": row[0].isoformat(),
+                    "rank": row[1],
+                    "score": row[2],
+                    "rating": float(row[3]) if row[3] else 0,
+                    "reviews": row[4]
+                })
+
+            # Calculate trends
+            if len(snapshots) >= 2:
+                first = snapshots[0]
+                last = snapshots[-1]
+
+                trends = {
+                    "rank_change": first["rank"] - last["rank"] if first["rank"] and last["rank"] else 0,
+                    "score_change": last["score"] - first["score"] if last["score"] and first["score"] else 0,
+                    "review_growth": last["reviews"] - first["reviews"],
+                    "trend_direction": "IMPROVING" if (last["score"] or 0) > (first["score"] or 0) else "DECLINING"
+                }
+            else:
+                trends = None
         
         return {
             "place_id": place_id,
@@ -601,31 +553,10 @@ class RevSpyGBPQueries:
     
     def get_profile_by_place_id(self, place_id: str) -> Optional[Dict]:
         """Get complete profile data for a place ID"""
-        cur = self.conn.cursor()
-        
-        cur.execute("""
-            SELECT 
-                place_id,
-                business_name,
-                primary_category,
-                secondary_categories,
-                rating,
-                review_count,
-                photo_count,
-                post_count,
-                competitor_rank,
-                gbp_health_score,
-                competitive_threat,
-                market,
-                city,
-                state,
-                zip_code
-            FROM revspy_gbp_profiles
-            WHERE place_id = %s
-        """, (place_id,))
-        
-        row = cur.fetchone()
-        cur.close()
+        with self.db.cursor() as cur:
+            self.db.execute_prepared(cur, "profile_by_place_id", (place_id,))
+
+            row = cur.fetchone()
         
         if not row:
             return None
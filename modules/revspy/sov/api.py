@@ -99,10 +99,14 @@ async def get_citation_gaps(
 @app.get("/api/v1/sov/{site_id}/history")
 async def get_sov_history_endpoint(
     site_id: int,
-    days: int = Query(30, ge=1, le=365)
+    days: int = Query(30, ge=1, le=365),
+    competitor_domains: str = Query("", description="Comma-separated competitor domains (default: the tracked ones)")
 ):
     """Get SOV history for a site"""
-    history = get_sov_history(site_id, days)
+    history = get_sov_history(
+        site_id, days,
+        competitor_domains=competitor_domains.split(',') if competitor_domains else None
+    )
     
     return {
         "site_id": site_id,
@@ -0,0 +1,137 @@
+-- ============================================================================
+-- REVINSIGHT SHARE OF VOICE - DAILY ROLLUPS
+-- Version: 1.0
+-- Purpose: Per-day (site, platform) and (site, platform, competitor) counters,
+--          maintained by a trigger on ai_citation_results, so SOV and history
+--          reads scale with the number of days instead of citation rows
+-- Used by: sov/sov_calculator.py
+-- ============================================================================
+
+-- ============================================================================
+-- PART 1: SARGABLE RANGE SCANS ON RAW RESULTS
+-- ============================================================================
+
+-- scraped_at >= start AND scraped_at < end + 1 day (not DATE(scraped_at) BETWEEN)
+CREATE INDEX IF NOT EXISTS idx_ai_citation_results_query_scraped
+    ON ai_citation_results (query_id, scraped_at);
+
+CREATE INDEX IF NOT EXISTS idx_ai_citation_queries_site
+    ON ai_citation_queries (site_id, id);
+
+-- ============================================================================
+-- PART 2: ROLLUP TABLES
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS ai_sov_daily_platform (
+    site_id INTEGER NOT NULL,
+    day DATE NOT NULL,
+    ai_platform VARCHAR(50) NOT NULL,
+    total_results INTEGER NOT NULL DEFAULT 0,
+    client_mentions INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (site_id, day, ai_platform)
+);
+
+-- competitor_domain is stored lowercased
+CREATE TABLE IF NOT EXISTS ai_sov_daily_competitor (
+    site_id INTEGER NOT NULL,
+    day DATE NOT NULL,
+    ai_platform VARCHAR(50) NOT NULL,
+    competitor_domain VARCHAR(255) NOT NULL,
+    mentions INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (site_id, day, ai_platform, competitor_domain)
+);
+
+CREATE INDEX IF NOT EXISTS idx_ai_sov_daily_competitor_domain
+    ON ai_sov_daily_competitor (site_id, competitor_domain, day);
+
+-- ============================================================================
+-- PART 3: INCREMENTAL MAINTENANCE
+-- ============================================================================
+
+-- Add (delta = 1) or remove (delta = -1) one result row from the rollups
+CREATE OR REPLACE FUNCTION ai_sov_apply_result(
+    p_query_id INTEGER,
+    p_platform VARCHAR,
+    p_scraped_at TIMESTAMP,
+    p_client_mentioned BOOLEAN,
+    p_competitors JSONB,
+    p_delta INTEGER
+) RETURNS void AS $$
+DECLARE
+    v_site_id INTEGER;
+    v_day DATE := p_scraped_at::date;
+BEGIN
+    SELECT site_id INTO v_site_id FROM ai_citation_queries WHERE id = p_query_id;
+    IF v_site_id IS NULL OR p_scraped_at IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO ai_sov_daily_platform AS d (site_id, day, ai_platform, total_results, client_mentions)
+    VALUES (v_site_id, v_day, p_platform, p_delta,
+            CASE WHEN p_client_mentioned THEN p_delta ELSE 0 END)
+    ON CONFLICT (site_id, day, ai_platform) DO UPDATE SET
+        total_results = d.total_results + EXCLUDED.total_results,
+        client_mentions = d.client_mentions + EXCLUDED.client_mentions;
+
+    IF p_competitors IS NOT NULL AND jsonb_typeof(p_competitors) = 'array' THEN
+        INSERT INTO ai_sov_daily_competitor AS d (site_id, day, ai_platform, competitor_domain, mentions)
+        SELECT v_site_id, v_day, p_platform, lower(domain), COUNT(*)::int * p_delta
+        FROM jsonb_array_elements_text(p_competitors) AS domain
+        GROUP BY lower(domain)
+        ON CONFLICT (site_id, day, ai_platform, competitor_domain) DO UPDATE SET
+            mentions = d.mentions + EXCLUDED.mentions;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION ai_citation_results_sov_rollup() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM ai_sov_apply_result(OLD.query_id, OLD.ai_platform, OLD.scraped_at,
+                                    OLD.client_mentioned, OLD.competitor_domains, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM ai_sov_apply_result(NEW.query_id, NEW.ai_platform, NEW.scraped_at,
+                                    NEW.client_mentioned, NEW.competitor_domains, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_ai_citation_results_sov_rollup ON ai_citation_results;
+CREATE TRIGGER trg_ai_citation_results_sov_rollup
+    AFTER INSERT OR DELETE OR UPDATE OF query_id, ai_platform, scraped_at, client_mentioned, competitor_domains
+    ON ai_citation_results
+    FOR EACH ROW EXECUTE FUNCTION ai_citation_results_sov_rollup();
+
+-- ============================================================================
+-- PART 4: BACKFILL (rollups rebuilt from scratch; safe to re-run)
+-- ============================================================================
+
+BEGIN;
+LOCK TABLE ai_citation_results IN SHARE MODE;
+
+TRUNCATE ai_sov_daily_platform, ai_sov_daily_competitor;
+
+INSERT INTO ai_sov_daily_platform (site_id, day, ai_platform, total_results, client_mentions)
+SELECT q.site_id, r.scraped_at::date, r.ai_platform,
+       COUNT(*), COUNT(*) FILTER (WHERE r.client_mentioned)
+FROM ai_citation_results r
+JOIN ai_citation_queries q ON r.query_id = q.id
+WHERE r.scraped_at IS NOT NULL
+GROUP BY q.site_id, r.scraped_at::date, r.ai_platform;
+
+INSERT INTO ai_sov_daily_competitor (site_id, day, ai_platform, competitor_domain, mentions)
+SELECT q.site_id, r.scraped_at::date, r.ai_platform, lower(c.domain), COUNT(*)
+FROM ai_citation_results r
+JOIN ai_citation_queries q ON r.query_id = q.id
+CROSS JOIN LATERAL jsonb_array_elements_text(
+    CASE WHEN jsonb_typeof(r.competitor_domains) = 'array' THEN r.competitor_domains ELSE '[]'::jsonb END
+) AS c(domain)
+WHERE r.scraped_at IS NOT NULL
+GROUP BY q.site_id, r.scraped_at::date, r.ai_platform, lower(c.domain);
+
+COMMIT;
+
+ANALYZE ai_sov_daily_platform;
+ANALYZE ai_sov_daily_competitor;
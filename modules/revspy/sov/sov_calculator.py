@@ -4,30 +4,26 @@ RevInsight™ Share of Voice Calculator
 Competitive intelligence for AI citations
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime, date, timedelta
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import errors
+from psycopg2.extras import RealDictCursor, execute_values
 import os
+import sys
 import logging
 
 from dotenv import load_dotenv
 load_dotenv('/opt/shared-api-engine/.env')
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from revspy_db import get_database
+
 logger = logging.getLogger(__name__)
 
 def get_db_connection():
-    """Get database connection, preferring DATABASE_URL"""
-    database_url = os.getenv("DATABASE_URL")
-    if database_url:
-        return psycopg2.connect(database_url)
-    return psycopg2.connect(
-        host=os.getenv('POSTGRES_HOST', 'localhost'),
-        port=int(os.getenv('POSTGRES_PORT', 5432)),
-        database=os.getenv('POSTGRES_DB', 'revflow'),
-        user=os.getenv('POSTGRES_USER', 'revflow'),
-        password=os.getenv('POSTGRES_PASSWORD', '')
-    )
+    """Borrow a connection from the shared RevSPY pool (close() returns it)"""
+    return get_database().acquire()
 
 
 class ShareOfVoiceCalculator:
@@ -40,28 +36,74 @@ class ShareOfVoiceCalculator:
         self.competitor_domains = [d.lower() for d in competitor_domains]
         
     def calculate_from_results(self, start_date: date, end_date: date) -> Dict:
-        """Calculate SOV from stored citation results"""
+        """
+        Calculate SOV from the daily rollups (migrations/sov_daily_rollups.sql)
+
+        Reads one row per (day, platform) and per (day, platform, tracked
+        competitor), so cost follows the date range, not the citation count.
+        Falls back to aggregating ai_citation_results if the rollups are missing.
+        """
         conn = get_db_connection()
         
         try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT 
-                        r.ai_platform,
-                        r.citations,
-                        r.client_mentioned,
-                        r.competitor_domains
-                    FROM ai_citation_results r
-                    JOIN ai_citation_queries q ON r.query_id = q.id
-                    WHERE q.site_id = %s
-                      AND DATE(r.scraped_at) BETWEEN %s AND %s
-                """, (self.site_id, start_date, end_date))
-                
-                results = cur.fetchall()
-                
+            with conn.cursor() as cur:
+                try:
+                    cur.execute("""
+                        SELECT ai_platform, SUM(total_results), SUM(client_mentions)
+                        FROM ai_sov_daily_platform
+                        WHERE site_id = %s AND day BETWEEN %s AND %s
+                        GROUP BY ai_platform
+                    """, (self.site_id, start_date, end_date))
+                    platform_rows = cur.fetchall()
+                    
+                    cur.execute("""
+                        SELECT competitor_domain, SUM(mentions)
+                        FROM ai_sov_daily_competitor
+                        WHERE site_id = %s AND day BETWEEN %s AND %s
+                          AND competitor_domain = ANY(%s)
+                        GROUP BY competitor_domain
+                    """, (self.site_id, start_date, end_date, self.competitor_domains))
+                    competitor_rows = cur.fetchall()
+                except errors.UndefinedTable:
+                    conn.rollback()
+                    logger.warning("SOV rollups missing, aggregating ai_citation_results")
+                    platform_rows, competitor_rows = self._aggregate_results(cur, start_date, end_date)
         finally:
             conn.close()
         
+        return self._build_sov(platform_rows, competitor_rows)
+    
+    def _aggregate_results(self, cur, start_date: date, end_date: date):
+        """Same counters as the rollups, straight from ai_citation_results"""
+        # Half-open range on the raw column so idx_ai_citation_results_query_scraped applies
+        range_params = (self.site_id, start_date, end_date + timedelta(days=1))
+        cur.execute("""
+            SELECT r.ai_platform, COUNT(*), COUNT(*) FILTER (WHERE r.client_mentioned)
+            FROM ai_citation_results r
+            JOIN ai_citation_queries q ON r.query_id = q.id
+            WHERE q.site_id = %s
+              AND r.scraped_at >= %s AND r.scraped_at < %s
+            GROUP BY r.ai_platform
+        """, range_params)
+        platform_rows = cur.fetchall()
+        
+        cur.execute("""
+            SELECT lower(c.domain), COUNT(*)
+            FROM ai_citation_results r
+            JOIN ai_citation_queries q ON r.query_id = q.id
+            CROSS JOIN LATERAL jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(r.competitor_domains) = 'array'
+                     THEN r.competitor_domains ELSE '[]'::jsonb END
+            ) AS c(domain)
+            WHERE q.site_id = %s
+              AND r.scraped_at >= %s AND r.scraped_at < %s
+              AND lower(c.domain) = ANY(%s)
+            GROUP BY lower(c.domain)
+        """, range_params + (self.competitor_domains,))
+        return platform_rows, cur.fetchall()
+    
+    def _build_sov(self, platform_rows, competitor_rows) -> Dict:
+        """SOV percentages from (platform, total, client_mentions) and (domain, mentions) counts"""
         sov_data = {
             'by_platform': {},
             'by_competitor': {},
@@ -72,38 +114,20 @@ class ShareOfVoiceCalculator:
             }
         }
         
-        platform_stats = {}
         competitor_stats = {d: 0 for d in self.competitor_domains}
-        
-        for row in results:
-            platform = row['ai_platform']
-            
-            if platform not in platform_stats:
-                platform_stats[platform] = {
-                    'client_mentions': 0,
-                    'total': 0
-                }
-            
-            platform_stats[platform]['total'] += 1
-            sov_data['overall']['total_opportunities'] += 1
-            
-            if row['client_mentioned']:
-                platform_stats[platform]['client_mentions'] += 1
-                sov_data['overall']['client_mentions'] += 1
-            
-            for comp_domain in row.get('competitor_domains', []) or []:
-                comp_lower = comp_domain.lower()
-                if comp_lower in competitor_stats:
-                    competitor_stats[comp_lower] += 1
+        for comp_domain, mentions in competitor_rows:
+            competitor_stats[comp_domain] = int(mentions)
         
         # Calculate percentages
-        for platform, stats in platform_stats.items():
-            total = stats['total']
+        for platform, total, client_mentions in platform_rows:
+            total, client_mentions = int(total), int(client_mentions)
+            sov_data['overall']['total_opportunities'] += total
+            sov_data['overall']['client_mentions'] += client_mentions
             if total > 0:
                 sov_data['by_platform'][platform] = {
-                    'client_sov': round(stats['client_mentions'] / total * 100, 1),
+                    'client_sov': round(client_mentions / total * 100, 1),
                     'total_queries': total,
-                    'client_mentions': stats['client_mentions']
+                    'client_mentions': client_mentions
                 }
         
         total_opps = sov_data['overall']['total_opportunities']
@@ -162,51 +186,95 @@ class ShareOfVoiceCalculator:
             
         return gaps
     
+    def snapshot_rows(self, sov_data: Dict) -> List[Dict]:
+        """
+        One ai_share_of_voice row per (competitor, platform): the platform's
+        client SOV next to the competitor's SOV and gap over all platforms
+        """
+        return [
+            {
+                'competitor_domain': comp_domain,
+                'ai_platform': platform,
+                'client_mentions': sov_data['overall']['client_mentions'],
+                'competitor_mentions': data['mentions'],
+                'total_queries': platform_data['total_queries'],
+                'client_sov_percent': platform_data['client_sov'],
+                'competitor_sov_percent': data['sov'],
+                'gap_percent': data['gap']
+            }
+            for comp_domain, data in sov_data.get('by_competitor', {}).items()
+            for platform, platform_data in sov_data.get('by_platform', {}).items()
+        ]
+    
     def save_daily_sov(self, sov_data: Dict, measurement_date: date):
-        """Save SOV data to database"""
+        """Save SOV data to database (one statement for the competitor x platform grid)"""
+        rows = [
+            (
+                self.site_id,
+                row['competitor_domain'],
+                measurement_date,
+                row['ai_platform'],
+                row['client_mentions'],
+                row['competitor_mentions'],
+                row['total_queries'],
+                row['client_sov_percent'],
+                row['competitor_sov_percent'],
+                row['gap_percent']
+            )
+            for row in self.snapshot_rows(sov_data)
+        ]
+        if not rows:
+            return
+        
         conn = get_db_connection()
         
         try:
             with conn.cursor() as cur:
-                for comp_domain, data in sov_data.get('by_competitor', {}).items():
-                    for platform, platform_data in sov_data.get('by_platform', {}).items():
-                        cur.execute("""
-                            INSERT INTO ai_share_of_voice 
-                            (site_id, competitor_domain, measurement_date, ai_platform,
-                             client_mentions, competitor_mentions, total_queries,
-                             client_sov_percent, competitor_sov_percent, gap_percent)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                            ON CONFLICT (site_id, competitor_domain, measurement_date, ai_platform)
-                            DO UPDATE SET
-                                client_mentions = EXCLUDED.client_mentions,
-                                competitor_mentions = EXCLUDED.competitor_mentions,
-                                total_queries = EXCLUDED.total_queries,
-                                client_sov_percent = EXCLUDED.client_sov_percent,
-                                competitor_sov_percent = EXCLUDED.competitor_sov_percent,
-                                gap_percent = EXCLUDED.gap_percent
-                        """, (
-                            self.site_id,
-                            comp_domain,
-                            measurement_date,
-                            platform,
-                            sov_data['overall']['client_mentions'],
-                            data['mentions'],
-                            platform_data['total_queries'],
-                            platform_data['client_sov'],
-                            data['sov'],
-                            data['gap']
-                        ))
+                execute_values(cur, """
+                    INSERT INTO ai_share_of_voice 
+                    (site_id, competitor_domain, measurement_date, ai_platform,
+                     client_mentions, competitor_mentions, total_queries,
+                     client_sov_percent, competitor_sov_percent, gap_percent)
+                    VALUES %s
+                    ON CONFLICT (site_id, competitor_domain, measurement_date, ai_platform)
+                    DO UPDATE SET
+                        client_mentions = EXCLUDED.client_mentions,
+                        competitor_mentions = EXCLUDED.competitor_mentions,
+                        total_queries = EXCLUDED.total_queries,
+                        client_sov_percent = EXCLUDED.client_sov_percent,
+                        competitor_sov_percent = EXCLUDED.competitor_sov_percent,
+                        gap_percent = EXCLUDED.gap_percent
+                """, rows, page_size=1000)
                 
                 conn.commit()
         finally:
             conn.close()
 
 
-def get_sov_history(site_id: int, days: int = 30) -> List[Dict]:
-    """Get SOV history for a site"""
+HISTORY_COLUMNS = ('client_sov_percent', 'competitor_sov_percent', 'gap_percent')
+
+
+def get_sov_history(site_id: int, days: int = 30,
+                    competitor_domains: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Get SOV history for a site, one row per (day, competitor, platform)
+
+    Rows mean what a daily save_daily_sov snapshot means: the platform's
+    client SOV, and the competitor's SOV and gap over all platforms that day.
+    They are rebuilt from the daily rollups (days without a competitor
+    mention count as 0%); without the rollup tables this reads the saved
+    ai_share_of_voice snapshots. Competitors default to the ones the site's
+    snapshots track.
+    """
     conn = get_db_connection()
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            domains = [d.lower() for d in competitor_domains] if competitor_domains else None
+            try:
+                return _history_from_rollups(cur, site_id, days, domains)
+            except errors.UndefinedTable:
+                conn.rollback()
+            
             cur.execute("""
                 SELECT 
                     measurement_date,
@@ -217,9 +285,57 @@ def get_sov_history(site_id: int, days: int = 30) -> List[Dict]:
                     gap_percent
                 FROM ai_share_of_voice
                 WHERE site_id = %s
-                  AND measurement_date >= CURRENT_DATE - INTERVAL '%s days'
-                ORDER BY measurement_date DESC, competitor_domain
-            """, (site_id, days))
+                  AND measurement_date >= CURRENT_DATE - %s
+                  AND (%s::text[] IS NULL OR competitor_domain = ANY(%s::text[]))
+                ORDER BY measurement_date DESC, competitor_domain, ai_platform
+            """, (site_id, days, domains, domains))
             return cur.fetchall()
     finally:
         conn.close()
+
+
+def _history_from_rollups(cur, site_id: int, days: int, domains: Optional[List[str]]) -> List[Dict]:
+    if domains is None:
+        cur.execute(
+            "SELECT DISTINCT competitor_domain FROM ai_share_of_voice WHERE site_id = %s",
+            (site_id,)
+        )
+        domains = sorted(row['competitor_domain'] for row in cur.fetchall())
+    
+    cur.execute("""
+        SELECT day, ai_platform, total_results, client_mentions
+        FROM ai_sov_daily_platform
+        WHERE site_id = %s AND day >= CURRENT_DATE - %s
+    """, (site_id, days))
+    platform_rows: Dict[date, List] = {}
+    for row in cur.fetchall():
+        platform_rows.setdefault(row['day'], []).append(
+            (row['ai_platform'], row['total_results'], row['client_mentions'])
+        )
+    if not domains or not platform_rows:
+        return []
+    
+    cur.execute("""
+        SELECT day, competitor_domain, SUM(mentions) AS mentions
+        FROM ai_sov_daily_competitor
+        WHERE site_id = %s AND day >= CURRENT_DATE - %s
+          AND competitor_domain = ANY(%s)
+        GROUP BY day, competitor_domain
+    """, (site_id, days, domains))
+    competitor_rows: Dict[date, List] = {}
+    for row in cur.fetchall():
+        competitor_rows.setdefault(row['day'], []).append((row['competitor_domain'], row['mentions']))
+    
+    calculator = ShareOfVoiceCalculator(site_id, [], domains)
+    history = []
+    for day in sorted(platform_rows, reverse=True):
+        sov_data = calculator._build_sov(platform_rows[day], competitor_rows.get(day, []))
+        rows = calculator.snapshot_rows(sov_data)
+        rows.sort(key=lambda row: (row['competitor_domain'], row['ai_platform']))
+        history.extend(
+            dict({'measurement_date': day, 'competitor_domain': row['competitor_domain'],
+                  'ai_platform': row['ai_platform']},
+                 **{column: row[column] for column in HISTORY_COLUMNS})
+            for row in rows
+        )
+    return history
@@ -0,0 +1,46 @@
+"""
+Tests for the deferred, coalesced market analysis queue
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip('psycopg2')
+fastapi = pytest.importorskip('fastapi')
+pytest.importorskip('httpx')
+
+from fastapi.testclient import TestClient
+
+from gbp_intelligence import api as gbp_api
+from gbp_intelligence.api import MarketAnalysisQueue
+
+
+class TestMarketAnalysisQueue:
+    def test_coalesces_and_flushes(self):
+        runs = []
+        queue = MarketAnalysisQueue(delay=60, runner=lambda market, category: runs.append((market, category)))
+        for _ in range(5):
+            queue.schedule('austin', 'Plumber')
+        queue.schedule('dallas', 'Plumber')
+
+        assert queue.pending() == 2
+        queue.flush()
+        assert sorted(runs) == [('austin', 'Plumber'), ('dallas', 'Plumber')]
+        assert queue.stats['coalesced'] == 4
+        assert queue.pending() == 0
+
+    def test_app_shutdown_flushes_pending_analyses(self, monkeypatch):
+        runs = []
+        queue = MarketAnalysisQueue(delay=60, runner=lambda market, category: runs.append((market, category)))
+        monkeypatch.setattr(gbp_api, 'analysis_queue', queue)
+        app = fastapi.FastAPI()
+        app.include_router(gbp_api.router)
+
+        with TestClient(app):
+            queue.schedule('austin', 'Plumber')
+            assert runs == []
+        assert runs == [('austin', 'Plumber')]
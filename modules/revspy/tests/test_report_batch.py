@@ -0,0 +1,276 @@
+"""
+Tests for the batch report pipeline: store keys, skipping unchanged reports,
+batch vs. single report queries and background jobs
+"""
+
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('dotenv')
+pytest.importorskip('reportlab')
+
+from reports import batch
+from reports.batch import BatchReportJobs, BatchReportPipeline, ReportStore
+from reports.generator import ReportGenerator
+
+MARKET = 'austin'
+CATEGORIES = ['Plumber', 'Electrician', 'Roofer']
+
+
+def _profiles():
+    profiles = []
+    for i in range(15):
+        profiles.append({
+            'place_id': f'p{i}', 'market': MARKET if i < 13 else 'dallas',
+            'business_name': f'Business {i}', 'primary_category': CATEGORIES[i % 3],
+            'rating': 3.5 + (i % 4) * 0.4, 'review_count': 10 * i, 'photo_count': i,
+            'post_count': i % 5, 'competitor_rank': i // 3 + 1, 'gbp_health_score': 50 + i * 3,
+            'competitive_threat': 'HIGH' if i % 2 else 'LOW',
+            'city': 'Austin', 'state': 'TX', 'zip_code': '78701'
+        })
+    return profiles
+
+
+def _benchmarks():
+    snapshots = []
+    for i in range(0, 15, 2):
+        for months in range(i % 3 + 1):
+            snapshots.append({
+                'place_id': f'p{i}', 'snapshot_date': date(2026, 9, 1) - timedelta(days=30 * months),
+                'rating': 3.0 + months * 0.1, 'review_count': 5 * i - months,
+                'competitor_rank': i // 3 + 1 + months, 'gbp_health_score': 40 + i + months
+            })
+    return snapshots
+
+
+class _FakeConnection:
+    """Answers the generator's batch queries from in-memory rows"""
+
+    def __init__(self, profiles, benchmarks, log):
+        self.profiles = profiles
+        self.benchmarks = benchmarks
+        self.log = log
+
+    def cursor(self, cursor_factory=None):
+        return _FakeCursor(self)
+
+    def close(self):
+        pass
+
+
+class _FakeCursor:
+    PROSPECT = ('business_name', 'primary_category', 'rating', 'review_count', 'photo_count',
+                'post_count', 'competitor_rank', 'gbp_health_score', 'competitive_threat',
+                'city', 'state', 'zip_code')
+    LEADER = ('business_name', 'rating', 'review_count', 'photo_count', 'post_count',
+              'competitor_rank', 'gbp_health_score')
+    CLIENT = ('business_name', 'rating', 'review_count', 'photo_count',
+              'competitor_rank', 'gbp_health_score', 'competitive_threat')
+    SNAPSHOT = ('rating', 'review_count', 'competitor_rank', 'gbp_health_score')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    @staticmethod
+    def _pick(row, columns, **extra):
+        return {**extra, **{column: row[column] for column in columns}}
+
+    def execute(self, query, params=()):
+        self.conn.log.append(query)
+        profiles = self.conn.profiles
+        if 'FROM revspy_competitive_benchmarks' in query:
+            self.rows = []
+            for place_id in params[0]:
+                snapshots = sorted((s for s in self.conn.benchmarks if s['place_id'] == place_id),
+                                   key=lambda s: s['snapshot_date'], reverse=True)
+                if len(snapshots) >= 2:
+                    self.rows.append(self._pick(snapshots[1], self.SNAPSHOT, place_id=place_id))
+        elif 'competitive_threat' in query and 'primary_category' not in query:
+            self.rows = [self._pick(p, self.CLIENT, place_id=p['place_id'])
+                         for p in profiles if p['place_id'] in params[0]]
+        elif 'WHERE place_id = ANY' in query:
+            self.rows = [self._pick(p, self.PROSPECT, place_id=p['place_id'])
+                         for p in profiles if p['place_id'] in params[0]]
+        elif 'GROUP BY primary_category' in query:
+            market, categories = params
+            self.rows = []
+            for category in categories:
+                group = [p for p in profiles if p['market'] == market and p['primary_category'] == category]
+                if group:
+                    self.rows.append({
+                        'primary_category': category,
+                        'avg_rating': sum(p['rating'] for p in group) / len(group),
+                        'avg_reviews': sum(p['review_count'] for p in group) / len(group),
+                        'avg_photos': sum(p['photo_count'] for p in group) / len(group),
+                        'avg_posts': sum(p['post_count'] for p in group) / len(group),
+                        'total_competitors': len(group)
+                    })
+        elif 'ROW_NUMBER()' in query:
+            market, categories = params
+            self.rows = []
+            for category in sorted(categories):
+                group = sorted((p for p in profiles if p['market'] == market and p['primary_category'] == category),
+                               key=lambda p: p['competitor_rank'])
+                self.rows += [self._pick(p, self.LEADER, place_id=p['place_id'], primary_category=category)
+                              for p in group[:4]]
+        else:
+            raise AssertionError(f"unexpected query: {query}")
+
+    def fetchall(self):
+        return [dict(row) for row in self.rows]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    generator = ReportGenerator()
+    generator.queries = []
+    generator.profiles = _profiles()
+    monkeypatch.setattr(generator, 'get_connection',
+                        lambda: _FakeConnection(generator.profiles, _benchmarks(), generator.queries))
+    return generator
+
+
+def _stable(report):
+    return {key: value for key, value in report.items() if key != 'generated_at'}
+
+
+class TestReportStoreKey:
+    REPORT = {'report_type': 'prospect_analysis', 'generated_at': '2026-10-01T09:00:00',
+              'prospect': {'business_name': 'A', 'rating': 4.5}, 'top_competitors': []}
+
+    def test_ignores_key_order_and_generated_at(self):
+        reordered = {'top_competitors': [], 'prospect': {'rating': 4.5, 'business_name': 'A'},
+                     'generated_at': '2026-10-16T12:00:00', 'report_type': 'prospect_analysis'}
+        assert ReportStore.key(reordered) == ReportStore.key(self.REPORT)
+
+    def test_changes_with_content_and_layout(self, monkeypatch):
+        key = ReportStore.key(self.REPORT)
+        changed = {**self.REPORT, 'prospect': {'business_name': 'A', 'rating': 4.6}}
+        assert ReportStore.key(changed) != key
+
+        monkeypatch.setattr(batch, 'LAYOUT_VERSION', batch.LAYOUT_VERSION + 1)
+        assert ReportStore.key(self.REPORT) != key
+
+
+class TestBatchQueries:
+    PLACE_IDS = [f'p{i}' for i in range(13)] + ['missing']
+
+    def test_prospect_reports_match_single_reports(self, generator):
+        reports = generator.generate_prospect_reports(self.PLACE_IDS, MARKET)
+        assert len(generator.queries) == 3
+        assert set(reports) == set(self.PLACE_IDS) - {'missing'}
+
+        for place_id in self.PLACE_IDS:
+            single = generator.generate_prospect_report(place_id, MARKET)
+            assert _stable(reports.get(place_id, single)) == _stable(single)
+            if place_id in reports:
+                assert ReportStore.key(reports[place_id]) == ReportStore.key(single)
+                assert all(c['business_name'] != single['prospect']['business_name']
+                           for c in single['top_competitors'])
+
+    def test_client_reports_match_single_reports(self, generator):
+        reports = generator.generate_monthly_client_reports(self.PLACE_IDS, MARKET)
+        assert len(generator.queries) == 2
+        assert {report['performance'] == 'NEW CLIENT' for report in reports.values()} == {True, False}
+
+        for place_id in self.PLACE_IDS:
+            single = generator.generate_monthly_client_report(place_id, MARKET)
+            assert _stable(reports.get(place_id, single)) == _stable(single)
+
+
+class TestBatchPipeline:
+    def test_unchanged_reports_are_not_rendered_again(self, generator, tmp_path, monkeypatch):
+        pipeline = BatchReportPipeline(generator, ReportStore(str(tmp_path)), workers=1)
+        rendered = []
+        render = batch._render_to_store
+        monkeypatch.setattr(batch, '_render_to_store', lambda *args: rendered.append(args[1]) or render(*args))
+
+        first = pipeline.run(['p0', 'p1', 'p2', 'missing'], MARKET)
+        assert (first['rendered'], first['not_found']) == (3, 1)
+        assert all(pipeline.store.get(first['results'][p]['key']) for p in ('p0', 'p1', 'p2'))
+
+        second = pipeline.run(['p0', 'p1', 'p2'], MARKET)
+        assert second['unchanged'] == 3
+        assert len(rendered) == 3
+
+        generator.profiles[1]['rating'] = 2.0
+        third = pipeline.run(['p0', 'p1', 'p2'], MARKET)
+        assert third['results']['p1']['status'] == 'rendered'
+        assert (third['unchanged'], len(rendered)) == (2, 4)
+
+    def test_render_pool_is_kept_across_runs(self, generator, tmp_path):
+        pipeline = BatchReportPipeline(generator, ReportStore(str(tmp_path)), workers=2)
+        try:
+            first = pipeline.run(['p0', 'p1', 'p2'], MARKET)
+            executor = pipeline._executor
+            generator.profiles[0]['rating'] = 2.0
+            second = pipeline.run(['p0', 'p1', 'p2'], MARKET)
+
+            assert first['rendered'] == 3
+            assert (second['rendered'], second['unchanged']) == (1, 2)
+            assert executor is not None and pipeline._executor is executor
+        finally:
+            pipeline.close()
+        assert pipeline._executor is None
+
+
+class _FakePipeline:
+    def __init__(self):
+        self.closed = False
+
+    def run(self, place_ids, market, report_type):
+        if market == 'broken':
+            raise RuntimeError('database unavailable')
+        return {'requested': len(place_ids)}
+
+    def close(self):
+        self.closed = True
+
+
+def _wait(jobs, job_id):
+    deadline = time.monotonic() + 5
+    while jobs.get(job_id)['status'] in ('queued', 'running'):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    return jobs.get(job_id)
+
+
+class TestBatchReportJobs:
+    def test_jobs_report_summary_or_error(self):
+        jobs = BatchReportJobs(_FakePipeline())
+        ok = jobs.submit(['p0', 'p1', 'p1'], MARKET)
+        failed = jobs.submit(['p0'], 'broken')
+
+        assert ok['status'] in ('queued', 'running') and ok['requested'] == 2
+        assert _wait(jobs, ok['job_id'])['summary'] == {'requested': 3}
+        assert _wait(jobs, failed['job_id'])['error'] == 'database unavailable'
+        assert jobs.get('nope') is None
+
+        jobs.close()
+        assert jobs.pipeline.closed
+
+    def test_only_recent_finished_jobs_are_kept(self):
+        jobs = BatchReportJobs(_FakePipeline(), keep=2)
+        ids = [jobs.submit(['p0'], MARKET)['job_id'] for _ in range(3)]
+        for job_id in ids:
+            _wait(jobs, job_id)
+        latest = jobs.submit(['p0'], MARKET)['job_id']
+
+        assert jobs.get(ids[0]) is None
+        assert all(jobs.get(job_id) for job_id in ids[1:] + [latest])
+        jobs.close()
+
+    def test_unknown_report_type_is_rejected(self):
+        with pytest.raises(ValueError):
+            BatchReportJobs(_FakePipeline()).submit(['p0'], MARKET, 'weekly')
@@ -0,0 +1,266 @@
+"""
+Tests for the shared RevSPY connection pool, without a PostgreSQL server
+"""
+
+import inspect
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+psycopg2 = pytest.importorskip('psycopg2')
+pytest.importorskip('dotenv')
+
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+from psycopg2.pool import PoolError
+
+import revspy_db
+from revspy_db import Database, KeepIdleConnectionPool, PoolMemberMixin
+
+
+class _BaseConnection:
+    """The parts of a psycopg2 connection the pool touches"""
+
+    def __init__(self):
+        self.closed = 0
+        self.status = TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+        self.executed = []
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = TRANSACTION_STATUS_IDLE
+
+    def cursor(self, cursor_factory=None):
+        return _FakeCursor(self)
+
+    def close(self):
+        self.closed = 1
+
+
+class _FakeConnection(PoolMemberMixin, _BaseConnection):
+    pass
+
+
+class _FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query, params=None):
+        self.connection.executed.append(query)
+        if 'revspy_gbp_profiles' in query and not query.startswith(('PREPARE', 'EXECUTE')):
+            self.connection.status = TRANSACTION_STATUS_INTRANS
+            raise psycopg2.ProgrammingError('relation "revspy_gbp_profiles" does not exist')
+
+    def close(self):
+        pass
+
+
+class _FakePool:
+    """ThreadedConnectionPool's getconn/putconn/closeall contract"""
+
+    def __init__(self, minconn=1):
+        self.minconn = minconn
+        self.idle = []
+        self.used = []
+        self.created = 0
+        self.lock = threading.Lock()
+
+    def getconn(self):
+        with self.lock:
+            if self.idle:
+                conn = self.idle.pop()
+            else:
+                conn = _FakeConnection()
+                self.created += 1
+            self.used.append(conn)
+            return conn
+
+    def putconn(self, conn, close=False):
+        with self.lock:
+            self.used.remove(conn)
+            if len(self.idle) < self.minconn and not close and not conn.closed:
+                self.idle.append(conn)
+            else:
+                conn.close()
+
+    def closeall(self):
+        for conn in self.idle + self.used:
+            conn.close()
+
+
+@pytest.fixture
+def database():
+    db = Database(minconn=1, maxconn=2, timeout=0.05)
+    db._pool = _FakePool(minconn=1)
+    return db
+
+
+class TestPool:
+    def test_release_rolls_back_open_transactions(self, database):
+        conn = database.acquire()
+        conn.status = TRANSACTION_STATUS_INTRANS
+        conn.close()
+
+        assert conn.rollbacks == 1
+        assert not conn.closed
+        assert database.stats()['pool']['in_use'] == 0
+        assert database.acquire() is conn
+
+    def test_second_close_after_release_is_a_no_op(self, database):
+        conn = database.acquire()
+        conn.close()
+        conn.close()
+
+        assert not conn.closed
+        assert database._pool.idle == [conn]
+        assert database.acquire() is conn
+
+    def test_surplus_and_broken_connections_are_really_closed(self, database):
+        first, second = database.acquire(), database.acquire()
+        first.close()
+        second.close()
+        assert database._pool.idle == [first]
+        assert second.closed
+
+        broken = database.acquire()
+        broken.closed = 2
+        broken.close()
+        assert database._pool.idle == []
+
+    def test_database_close_really_closes_idle_connections(self, database):
+        conn = database.acquire()
+        conn.close()
+        database.close()
+
+        assert conn.closed
+
+    def test_acquire_times_out_when_exhausted(self, database):
+        held = [database.acquire(), database.acquire()]
+        with pytest.raises(PoolError, match="No database connection available"):
+            database.acquire()
+        assert database.pool_wait.count == 3
+
+        held[0].close()
+        assert database.acquire() is held[0]
+
+    def test_failed_getconn_gives_the_slot_back(self, database):
+        def fail():
+            raise psycopg2.OperationalError("could not connect")
+
+        database._pool.getconn = fail
+        for _ in range(3):
+            with pytest.raises(psycopg2.OperationalError):
+                database.acquire()
+        assert database._slots.acquire(timeout=0) and database._slots.acquire(timeout=0)
+
+    def test_prepared_statements_are_reused_per_connection(self, database):
+        for place_id in ('a', 'b', 'c'):
+            with database.connection() as conn:
+                database.execute_prepared(_FakeCursor(conn), 'profile_by_place_id', (place_id,))
+
+        prepares = [q for q in conn.executed if q.startswith('PREPARE')]
+        executes = [q for q in conn.executed if q.startswith('EXECUTE')]
+        assert len(prepares) == 1
+        assert executes == ['EXECUTE profile_by_place_id (%s)'] * 3
+        assert database.stats()['prepared']['profile_by_place_id']['count'] == 3
+
+
+class TestKeepIdleConnectionPool:
+    def test_idle_connections_are_kept_up_to_maxconn(self, monkeypatch):
+        opened = []
+
+        def connect(*args, **kwargs):
+            conn = _BaseConnection()
+            conn.info = type('info', (), {'transaction_status': TRANSACTION_STATUS_IDLE})()
+            opened.append(conn)
+            return conn
+
+        monkeypatch.setattr(revspy_db.psycopg2, 'connect', connect)
+        pool = KeepIdleConnectionPool(1, 3)
+        assert len(opened) == 1
+
+        for _ in range(2):
+            held = [pool.getconn() for _ in range(3)]
+            for conn in held:
+                pool.putconn(conn)
+
+        assert len(opened) == 3
+        assert not any(conn.closed for conn in opened)
+
+    def test_slow_connect_does_not_block_idle_handoff(self, monkeypatch):
+        opened, slow = [], threading.Event()
+
+        def connect(*args, **kwargs):
+            if opened:
+                assert slow.wait(5)
+            conn = _BaseConnection()
+            conn.info = type('info', (), {'transaction_status': TRANSACTION_STATUS_IDLE})()
+            opened.append(conn)
+            return conn
+
+        monkeypatch.setattr(revspy_db.psycopg2, 'connect', connect)
+        pool = KeepIdleConnectionPool(1, 3)
+        idle = pool.getconn()
+
+        connecting = threading.Thread(target=pool.getconn)
+        connecting.start()
+        handoff = []
+
+        def recycle():
+            pool.putconn(idle)
+            handoff.append(pool.getconn())
+
+        recycler = threading.Thread(target=recycle)
+        recycler.start()
+        recycler.join(1)
+        try:
+            assert handoff == [idle]
+        finally:
+            slow.set()
+            connecting.join()
+        assert len(opened) == 2
+
+
+class TestCache:
+    def test_invalidate_during_load_discards_the_stale_value(self, database):
+        def stale_loader():
+            database.invalidate('market:')
+            return 'stale'
+
+        assert database.cached('market:austin', stale_loader) == 'stale'
+        assert database.cached('market:austin', lambda: 'fresh') == 'fresh'
+        assert database.cached('market:austin', lambda: 'reloaded') == 'fresh'
+
+
+class TestHealthCheck:
+    def test_failed_query_returns_the_connection(self, database, monkeypatch):
+        pytest.importorskip('fastapi')
+        from gbp_intelligence import api as gbp_api
+
+        monkeypatch.setattr(gbp_api, 'get_database', lambda: database)
+        for _ in range(3):
+            result = gbp_api.health_check()
+            assert result['status'] == 'unhealthy'
+
+        assert database.stats()['pool']['in_use'] == 0
+        assert database._pool.idle[0].rollbacks == 3
+
+    def test_pool_backed_handlers_run_in_the_threadpool(self):
+        pytest.importorskip('fastapi')
+        pytest.importorskip('reportlab')
+        from gbp_intelligence import api as gbp_api
+        from gbp_intelligence import reports_api
+
+        handlers = [
+            gbp_api.get_markets, gbp_api.get_market_profiles, gbp_api.get_geographic_gaps,
+            gbp_api.get_category_opportunities, gbp_api.health_check, reports_api.get_market_summary,
+        ]
+        # async def handlers would block the event loop while waiting for a pool slot
+        assert not any(inspect.iscoroutinefunction(handler) for handler in handlers)
@@ -0,0 +1,191 @@
+"""
+Tests for share of voice history: rollup path vs. saved snapshots
+"""
+
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'sov'))
+
+psycopg2 = pytest.importorskip('psycopg2')
+pytest.importorskip('dotenv')
+
+from psycopg2 import errors
+
+import sov_calculator
+from sov_calculator import ShareOfVoiceCalculator, get_sov_history
+
+SITE_ID = 7
+TODAY = date.today()
+PLATFORMS = ['chatgpt', 'perplexity', 'gemini']
+COMPETITORS = ['rival.com', 'other.com', 'third.com']
+
+
+class _FakeSOVDatabase:
+    """Daily rollups plus ai_share_of_voice, answering the calculator's queries"""
+
+    def __init__(self, platform, competitor):
+        self.platform = platform          # (day, platform) -> [total_results, client_mentions]
+        self.competitor = competitor      # (day, platform, domain) -> mentions
+        self.snapshots = {}               # (domain, day, platform) -> row dict
+        self.rollups_installed = True
+
+    def cursor(self, cursor_factory=None):
+        return _FakeCursor(self, as_dict=cursor_factory is not None)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _FakeCursor:
+    def __init__(self, db, as_dict):
+        self.db = db
+        self.as_dict = as_dict
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def _rollup_table(self):
+        if not self.db.rollups_installed:
+            raise errors.UndefinedTable('relation "ai_sov_daily_platform" does not exist')
+
+    def execute(self, query, params=()):
+        db = self.db
+        if 'GROUP BY ai_platform' in query:
+            self._rollup_table()
+            _, start, end = params
+            totals = {}
+            for (day, platform), (total, client) in db.platform.items():
+                if start <= day <= end:
+                    current = totals.setdefault(platform, [0, 0])
+                    current[0] += total
+                    current[1] += client
+            self.rows = [(platform, total, client) for platform, (total, client) in totals.items()]
+        elif 'GROUP BY competitor_domain' in query:
+            _, start, end, domains = params
+            totals = {}
+            for (day, _, domain), mentions in db.competitor.items():
+                if start <= day <= end and domain in domains:
+                    totals[domain] = totals.get(domain, 0) + mentions
+            self.rows = list(totals.items())
+        elif query.startswith('SELECT DISTINCT competitor_domain'):
+            self.rows = [{'competitor_domain': d} for d in {key[0] for key in db.snapshots}]
+        elif 'SELECT day, ai_platform, total_results' in query:
+            self._rollup_table()
+            since = TODAY - timedelta(days=params[1])
+            self.rows = [
+                {'day': day, 'ai_platform': platform, 'total_results': total, 'client_mentions': client}
+                for (day, platform), (total, client) in db.platform.items() if day >= since
+            ]
+        elif 'SELECT day, competitor_domain, SUM(mentions)' in query:
+            since = TODAY - timedelta(days=params[1])
+            totals = {}
+            for (day, _, domain), mentions in db.competitor.items():
+                if day >= since and domain in params[2]:
+                    totals[(day, domain)] = totals.get((day, domain), 0) + mentions
+            self.rows = [{'day': day, 'competitor_domain': domain, 'mentions': mentions}
+                         for (day, domain), mentions in totals.items()]
+        elif 'FROM ai_share_of_voice' in query:
+            since = TODAY - timedelta(days=params[1])
+            domains = params[2]
+            self.rows = sorted(
+                (row for (domain, day, _), row in db.snapshots.items()
+                 if day >= since and (domains is None or domain in domains)),
+                key=lambda row: (-row['measurement_date'].toordinal(), row['competitor_domain'], row['ai_platform'])
+            )
+        else:
+            raise AssertionError(f"unexpected query: {query}")
+
+    def fetchall(self):
+        return self.rows
+
+
+def _execute_values(cur, query, rows, page_size=None):
+    for site_id, domain, day, platform, _, _, _, client_sov, comp_sov, gap in rows:
+        cur.db.snapshots[(domain, day, platform)] = {
+            'measurement_date': day, 'competitor_domain': domain, 'ai_platform': platform,
+            'client_sov_percent': client_sov, 'competitor_sov_percent': comp_sov, 'gap_percent': gap
+        }
+
+
+def _random_rollups(rng, days):
+    platform, competitor = {}, {}
+    for offset in range(days):
+        day = TODAY - timedelta(days=offset)
+        for name in rng.sample(PLATFORMS, rng.randrange(1, len(PLATFORMS) + 1)):
+            total = rng.randrange(0, 40)
+            platform[(day, name)] = [total, rng.randrange(0, total + 1)]
+            for domain in COMPETITORS:
+                # Leave some competitor-days with no rollup row at all
+                if total and rng.random() < 0.6:
+                    competitor[(day, name, domain)] = rng.randrange(1, total + 1)
+    return platform, competitor
+
+
+@pytest.fixture
+def database(monkeypatch):
+    db = _FakeSOVDatabase(*_random_rollups(random.Random(22), days=20))
+    monkeypatch.setattr(sov_calculator, 'get_db_connection', lambda: db)
+    monkeypatch.setattr(sov_calculator, 'execute_values', _execute_values)
+
+    # Daily snapshots of the first two competitors, the way the SOV job saves them
+    calculator = ShareOfVoiceCalculator(SITE_ID, ['client.com'], COMPETITORS[:2])
+    for offset in range(20):
+        day = TODAY - timedelta(days=offset)
+        calculator.save_daily_sov(calculator.calculate_from_results(day, day), day)
+    return db
+
+
+def _history(db, rollups, **kwargs):
+    db.rollups_installed = rollups
+    return [
+        (row['measurement_date'], row['competitor_domain'], row['ai_platform'],
+         *(float(row[column]) for column in sov_calculator.HISTORY_COLUMNS))
+        for row in get_sov_history(SITE_ID, **kwargs)
+    ]
+
+
+class TestSOVHistory:
+    def test_rollups_match_saved_snapshots(self, database):
+        from_rollups = _history(database, rollups=True, days=30)
+        from_snapshots = _history(database, rollups=False, days=30)
+
+        assert from_rollups
+        assert from_rollups == from_snapshots
+
+    def test_defaults_to_tracked_competitors(self, database):
+        competitors = {row[1] for row in _history(database, rollups=True, days=30)}
+        assert competitors == set(COMPETITORS[:2])
+
+    def test_zero_mention_days_are_kept(self, database):
+        day = TODAY - timedelta(days=1)
+        database.platform[(day, 'chatgpt')] = [10, 4]
+        for key in [key for key in database.competitor if key[0] == day]:
+            del database.competitor[key]
+
+        day_counts = [counts for (d, _), counts in database.platform.items() if d == day]
+        client_sov = round(sum(c for _, c in day_counts) / sum(t for t, _ in day_counts) * 100, 1)
+
+        rows = [row for row in _history(database, rollups=True, days=30, competitor_domains=['RIVAL.com'])
+                if row[0] == day and row[2] == 'chatgpt']
+        assert rows == [(day, 'rival.com', 'chatgpt', 40.0, 0.0, client_sov)]
+
+    def test_window_filter(self, database):
+        rows = _history(database, rollups=True, days=3)
+        assert rows and min(row[0] for row in rows) >= TODAY - timedelta(days=3)
@@ -0,0 +1,235 @@
+"""
+Tests for the spatial competitor density index against brute-force scans
+"""
+
+import math
+import os
+import random
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('dotenv')
+
+from gbp_intelligence import spatial
+from gbp_intelligence.spatial import (
+    CompetitorDensityIndex, circle_overlap_area, haversine_km, service_radius_km
+)
+
+MARKETS = {
+    "Chicago, IL": (41.88, -87.63),
+    "Seattle, WA": (47.61, -122.33),
+}
+CATEGORIES = ["Electrician", "Plumber", "Dentist"]
+
+
+def _random_rows(rng, count, prefix="p"):
+    for i in range(count):
+        market = rng.choice(list(MARKETS))
+        lat0, lng0 = MARKETS[market]
+        distance = abs(rng.gauss(0, 12))
+        bearing = rng.random() * 2 * math.pi
+        lat = lat0 + distance * math.cos(bearing) / 111.2
+        lng = lng0 + distance * math.sin(bearing) / (111.2 * math.cos(math.radians(lat0)))
+        radius = rng.choice([None, None, 5, 10, 15, 25])
+        yield f"{prefix}{i}", market, rng.choice(CATEGORIES), lat, lng, radius
+
+
+def _covers(grid, row, col, lat, lng, radius_km):
+    """A service area covers a cell whose centre it contains, and its home cell"""
+    if (row, col) == grid.cell(lat, lng):
+        return True
+    dy_km = (grid.row_lat(row) - lat) * spatial.KM_PER_DEGREE
+    dx_km = (col - ((lng + 180.0) / grid.dlng(row) - 0.5)) * grid.cell_km
+    return dx_km * dx_km + dy_km * dy_km <= radius_km * radius_km
+
+
+def _brute_coverage(index, rows, market, category, cell):
+    return sum(
+        1 for _, m, c, lat, lng, radius in rows
+        if (m, c) == (market, category) and _covers(index.grid, *cell, lat, lng, service_radius_km(radius))
+    )
+
+
+@pytest.fixture
+def rows():
+    return list(_random_rows(random.Random(25), 1500))
+
+
+@pytest.fixture
+def index(rows):
+    index = CompetitorDensityIndex(cell_km=2)
+    index.build(rows)
+    return index
+
+
+class TestAgainstBruteForce:
+    def test_within_radius(self, index, rows):
+        rng = random.Random(1)
+        for _ in range(60):
+            market = rng.choice(list(MARKETS))
+            lat0, lng0 = MARKETS[market]
+            lat, lng = lat0 + rng.uniform(-0.3, 0.3), lng0 + rng.uniform(-0.3, 0.3)
+            radius = rng.choice([0.5, 2, 5, 15])
+            category = rng.choice([None] + CATEGORIES)
+
+            expected = sorted(
+                place_id for place_id, m, c, plat, plng, _ in rows
+                if (category is None or (m, c) == (market, category))
+                and haversine_km(lat, lng, plat, plng) <= radius
+            )
+            found = index.within_radius(lat, lng, radius, market if category else None, category)
+            assert sorted(p['place_id'] for p in found) == expected
+            distances = [p['distance_km'] for p in found]
+            assert distances == sorted(distances)
+
+    def test_coverage_overlap(self, index, rows):
+        by_id = {row[0]: row for row in rows}
+        for place_id in random.Random(2).sample(list(by_id), 40):
+            _, market, category, lat, lng, radius = by_id[place_id]
+            own = service_radius_km(radius)
+            expected = sorted(
+                other for other, m, c, olat, olng, oradius in rows
+                if other != place_id and (m, c) == (market, category)
+                and circle_overlap_area(own, service_radius_km(oradius), haversine_km(lat, lng, olat, olng)) > 0
+            )
+            overlap = index.coverage_overlap(place_id, limit=len(rows))
+            assert sorted(o['place_id'] for o in overlap['overlaps']) == expected
+
+    def test_coverage_and_underserved_cells(self, index, rows):
+        for market in MARKETS:
+            market_cells = {index.grid.cell(lat, lng) for _, m, _, lat, lng, _ in rows if m == market}
+            for category in CATEGORIES:
+                coverage = {cell: _brute_coverage(index, rows, market, category, cell) for cell in market_cells}
+                for cell in list(market_cells)[:50]:
+                    assert index.coverage_at(market, category, *index.grid.center(cell)) == coverage[cell]
+
+                gaps = index.underserved_cells(market, category, min_coverage=4, limit=len(market_cells))
+                assert {gap['cell']: gap['coverage'] for gap in gaps} == {
+                    f"{row}:{col}": count for (row, col), count in coverage.items() if count < 4
+                }
+
+    def test_incremental_updates_match_a_fresh_build(self, index, rows):
+        rng = random.Random(3)
+        current = {row[0]: row for row in rows}
+        for place_id in rng.sample(list(current), 300):
+            moved = next(_random_rows(rng, 1, prefix=place_id))
+            current[place_id] = (place_id,) + moved[1:]
+            index.upsert(*current[place_id])
+        for place_id in rng.sample(list(current), 200):
+            index.remove(place_id)
+            del current[place_id]
+
+        fresh = CompetitorDensityIndex(cell_km=2)
+        fresh.build(current.values())
+        assert index._coverage == fresh._coverage
+        assert index._market_cells == fresh._market_cells
+        for market in MARKETS:
+            for category in CATEGORIES:
+                assert index.underserved_cells(market, category, 3, 500) == \
+                    fresh.underserved_cells(market, category, 3, 500)
+
+
+class TestProcessIndex:
+    @pytest.fixture
+    def table(self, monkeypatch):
+        """Stand-in for revspy_gbp_profiles; load_from_db reads whatever it holds"""
+        table = {'rows': list(_random_rows(random.Random(4), 50)), 'loads': 0, 'gate': None}
+
+        def load_from_db(index, db=None, **kwargs):
+            table['loads'] += 1
+            if table['gate'] is not None:
+                table['gate'].wait(5)
+            return index.build(list(table['rows']), overwrite=False)
+
+        monkeypatch.setattr(CompetitorDensityIndex, 'load_from_db', load_from_db)
+        monkeypatch.setattr(spatial, '_index', None)
+        monkeypatch.setattr(spatial, '_loading', None)
+        monkeypatch.setattr(spatial, '_refresh_due', 0.0)
+        return table
+
+    def _wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+    def test_stale_index_is_rebuilt_in_the_background(self, table, monkeypatch):
+        monkeypatch.setattr(spatial, 'SPATIAL_INDEX_TTL', 60)
+        first = spatial.get_spatial_index()
+        assert table['loads'] == 1 and spatial.get_spatial_index() is first
+
+        # A row deleted from the table outside the ingest path
+        deleted = table['rows'].pop()[0]
+        monkeypatch.setattr(spatial, '_refresh_due', 0.0)
+        table['gate'] = threading.Event()
+        assert spatial.get_spatial_index() is first
+        self._wait_for(lambda: spatial._loading is not None)
+
+        # Ingested while the rebuild is running: lands in both indexes
+        profile = SimpleNamespace(place_id='live', primary_category='Plumber', lat=41.9, lng=-87.6,
+                                  service_area_radius=None)
+        spatial.update_spatial_index([profile], 'Chicago, IL')
+        assert spatial.get_spatial_index() is first
+        table['gate'].set()
+        self._wait_for(lambda: spatial._index is not first)
+
+        rebuilt = spatial.get_spatial_index()
+        assert table['loads'] == 2
+        assert deleted in first._profiles and deleted not in rebuilt._profiles
+        assert 'live' in first._profiles and 'live' in rebuilt._profiles
+
+    def test_failed_refresh_keeps_the_current_index(self, table, monkeypatch):
+        first = spatial.get_spatial_index()
+        monkeypatch.setattr(spatial, '_refresh_due', 0.0)
+        monkeypatch.setattr(CompetitorDensityIndex, 'load_from_db',
+                            lambda index, db=None, **kwargs: 1 / 0)
+        spatial.get_spatial_index()
+        self._wait_for(lambda: not any(t.name == 'revspy-spatial-refresh' for t in threading.enumerate()))
+        assert spatial.get_spatial_index() is first
+
+
+class TestIngest:
+    def test_failed_rows_are_not_indexed(self, monkeypatch):
+        pytest.importorskip('fastapi')
+        from gbp_intelligence import api as gbp_api
+
+        def execute_values(cur, sql, rows, template=None, page_size=None, fetch=False):
+            if any(row[0].startswith('bad') for row in rows):
+                raise ValueError('invalid input syntax')
+            return [(True,)] * len(rows)
+
+        class _Cursor:
+            def execute(self, query, params=None):
+                pass
+
+            def fetchone(self):
+                return (1,)
+
+            def close(self):
+                pass
+
+        conn = SimpleNamespace(cursor=_Cursor, commit=lambda: None, rollback=lambda: None, close=lambda: None)
+        monkeypatch.setattr(gbp_api, 'execute_values', execute_values)
+        monkeypatch.setattr(gbp_api, 'get_db_connection', lambda: conn)
+        monkeypatch.setattr(gbp_api, 'analysis_queue', SimpleNamespace(schedule=lambda market, category: None))
+        index = CompetitorDensityIndex()
+        monkeypatch.setattr(spatial, '_index', index)
+        monkeypatch.setattr(spatial, '_loading', None)
+
+        data = gbp_api.GBPBulkImport(market='Chicago, IL', scraped_by='test', profiles=[
+            gbp_api.GBPProfile(place_id=place_id, business_name=place_id, primary_category='Plumber',
+                               lat=41.9, lng=-87.6)
+            for place_id in ('good1', 'bad1', 'good2')
+        ])
+        request = SimpleNamespace(client=SimpleNamespace(host='127.0.0.1'))
+        response = gbp_api.ingest_gbp_data(data, request)
+
+        assert (response.profiles_inserted, response.profiles_failed) == (2, 1)
+        assert set(index._profiles) == {'good1', 'good2'}